@@ -4,19 +4,21 @@
 from fastapi import FastAPI, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-import psycopg2
-from psycopg2.extras import RealDictCursor
 from typing import Optional, List, Dict, Any, Union
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
+import asyncio
 import logging
 import traceback
 import uvicorn
-import os
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+from db import init_pool, get_pool, close_pool
+from rollups import ensure_schema, refresh_rollups, run_rollup_job
+from response_cache import response_cache
+
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
@@ -33,19 +35,23 @@ app.add_middleware(
     expose_headers=["*"],  # Expose all headers
     max_age=86400,  # Cache preflight requests for 24 hours
 )
-# Database connection function using environment variables
-def get_db_connection():
+
+# Open the connection pool and bring the daily rollups up to date before serving
+@app.on_event("startup")
+async def startup():
+    pool = await init_pool()
     try:
-        conn = psycopg2.connect(
-            host=os.getenv("DATABASE_HOST", "localhost"),
-            database=os.getenv("DATABASE_NAME", "arlo_dashboard"),
-            user=os.getenv("DATABASE_USER", "postgres"),
-            password=os.getenv("DATABASE_PASSWORD", "Vijaya@2210$")
-        )
-        return conn
+        await ensure_schema(pool)
+        await refresh_rollups(pool, wait=True)
     except Exception as e:
-        logger.error(f"Database connection failed: {str(e)}")
-        raise
+        logger.error(f"Initial rollup refresh failed: {str(e)}")
+        logger.error(f"Full exception details: {traceback.format_exc()}")
+    app.state.rollup_task = asyncio.create_task(run_rollup_job(pool, on_change=response_cache.clear))
+
+@app.on_event("shutdown")
+async def shutdown():
+    app.state.rollup_task.cancel()
+    await close_pool()
 
 # Common function to get data filter conditions
 def get_common_filter_conditions():
@@ -62,6 +68,40 @@ def get_common_filter_conditions():
         AND symptoms != ''
     """
 
+# Common function to parse the requested date range
+def resolve_date_range(start_date, end_date, label):
+    """
+    Returns the (first day, last day) of the requested range, or (None, None)
+    when no valid range was given and all data should be used.
+    """
+    if start_date and end_date and start_date != 'null' and end_date != 'null':
+        try:
+            parsed_start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+            parsed_end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+            return parsed_start_date, parsed_end_date
+        except ValueError:
+            logger.warning(f"Invalid date format received for {label}: {start_date} to {end_date}")
+    return None, None
+
+def rollup_range_condition(start, end):
+    """Condition and parameters limiting a rollup table to the days of a range."""
+    if start is None:
+        return "TRUE", []
+    return "day BETWEEN $1 AND $2", [start, end]
+
+def raw_range_condition(start, end, first_param=1):
+    """Condition and parameters limiting sf_chat_transcript_summary to the days of a range."""
+    if start is None:
+        return "TRUE", []
+    return (
+        f"created_date >= ${first_param} AND created_date < ${first_param + 1}",
+        [datetime.combine(start, datetime.min.time()), datetime.combine(end + timedelta(days=1), datetime.min.time())]
+    )
+
+def format_duration(seconds):
+    """Formats a duration in seconds as M:SS."""
+    return f"{int(seconds // 60)}:{int(seconds % 60):02d}"
+
 # Test route to verify server is running
 @app.get("/")
 def home():
@@ -69,210 +109,137 @@ def home():
 
 # Route to fetch summary data
 @app.get("/api/summary-data")
-def get_summary_data(
+async def get_summary_data(
     from_date: Optional[str] = Query(None),
     to_date: Optional[str] = Query(None),
     from_: Optional[str] = Query(None, alias="from"),
     to: Optional[str] = Query(None)
 ):
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
         # Use whichever parameters are provided
         start_date = from_date or from_
         end_date = to_date or to
-        
+
         logger.debug(f"Summary data - using date range: {start_date} to {end_date}")
-        
-        where_clause = ""
-        params = []
-       
-        # Build the date filter clause if valid dates are provided
-        if start_date and end_date and start_date != 'null' and end_date != 'null':
-            try:
-                parsed_start_date = datetime.strptime(start_date, '%Y-%m-%d')
-                parsed_end_date = datetime.strptime(end_date, '%Y-%m-%d')
-                where_clause = "WHERE created_date BETWEEN %s AND %s"
-                params = [parsed_start_date, parsed_end_date]
-            except ValueError:
-                logger.warning(f"Invalid date format received for summary data: {start_date} to {end_date}")
-
-        # Query for total sessions
-        cursor.execute(f"""
-            SELECT COUNT(*)
-            FROM sf_chat_transcript_summary
-            {where_clause}
-        """, params)
-        total_sessions = cursor.fetchone()[0]
+
+        start, end = resolve_date_range(start_date, end_date, "summary data")
+        return await response_cache.get_or_compute(
+            ("summary-data", start, end), lambda: fetch_summary_data(start, end)
+        )
+
+    except Exception as e:
+        logger.error(f"Error in get_summary_data: {str(e)}")
+        logger.error(f"Full exception details: {traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def fetch_summary_data(start, end):
+    async with get_pool().acquire() as conn:
+        range_condition, params = rollup_range_condition(start, end)
+
+        # Query for total sessions, handle time, resolution rate and votes
+        totals_query = """
+            SELECT
+                COALESCE(SUM(sessions), 0)::bigint AS sessions,
+                SUM(duration_sum) / NULLIF(SUM(duration_count), 0) AS avg_handle_time,
+                SUM(completed) * 100.0 / NULLIF(SUM(sessions), 0) AS resolution_rate,
+                COALESCE(SUM(ai_yes), 0)::bigint AS upvotes,
+                COALESCE(SUM(ai_no), 0)::bigint AS downvotes
+            FROM arlo_daily_sessions
+            WHERE {condition}
+        """
+        totals = await conn.fetchrow(totals_query.format(condition=range_condition), *params)
 
         # If no data is found, remove the date filter and fetch all data
-        if total_sessions == 0:
+        if totals["sessions"] == 0 and start is not None:
             logger.info("No data found for the specified date range. Fetching all data for summary.")
-            where_clause = ""
-            params = []
-            cursor.execute(f"""
-                SELECT COUNT(*)
-                FROM sf_chat_transcript_summary
-            """)
-            total_sessions = cursor.fetchone()[0]
-
-        # Query for average handle time
-        cursor.execute(f"""
-            SELECT AVG(chat_duration)
-            FROM sf_chat_transcript_summary
-            WHERE chat_duration IS NOT NULL
-            {' AND ' + where_clause[6:] if where_clause else ''}
-        """, params)
-        avg_handle_time = cursor.fetchone()[0] or 0
-        avg_minutes = int(avg_handle_time // 60)
-        avg_seconds = int(avg_handle_time % 60)
-        aht = f"{avg_minutes}:{avg_seconds:02d}"
-
-        # Query for resolution rate
-        cursor.execute(f"""
-            SELECT
-                COUNT(CASE WHEN status = 'Completed' THEN 1 END) * 100.0 / NULLIF(COUNT(*), 0)
-            FROM sf_chat_transcript_summary
-            {where_clause}
-        """, params)
-        resolution_rate = cursor.fetchone()[0] or 0
+            range_condition, params = rollup_range_condition(None, None)
+            totals = await conn.fetchrow(totals_query.format(condition=range_condition))
 
         # Query for root causes
-        cursor.execute(f"""
+        root_causes = await conn.fetch(f"""
             SELECT
-                CASE
-                    WHEN problem IS NULL OR problem = '' THEN 'Uncategorized'
-                    ELSE problem
-                END as name,
-                COUNT(*) as sessions,
-                COUNT(*) * 100.0 / SUM(COUNT(*)) OVER() as percentage
-            FROM sf_chat_transcript_summary
-            {where_clause}
-            GROUP BY
-                CASE
-                    WHEN problem IS NULL OR problem = '' THEN 'Uncategorized'
-                    ELSE problem
-                END
-            ORDER BY sessions DESC
+                problem as name,
+                SUM(sessions)::bigint as sessions,
+                SUM(sessions) * 100.0 / SUM(SUM(sessions)) OVER() as percentage
+            FROM arlo_daily_root_causes
+            WHERE {range_condition}
+            GROUP BY problem
+            ORDER BY 2 DESC
             LIMIT 6
-        """, params)
-        root_causes = [dict(zip(['name', 'sessions', 'percentage'],
-                                [r[0], r[1], round(r[2], 1)])) for r in cursor.fetchall()]
-
-        # Query for upvotes and downvotes
-        cursor.execute(f"""
-            SELECT
-                COUNT(CASE WHEN ai_usage_id = 'Yes' THEN 1 END) as upvotes,
-                COUNT(CASE WHEN ai_usage_id = 'No' THEN 1 END) as downvotes
-            FROM sf_chat_transcript_summary
-            {where_clause}
-        """, params)
-        votes = cursor.fetchone()
-        upvotes = votes[0] or 0
-        downvotes = votes[1] or 0
-
-        cursor.close()
-        conn.close()
-
-        return {
-            "totalSessions": total_sessions,
-            "aht": aht,
-            "resolutionRate": resolution_rate,
-            "upvotes": upvotes,
-            "downvotes": downvotes,
-            "rootCauses": root_causes
-        }
-
-    except Exception as e:
-        logger.error(f"Error in get_summary_data: {str(e)}")
-        logger.error(f"Full exception details: {traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail=str(e))
+        """, *params)
+
+    return {
+        "totalSessions": totals["sessions"],
+        "aht": format_duration(totals["avg_handle_time"] or 0),
+        "resolutionRate": totals["resolution_rate"] or 0,
+        "upvotes": totals["upvotes"],
+        "downvotes": totals["downvotes"],
+        "rootCauses": [
+            {"name": r["name"], "sessions": r["sessions"], "percentage": round(r["percentage"], 1)}
+            for r in root_causes
+        ]
+    }
 
 # Route to fetch problems data - UPDATED TO MATCH SUMMARY
 @app.get("/api/problems-data")
-def get_problems_data(
+async def get_problems_data(
     from_date: Optional[str] = Query(None),
     to_date: Optional[str] = Query(None),
     from_: Optional[str] = Query(None, alias="from"),
     to: Optional[str] = Query(None)
 ):
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
         # Use whichever parameters are provided
         start_date = from_date or from_
         end_date = to_date or to
-        
+
         logger.debug(f"Problems data - using date range: {start_date} to {end_date}")
-        
-        where_clause = ""
-        params = []
-        
-        # Build the date filter clause if valid dates are provided
-        if start_date and end_date and start_date != 'null' and end_date != 'null':
-            try:
-                parsed_start_date = datetime.strptime(start_date, '%Y-%m-%d')
-                parsed_end_date = datetime.strptime(end_date, '%Y-%m-%d')
-                where_clause = "WHERE created_date BETWEEN %s AND %s"
-                params = [parsed_start_date, parsed_end_date]
-            except ValueError:
-                logger.warning(f"Invalid date format received for problems data: {start_date} to {end_date}")
-        
-        # Build full query
-        query = f"""
-            SELECT
-                problem AS "Problem",
-                root_cause AS "Root cause",
-                symptoms AS "Symptoms",
-                ai_usage_id AS "AI Usage ID",
-                chat_duration AS "Chat Duration"
-            FROM sf_chat_transcript_summary
-            {where_clause}
-        """
-        
-        # Execute the query
-        cursor.execute(query, tuple(params))
-        results = cursor.fetchall()
-        
-        # If no data is found, fetch all data without the date filter
-        if not results:
-            logger.info("No data found for the specified date range. Fetching all data.")
-            query_all = """
-                SELECT
-                    problem AS "Problem",
-                    root_cause AS "Root cause",
-                    symptoms AS "Symptoms",
-                    ai_usage_id AS "AI Usage ID",
-                    chat_duration AS "Chat Duration"
-                FROM sf_chat_transcript_summary
-            """
-            cursor.execute(query_all)
-            results = cursor.fetchall()
-        
-        # Format chat duration in results
-        formatted_results = []
-        for row in results:
-            row_dict = dict(row)
-            if row_dict["Chat Duration"] is not None:
-                hours = int(row_dict["Chat Duration"] // 60)
-                minutes = int(row_dict["Chat Duration"] % 60)
-                row_dict["Chat Duration"] = f"{hours:02d}:{minutes:02d}"
-            formatted_results.append(row_dict)
-        
-        cursor.close()
-        conn.close()
-        return formatted_results
-    
+
+        start, end = resolve_date_range(start_date, end_date, "problems data")
+        return await response_cache.get_or_compute(
+            ("problems-data", start, end), lambda: fetch_problems_data(start, end)
+        )
+
     except Exception as e:
         logger.error(f"Error in get_problems_data: {str(e)}")
         logger.error(f"Full exception details: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def fetch_problems_data(start, end):
+    query = """
+        SELECT
+            problem AS "Problem",
+            root_cause AS "Root cause",
+            symptoms AS "Symptoms",
+            ai_usage_id AS "AI Usage ID",
+            chat_duration AS "Chat Duration"
+        FROM sf_chat_transcript_summary
+        WHERE {condition}
+    """
+    async with get_pool().acquire() as conn:
+        range_condition, params = raw_range_condition(start, end)
+        results = await conn.fetch(query.format(condition=range_condition), *params)
+
+        # If no data is found, fetch all data without the date filter
+        if not results and start is not None:
+            logger.info("No data found for the specified date range. Fetching all data.")
+            results = await conn.fetch(query.format(condition="TRUE"))
+
+    # Format chat duration in results
+    formatted_results = []
+    for row in results:
+        row_dict = dict(row)
+        if row_dict["Chat Duration"] is not None:
+            hours = int(row_dict["Chat Duration"] // 60)
+            minutes = int(row_dict["Chat Duration"] % 60)
+            row_dict["Chat Duration"] = f"{hours:02d}:{minutes:02d}"
+        formatted_results.append(row_dict)
+
+    return formatted_results
+
 # Route to fetch agents data - UPDATED TO MATCH SUMMARY
 @app.get("/api/agents-data")
-def get_agents_data(
+async def get_agents_data(
     from_date: Optional[str] = Query(None),
     to_date: Optional[str] = Query(None),
     from_: Optional[str] = Query(None, alias="from"),
@@ -282,105 +249,127 @@ def get_agents_data(
         # Use whichever parameters are provided
         start_date = from_date or from_
         end_date = to_date or to
-        
+
         logger.debug(f"Agents data - using date range: {start_date} to {end_date}")
-        
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # Base fields to select
-        select_fields = """
+
+        start, end = resolve_date_range(start_date, end_date, "agents data")
+        return await response_cache.get_or_compute(
+            ("agents-data", start, end), lambda: fetch_agents_data(start, end)
+        )
+
+    except Exception as e:
+        logger.error(f"Error in get_agents_data: {str(e)}")
+        logger.error(f"Full exception details: {traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def fetch_agents_data(start, end):
+    # Base query
+    query = """
+        SELECT
             owner_full_name as "Owner: Full Name",
             status as "Status",
             chat_duration as "Chat Duration",
-            created_date as "Created Date", 
+            created_date as "Created Date",
             ai_usage_id as "AIAssisted"
-        """
-        
-        where_clause = ""
-        params = []
-        
-        # Build the date filter clause if valid dates are provided
-        if start_date and end_date and start_date != 'null' and end_date != 'null':
-            try:
-                parsed_start_date = datetime.strptime(start_date, '%Y-%m-%d')
-                parsed_end_date = datetime.strptime(end_date, '%Y-%m-%d')
-                where_clause = "WHERE created_date BETWEEN %s AND %s"
-                params = [parsed_start_date, parsed_end_date]
-            except ValueError:
-                logger.warning(f"Invalid date format received for agents data: {start_date} to {end_date}")
-        
-        # Base query 
-        query = f"""
-            SELECT {select_fields}
-            FROM sf_chat_transcript_summary 
-            {where_clause}
-        """
-        
+        FROM sf_chat_transcript_summary
+        WHERE {condition}
+    """
+    async with get_pool().acquire() as conn:
+        range_condition, params = raw_range_condition(start, end)
+
         # Execute query with date filter
-        logger.debug(f"Executing query: {query} with params: {params}")
-        cursor.execute(query, params)
-        
-        results = cursor.fetchall()
-        
+        logger.debug(f"Executing agents query for {start} to {end}")
+        results = await conn.fetch(query.format(condition=range_condition), *params)
+
         # If no data found with date filter, fetch all data
-        if not results:
+        if not results and start is not None:
             logger.warning("No data found for the specified date range. Fetching all data.")
-            base_query = f"""
-                SELECT {select_fields}
-                FROM sf_chat_transcript_summary
-            """
-            
-            cursor.execute(base_query)
-            results = cursor.fetchall()
-        
-        # If still no results, create synthetic data for testing
-        if not results:
-            logger.warning("No data found in database. Generating synthetic data for testing.")
-            results = generate_synthetic_data()
-        
-        # Process the results to format dates and durations
-        formatted_results = []
-        for row in results:
-            row_dict = dict(row)
-            
-            # Format created_date
-            if "Created Date" in row_dict and row_dict["Created Date"] is not None:
-                if isinstance(row_dict["Created Date"], (datetime, date)):
-                    row_dict["Created Date"] = row_dict["Created Date"].isoformat()
-            
-            # Format chat_duration - convert from seconds to MM:SS format
-            if "Chat Duration" in row_dict and row_dict["Chat Duration"] is not None:
-                # Handle different formats - some may be strings, some may be floats
-                try:
-                    duration_value = float(row_dict["Chat Duration"])
-                    minutes = int(duration_value // 60)
-                    seconds = int(duration_value % 60)
-                    row_dict["Chat Duration"] = f"{minutes}:{seconds:02d}"
-                except (ValueError, TypeError):
-                    # Keep as is if it can't be converted
-                    pass
-            
-            # Map AIAssisted to Yes/No based on actual value
-            if "AIAssisted" in row_dict:
-                if row_dict["AIAssisted"] == "Yes" or row_dict["AIAssisted"] == "Y" or row_dict["AIAssisted"] == True:
-                    row_dict["AIAssisted"] = "Yes"
-                else:
-                    row_dict["AIAssisted"] = "No"
-                
-            formatted_results.append(row_dict)
-        
-        cursor.close()
-        conn.close()
-        
-        logger.info(f"Returning {len(formatted_results)} results")
-        return formatted_results
-        
+            results = await conn.fetch(query.format(condition="TRUE"))
+
+    # If still no results, create synthetic data for testing
+    if not results:
+        logger.warning("No data found in database. Generating synthetic data for testing.")
+        results = generate_synthetic_data()
+
+    # Process the results to format dates and durations
+    formatted_results = []
+    for row in results:
+        row_dict = dict(row)
+
+        # Format created_date
+        if "Created Date" in row_dict and row_dict["Created Date"] is not None:
+            if isinstance(row_dict["Created Date"], (datetime, date)):
+                row_dict["Created Date"] = row_dict["Created Date"].isoformat()
+
+        # Format chat_duration - convert from seconds to MM:SS format
+        if "Chat Duration" in row_dict and row_dict["Chat Duration"] is not None:
+            # Handle different formats - some may be strings, some may be floats
+            try:
+                row_dict["Chat Duration"] = format_duration(float(row_dict["Chat Duration"]))
+            except (ValueError, TypeError):
+                # Keep as is if it can't be converted
+                pass
+
+        # Map AIAssisted to Yes/No based on actual value
+        if "AIAssisted" in row_dict:
+            if row_dict["AIAssisted"] == "Yes" or row_dict["AIAssisted"] == "Y" or row_dict["AIAssisted"] == True:
+                row_dict["AIAssisted"] = "Yes"
+            else:
+                row_dict["AIAssisted"] = "No"
+
+        formatted_results.append(row_dict)
+
+    logger.info(f"Returning {len(formatted_results)} results")
+    return formatted_results
+
+# Route to fetch per-agent totals from the daily rollups
+@app.get("/api/agents-summary")
+async def get_agents_summary(
+    from_date: Optional[str] = Query(None),
+    to_date: Optional[str] = Query(None),
+    from_: Optional[str] = Query(None, alias="from"),
+    to: Optional[str] = Query(None)
+):
+    try:
+        start_date = from_date or from_
+        end_date = to_date or to
+
+        logger.debug(f"Agents summary - using date range: {start_date} to {end_date}")
+
+        start, end = resolve_date_range(start_date, end_date, "agents summary")
+        return await response_cache.get_or_compute(
+            ("agents-summary", start, end), lambda: fetch_agents_summary(start, end)
+        )
+
     except Exception as e:
-        logger.error(f"Error in get_agents_data: {str(e)}")
+        logger.error(f"Error in get_agents_summary: {str(e)}")
         logger.error(f"Full exception details: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def fetch_agents_summary(start, end):
+    range_condition, params = rollup_range_condition(start, end)
+    async with get_pool().acquire() as conn:
+        results = await conn.fetch(f"""
+            SELECT
+                owner_full_name as "Owner: Full Name",
+                SUM(sessions)::bigint as "Sessions",
+                SUM(completed)::bigint as "Completed",
+                SUM(ai_assisted)::bigint as "AI Assisted",
+                SUM(duration_sum) / NULLIF(SUM(duration_count), 0) as "AHT"
+            FROM arlo_daily_agents
+            WHERE {range_condition}
+            GROUP BY owner_full_name
+            ORDER BY "Sessions" DESC
+        """, *params)
+
+    formatted_results = []
+    for row in results:
+        row_dict = dict(row)
+        if row_dict["AHT"] is not None:
+            row_dict["AHT"] = format_duration(row_dict["AHT"])
+        formatted_results.append(row_dict)
+    return formatted_results
+
 # Generate synthetic data function (used by agents-data)
 def generate_synthetic_data():
     """Generate synthetic data for testing when database has no data"""
@@ -439,7 +428,7 @@ def generate_synthetic_data():
 
 # Route to fetch products data - UPDATED TO MATCH SUMMARY
 @app.get("/api/products")
-def get_products_data(
+async def get_products_data(
     from_date: Optional[str] = Query(None),
     to_date: Optional[str] = Query(None),
     from_: Optional[str] = Query(None, alias="from"),
@@ -449,77 +438,100 @@ def get_products_data(
         # Use whichever parameters are provided
         start_date = from_date or from_
         end_date = to_date or to
-        
+
         logger.debug(f"Products data - using date range: {start_date} to {end_date}")
-        
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
 
-        # Constructing WHERE clause based on dates
-        where_clause = ""
-        params = []
-        if start_date and end_date and start_date != 'null' and end_date != 'null':
-            try:
-                parsed_start_date = datetime.strptime(start_date, '%Y-%m-%d')
-                parsed_end_date = datetime.strptime(end_date, '%Y-%m-%d')
-                where_clause = "WHERE created_date BETWEEN %s AND %s"
-                params = [parsed_start_date, parsed_end_date]
-            except ValueError:
-                logger.warning(f"Invalid date format received for products data: {start_date} to {end_date}")
-
-        # Main query with optional WHERE clause
-        query = f"""
-            SELECT
-                product as "Products",
-                sub_product as "Sub Product",
-                chat_duration as "AHT",
-                problem as "Problem",
-                root_cause as "Root cause"
-            FROM sf_chat_transcript_summary
-            {where_clause}
-        """
-       
-        cursor.execute(query, params)
-        results = cursor.fetchall()
+        start, end = resolve_date_range(start_date, end_date, "products data")
+        return await response_cache.get_or_compute(
+            ("products", start, end), lambda: fetch_products_data(start, end)
+        )
+
+    except Exception as e:
+        logger.error(f"Error in get_products_data: {str(e)}")
+        logger.error(f"Full exception details: {traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def fetch_products_data(start, end):
+    # Main query with optional date condition
+    query = """
+        SELECT
+            product as "Products",
+            sub_product as "Sub Product",
+            chat_duration as "AHT",
+            problem as "Problem",
+            root_cause as "Root cause"
+        FROM sf_chat_transcript_summary
+        WHERE {condition}
+    """
+    async with get_pool().acquire() as conn:
+        range_condition, params = raw_range_condition(start, end)
+        results = await conn.fetch(query.format(condition=range_condition), *params)
 
         # If no results are found, fetch all data
-        if not results:
+        if not results and start is not None:
             logger.info("No results found for the given date range. Fetching all product data.")
-            query_all = """
-                SELECT
-                    product as "Products",
-                    sub_product as "Sub Product",
-                    chat_duration as "AHT",
-                    problem as "Problem",
-                    root_cause as "Root cause"
-                FROM sf_chat_transcript_summary
-            """
-            cursor.execute(query_all)
-            results = cursor.fetchall()
+            results = await conn.fetch(query.format(condition="TRUE"))
+
+    # Format AHT in results
+    formatted_results = []
+    for row in results:
+        row_dict = dict(row)
+        if row_dict["AHT"] is not None:
+            row_dict["AHT"] = format_duration(row_dict["AHT"])
+        formatted_results.append(row_dict)
 
-        # Format AHT in results
-        formatted_results = []
-        for row in results:
-            row_dict = dict(row)
-            if row_dict["AHT"] is not None:
-                minutes = int(row_dict["AHT"] // 60)
-                seconds = int(row_dict["AHT"] % 60)
-                row_dict["AHT"] = f"{minutes}:{seconds:02d}"
-            formatted_results.append(row_dict)
+    return formatted_results
 
-        cursor.close()
-        conn.close()
+# Route to fetch per-product totals from the daily rollups
+@app.get("/api/products-summary")
+async def get_products_summary(
+    from_date: Optional[str] = Query(None),
+    to_date: Optional[str] = Query(None),
+    from_: Optional[str] = Query(None, alias="from"),
+    to: Optional[str] = Query(None)
+):
+    try:
+        start_date = from_date or from_
+        end_date = to_date or to
 
-        return formatted_results
+        logger.debug(f"Products summary - using date range: {start_date} to {end_date}")
+
+        start, end = resolve_date_range(start_date, end_date, "products summary")
+        return await response_cache.get_or_compute(
+            ("products-summary", start, end), lambda: fetch_products_summary(start, end)
+        )
 
     except Exception as e:
-        logger.error(f"Error in get_products_data: {str(e)}")
+        logger.error(f"Error in get_products_summary: {str(e)}")
         logger.error(f"Full exception details: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def fetch_products_summary(start, end):
+    range_condition, params = rollup_range_condition(start, end)
+    async with get_pool().acquire() as conn:
+        results = await conn.fetch(f"""
+            SELECT
+                product as "Products",
+                sub_product as "Sub Product",
+                SUM(sessions)::bigint as "Sessions",
+                SUM(duration_sum) / NULLIF(SUM(duration_count), 0) as "AHT"
+            FROM arlo_daily_products
+            WHERE {range_condition}
+            GROUP BY product, sub_product
+            ORDER BY "Sessions" DESC
+        """, *params)
+
+    formatted_results = []
+    for row in results:
+        row_dict = dict(row)
+        if row_dict["AHT"] is not None:
+            row_dict["AHT"] = format_duration(row_dict["AHT"])
+        formatted_results.append(row_dict)
+    return formatted_results
+
 # Route to fetch feedback data - UPDATED TO MATCH SUMMARY
 @app.get("/api/feedback")
-def get_feedback(
+async def get_feedback(
     from_date: Optional[str] = Query(None),
     to_date: Optional[str] = Query(None),
     from_: Optional[str] = Query(None, alias="from"),
@@ -529,153 +541,83 @@ def get_feedback(
         # Use whichever parameters are provided
         start_date = from_date or from_
         end_date = to_date or to
-        
+
         logger.debug(f"Feedback data - using date range: {start_date} to {end_date}")
-        
-        conn = get_db_connection()
-        cursor = conn.cursor()
 
-        where_clause = ""
-        params = []
-        if start_date and end_date and start_date != 'null' and end_date != 'null':
-            try:
-                parsed_start_date = datetime.strptime(start_date, '%Y-%m-%d')
-                parsed_end_date = datetime.strptime(end_date, '%Y-%m-%d')
-                where_clause = "WHERE created_date BETWEEN %s AND %s"
-                params = [parsed_start_date, parsed_end_date]
-            except ValueError:
-                logger.warning(f"Invalid date format received for feedback data: {start_date} to {end_date}")
-
-        # Modified upvoted query to use upvotes column
-        upvoted_query = f"""
-            SELECT 
-                symptoms as item,
-                'Symptom' as category,
-                SUM(upvotes::int) as vote_count,
-                array_agg(chat_transcript_id) as transcript_ids
-            FROM sf_chat_transcript_summary
-            {where_clause}
-            {'AND ' if where_clause else 'WHERE '}
-            symptoms IS NOT NULL 
-            AND symptoms != ''
-            AND upvotes > 0
-            GROUP BY symptoms
-            ORDER BY vote_count DESC
-            LIMIT 3
-        """
-        
-        # Modified downvoted query to use downvotes column
-        downvoted_query = f"""
-            SELECT 
-                symptoms as item,
-                'Symptom' as category,
-                SUM(downvotes::int) as vote_count,
-                array_agg(chat_transcript_id) as transcript_ids
-            FROM sf_chat_transcript_summary
-            {where_clause}
-            {'AND ' if where_clause else 'WHERE '}
-            symptoms IS NOT NULL 
-            AND symptoms != ''
-            AND downvotes > 0
-            GROUP BY symptoms
-            ORDER BY vote_count DESC
-            LIMIT 3
-        """
+        start, end = resolve_date_range(start_date, end_date, "feedback data")
+        return await response_cache.get_or_compute(
+            ("feedback", start, end), lambda: fetch_feedback(start, end)
+        )
 
-        cursor.execute(upvoted_query, params)
-        most_upvoted = [
-            {
-                'item': row[0],
-                'category': row[1],
-                'count': int(row[2]) if row[2] is not None else 0,
-                'transcript_ids': row[3]
-            }
-            for row in cursor.fetchall()
-        ]
+    except Exception as e:
+        logger.error(f"Error in get_feedback: {str(e)}")
+        logger.error(f"Full exception details: {traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-        cursor.execute(downvoted_query, params)
-        most_downvoted = [
-            {
-                'item': row[0],
-                'category': row[1],
-                'count': int(row[2]) if row[2] is not None else 0,
-                'transcript_ids': row[3][:5] if row[3] is not None else []
-            }
-            for row in cursor.fetchall()
-        ]
+async def fetch_most_voted(conn, column, start, end, max_transcript_ids=None):
+    """
+    Top 3 symptoms by upvotes or downvotes (column) in the range, with the
+    transcripts that voted on them.
+    """
+    range_condition, params = rollup_range_condition(start, end)
+    top = await conn.fetch(f"""
+        SELECT
+            symptoms,
+            SUM({column})::bigint as vote_count
+        FROM arlo_daily_symptom_votes
+        WHERE {column} > 0
+        AND {range_condition}
+        GROUP BY symptoms
+        ORDER BY vote_count DESC
+        LIMIT 3
+    """, *params)
+    if not top:
+        return []
+
+    # Transcript IDs are only looked up for the top symptoms
+    range_condition, params = raw_range_condition(start, end, first_param=2)
+    transcripts = await conn.fetch(f"""
+        SELECT
+            symptoms,
+            array_agg(chat_transcript_id) as transcript_ids
+        FROM sf_chat_transcript_summary
+        WHERE symptoms = ANY($1::text[])
+        AND {column} > 0
+        AND {range_condition}
+        GROUP BY symptoms
+    """, [row["symptoms"] for row in top], *params)
+    transcript_ids = {row["symptoms"]: row["transcript_ids"] for row in transcripts}
+
+    return [
+        {
+            'item': row["symptoms"],
+            'category': 'Symptom',
+            'count': int(row["vote_count"]) if row["vote_count"] is not None else 0,
+            'transcript_ids': transcript_ids.get(row["symptoms"], [])[:max_transcript_ids]
+        }
+        for row in top
+    ]
+
+async def fetch_feedback(start, end):
+    async with get_pool().acquire() as conn:
+        most_upvoted = await fetch_most_voted(conn, "upvotes", start, end)
+        most_downvoted = await fetch_most_voted(conn, "downvotes", start, end, max_transcript_ids=5)
 
         # If no results with date filter, fetch all-time data
-        if not most_upvoted or not most_downvoted:
+        if (not most_upvoted or not most_downvoted) and start is not None:
             logger.info("No feedback data found for the given date range. Fetching all-time data.")
-            all_time_upvoted = """
-                SELECT 
-                    symptoms as item,
-                    'Symptom' as category,
-                    SUM(upvotes::int) as vote_count,
-                    array_agg(chat_transcript_id) as transcript_ids
-                FROM sf_chat_transcript_summary
-                WHERE symptoms IS NOT NULL 
-                AND symptoms != ''
-                AND upvotes > 0
-                GROUP BY symptoms
-                ORDER BY vote_count DESC
-                LIMIT 3
-            """
-            
-            all_time_downvoted = """
-                SELECT 
-                    symptoms as item,
-                    'Symptom' as category,
-                    SUM(downvotes::int) as vote_count,
-                    array_agg(chat_transcript_id) as transcript_ids
-                FROM sf_chat_transcript_summary
-                WHERE symptoms IS NOT NULL 
-                AND symptoms != ''
-                AND downvotes > 0
-                GROUP BY symptoms
-                ORDER BY vote_count DESC
-                LIMIT 3
-            """
+            most_upvoted = await fetch_most_voted(conn, "upvotes", None, None)
+            most_downvoted = await fetch_most_voted(conn, "downvotes", None, None, max_transcript_ids=5)
 
-            cursor.execute(all_time_upvoted)
-            most_upvoted = [
-                {
-                    'item': row[0],
-                    'category': row[1],
-                    'count': int(row[2]) if row[2] is not None else 0,
-                    'transcript_ids': row[3]
-                }
-                for row in cursor.fetchall()
-            ]
-
-            cursor.execute(all_time_downvoted)
-            most_downvoted = [
-                {
-                    'item': row[0],
-                    'category': row[1],
-                    'count': int(row[2]) if row[2] is not None else 0,
-                    'transcript_ids': row[3][:5] if row[3] is not None else []
-                }
-                for row in cursor.fetchall()
-            ]
-
-        cursor.close()
-        conn.close()
-
-        return {
-            "mostUpvoted": most_upvoted,
-            "mostDownvoted": most_downvoted
-        }
-
-    except Exception as e:
-        logger.error(f"Error in get_feedback: {str(e)}")
-        logger.error(f"Full exception details: {traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "mostUpvoted": most_upvoted,
+        "mostDownvoted": most_downvoted
+    }
 
 # Route to fetch feedback details - UPDATED TO MATCH SUMMARY
 # Route to fetch feedback details - IMPROVED VERSION
 @app.get("/api/feedback-details")
-def get_feedback_details(
+async def get_feedback_details(
     item: str = Query(...),
     type: str = Query(...),
     from_date: Optional[str] = Query(None),
@@ -705,7 +647,7 @@ def get_feedback_details(
                     symptoms,
                     upvotes
                 FROM sf_chat_transcript_summary
-                WHERE symptoms = %s
+                WHERE symptoms = $1
                 AND COALESCE(upvotes, 0) > 0
                 LIMIT 5
             """
@@ -719,21 +661,19 @@ def get_feedback_details(
                     symptoms,
                     downvotes
                 FROM sf_chat_transcript_summary
-                WHERE symptoms = %s
+                WHERE symptoms = $1
                 AND COALESCE(downvotes, 0) > 0
                 LIMIT 5
             """
         
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            
             # Execute with just the item parameter
-            cursor.execute(query, [item])
+            async with get_pool().acquire() as conn:
+                rows = await conn.fetch(query, item)
             
             # Process results
             results = []
-            for row in cursor.fetchall():
+            for row in rows:
                 results.append({
                     'chat_transcript_id': row[0] or f"RESULT-{len(results)+1}",
                     'product': row[1] or 'Arlo Device',
@@ -744,9 +684,6 @@ def get_feedback_details(
                     'downvotes': row[5] if type == 'downvote' else 0
                 })
             
-            cursor.close()
-            conn.close()
-            
             logger.debug(f"Query returned {len(results)} results")
             
         except Exception as db_error:
@@ -803,7 +740,7 @@ def get_feedback_details(
 # Root cause endpoint - ADDED FOR COMPLETENESS
 # Root cause endpoint continued
 @app.get("/api/root-cause-data")
-def get_root_cause_data(
+async def get_root_cause_data(
     from_date: Optional[str] = Query(None),
     to_date: Optional[str] = Query(None),
     from_: Optional[str] = Query(None, alias="from"),
@@ -813,85 +750,60 @@ def get_root_cause_data(
         # Use whichever parameters are provided
         start_date = from_date or from_
         end_date = to_date or to
-        
+
         logger.debug(f"Root cause data - using date range: {start_date} to {end_date}")
-        
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
 
-        where_clause = ""
-        params = []
-        if start_date and end_date and start_date != 'null' and end_date != 'null':
-            try:
-                parsed_start_date = datetime.strptime(start_date, '%Y-%m-%d')
-                parsed_end_date = datetime.strptime(end_date, '%Y-%m-%d')
-                where_clause = "WHERE created_date BETWEEN %s AND %s"
-                params = [parsed_start_date, parsed_end_date]
-            except ValueError:
-                logger.warning(f"Invalid date format received for root cause data: {start_date} to {end_date}")
+        start, end = resolve_date_range(start_date, end_date, "root cause data")
+        return await response_cache.get_or_compute(
+            ("root-cause-data", start, end), lambda: fetch_root_cause_data(start, end)
+        )
 
-        # Query for root causes
-        query = f"""
-            SELECT
-                problem as "Problem",
-                root_cause as "Root Cause",
-                COUNT(*) as "Count",
-                SUM(CASE WHEN ai_usage_id = 'Yes' THEN 1 ELSE 0 END) as "AI Assisted Count",
-                AVG(chat_duration) as "Average Duration"
-            FROM sf_chat_transcript_summary
-            {where_clause}
-            GROUP BY problem, root_cause
-            ORDER BY "Count" DESC
-        """
-        
-        cursor.execute(query, params)
-        results = cursor.fetchall()
+    except Exception as e:
+        logger.error(f"Error in get_root_cause_data: {str(e)}")
+        logger.error(f"Full exception details: {traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def fetch_root_cause_data(start, end):
+    # Query for root causes
+    query = """
+        SELECT
+            problem as "Problem",
+            root_cause as "Root Cause",
+            SUM(sessions)::bigint as "Count",
+            SUM(ai_assisted)::bigint as "AI Assisted Count",
+            SUM(duration_sum) / NULLIF(SUM(duration_count), 0) as "Average Duration"
+        FROM arlo_daily_problem_root_causes
+        WHERE {condition}
+        GROUP BY problem, root_cause
+        ORDER BY "Count" DESC
+    """
+    async with get_pool().acquire() as conn:
+        range_condition, params = rollup_range_condition(start, end)
+        results = await conn.fetch(query.format(condition=range_condition), *params)
 
         # If no results are found, fetch all data
-        if not results:
+        if not results and start is not None:
             logger.info("No results found for the given date range. Fetching all root cause data.")
-            query_all = """
-                SELECT
-                    problem as "Problem",
-                    root_cause as "Root Cause",
-                    COUNT(*) as "Count",
-                    SUM(CASE WHEN ai_usage_id = 'Yes' THEN 1 ELSE 0 END) as "AI Assisted Count",
-                    AVG(chat_duration) as "Average Duration"
-                FROM sf_chat_transcript_summary
-                GROUP BY problem, root_cause
-                ORDER BY "Count" DESC
-            """
-            cursor.execute(query_all)
-            results = cursor.fetchall()
+            results = await conn.fetch(query.format(condition="TRUE"))
 
-        # Format results
-        formatted_results = []
-        for row in results:
-            row_dict = dict(row)
-            
-            # Format average duration
-            if row_dict["Average Duration"] is not None:
-                minutes = int(row_dict["Average Duration"] // 60)
-                seconds = int(row_dict["Average Duration"] % 60)
-                row_dict["Average Duration"] = f"{minutes}:{seconds:02d}"
-                
-            # Calculate AI assisted percentage
-            if row_dict["Count"] > 0:
-                row_dict["AI Assisted Percentage"] = round((row_dict["AI Assisted Count"] / row_dict["Count"]) * 100, 1)
-            else:
-                row_dict["AI Assisted Percentage"] = 0
-                
-            formatted_results.append(row_dict)
+    # Format results
+    formatted_results = []
+    for row in results:
+        row_dict = dict(row)
 
-        cursor.close()
-        conn.close()
+        # Format average duration
+        if row_dict["Average Duration"] is not None:
+            row_dict["Average Duration"] = format_duration(row_dict["Average Duration"])
 
-        return formatted_results
+        # Calculate AI assisted percentage
+        if row_dict["Count"] > 0:
+            row_dict["AI Assisted Percentage"] = round((row_dict["AI Assisted Count"] / row_dict["Count"]) * 100, 1)
+        else:
+            row_dict["AI Assisted Percentage"] = 0
 
-    except Exception as e:
-        logger.error(f"Error in get_root_cause_data: {str(e)}")
-        logger.error(f"Full exception details: {traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail=str(e))
+        formatted_results.append(row_dict)
+
+    return formatted_results
 
 if __name__ == '__main__':
-    uvicorn.run("app:app", host="0.0.0.0", port=5000, reload=True)
\ No newline at end of file
+    uvicorn.run("app:app", host="0.0.0.0", port=5000, reload=True)
@@ -0,0 +1,54 @@
+"""
+Shared asyncpg connection pool for the dashboard API.
+
+The pool is opened on application startup and closed on shutdown. Endpoints
+borrow a connection with `async with get_pool().acquire() as conn:` instead of
+opening a new database connection per request.
+"""
+
+import logging
+import os
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+# Seconds before a dashboard query is cancelled
+DB_COMMAND_TIMEOUT = float(os.getenv("DB_COMMAND_TIMEOUT", "60"))
+
+_pool = None
+
+
+async def init_pool():
+    global _pool
+    if _pool is not None:
+        return _pool
+    try:
+        _pool = await asyncpg.create_pool(
+            host=os.getenv("DATABASE_HOST", "localhost"),
+            database=os.getenv("DATABASE_NAME", "arlo_dashboard"),
+            user=os.getenv("DATABASE_USER", "postgres"),
+            password=os.getenv("DATABASE_PASSWORD", "Vijaya@2210$"),
+            min_size=DB_POOL_MIN_SIZE,
+            max_size=DB_POOL_MAX_SIZE,
+            command_timeout=DB_COMMAND_TIMEOUT,
+        )
+    except Exception as e:
+        logger.error(f"Database connection failed: {str(e)}")
+        raise
+    return _pool
+
+
+def get_pool():
+    if _pool is None:
+        raise RuntimeError("Database pool is not initialized")
+    return _pool
+
+
+async def close_pool():
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
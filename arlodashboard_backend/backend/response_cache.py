@@ -0,0 +1,65 @@
+"""
+Short-lived cache of dashboard responses.
+
+Entries are keyed by (endpoint, date range, filters) and expire after
+RESPONSE_CACHE_TTL seconds. Concurrent requests for the same key share one
+computation, and the cache is cleared whenever the rollup job applies changes.
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+
+
+class ResponseCache:
+    def __init__(self, ttl=RESPONSE_CACHE_TTL, max_entries=RESPONSE_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._pending = {}  # key -> Future of the running computation
+
+    async def get_or_compute(self, key, compute):
+        """Cached value of key, or the result of awaiting compute()."""
+        if self.ttl <= 0:
+            return await compute()
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            return entry[1]
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            # Errors are not cached, only handed to the requests already waiting
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            self._pending.pop(key, None)
+
+        future.set_result(value)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,309 @@
+"""
+Daily rollups of sf_chat_transcript_summary for the dashboard endpoints.
+
+Each rollup table holds one row per day (created_date::date) and group, so an
+endpoint sums a handful of rows per day instead of scanning every chat in the
+requested range. Chats without a created_date roll up into day NULL, which
+only the all-time aggregates include, as with the raw queries.
+
+Changes are recorded by triggers on the source table: every inserted, updated
+or deleted chat appends its day to arlo_rollup_changes. refresh_rollups()
+drains that log, recomputes the affected days and advances the watermark (the
+highest change id applied) in one transaction. When the source table is
+(re)created or truncated, e.g. by import_data.py, the triggers are reinstalled
+and all rollups are rebuilt.
+"""
+
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+SOURCE_TABLE = "sf_chat_transcript_summary"
+
+ROLLUP_REFRESH_SECONDS = float(os.getenv("ROLLUP_REFRESH_SECONDS", "60"))
+
+# Advisory lock held while refreshing, so only one API worker runs the job
+ROLLUP_LOCK_KEY = 0x41524C4F
+
+# table -> (columns after "day", SELECT producing "day" and those columns).
+# {source} is the FROM item (aliased s) and {scope} limits the chats read.
+ROLLUPS = {
+    "arlo_daily_sessions": (
+        [
+            ("sessions", "bigint"),
+            ("completed", "bigint"),
+            ("duration_sum", "numeric"),
+            ("duration_count", "bigint"),
+            ("ai_yes", "bigint"),
+            ("ai_no", "bigint"),
+        ],
+        """
+        SELECT
+            s.created_date::date,
+            COUNT(*),
+            COUNT(*) FILTER (WHERE s.status = 'Completed'),
+            SUM(s.chat_duration),
+            COUNT(s.chat_duration),
+            COUNT(*) FILTER (WHERE s.ai_usage_id = 'Yes'),
+            COUNT(*) FILTER (WHERE s.ai_usage_id = 'No')
+        FROM {source}
+        WHERE {scope}
+        GROUP BY 1
+        """,
+    ),
+    "arlo_daily_root_causes": (
+        [("problem", "text"), ("sessions", "bigint")],
+        """
+        SELECT
+            s.created_date::date,
+            CASE
+                WHEN s.problem IS NULL OR s.problem = '' THEN 'Uncategorized'
+                ELSE s.problem
+            END,
+            COUNT(*)
+        FROM {source}
+        WHERE {scope}
+        GROUP BY 1, 2
+        """,
+    ),
+    "arlo_daily_problem_root_causes": (
+        [
+            ("problem", "text"),
+            ("root_cause", "text"),
+            ("sessions", "bigint"),
+            ("ai_assisted", "bigint"),
+            ("duration_sum", "numeric"),
+            ("duration_count", "bigint"),
+        ],
+        """
+        SELECT
+            s.created_date::date,
+            s.problem,
+            s.root_cause,
+            COUNT(*),
+            COUNT(*) FILTER (WHERE s.ai_usage_id = 'Yes'),
+            SUM(s.chat_duration),
+            COUNT(s.chat_duration)
+        FROM {source}
+        WHERE {scope}
+        GROUP BY 1, 2, 3
+        """,
+    ),
+    "arlo_daily_symptom_votes": (
+        [("symptoms", "text"), ("upvotes", "bigint"), ("downvotes", "bigint")],
+        """
+        SELECT
+            s.created_date::date,
+            s.symptoms,
+            SUM(s.upvotes) FILTER (WHERE s.upvotes > 0),
+            SUM(s.downvotes) FILTER (WHERE s.downvotes > 0)
+        FROM {source}
+        WHERE {scope}
+            AND s.symptoms IS NOT NULL
+            AND s.symptoms != ''
+            AND (s.upvotes > 0 OR s.downvotes > 0)
+        GROUP BY 1, 2
+        """,
+    ),
+    "arlo_daily_agents": (
+        [
+            ("owner_full_name", "text"),
+            ("sessions", "bigint"),
+            ("completed", "bigint"),
+            ("ai_assisted", "bigint"),
+            ("duration_sum", "numeric"),
+            ("duration_count", "bigint"),
+        ],
+        """
+        SELECT
+            s.created_date::date,
+            s.owner_full_name,
+            COUNT(*),
+            COUNT(*) FILTER (WHERE s.status = 'Completed'),
+            COUNT(*) FILTER (WHERE s.ai_usage_id IN ('Yes', 'Y')),
+            SUM(s.chat_duration),
+            COUNT(s.chat_duration)
+        FROM {source}
+        WHERE {scope}
+        GROUP BY 1, 2
+        """,
+    ),
+    "arlo_daily_products": (
+        [
+            ("product", "text"),
+            ("sub_product", "text"),
+            ("sessions", "bigint"),
+            ("duration_sum", "numeric"),
+            ("duration_count", "bigint"),
+        ],
+        """
+        SELECT
+            s.created_date::date,
+            s.product,
+            s.sub_product,
+            COUNT(*),
+            SUM(s.chat_duration),
+            COUNT(s.chat_duration)
+        FROM {source}
+        WHERE {scope}
+        GROUP BY 1, 2, 3
+        """,
+    ),
+}
+
+SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS arlo_rollup_state (
+        id boolean PRIMARY KEY DEFAULT TRUE CHECK (id),
+        source_oid oid,
+        watermark bigint NOT NULL DEFAULT 0,
+        refreshed_at timestamptz
+    );
+    CREATE TABLE IF NOT EXISTS arlo_rollup_changes (
+        id bigserial PRIMARY KEY,
+        day date
+    );
+    CREATE OR REPLACE FUNCTION arlo_rollup_track_change() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            INSERT INTO arlo_rollup_changes (day) VALUES (OLD.created_date::date);
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            INSERT INTO arlo_rollup_changes (day) VALUES (NEW.created_date::date);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql;
+    CREATE OR REPLACE FUNCTION arlo_rollup_track_truncate() RETURNS trigger AS $$
+    BEGIN
+        -- Forces a full rebuild on the next refresh
+        UPDATE arlo_rollup_state SET source_oid = NULL;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql;
+"""
+
+TRIGGERS_SQL = f"""
+    DROP TRIGGER IF EXISTS arlo_rollup_track_change ON {SOURCE_TABLE};
+    CREATE TRIGGER arlo_rollup_track_change
+        AFTER INSERT OR UPDATE OR DELETE ON {SOURCE_TABLE}
+        FOR EACH ROW EXECUTE PROCEDURE arlo_rollup_track_change();
+    DROP TRIGGER IF EXISTS arlo_rollup_track_truncate ON {SOURCE_TABLE};
+    CREATE TRIGGER arlo_rollup_track_truncate
+        AFTER TRUNCATE ON {SOURCE_TABLE}
+        FOR EACH STATEMENT EXECUTE PROCEDURE arlo_rollup_track_truncate();
+"""
+
+
+def _rollup_ddl():
+    statements = []
+    for table, (columns, _) in ROLLUPS.items():
+        column_defs = ", ".join(f"{name} {type_}" for name, type_ in columns)
+        statements.append(f"CREATE TABLE IF NOT EXISTS {table} (day date, {column_defs})")
+        statements.append(f"CREATE INDEX IF NOT EXISTS {table}_day_idx ON {table} (day)")
+    return ";\n".join(statements)
+
+
+def _insert_sql(table, source, scope):
+    columns, select = ROLLUPS[table]
+    column_names = ", ".join(["day"] + [name for name, _ in columns])
+    return f"INSERT INTO {table} ({column_names}) " + select.format(source=source, scope=scope)
+
+
+async def ensure_schema(pool):
+    """Create the rollup tables and change-tracking functions; run once at startup."""
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            # Workers start together; concurrent CREATE OR REPLACE FUNCTION can fail
+            await conn.execute("SELECT pg_advisory_xact_lock($1)", ROLLUP_LOCK_KEY)
+            await conn.execute(SCHEMA_SQL)
+            await conn.execute(_rollup_ddl())
+
+
+async def _rebuild_all(conn):
+    await conn.execute(TRIGGERS_SQL)
+    for table in ROLLUPS:
+        # DELETE rather than TRUNCATE, so dashboard reads are not blocked meanwhile
+        await conn.execute(f"DELETE FROM {table}")
+        await conn.execute(_insert_sql(table, f"{SOURCE_TABLE} s", "TRUE"))
+
+
+async def _recompute_days(conn, days):
+    dated = sorted(day for day in days if day is not None)
+    for table in ROLLUPS:
+        if dated:
+            await conn.execute(f"DELETE FROM {table} WHERE day = ANY($1::date[])", dated)
+            # Range join per day, so the created_date index is used
+            source = (
+                "unnest($1::date[]) AS d(day) "
+                f"JOIN {SOURCE_TABLE} s ON s.created_date >= d.day AND s.created_date < d.day + 1"
+            )
+            await conn.execute(_insert_sql(table, source, "TRUE"), dated)
+        if None in days:
+            await conn.execute(f"DELETE FROM {table} WHERE day IS NULL")
+            await conn.execute(_insert_sql(table, f"{SOURCE_TABLE} s", "s.created_date IS NULL"))
+
+
+async def refresh_rollups(pool, wait=False):
+    """
+    Apply pending source changes to the rollup tables created by ensure_schema().
+
+    Returns True if any rollup changed. Without wait, returns False right away
+    when another worker is already refreshing.
+    """
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            if wait:
+                await conn.execute("SELECT pg_advisory_xact_lock($1)", ROLLUP_LOCK_KEY)
+            elif not await conn.fetchval("SELECT pg_try_advisory_xact_lock($1)", ROLLUP_LOCK_KEY):
+                return False
+
+            source_oid = await conn.fetchval("SELECT to_regclass($1)::oid", SOURCE_TABLE)
+            if source_oid is None:
+                logger.warning(f"Table {SOURCE_TABLE} does not exist, skipping rollup refresh")
+                return False
+
+            state = await conn.fetchrow("SELECT source_oid, watermark FROM arlo_rollup_state")
+            if state is None or state["source_oid"] != source_oid:
+                logger.info(f"Rebuilding dashboard rollups from {SOURCE_TABLE}")
+                # Installing the triggers locks out writers until commit, so
+                # every change already logged is covered by the rebuild
+                await _rebuild_all(conn)
+                logged = await conn.fetchval("SELECT COALESCE(MAX(id), 0) FROM arlo_rollup_changes")
+                await conn.execute("DELETE FROM arlo_rollup_changes")
+                watermark = max(state["watermark"] if state else 0, logged)
+            else:
+                # Drain the committed changes rather than reading past the
+                # watermark: ids of concurrent transactions can commit out of order
+                changes = await conn.fetch("DELETE FROM arlo_rollup_changes RETURNING id, day")
+                if not changes:
+                    return False
+                await _recompute_days(conn, {change["day"] for change in changes})
+                watermark = max(state["watermark"], max(change["id"] for change in changes))
+                logger.debug(f"Applied {len(changes)} chat changes to dashboard rollups")
+
+            await conn.execute(
+                """
+                INSERT INTO arlo_rollup_state (id, source_oid, watermark, refreshed_at)
+                VALUES (TRUE, $1, $2, now())
+                ON CONFLICT (id) DO UPDATE
+                SET source_oid = EXCLUDED.source_oid,
+                    watermark = EXCLUDED.watermark,
+                    refreshed_at = EXCLUDED.refreshed_at
+                """,
+                source_oid,
+                watermark,
+            )
+            return True
+
+
+async def run_rollup_job(pool, on_change=None):
+    """Refresh the rollups every ROLLUP_REFRESH_SECONDS until cancelled."""
+    while True:
+        await asyncio.sleep(ROLLUP_REFRESH_SECONDS)
+        try:
+            if await refresh_rollups(pool) and on_change is not None:
+                on_change()
+        except Exception as e:
+            logger.error(f"Rollup refresh failed: {str(e)}")
@@ -44,6 +44,9 @@ class DatabaseConnector:
         self.password = os.getenv("DB_PASSWORD")
         self.database = os.getenv("DB_NAME")
         self.echo = os.getenv("DB_ECHO", "False").lower() == "true"
+        # Optional SELECT-only role for queries written by the SQL agent
+        self.agent_username = os.getenv("SQL_AGENT_DB_USERNAME")
+        self.agent_password = os.getenv("SQL_AGENT_DB_PASSWORD")
 
         # Validate required configuration
         if not all([self.username, self.password, self.database]):
@@ -56,6 +59,12 @@ class DatabaseConnector:
             connection_string = f"postgresql://{self.username}:{self.password}@{self.host}:{self.port}/{self.database}"
             self.engine = create_engine(connection_string, echo=self.echo, pool_pre_ping=True)
             self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+            if self.agent_username:
+                agent_connection_string = f"postgresql://{self.agent_username}:{self.agent_password}@{self.host}:{self.port}/{self.database}"
+                self.agent_engine = create_engine(agent_connection_string, echo=self.echo, pool_pre_ping=True)
+                logger.info(f"SQL agent engine uses role {self.agent_username}")
+            else:
+                self.agent_engine = self.engine
             logger.info(f"Database engine initialized for {self.host}:{self.port}/{self.database}")
         except Exception as e:
             logger.error(f"Failed to initialize database engine: {e}")
@@ -6,6 +6,7 @@ from dotenv import load_dotenv
 import os
 from db_connector import db_connector
 from sql_agent_inference import sql_inference
+from sql_agent_factory import invalidate_sql_agent_cache
 import json
 from fastapi.responses import StreamingResponse, JSONResponse
 
@@ -102,6 +103,8 @@ load_csv_files()
         description="Reloads CSV files from disk to update data")
 async def reload_csv_files():
     load_csv_files()
+    # Table info and cached SQL agent query results may be stale now
+    invalidate_sql_agent_cache()
     return {"status": "CSV files reloaded"}
 
 # Rest of your API endpoints...
@@ -1,58 +1,60 @@
 from langchain_openai import ChatOpenAI
 from langchain_community.agent_toolkits.sql.base import create_sql_agent
-from langchain.agents.agent_types import AgentType
+from langchain_community.agent_toolkits.sql.toolkit import SQLDatabaseToolkit
+from langchain_community.tools.sql_database.tool import (
+    InfoSQLDatabaseTool,
+    QuerySQLDatabaseTool,
+)
 from langchain_community.utilities import SQLDatabase
-from langchain import hub
+from langchain_community.utilities.sql_database import truncate_word
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.memory import ConversationBufferMemory
+from sqlalchemy import text
+from collections import OrderedDict
 from db_connector import db_connector
+import logging
 import os
+import re
+import threading
+import time
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
 
-def create_campaign_sql_agent(conversation_history=None, temperature=0):
+INCLUDE_TABLES = ["campaign_data_table", "creative_data_table"]
+
+# Agent queries are aborted after this many milliseconds
+STATEMENT_TIMEOUT_MS = int(os.getenv("SQL_AGENT_STATEMENT_TIMEOUT_MS", "15000"))
+# Small cache of query results keyed by normalized SQL
+QUERY_CACHE_SIZE = int(os.getenv("SQL_AGENT_QUERY_CACHE_SIZE", "128"))
+QUERY_CACHE_TTL = int(os.getenv("SQL_AGENT_QUERY_CACHE_TTL", "300"))
+# How often (seconds) the table columns are checked for schema changes
+SCHEMA_CHECK_INTERVAL = int(os.getenv("SQL_AGENT_SCHEMA_CHECK_INTERVAL", "300"))
+
+READ_ONLY_SQL = re.compile(r"^\s*(select|with|explain)\b", re.IGNORECASE)
+
+
+def is_read_only_sql(sql):
     """
-    Factory function to create a SQL agent specialized for campaign data.
-    
-    Args:
-        conversation_history: List of conversation messages
-        temperature: Temperature for the LLM
-        
-    Returns:
-        agent_executor: The SQL agent
-        query_extractor: Callback handler for extracting SQL queries
+    Whether normalized SQL is a single SELECT/WITH/EXPLAIN statement.
+
+    psycopg2 runs ";"-separated statements in one call, so a later COMMIT could
+    end the read-only transaction; any remaining ";" is rejected. Set
+    SQL_AGENT_DB_USERNAME to a SELECT-only role to enforce this in the database too.
     """
-    # Initialize database connection
-    db = SQLDatabase.from_uri(
-        f"postgresql://{db_connector.username}:{db_connector.password}@{db_connector.host}:{db_connector.port}/{db_connector.database}",
-        include_tables=["campaign_data_table","creative_data_table"],
-        sample_rows_in_table_info=3
-    )
-    API_KEY = os.environ["OPENAI_API_KEY"]
-    # Initialize the language model
-    llm = ChatOpenAI(temperature=temperature, model="gpt-4o-mini",api_key=API_KEY)
-    # Get table info
-    table_info = db.get_table_info()
-    # Create a proper ChatPromptTemplate
-    # filter_instructions = ""
-    # if selected_brand or selected_ad_surface or selected_campaign:
-    #     filter_instructions = "IMPORTANT: You must filter your queries according to the user's current selection:\n"
-        
-    #     if selected_brand:
-    #         filter_instructions += f"- Brand: {selected_brand}\n"
-        
-    #     if selected_ad_surface:
-    #         filter_instructions += f"- Ad Surface: {selected_ad_surface}\n"
-        
-    #     if selected_campaign:
-    #         filter_instructions += f"- Campaign: {selected_campaign}\n"
-        
-    #     filter_instructions += "\nAll SQL queries MUST include these filters in the WHERE clause to ensure results are relevant to the user's current view(Unless specified otherwise).\n"
+    return bool(READ_ONLY_SQL.match(sql)) and ";" not in sql
 
-    system_message = """You are an agent designed to interact with a SQL database.
+SCHEMA_FINGERPRINT_SQL = text("""
+    SELECT md5(string_agg(table_name || '.' || column_name || ':' || data_type, ','
+                          ORDER BY table_name, ordinal_position))
+    FROM information_schema.columns
+    WHERE table_schema = current_schema() AND table_name = ANY(:tables)
+""")
+
+SYSTEM_MESSAGE = """You are an agent designed to interact with a SQL database.
         Given an input question, create a syntactically correct PostgreSQL query to run, then look at the results of the query and return the answer.
         Unless the user specifies a specific number of examples they wish to obtain, always limit your query to at most 10 results.
         You can order the results by a relevant column to return the most interesting examples in the database.
@@ -98,41 +100,212 @@ def create_campaign_sql_agent(conversation_history=None, temperature=0):
         You can join tables using campaign_name to analyze how creative elements impact campaign performance.
         
         Always provide insights that would be valuable for marketing analysis.
+"""
+
+PROMPT_TEMPLATE = ChatPromptTemplate.from_messages([
+    ("system", SYSTEM_MESSAGE),
+    ("human", "{input}"),
+    MessagesPlaceholder(variable_name="agent_scratchpad")
+])
+
+
+def normalize_sql(query):
+    """Collapse whitespace and trailing semicolons so equivalent queries share a cache entry."""
+    return " ".join(query.split()).rstrip(";").strip()
+
+
+class QueryResultCache:
+    """LRU cache of query results with a time-to-live."""
+
+    def __init__(self, max_size=QUERY_CACHE_SIZE, ttl=QUERY_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+query_result_cache = QueryResultCache()
+
+
+class ReadOnlyQuerySQLDatabaseTool(QuerySQLDatabaseTool):
+    """
+    Runs agent queries in a read-only transaction with a statement timeout.
+    Results are cached by normalized SQL until the schema cache is invalidated.
+    """
+
+    def _run(self, query, run_manager=None):
+        sql = normalize_sql(query)
+        if not is_read_only_sql(sql):
+            return "Error: Only a single read-only SELECT query is allowed."
+        cached = query_result_cache.get(sql)
+        if cached is not None:
+            return cached
+        try:
+            with self.db._engine.connect() as connection:
+                with connection.begin():
+                    connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+                    connection.exec_driver_sql(
+                        f"SET LOCAL statement_timeout = {STATEMENT_TIMEOUT_MS}"
+                    )
+                    result = connection.execute(text(sql))
+                    rows = [
+                        tuple(truncate_word(c, length=self.db._max_string_length) for c in row)
+                        for row in result.fetchall()
+                    ] if result.returns_rows else []
+        except Exception as e:
+            # Returned to the agent so it can rewrite the query
+            return f"Error: {e}"
+        output = str(rows) if rows else ""
+        query_result_cache.put(sql, output)
+        return output
+
+
+class CachedInfoSQLDatabaseTool(InfoSQLDatabaseTool):
+    """Serves table schemas and sample rows from the table info snapshot."""
+
+    def _run(self, table_names, run_manager=None):
+        snapshot = get_schema_snapshot()
+        tables = [t.strip() for t in table_names.split(",")]
+        missing = [t for t in tables if t not in snapshot.table_info]
+        if missing:
+            return f"Error: table_names {set(missing)} not found in database"
+        return "\n\n".join(snapshot.table_info[t] for t in tables)
+
+
+class CampaignSQLDatabaseToolkit(SQLDatabaseToolkit):
+    """SQL toolkit with the read-only query tool and cached schema tool."""
+
+    def get_tools(self):
+        tools = []
+        for tool in super().get_tools():
+            if isinstance(tool, QuerySQLDatabaseTool):
+                tool = ReadOnlyQuerySQLDatabaseTool(db=self.db, description=tool.description)
+            elif isinstance(tool, InfoSQLDatabaseTool):
+                tool = CachedInfoSQLDatabaseTool(db=self.db, description=tool.description)
+            tools.append(tool)
+        return tools
+
+
+class SchemaSnapshot:
+    """Reflected database, per-table info and prompt for one schema version."""
+
+    def __init__(self):
+        # Uses the process-level pooled engine; reflects the tables once
+        self.db = SQLDatabase(
+            db_connector.agent_engine,
+            include_tables=INCLUDE_TABLES,
+            sample_rows_in_table_info=3
+        )
+        self.table_info = {
+            table: self.db.get_table_info([table])
+            for table in self.db.get_usable_table_names()
+        }
+        self.prompt = PROMPT_TEMPLATE.partial(
+            table_info="\n\n".join(self.table_info.values())
+        )
+        self.fingerprint = schema_fingerprint()
+        self.checked_at = time.monotonic()
+        # temperature -> prebuilt agent executor
+        self.agents = {}
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def schema_fingerprint():
+    with db_connector.engine.connect() as connection:
+        return connection.execute(SCHEMA_FINGERPRINT_SQL, {"tables": INCLUDE_TABLES}).scalar()
+
+
+def invalidate_sql_agent_cache():
+    """Drop the table info snapshot, prebuilt agents and cached query results."""
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
+    query_result_cache.clear()
+
+
+def get_schema_snapshot():
+    """Current snapshot, rebuilt after invalidation or when the table columns change."""
+    global _snapshot
+    with _snapshot_lock:
+        snapshot = _snapshot
+        if snapshot is not None and time.monotonic() - snapshot.checked_at > SCHEMA_CHECK_INTERVAL:
+            snapshot.checked_at = time.monotonic()
+            if schema_fingerprint() != snapshot.fingerprint:
+                logger.info("SQL agent schema changed, rebuilding table info")
+                snapshot = None
+                query_result_cache.clear()
+        if snapshot is None:
+            snapshot = _snapshot = SchemaSnapshot()
+        return snapshot
+
+
+def create_campaign_sql_agent(conversation_history=None, temperature=0):
     """
-    
-    # Create the chat prompt template
-    chat_prompt = ChatPromptTemplate.from_messages([
-        ("system", system_message),
-        ("human", "{input}"),
-        MessagesPlaceholder(variable_name="agent_scratchpad")
-    ])
-    
+    Factory function to create a SQL agent specialized for campaign data.
+
+    The agent, prompt and table info are built once per schema snapshot and
+    shared between requests; only conversation memory is per call.
+
+    Args:
+        conversation_history: List of conversation messages
+        temperature: Temperature for the LLM
+        
+    Returns:
+        agent_executor: The SQL agent
+    """
+    snapshot = get_schema_snapshot()
+    with _snapshot_lock:
+        agent_executor = snapshot.agents.get(temperature)
+        if agent_executor is None:
+            API_KEY = os.environ["OPENAI_API_KEY"]
+            # Initialize the language model
+            llm = ChatOpenAI(temperature=temperature, model="gpt-4o-mini",api_key=API_KEY)
+            # Create the SQL agent
+            agent_executor = snapshot.agents[temperature] = create_sql_agent(
+                llm=llm,
+                toolkit=CampaignSQLDatabaseToolkit(db=snapshot.db, llm=llm),
+                agent_type="openai-tools",
+                verbose=True,
+                prompt=snapshot.prompt,
+            )
+
+    if not conversation_history:
+        return agent_executor
+
     # Setup conversation memory
     memory = ConversationBufferMemory(
         memory_key="chat_history",
         return_messages=True
     )
-    
+
     # Add conversation history to memory
-    if conversation_history:
-        for message in conversation_history:
-            if message["role"] == "user":
-                memory.chat_memory.add_user_message(message["content"])
-            else:
-                memory.chat_memory.add_ai_message(message["content"])
-    
-    # # Create SQL query extractor callback
-    # query_extractor = SQLQueryExtractor()
-    
-    print("PROMPT SENT: ",chat_prompt)
-    # Create the SQL agent
-    agent_executor = create_sql_agent(
-        llm=llm,
-        db=db,
-        agent_type="openai-tools",
-        verbose=True,
-        prompt=chat_prompt,
-        memory=memory
-    )
-    
-    return agent_executor
+    for message in conversation_history:
+        if message["role"] == "user":
+            memory.chat_memory.add_user_message(message["content"])
+        else:
+            memory.chat_memory.add_ai_message(message["content"])
+
+    # Per-call copy; the prebuilt agent and tools are shared
+    return agent_executor.model_copy(update={"memory": memory})
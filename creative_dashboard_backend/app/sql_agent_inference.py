@@ -1,3 +1,4 @@
+import asyncio
 from model import InferencePayload
 from sql_agent_factory import create_campaign_sql_agent
 from db_connector import db_connector
@@ -17,7 +18,8 @@ async def sql_inference(inference_payload: InferencePayload):
         
         # Create SQL agent and query extractor
         # agent_executor, query_extractor = create_campaign_sql_agent()
-        agent_executor = create_campaign_sql_agent()
+        # Built off the event loop (the first call reflects the schema)
+        agent_executor = await asyncio.to_thread(create_campaign_sql_agent)
             # selected_brand=selected_brand,
             # selected_ad_surface=selected_ad_surface,
             # selected_campaign=selected_campaign
@@ -0,0 +1,10 @@
+import os
+import sys
+
+# The app modules import each other as top-level modules (as in the container)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+# db_connector builds its engine at import time; no connection is opened
+os.environ.setdefault("DB_USERNAME", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+os.environ.setdefault("DB_NAME", "test")
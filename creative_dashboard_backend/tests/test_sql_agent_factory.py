@@ -0,0 +1,42 @@
+"""
+Tests for the read-only query tool of the SQL agent
+"""
+
+import pytest
+from langchain_community.utilities import SQLDatabase
+from sqlalchemy import create_engine, inspect, text
+
+from sql_agent_factory import ReadOnlyQuerySQLDatabaseTool, is_read_only_sql, normalize_sql
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE campaign_data_table (id INTEGER)"))
+    return engine
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "SELECT 1; COMMIT; DROP TABLE campaign_data_table",
+        "WITH x AS (SELECT 1) SELECT * FROM x; DELETE FROM campaign_data_table;",
+        "DROP TABLE campaign_data_table",
+    ],
+)
+def test_only_single_read_only_statements_are_allowed(query):
+    assert not is_read_only_sql(normalize_sql(query))
+
+
+def test_trailing_semicolon_is_allowed():
+    assert is_read_only_sql(normalize_sql("SELECT id FROM campaign_data_table;  "))
+
+
+def test_multi_statement_query_is_rejected_before_running(engine):
+    tool = ReadOnlyQuerySQLDatabaseTool(db=SQLDatabase(engine))
+
+    result = tool._run("SELECT 1; COMMIT; DROP TABLE campaign_data_table")
+
+    assert result.startswith("Error:")
+    assert inspect(engine).has_table("campaign_data_table")
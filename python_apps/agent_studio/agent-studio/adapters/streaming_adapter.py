@@ -57,12 +57,16 @@ class StreamingAdapter:
         async for sse_line in sdk_stream:
             event_count += 1
 
-            # Parse SDK event
-            if not sse_line.startswith("data: "):
+            # Parse SDK event (frames may carry an "id:" line before the data)
+            data_line = next(
+                (line for line in sse_line.split("\n") if line.startswith("data: ")),
+                None,
+            )
+            if data_line is None:
                 continue
 
             try:
-                sdk_event = json.loads(sse_line[6:])  # Remove "data: " prefix
+                sdk_event = json.loads(data_line[6:])  # Remove "data: " prefix
                 event_type = sdk_event.get("type")
 
                 # Emit 'started' status chunk on first real event (not heartbeat)
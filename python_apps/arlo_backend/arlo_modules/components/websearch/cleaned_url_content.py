@@ -1,4 +1,8 @@
 from langchain_openai import OpenAIEmbeddings
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import threading
+import time
 import trafilatura
 import re
 import os
@@ -32,6 +36,55 @@ def extract_links(query_result):
 
 embedding_model = OpenAIEmbeddings()
 
+# Fetched page text is kept for a while, so repeated questions about the same
+# product pages don't re-download and re-extract them.
+PAGE_CACHE_TTL_SECONDS = float(os.getenv("WEB_FETCH_CACHE_TTL_SECONDS", "900"))
+PAGE_CACHE_MAX_ENTRIES = int(os.getenv("WEB_FETCH_CACHE_MAX_ENTRIES", "512"))
+FETCH_WORKERS = int(os.getenv("WEB_FETCH_WORKERS", "8"))
+
+_fetch_executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="web-fetch")
+_page_cache = {}  # url -> (expires_at, page_content)
+_extracted_by_hash = {}  # sha256 of downloaded html -> page_content
+_cache_lock = threading.Lock()
+
+
+def _evict_oldest(cache):
+    while len(cache) > PAGE_CACHE_MAX_ENTRIES:
+        cache.pop(next(iter(cache)))
+
+
+def fetch_page_content(url):
+    """
+    Download and extract the main text of a page, using the TTL cache.
+    Args:
+        url (str): The page URL.
+    Returns:
+        str or None: The extracted text ("" if nothing could be extracted), or None if the download failed.
+    """
+    with _cache_lock:
+        cached = _page_cache.get(url)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    downloaded = trafilatura.fetch_url(url)
+    if not downloaded:
+        return None
+
+    content_hash = hashlib.sha256(downloaded.encode("utf-8", errors="replace")).hexdigest()
+    with _cache_lock:
+        page_content = _extracted_by_hash.get(content_hash)
+    if page_content is None:
+        page_content = trafilatura.extract(downloaded) or ""
+
+    with _cache_lock:
+        _extracted_by_hash[content_hash] = page_content
+        _evict_oldest(_extracted_by_hash)
+        _page_cache.pop(url, None)
+        _page_cache[url] = (time.monotonic() + PAGE_CACHE_TTL_SECONDS, page_content)
+        _evict_oldest(_page_cache)
+    return page_content
+
+
 def perform_web_search(query, sites=None):
     print("Web Search Query: ", query)
     if sites:
@@ -46,19 +99,20 @@ def perform_web_search(query, sites=None):
     links = extract_links(query_result)
     # print("Original Links: ", links)
     filtered_links = []
-    documents = ["-"]
+    page_links = []
     for link in links:
         if "community.arlo.com" in link or "kb.arlo.com" in link:
             filtered_links.append(link)
         elif "www.arlo.com" in link:
-            pass
-            downloaded = trafilatura.fetch_url(link)
-            if downloaded:
-                page_content = trafilatura.extract(downloaded)
-                if page_content:
-                    documents.append(page_content)
-            else:
-                documents.append("-")
+            page_links.append(link)
+
+    # Fetch all www.arlo.com pages concurrently; results keep the search order
+    documents = ["-"]
+    for page_content in _fetch_executor.map(fetch_page_content, page_links):
+        if page_content is None:
+            documents.append("-")
+        elif page_content:
+            documents.append(page_content)
 
     if len(documents) > 0:
         url_contents = "\n".join(documents)
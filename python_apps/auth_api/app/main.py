@@ -4,6 +4,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.security import HTTPBearer
 from fastapi.middleware.cors import CORSMiddleware
+from db_core import close_tenant_pools
 from db_core.middleware import add_tenant_middleware
 from starlette.middleware.base import BaseHTTPMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
@@ -76,6 +77,8 @@ async def lifespan(_app: FastAPI):  # pylint: disable=unused-argument
             await cleanup_task
         except asyncio.CancelledError:
             logger.info("Cleanup tasks cancelled")
+
+        await close_tenant_pools()
     finally:
         logger.info("Shutting down Auth API application")
 
@@ -95,7 +95,7 @@ def getApplicationInstanceLogs(
         route_validator_map[(api_schemas.APINamespace.ETL_API, "getApplicationInstanceLogs")]
     ),  # uncomment this to use validator
 ) -> list[instance_schemas.InstanceLogs]:
-    return instance_service.getInstanceLogs(instance_id=instance_id, offset=skip, limit=limit)
+    return instance_service.getApplicationInstanceLogs(instance_id=instance_id, offset=skip, limit=limit)
 
 
 @router.post("/", response_model=instance_schemas.Instance)
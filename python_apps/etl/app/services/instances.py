@@ -1,4 +1,5 @@
 import json
+from itertools import islice
 from typing import List
 import elasticsearch
 from elevaitelib.pipelines.service import create_pipelines_for_provider
@@ -157,12 +158,19 @@ def getInstanceConfiguration(db: Session, instance_id: str) -> Configuration:
     return res
 
 
+# Elasticsearch's default index.max_result_window
+LOGS_MAX_RESULT_WINDOW = 10000
+
+
 def getApplicationInstanceLogs(instance_id: str, limit: int = 100, offset: int = 0):
     es = ElasticSingleton()
     result: list[InstanceLogs] = []
     try:
-        _entries = es.getAllInIndexPaginated(index=instance_id, offset=offset, pagesize=limit)
-        _entries = es.getAllInIndexPaginated(index=instance_id, offset=offset, pagesize=limit)
+        if offset + limit <= LOGS_MAX_RESULT_WINDOW:
+            _entries = es.getAllInIndexPaginated(index=instance_id, offset=offset, pagesize=limit)
+        else:
+            # from/size cannot page past the result window, walk a point in time instead
+            _entries = islice(es.iterateIndex(index=instance_id), offset, offset + limit)
         for entry in _entries:
             result.append(InstanceLogs(**entry["_source"]))
     except elasticsearch.NotFoundError:
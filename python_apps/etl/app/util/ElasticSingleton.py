@@ -1,11 +1,18 @@
 import os
+import queue
+import threading
+from typing import Any, AsyncIterator, Iterable, Iterator, Optional
 from dotenv import load_dotenv
-from elasticsearch import Elasticsearch
+from elasticsearch import AsyncElasticsearch, Elasticsearch, helpers
 from .SingletonMeta import SingletonMeta
 
+# Sort for point-in-time pagination: cheapest total order over a PIT
+PIT_SORT = [{"_shard_doc": "asc"}]
+
 
 class ElasticSingleton(metaclass=SingletonMeta):
     client: Elasticsearch = None  # type: ignore
+    _async_client: Optional[AsyncElasticsearch] = None
 
     def __init__(self) -> None:
         load_dotenv()
@@ -19,33 +26,205 @@ class ElasticSingleton(metaclass=SingletonMeta):
         if ELASTIC_HOST is None:
             raise Exception("Missing ELASTIC_HOST from the environment")
 
-        # Create the client instance
-        self.client = Elasticsearch(
-            ELASTIC_HOST,
+        self._client_options = dict(
+            hosts=ELASTIC_HOST,
             ssl_assert_fingerprint=ELASTIC_SSL_FINGERPRINT,
             basic_auth=("elastic", ELASTIC_PASSWORD),
         )
+        # Create the client instance
+        self.client = Elasticsearch(**self._client_options)
+
+    @property
+    def asyncClient(self) -> AsyncElasticsearch:
+        """Async client with the same connection settings, created on first use."""
+        if self._async_client is None:
+            self._async_client = AsyncElasticsearch(**self._client_options)
+        return self._async_client
 
     def getAllInIndex(self, index: str, pagesize: int = 250, **kwargs):
         """
         Helper to iterate ALL values from
         Yields all the documents.
         """
-        offset = 0
-        while True:
-            result = self.client.search(index=index, **kwargs, body={"size": pagesize, "from": offset})
-            hits = result["hits"]["hits"]
-            # Stop after no more docs
-            if not hits:
-                break
-            # Yield each entry
-            yield from (hit["_source"] for hit in hits)
-            # Continue from there
-            offset += pagesize
+        yield from (hit["_source"] for hit in self.iterateIndex(index, pagesize=pagesize, **kwargs))
+
+    def iterateIndex(
+        self,
+        index: str,
+        pagesize: int = 1000,
+        query: Optional[dict] = None,
+        source: Any = None,
+        keep_alive: str = "1m",
+        **kwargs,
+    ) -> Iterator[dict]:
+        """
+        Yields every hit of an index (or of a query on it) from a point in time.
+
+        Pages with search_after, so each page costs the same however deep it is,
+        there is no index.max_result_window limit, and the results are a
+        consistent snapshot. Use source to only fetch some _source fields.
+        """
+        pit_id = self.client.open_point_in_time(index=index, keep_alive=keep_alive)["id"]
+        try:
+            search_after = None
+            while True:
+                result = self.client.search(
+                    pit={"id": pit_id, "keep_alive": keep_alive},
+                    query=query,
+                    source=source,
+                    sort=PIT_SORT,
+                    search_after=search_after,
+                    size=pagesize,
+                    track_total_hits=False,
+                    **kwargs,
+                )
+                # The PIT id may change between requests
+                pit_id = result.get("pit_id", pit_id)
+                hits = result["hits"]["hits"]
+                # Stop after no more docs
+                if not hits:
+                    break
+                yield from hits
+                search_after = hits[-1]["sort"]
+        finally:
+            self.client.close_point_in_time(id=pit_id)
+
+    def scanIndexSliced(
+        self,
+        index: str,
+        slices: int = 4,
+        pagesize: int = 1000,
+        query: Optional[dict] = None,
+        source: Any = None,
+        keep_alive: str = "5m",
+    ) -> Iterator[dict]:
+        """
+        Yields every hit of an index using a sliced scroll read by parallel threads.
+
+        Meant for full exports: hits arrive in no particular order, and the
+        slices are read concurrently through a small bounded buffer.
+        """
+        buffer: "queue.Queue" = queue.Queue(maxsize=slices * 2)
+        done = object()
+        stop = threading.Event()
+
+        def read_slice(slice_id: int):
+            scroll_id = None
+            try:
+                result = self.client.search(
+                    index=index,
+                    scroll=keep_alive,
+                    slice={"id": slice_id, "max": slices} if slices > 1 else None,
+                    query=query,
+                    source=source,
+                    sort=["_doc"],
+                    size=pagesize,
+                )
+                while not stop.is_set():
+                    scroll_id = result["_scroll_id"]
+                    hits = result["hits"]["hits"]
+                    if not hits:
+                        break
+                    buffer.put(hits)
+                    result = self.client.scroll(scroll_id=scroll_id, scroll=keep_alive)
+                buffer.put(done)
+            except Exception as e:
+                buffer.put(e)
+            finally:
+                if scroll_id:
+                    self.client.clear_scroll(scroll_id=scroll_id)
+
+        threads = [threading.Thread(target=read_slice, args=(i,), daemon=True) for i in range(slices)]
+        for thread in threads:
+            thread.start()
+        try:
+            remaining = slices
+            while remaining:
+                item = buffer.get()
+                if item is done:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield from item
+        finally:
+            stop.set()
+            # Unblock readers waiting on a full buffer
+            while any(thread.is_alive() for thread in threads):
+                try:
+                    buffer.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+    async def aIterateIndex(
+        self,
+        index: str,
+        pagesize: int = 1000,
+        query: Optional[dict] = None,
+        source: Any = None,
+        keep_alive: str = "1m",
+        **kwargs,
+    ) -> AsyncIterator[dict]:
+        """Async variant of iterateIndex using asyncClient."""
+        client = self.asyncClient
+        pit_id = (await client.open_point_in_time(index=index, keep_alive=keep_alive))["id"]
+        try:
+            search_after = None
+            while True:
+                result = await client.search(
+                    pit={"id": pit_id, "keep_alive": keep_alive},
+                    query=query,
+                    source=source,
+                    sort=PIT_SORT,
+                    search_after=search_after,
+                    size=pagesize,
+                    track_total_hits=False,
+                    **kwargs,
+                )
+                pit_id = result.get("pit_id", pit_id)
+                hits = result["hits"]["hits"]
+                if not hits:
+                    break
+                for hit in hits:
+                    yield hit
+                search_after = hits[-1]["sort"]
+        finally:
+            await client.close_point_in_time(id=pit_id)
 
     def getAllInIndexPaginated(self, index: str, pagesize: int = 250, offset: int = 0, **kwargs):
         result = self.client.search(index=index, **kwargs, body={"size": pagesize, "from": offset})
         return result["hits"]["hits"]
 
+    def bulkIndex(
+        self,
+        index: str,
+        documents: Iterable[dict],
+        id_field: Optional[str] = None,
+        chunk_size: int = 500,
+    ) -> tuple[int, list]:
+        """
+        Indexes documents with streaming_bulk, chunk_size documents per request.
+
+        Documents are consumed lazily, so generators of any size can be written.
+        Returns the number of indexed documents and the failed items.
+        """
+
+        def actions():
+            for document in documents:
+                action = {"_index": index, "_source": document}
+                if id_field is not None:
+                    action["_id"] = document[id_field]
+                yield action
+
+        indexed, errors = 0, []
+        for ok, item in helpers.streaming_bulk(
+            self.client, actions(), chunk_size=chunk_size, raise_on_error=False, max_retries=3
+        ):
+            if ok:
+                indexed += 1
+            else:
+                errors.append(item)
+        return indexed, errors
+
     def getById(self, index: str, id: str):
         return self.client.get(index=index, id=id)
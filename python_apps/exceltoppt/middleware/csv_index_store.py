@@ -0,0 +1,95 @@
+"""
+Persistent vector indexes for the CSV question answering endpoint.
+
+A sheet is parsed and embedded once per (workbook content, sheet, manifest
+content). The CSV and the Chroma collection are kept under data/Index/<key>,
+so later questions, and restarts, reuse them. Builds run in a worker thread;
+concurrent requests for the same sheet wait for a single build.
+"""
+
+import asyncio
+import hashlib
+import os
+import shutil
+
+from langchain.document_loaders import CSVLoader
+from langchain.indexes import VectorstoreIndexCreator
+from langchain.embeddings.openai import OpenAIEmbeddings
+from langchain.vectorstores import Chroma
+
+from utils import Excel_to_dataframe
+from utils import Excel_to_Dataframe_auto
+
+current_woring_dir = os.path.dirname(os.path.realpath(__file__))
+index_dir = os.path.join(current_woring_dir, "data", "Index")
+
+# Written last, so a half-built index directory is never loaded
+READY_MARKER = "READY"
+
+# (path, size, mtime) -> sha256, so unchanged files are not re-read per question
+_file_hashes = {}
+
+
+def file_hash(path):
+    if not os.path.exists(path):
+        return ""
+    stat = os.stat(path)
+    cache_key = (path, stat.st_size, stat.st_mtime_ns)
+    if cache_key not in _file_hashes:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        _file_hashes[cache_key] = digest.hexdigest()
+    return _file_hashes[cache_key]
+
+
+def index_key(excel_file_path, manifest_file_path, selected_sheet):
+    parts = [file_hash(excel_file_path), selected_sheet, file_hash(manifest_file_path)]
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()[:32]
+
+
+class CsvIndexStore:
+    def __init__(self, root=index_dir):
+        self.root = root
+        self._indexes = {}
+        self._locks = {}
+
+    async def get_vectorstore(self, excel_file_path, manifest_file_path, selected_sheet, use_manifest):
+        key = await asyncio.to_thread(index_key, excel_file_path, manifest_file_path, selected_sheet)
+        if key in self._indexes:
+            return self._indexes[key]
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if key not in self._indexes:
+                self._indexes[key] = await asyncio.to_thread(
+                    self._load_or_build, key, excel_file_path, manifest_file_path, selected_sheet, use_manifest
+                )
+        self._locks.pop(key, None)
+        return self._indexes[key]
+
+    def _load_or_build(self, key, excel_file_path, manifest_file_path, selected_sheet, use_manifest):
+        persist_dir = os.path.join(self.root, key)
+        if os.path.exists(os.path.join(persist_dir, READY_MARKER)):
+            print("Loading index for sheet " + selected_sheet)
+            return Chroma(persist_directory=persist_dir, embedding_function=OpenAIEmbeddings())
+
+        print("Building index for sheet " + selected_sheet)
+        shutil.rmtree(persist_dir, ignore_errors=True)
+        os.makedirs(persist_dir)
+        csv_file_path = os.path.join(persist_dir, "sheet.csv")
+        if use_manifest:
+            df = Excel_to_dataframe(excel_file_path, manifest_file_path, selected_sheet)
+        else:
+            df = Excel_to_Dataframe_auto(excel_file_path, selected_sheet, csv_file_path)
+        df.to_csv(csv_file_path, index = True)
+
+        loader = CSVLoader(file_path=csv_file_path)
+        index_creator = VectorstoreIndexCreator(vectorstore_kwargs={"persist_directory": persist_dir})
+        vectorstore = index_creator.from_loaders([loader]).vectorstore
+        vectorstore.persist()
+        open(os.path.join(persist_dir, READY_MARKER), "w").close()
+        return vectorstore
+
+
+csv_index_store = CsvIndexStore()
@@ -4,6 +4,7 @@ from fastapi.responses import JSONResponse
 from fastapi.responses import StreamingResponse
 from http.server import SimpleHTTPRequestHandler
 from socketserver import TCPServer
+import asyncio
 import io 
 import os
 from fastapi.responses import FileResponse
@@ -13,22 +14,17 @@ from utils import generate_manifest
 from utils import generate_summary
 #from utils import generate_presentation
 from Presentation import generate_presentation
-from utils import Excel_to_dataframe
-from utils import Excel_to_Dataframe_auto
 from utils import ask_your_doc
 from utils import generate_csv_for_excel
 from utils import ask_csv_agent
+from csv_index_store import csv_index_store
 
 
 
-from langchain.document_loaders import CSVLoader
-from langchain.indexes import VectorstoreIndexCreator
 from langchain.chains import RetrievalQA
 from langchain.llms import OpenAI
-from langchain.embeddings.openai import OpenAIEmbeddings
 
 current_woring_dir = os.path.dirname(os.path.realpath(__file__))
-csv_file_path = os.path.join(current_woring_dir, "data/Output", "output.csv")
 
 
 app = FastAPI()
@@ -101,29 +97,12 @@ async def askCsvAgent(excel_file: str, manifest_file: str, question: str):
         excel_file_path = os.path.join("data", "Excel", excel_file)
         manifest_file_path = os.path.join("data", "Manifest", excel_file.split(".")[0], manifest_file)
         selected_sheet = manifest_file.split(".")[0]
-        if excel_file == "cisco.xlsx":
-            print("inside cisco")
-            df = Excel_to_dataframe(excel_file_path, manifest_file_path, selected_sheet)
-            df.to_csv(csv_file_path, index = True)
-            loader = CSVLoader(file_path=csv_file_path)
-            document = loader.load()
-            embeddings = OpenAIEmbeddings()
-            index_creator = VectorstoreIndexCreator()
-            docsearch = index_creator.from_loaders([loader])
-            chain = RetrievalQA.from_chain_type(llm=OpenAI(), chain_type="stuff", retriever=docsearch.vectorstore.as_retriever(), input_key="question")
-            response = chain({"question": question})
-            return JSONResponse(content = response, status_code=200)
-        else:
-            df = Excel_to_Dataframe_auto(excel_file_path, selected_sheet, csv_file_path)
-            df.to_csv(csv_file_path, index = True)
-            loader = CSVLoader(file_path=csv_file_path)
-            document = loader.load()
-            embeddings = OpenAIEmbeddings()
-            index_creator = VectorstoreIndexCreator()
-            docsearch = index_creator.from_loaders([loader])
-            chain = RetrievalQA.from_chain_type(llm=OpenAI(), chain_type="stuff", retriever=docsearch.vectorstore.as_retriever(), input_key="question")
-            response = chain({"question": question})
-            return JSONResponse(content = response, status_code=200)
+        # Parsed and embedded once per workbook/sheet/manifest, then reused
+        vectorstore = await csv_index_store.get_vectorstore(
+            excel_file_path, manifest_file_path, selected_sheet, use_manifest = excel_file == "cisco.xlsx")
+        chain = RetrievalQA.from_chain_type(llm=OpenAI(), chain_type="stuff", retriever=vectorstore.as_retriever(), input_key="question")
+        response = await asyncio.to_thread(chain, {"question": question})
+        return JSONResponse(content = response, status_code=200)
         
     except Exception as e:
         print("askCsvAgent error: " +str(e))
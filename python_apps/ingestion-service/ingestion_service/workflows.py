@@ -165,6 +165,32 @@ def _build_pipeline_config(config: Dict[str, Any]):
     return PipelineConfig.from_dict(config)
 
 
+async def _execute_streaming_pipeline(pipeline_config) -> Dict[str, Any]:
+    """
+    Run all stages in-process as one streaming pipeline (config["streaming"]["enabled"]).
+
+    Stages are connected by bounded queues instead of intermediate S3 objects and
+    progress is checkpointed per document.
+    """
+    from elevaite_ingestion.stage.streaming_pipeline import execute_streaming_pipeline
+
+    logger.info("Starting streaming ingestion pipeline...")
+    streaming_result = await execute_streaming_pipeline(pipeline_config)
+    streaming_status = streaming_result.get("STREAMING_PIPELINE", {})
+
+    if streaming_status.get("STATUS") == "Failed":
+        raise Exception(f"Streaming pipeline failed: {streaming_status}")
+
+    index_id = pipeline_config.vector_db.collection_name or pipeline_config.vector_db.index_name
+    return {
+        "files_processed": streaming_status.get("TOTAL_FILES", 0),
+        "chunks_created": streaming_status.get("TOTAL_CHUNKS", 0),
+        "embeddings_generated": streaming_status.get("TOTAL_EMBEDDINGS", 0),
+        "index_ids": [index_id] if index_id else [],
+        "stages": {"STREAMING": streaming_result},
+    }
+
+
 async def execute_ingestion_pipeline(config: Dict[str, Any]) -> Dict[str, Any]:
     """
     Execute the elevaite_ingestion pipeline with the given configuration.
@@ -175,12 +201,17 @@ async def execute_ingestion_pipeline(config: Dict[str, Any]) -> Dict[str, Any]:
     3. EMBEDDING - Generate embeddings for chunks
     4. VECTOR_DB - Store embeddings in vector database
 
+    With config["streaming"]["enabled"] the same stages run concurrently as one
+    in-process streaming pipeline instead.
+
     Args:
         config: Ingestion configuration containing:
             - mode: 's3' or 'local'
             - aws: AWS config (input_bucket, intermediate_bucket)
             - embedding: provider, model configuration
             - vector_db: target vector database configuration
+            - streaming: optional streaming mode settings (enabled, queue_size,
+              per-stage concurrency)
 
     Returns:
         Summary of ingestion results
@@ -202,6 +233,9 @@ async def execute_ingestion_pipeline(config: Dict[str, Any]) -> Dict[str, Any]:
         "index_ids": [],
     }
 
+    if config.get("streaming", {}).get("enabled"):
+        return await _execute_streaming_pipeline(pipeline_config)
+
     try:
         # Stage 1: PARSING
         logger.info("Starting STAGE_2: PARSING...")
@@ -1,29 +1,35 @@
-import redis
+import redis.asyncio as redis
 import os
 from dotenv import load_dotenv
 load_dotenv()
 
+# Shared across CacheControl instances so each request reuses pooled connections
+_connection_pool = None
+
 class CacheControl:
     def __init__(self):
-        self.cache = redis.StrictRedis(host=os.getenv("REDIS_HOST"), port=os.getenv("REDIS_PORT"), db=os.getenv("REDIS_DB"))
+        global _connection_pool
+        if _connection_pool is None:
+            _connection_pool = redis.ConnectionPool(host=os.getenv("REDIS_HOST"), port=os.getenv("REDIS_PORT"), db=os.getenv("REDIS_DB"))
+        self.cache = redis.StrictRedis(connection_pool=_connection_pool)
 
-    def get(self, key):
-        return self.cache.get(key)
+    async def get(self, key):
+        return await self.cache.get(key)
 
-    def set(self, key, value):
-        return self.cache.set(key, value)
+    async def set(self, key, value):
+        return await self.cache.set(key, value)
 
-    def hset(self, key, field, value):
-        return self.cache.hset(key, field, value)
+    async def hset(self, key, field, value):
+        return await self.cache.hset(key, field, value)
 
-    def hget(self, key, field):
-        return self.cache.hget(key, field)
+    async def hget(self, key, field):
+        return await self.cache.hget(key, field)
 
-    def delete(self, key):
-        return self.cache.delete(key)
+    async def delete(self, key):
+        return await self.cache.delete(key)
 
-    def expire(self, key, exp_time):
-        return self.cache.expire(key, exp_time)
+    async def expire(self, key, exp_time):
+        return await self.cache.expire(key, exp_time)
     
-    def setex(self, key, expiration, value):
-        return self.cache.setex(key, expiration, value)
+    async def setex(self, key, expiration, value):
+        return await self.cache.setex(key, expiration, value)
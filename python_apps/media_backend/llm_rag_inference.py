@@ -1,8 +1,8 @@
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient
 from qdrant_client.http.models import Filter, FieldCondition, Range, MatchValue, MatchAny
 from fastapi import HTTPException
 from typing import Dict, Any, List
-from openai import OpenAI
+from openai import AsyncOpenAI
 from model import AdCreative, SearchResult, InferencePayload, ConversationPayload, IntentOutput, MediaPlanOutput, CreativeInsightsReport,AnalysisOfTrendsTwo,AnalysisOfTrendsOne,AnalysisOfTrendsThree# MediaPlanSearchResult, MediaPlanCreative, CampaignPerformanceReport
 import os
 import re
@@ -11,12 +11,12 @@ import json
 from typing import Type, Optional, AsyncGenerator
 from pydantic import BaseModel
 import time
-import requests
+import httpx
 import asyncio
 from prompts.prompts import SystemPrompts
-from sentence_transformers import CrossEncoder
 from collections import OrderedDict
 from cache_control import CacheControl
+from reranker import get_reranker
 
 import logging
 # Timer and logging
@@ -24,7 +24,7 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 # cache_control = CacheControl()
 
-reranker = CrossEncoder("cross-encoder/ms-marco-MiniLM-L-6-v2",tokenizer_args={'clean_up_tokenization_spaces': True})
+reranker = get_reranker("cross-encoder/ms-marco-MiniLM-L-6-v2")  # loaded lazily on the reranker worker thread
 
 def timer_decorator(func):
     async def async_wrapper(*args, **kwargs):
@@ -64,7 +64,7 @@ load_dotenv()
 
 # Initialize Qdrant client
 try:
-    Qclient = QdrantClient(
+    Qclient = AsyncQdrantClient(
         os.getenv("QDRANT_HOST", "localhost"),
         port=int(os.getenv("QDRANT_PORT", 6333))
     )
@@ -74,16 +74,16 @@ except Exception as e:
 
 # Initialize OpenAI client
 try:
-    client = OpenAI(
+    client = AsyncOpenAI(
         api_key=os.environ.get("OPENAI_API_KEY"),
     )
 except Exception as e:
     logger.error(f"Error initializing OpenAI client: {e}")
     client = None
 # @timer_decorator 
-def get_embedding(text):
+async def get_embedding(text):
     try:
-        response = client.embeddings.create(
+        response = await client.embeddings.create(
             input=text,
             model="text-embedding-ada-002"
         )
@@ -92,7 +92,7 @@ def get_embedding(text):
         logger.error(f"Error getting embedding: {e}")
         return None
     
-def rerank_results(query_text: str, results: List[AdCreative], enriched_query_text: str) -> List[AdCreative]:
+async def rerank_results(query_text: str, results: List[AdCreative], enriched_query_text: str) -> List[AdCreative]:
     """Rerank results based on query relevance, considering dynamic contextual terms from the enriched query."""    
     # Process the enriched query to detect key contextual terms (e.g., industries, product categories, etc.)
     # This should capture the terms from the enriched query dynamically without hardcoding
@@ -104,7 +104,7 @@ def rerank_results(query_text: str, results: List[AdCreative], enriched_query_te
         # Concatenate the enriched query with brand and business_category for better contextual matching
         reranker_input.append((enriched_query_text, f"{brand} {business_category}"))
     
-    scores = reranker.predict(reranker_input)    
+    scores = await reranker.ascore(reranker_input)
     reranked_results = []
 
     for ad_creative, score in zip(results, scores):
@@ -187,12 +187,16 @@ async def topic_extractor(past_topics: List[str], enhanced_query: str) -> str:
         logger.error(f"Error in topic extraction: {e}")
         return ""
 
-# Searches Qdrant and returns search result object
-def search_qdrant(query_text: str, conversation_payload: list, parameters: Dict[str, Any], use_vector_search: bool = False, number_of_results: int = 4) -> SearchResult:
+def enrich_query_text(query_text: str, conversation_payload: list) -> str:
     formatted_history = format_conversation_payload(conversation_payload)
-    enriched_query_text = f"{formatted_history}\nUser Query: {query_text}"
+    return f"{formatted_history}\nUser Query: {query_text}"
+
+# Searches Qdrant and returns search result object. A precomputed query_vector for the enriched query can be passed to skip the embedding call.
+async def search_qdrant(query_text: str, conversation_payload: list, parameters: Dict[str, Any], use_vector_search: bool = False, number_of_results: int = 4, query_vector: Optional[List[float]] = None) -> SearchResult:
+    enriched_query_text = enrich_query_text(query_text, conversation_payload)
     # print("Query Used for Vector Search:",enriched_query_text)
-    query_vector = get_embedding(enriched_query_text)
+    if query_vector is None:
+        query_vector = await get_embedding(enriched_query_text)
 
     if not query_vector or len(query_vector) == 0:
         logger.error("No valid query vector obtained from the text.")
@@ -204,7 +208,7 @@ def search_qdrant(query_text: str, conversation_payload: list, parameters: Dict[
     if use_vector_search:
         brand_count = {}  # Dictionary to count creatives per brand
         try:
-            search_result = Qclient.search(
+            search_result = await Qclient.search(
                 collection_name=os.getenv("COLLECTION_NAME", "Media_Performance"),
                 query_vector=query_vector,
                 limit=number_of_results*10,
@@ -269,7 +273,7 @@ def search_qdrant(query_text: str, conversation_payload: list, parameters: Dict[
             search_filter = Filter(should=filter_conditions) if filter_conditions else None
 
             try:
-                search_result = Qclient.search(
+                search_result = await Qclient.search(
                     collection_name=os.getenv("COLLECTION_NAME", "Media_Performance"),
                     query_vector = query_vector,
                     query_filter=search_filter,
@@ -299,7 +303,7 @@ def search_qdrant(query_text: str, conversation_payload: list, parameters: Dict[
                     logger.error(f"Error processing media creative {index + 1}: {e}")
                     logger.error(f"Problematic payload: {payload}")
     if ad_creatives:
-        ad_creatives = rerank_results(query_text, ad_creatives,enriched_query_text)
+        ad_creatives = await rerank_results(query_text, ad_creatives,enriched_query_text)
     else:
         logger.warning("No valid results found after filtering and validation.")
         return SearchResult(results=[], total=0)
@@ -310,7 +314,7 @@ def search_qdrant(query_text: str, conversation_payload: list, parameters: Dict[
 
 # Identifies the intent and enhances the query
 @timer_decorator   
-def determine_intent(user_query: str, conversation_history: List[ConversationPayload],prompt_file: str,creative_provided: bool = False) -> dict:
+async def determine_intent(user_query: str, conversation_history: List[ConversationPayload],prompt_file: str,creative_provided: bool = False) -> dict:
     try:
 
         system_prompt = load_prompt(prompt_file)
@@ -326,7 +330,7 @@ def determine_intent(user_query: str, conversation_history: List[ConversationPay
         messages.append({"role": "user", "content": user_query})
         
         print("Input to the intent:",messages)
-        response = client.beta.chat.completions.parse(
+        response = await client.beta.chat.completions.parse(
             model="gpt-4o",
             messages=messages,
             response_format=IntentOutput,
@@ -382,8 +386,8 @@ async def generate_response_streaming(
             "temperature": 0.1,
             "stream": True  # Enable streaming
         }
-        response_stream = client.chat.completions.create(**request_params)
-        for chunk in response_stream:
+        response_stream = await client.chat.completions.create(**request_params)
+        async for chunk in response_stream:
             content = chunk.choices[0].delta.content
             # print("streamed content:",content)
             if content:
@@ -429,7 +433,7 @@ async def generate_response(
         }
         if response_class:
             request_params["response_format"] = response_class
-        response = await asyncio.to_thread(client.beta.chat.completions.parse, **request_params)
+        response = await client.beta.chat.completions.parse(**request_params)
         response_content = response.choices[0].message.content.strip()
         if response_class:
             try:
@@ -443,7 +447,7 @@ async def generate_response(
         return "I apologize, but I couldn't generate a response at this time."
 
 # @timer_decorator
-def generate_response_with_creatives(    
+async def generate_response_with_creatives(    
     creative :str, # Base 64 encoded image/video/gif
     query: str,
     system_prompt: str,
@@ -491,7 +495,7 @@ def generate_response_with_creatives(
         # print("Message sent:",request_params)
         if response_class:
             request_params["response_format"] = response_class
-        response = client.chat.completions.create(**request_params)
+        response = await client.chat.completions.create(**request_params)
         # print("Response:",response)
         response_content = response.choices[0].message.content.strip()        
         if response_class:
@@ -505,7 +509,7 @@ def generate_response_with_creatives(
     return 
     
 @timer_decorator
-def creative_to_features(creative: str)-> str:
+async def creative_to_features(creative: str)-> str:
     prompt = load_prompt("creative_feature_extractor")
     messages = [{"role": "system", "content": prompt}]
     messages.append({"role":"user","content":[{
@@ -519,7 +523,7 @@ def creative_to_features(creative: str)-> str:
             "n": 1,
             "temperature": 0.1,
         }
-        response = client.chat.completions.create(**request_params)
+        response = await client.chat.completions.create(**request_params)
         response_content = response.choices[0].message.content.strip()
         return response_content
     except Exception as e:
@@ -527,7 +531,7 @@ def creative_to_features(creative: str)-> str:
     return
 
 # @timer_decorator
-def generate_image_from_getimgai(prompt: str, image_data: Optional[str] = None, api_call_type: str = "text-to-image", model: str = "flux-schnell"):
+async def generate_image_from_getimgai(prompt: str, image_data: Optional[str] = None, api_call_type: str = "text-to-image", model: str = "flux-schnell"):
     
     # Determine if it's an image-to-image request
     max_prompt_length = 2048  # Set to 2048 as per the API documentation
@@ -601,7 +605,8 @@ def generate_image_from_getimgai(prompt: str, image_data: Optional[str] = None,
             raise HTTPException(status_code=400, detail="Error processing image data. Ensure it's a valid base64-encoded image.")
 
     # Make the API request (POST)
-    response = requests.post(url, headers=headers, json=payload)
+    async with httpx.AsyncClient(timeout=120) as http_client:
+        response = await http_client.post(url, headers=headers, json=payload)
 
     # Check if the request was successful
     if response.status_code != 200:
@@ -630,12 +635,12 @@ async def creative_inspiration_with_generation(
         conversation_history = ""
     search_results = ""
     if creative:
-        extracted_features = creative_to_features(creative)
+        extracted_features = await creative_to_features(creative)
         # print("Extracted features:",extracted_features)
     if creative and vector_search:
-        search_results = search_qdrant(f"{enhanced_query} Creative: {extracted_features}", conversation_history, use_vector_search=True, number_of_results=3,parameters={})
+        search_results = await search_qdrant(f"{enhanced_query} Creative: {extracted_features}", conversation_history, use_vector_search=True, number_of_results=3,parameters={})
     elif vector_search:
-        search_results = search_qdrant(f"{enhanced_query}", conversation_history, use_vector_search=True, number_of_results=3,parameters={})
+        search_results = await search_qdrant(f"{enhanced_query}", conversation_history, use_vector_search=True, number_of_results=3,parameters={})
     
     system_prompt = load_prompt("creative_agent_generation")
     # print(system_prompt)
@@ -646,23 +651,23 @@ async def creative_inspiration_with_generation(
     # print("Generated prompt:",generated_prompt)
     logger.info(f"Generated prompt:\n{generated_prompt}")
     if creative:
-        image_data = generate_image_from_getimgai(prompt=generated_prompt, api_call_type="text-to-image",model="flux-schnell")
+        image_data = await generate_image_from_getimgai(prompt=generated_prompt, api_call_type="text-to-image",model="flux-schnell")
     else:
-        image_data = generate_image_from_getimgai(prompt=generated_prompt, api_call_type="text-to-image",model="flux-schnell")
+        image_data = await generate_image_from_getimgai(prompt=generated_prompt, api_call_type="text-to-image",model="flux-schnell")
     return image_data
 
 @timer_decorator
-def ideate_to_create_with_rag(user_query: str,creative:str,conversation_history:List[ConversationPayload],parameters:Dict[str, Any])-> str:
-    extracted_features = creative_to_features(creative)
-    search_result = search_qdrant(query_text= f"{user_query} Creatives: {extracted_features}", conversation_payload=conversation_history,parameters=parameters,use_vector_search = True, number_of_results = 2)
+async def ideate_to_create_with_rag(user_query: str,creative:str,conversation_history:List[ConversationPayload],parameters:Dict[str, Any])-> str:
+    extracted_features = await creative_to_features(creative)
+    search_result = await search_qdrant(query_text= f"{user_query} Creatives: {extracted_features}", conversation_payload=conversation_history,parameters=parameters,use_vector_search = True, number_of_results = 2)
     # print("Search Results :",search_result)
     prompt = load_prompt("creative_trends")
-    return generate_response_with_creatives(creative=creative,query=user_query,search_result=search_result,system_prompt=prompt,conversation_history=conversation_history) 
+    return await generate_response_with_creatives(creative=creative,query=user_query,search_result=search_result,system_prompt=prompt,conversation_history=conversation_history) 
 
 @timer_decorator
-def ideate_to_create_without_rag(user_query:str,creative:str,conversation_history:List[ConversationPayload])-> str:
+async def ideate_to_create_without_rag(user_query:str,creative:str,conversation_history:List[ConversationPayload])-> str:
     prompt = load_prompt("creative_feedback")
-    return generate_response_with_creatives(creative=creative,query=user_query,system_prompt=prompt,conversation_history=conversation_history) 
+    return await generate_response_with_creatives(creative=creative,query=user_query,system_prompt=prompt,conversation_history=conversation_history) 
 
 # @timer_decorator
 async def formatter_streaming(final_output: str = None, prompt_file_name: str = "formatter", query_content: str = None) -> AsyncGenerator[str, None]:
@@ -1071,12 +1076,12 @@ async def generic_without_creative(query: str, conversation_history: List[Conver
     return raw_response
 
 @timer_decorator
-def generic_with_creative(user_query:str,conversation_history:List[ConversationPayload],creative:str,filtered_data: SearchResult=None)-> str:
+async def generic_with_creative(user_query:str,conversation_history:List[ConversationPayload],creative:str,filtered_data: SearchResult=None)-> str:
     prompt = "You are an AI assistant. Be Polite and answer in markdown. You can answer questions based on uploaded creatives."
     if filtered_data:
-        result = generate_response_with_creatives(creative=creative,query=user_query,system_prompt=prompt,conversation_history=conversation_history,search_result=filtered_data) 
+        result = await generate_response_with_creatives(creative=creative,query=user_query,system_prompt=prompt,conversation_history=conversation_history,search_result=filtered_data) 
     else:
-        result = generate_response_with_creatives(creative=creative,query=user_query,system_prompt=prompt,conversation_history=conversation_history) 
+        result = await generate_response_with_creatives(creative=creative,query=user_query,system_prompt=prompt,conversation_history=conversation_history) 
     return result
 
 # @timer_decorator
@@ -1173,7 +1178,7 @@ async def generate_related_queries(intent_data: dict, conversation_history: List
     }
     # Call the LLM with the prompt and input data
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-4o",
             messages=[{"role": "system", "content": prompt}, {"role": "user", "content": str(input_data)}],
             max_tokens=200  # Adjust max tokens as needed
@@ -1188,6 +1193,7 @@ async def generate_related_queries(intent_data: dict, conversation_history: List
 
 # @timer_decorator
 async def perform_inference(inference_payload: InferencePayload):
+    pending_tasks = []
     try:
         user_id = inference_payload.user_id  # Assuming user_id is part of the payload
         session_id = inference_payload.session_id  # Assuming session_id is part of the payload
@@ -1206,7 +1212,7 @@ async def perform_inference(inference_payload: InferencePayload):
         past_topics = []
         filtered_data = None
         related_prompt_file = "related_queries_general" # Default prompt file for related queries
-        existing_data_json = cache_control.get(cache_key)
+        existing_data_json = await cache_control.get(cache_key)
         existing_data = json.loads(existing_data_json) if existing_data_json else []
 
         # cached_message_data = cache_control.get(cache_key)
@@ -1226,10 +1232,12 @@ async def perform_inference(inference_payload: InferencePayload):
         logger.info(f"conversation_history:{conversation_history}")
         user_query=inference_payload.query
         # print("Conversation_HIstory length",len(conversation_history))
-        if inference_payload.creative:
-            intent_data = determine_intent(user_query=user_query, conversation_history=conversation_history, prompt_file="intention", creative_provided=True)
-        else:
-            intent_data = determine_intent(user_query=user_query, conversation_history=conversation_history, prompt_file="intention", creative_provided=False)
+        # Speculatively embed the raw query while the intent is classified; the vector is reused for
+        # retrieval when the intent agent leaves the query unchanged and discarded otherwise.
+        speculative_query_text = enrich_query_text(user_query, conversation_history)
+        speculative_embedding_task = asyncio.create_task(get_embedding(speculative_query_text))
+        pending_tasks.append(speculative_embedding_task)
+        intent_data = await determine_intent(user_query=user_query, conversation_history=conversation_history, prompt_file="intention", creative_provided=bool(inference_payload.creative))
         
         required_outcomes = intent_data.get('required_outcomes', [11])
         unrelated_query = intent_data.get('unrelated_query', False)  
@@ -1243,7 +1251,42 @@ async def perform_inference(inference_payload: InferencePayload):
             # print("Existing Data:",existing_data)
             # print("Past Topics:",past_topics)
 
-        current_topic = await topic_extractor(past_topics,enhanced_query)
+        if 11 in required_outcomes:
+            speculative_embedding_task.cancel()
+            yield {"response": "I specialize in media marketing campaigns plan generation and historical data insights. Is there anything related to media campaigns that I can assist you with?\n"}
+            return
+        if unrelated_query:
+            conversation_history = ""
+
+        # Topic extraction and retrieval for the enhanced query are independent, so run them concurrently.
+        topic_task = asyncio.create_task(topic_extractor(past_topics,enhanced_query))
+        pending_tasks.append(topic_task)
+        needs_filtered_search = any(num in required_outcomes for num in [1, 2, 3, 4, 5])
+        needs_generic_vector_search = 10 in required_outcomes and vector_search
+        query_vector_task = None
+        filtered_search_task = None
+        generic_vector_search_task = None
+        if needs_filtered_search or needs_generic_vector_search:
+            if enrich_query_text(enhanced_query, conversation_history) == speculative_query_text:
+                query_vector_task = speculative_embedding_task
+            else:
+                speculative_embedding_task.cancel()
+                query_vector_task = asyncio.create_task(get_embedding(enrich_query_text(enhanced_query, conversation_history)))
+                pending_tasks.append(query_vector_task)
+
+            async def search_with_query_vector(*args, **kwargs) -> SearchResult:
+                return await search_qdrant(*args, query_vector=await query_vector_task, **kwargs)
+
+            if needs_filtered_search:
+                filtered_search_task = asyncio.create_task(search_with_query_vector(enhanced_query, conversation_history, parameters, False, 10))
+                pending_tasks.append(filtered_search_task)
+            if needs_generic_vector_search:
+                generic_vector_search_task = asyncio.create_task(search_with_query_vector(enhanced_query, conversation_history, parameters, use_vector_search=True, number_of_results=threshold))
+                pending_tasks.append(generic_vector_search_task)
+        else:
+            speculative_embedding_task.cancel()
+
+        current_topic = await topic_task
         # print("Current Topic:",current_topic)  
         non_empty_fields = check_non_empty_fields_for_topic(existing_data, current_topic)
         # print(f"Non-empty fields for topic '{current_topic}': {non_empty_fields}")
@@ -1258,12 +1301,6 @@ async def perform_inference(inference_payload: InferencePayload):
         logger.info("Intent Agent Output:",intent_data)
         print("Intent Extracted:\n", "Query:",enhanced_query,"\nRequired Outcomes",required_outcomes,"\nvector_search:",vector_search)
         print(intent_data)
-        if unrelated_query:
-            conversation_history = ""
-        # Irrelevant Questions
-        if 11 in required_outcomes:
-            yield {"response": "I specialize in media marketing campaigns plan generation and historical data insights. Is there anything related to media campaigns that I can assist you with?\n"}
-            return
         # Follow up Questions
         if 9 in required_outcomes:
             follow_up_message = intent_data.get('follow_up', 'Could you explain your query further') 
@@ -1271,7 +1308,7 @@ async def perform_inference(inference_payload: InferencePayload):
             general_response_string += follow_up_message
         # Creative Feedback - Constructive Feedback based on provided Creative
         if 8 in required_outcomes:
-            result = ideate_to_create_without_rag(user_query, inference_payload.creative, conversation_history)
+            result = await ideate_to_create_without_rag(user_query, inference_payload.creative, conversation_history)
             result = replace_hash_with_url(remove_markdown_prefix(result))
             yield {"response": result}      
             general_response_string += result
@@ -1279,7 +1316,7 @@ async def perform_inference(inference_payload: InferencePayload):
                                 
         # Uploaded Creative Trends analysis 
         if 6 in required_outcomes:
-            result = ideate_to_create_with_rag(
+            result = await ideate_to_create_with_rag(
                 user_query=user_query,
                 creative=inference_payload.creative,
                 conversation_history=conversation_history,
@@ -1294,18 +1331,18 @@ async def perform_inference(inference_payload: InferencePayload):
         if 10 in required_outcomes:
             if inference_payload.creative:
                 if vector_search:
-                    filtered_data  = search_qdrant(enhanced_query, conversation_history, parameters, use_vector_search=True, number_of_results= threshold)
-                    result = generic_with_creative(user_query=user_query, creative=inference_payload.creative,conversation_history= conversation_history,filtered_data=filtered_data)
+                    filtered_data  = await generic_vector_search_task
+                    result = await generic_with_creative(user_query=user_query, creative=inference_payload.creative,conversation_history= conversation_history,filtered_data=filtered_data)
                     result = replace_hash_with_url(remove_markdown_prefix(result))
                     yield {"response": result} 
                     
                 else:
-                    result = generic_with_creative(user_query=user_query, creative=inference_payload.creative, conversation_history=conversation_history)
+                    result = await generic_with_creative(user_query=user_query, creative=inference_payload.creative, conversation_history=conversation_history)
                     result = replace_hash_with_url(remove_markdown_prefix(result))
                     yield {"response": result}
             else:
                 if vector_search:
-                    filtered_data  = search_qdrant(enhanced_query, conversation_history, parameters, use_vector_search=True, number_of_results= threshold)
+                    filtered_data  = await generic_vector_search_task
                     result = await generic_without_creative(user_query, conversation_history,filtered_data=filtered_data)
                     yield {"response": f"{result}\n\n"}
                 else:
@@ -1319,12 +1356,12 @@ async def perform_inference(inference_payload: InferencePayload):
 
 
         if any(num in required_outcomes for num in [1, 2, 3, 4, 5]):
-            filtered_data = search_qdrant(enhanced_query, conversation_history, parameters, False, 10)          
+            filtered_data = await filtered_search_task          
             # print(f"Original data:{filtered_data}")
             
             if not filtered_data.results:
                 # yield {"response":"Searching for data most related with your query...\n"}
-                filtered_data = search_qdrant(enhanced_query, conversation_history, parameters, use_vector_search=True, number_of_results= threshold)
+                filtered_data = await search_with_query_vector(enhanced_query, conversation_history, parameters, use_vector_search=True, number_of_results= threshold)
                 # print("Additional_Data Data1:",filtered_data)
                 if len(filtered_data.results)<1:
                     yield {"response":"Media Campaign Information related to your query were not found. Please try a different query.\n"}
@@ -1334,7 +1371,7 @@ async def perform_inference(inference_payload: InferencePayload):
                 # yield {"response":"Found and filtered some relevant data. Searching for additional data most relevant to your query...\n"}
 
                 currently_present_ids = [i.id for i in filtered_data.results]
-                additional_data = search_qdrant(enhanced_query, conversation_history, parameters, use_vector_search=True, number_of_results=(threshold - len(filtered_data.results)))
+                additional_data = await search_with_query_vector(enhanced_query, conversation_history, parameters, use_vector_search=True, number_of_results=(threshold - len(filtered_data.results)))
                 # print("Additional_Data 2:",additional_data)
                 if len(additional_data.results)>0:
                     # yield {"response":"Incorporating additional data to your response.\n"}
@@ -1441,11 +1478,16 @@ async def perform_inference(inference_payload: InferencePayload):
         }
 
         existing_data.append(session_data)
-        cache_control.setex(cache_key, 500, json.dumps(existing_data))  # 
+        await cache_control.setex(cache_key, 500, json.dumps(existing_data))  # 
 
     except Exception as e:
         logger.error(f"An error occurred: {e}")
         yield {"response": f"An error occurred: {e}\n"}
+    finally:
+        # Discard speculative or abandoned work, e.g. when the client disconnects mid-stream
+        for task in pending_tasks:
+            if not task.done():
+                task.cancel()
 
 # @timer_decorator 
 async def get_insight_function(outcome):
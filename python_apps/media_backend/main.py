@@ -2,7 +2,7 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from model import InferencePayload, MarkdownRequest
-from llm_rag_inference import perform_inference
+from llm_rag_inference import perform_inference, reranker
 from fastapi.responses import StreamingResponse
 import json
 import re
@@ -200,6 +200,10 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 async def root():
     return {"message": "Hello World"}
 
+@app.get("/metrics/reranker")
+async def reranker_metrics():
+    return reranker.metrics()
+
 @app.post("/")
 async def post_message(inference_payload: InferencePayload):
     try:
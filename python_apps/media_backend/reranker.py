@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+Pair = Tuple[str, str]
+
+
+@dataclass
+class _RerankRequest:
+    pairs: List[Pair]
+    future: Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class BatchingReranker:
+    """
+    Cross-encoder reranker that runs inference on a dedicated worker thread.
+
+    Concurrent callers submit (query, document) pairs; the worker coalesces everything that
+    arrives within `max_wait_ms` (up to `max_batch_size` pairs) into a single `predict` call
+    and hands each caller back its own slice of the scores. The model is loaded on first use,
+    not at import time, and inference never runs on the event loop.
+
+    Usable from async code (`await reranker.ascore(pairs)`) and from blocking code
+    (`reranker.score(pairs)`), so other retrievers can share one instance per process.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        backend: str = "torch",
+        model_file: Optional[str] = None,
+        tokenizer_args: Optional[Dict[str, Any]] = None,
+    ):
+        self.model_name = model_name
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.backend = backend
+        self.model_file = model_file
+        self.tokenizer_args = tokenizer_args or {}
+
+        self._model = None
+        self._queue: "queue.Queue[_RerankRequest]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "requests": 0,
+            "batches": 0,
+            "pairs": 0,
+            "max_batch_size_seen": 0,
+            "queue_latency_ms_total": 0.0,
+            "queue_latency_ms_max": 0.0,
+            "inference_ms_total": 0.0,
+        }
+
+    def _load_model(self):
+        from sentence_transformers import CrossEncoder
+
+        kwargs: Dict[str, Any] = {"tokenizer_args": self.tokenizer_args}
+        if self.backend != "torch":
+            # onnx / openvino CPU backends; model_file selects e.g. a quantized export
+            kwargs["backend"] = self.backend
+            if self.model_file:
+                kwargs["model_kwargs"] = {"file_name": self.model_file}
+        logger.info(f"Loading reranker model {self.model_name} (backend={self.backend})")
+        return CrossEncoder(self.model_name, **kwargs)
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="reranker-worker", daemon=True
+                )
+                self._worker.start()
+
+    def _collect_batch(self) -> List[_RerankRequest]:
+        batch = [self._queue.get()]
+        batch_size = len(batch[0].pairs)
+        deadline = time.perf_counter() + self.max_wait_ms / 1000
+        while batch_size < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            batch_size += len(request.pairs)
+        return batch
+
+    def _run(self):
+        while True:
+            try:
+                self._process_batch(self._collect_batch())
+            except Exception as e:
+                # Never let one bad batch end the worker; later callers would hang
+                logger.exception(f"Error in reranker worker: {e}")
+
+    def _process_batch(self, batch: List[_RerankRequest]):
+        # Drop requests whose caller gave up (timeout, disconnect); the rest can no
+        # longer be cancelled, so their results are always delivered
+        batch = [request for request in batch if request.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        started_at = time.perf_counter()
+        pairs = [pair for request in batch for pair in request.pairs]
+        try:
+            if self._model is None:
+                self._model = self._load_model()
+            scores = self._model.predict(pairs, batch_size=self.max_batch_size)
+        except Exception as e:
+            logger.error(f"Error in reranker inference: {e}")
+            for request in batch:
+                request.future.set_exception(e)
+            return
+        finished_at = time.perf_counter()
+
+        offset = 0
+        for request in batch:
+            request.future.set_result(
+                [float(score) for score in scores[offset : offset + len(request.pairs)]]
+            )
+            offset += len(request.pairs)
+        self._record_batch(batch, len(pairs), started_at, finished_at)
+
+    def _record_batch(
+        self,
+        batch: List[_RerankRequest],
+        pair_count: int,
+        started_at: float,
+        finished_at: float,
+    ):
+        with self._metrics_lock:
+            metrics = self._metrics
+            metrics["requests"] += len(batch)
+            metrics["batches"] += 1
+            metrics["pairs"] += pair_count
+            metrics["max_batch_size_seen"] = max(
+                metrics["max_batch_size_seen"], pair_count
+            )
+            for request in batch:
+                queue_latency_ms = (started_at - request.enqueued_at) * 1000
+                metrics["queue_latency_ms_total"] += queue_latency_ms
+                metrics["queue_latency_ms_max"] = max(
+                    metrics["queue_latency_ms_max"], queue_latency_ms
+                )
+            metrics["inference_ms_total"] += (finished_at - started_at) * 1000
+
+    def submit(self, pairs: Sequence[Pair]) -> Future:
+        future: Future = Future()
+        if not pairs:
+            future.set_result([])
+            return future
+        self._ensure_worker()
+        self._queue.put(_RerankRequest(pairs=list(pairs), future=future))
+        return future
+
+    def score(self, pairs: Sequence[Pair]) -> List[float]:
+        return self.submit(pairs).result()
+
+    async def ascore(self, pairs: Sequence[Pair]) -> List[float]:
+        return await asyncio.wrap_future(self.submit(pairs))
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        batches = metrics["batches"] or 1
+        requests = metrics["requests"] or 1
+        metrics["avg_batch_size"] = metrics["pairs"] / batches
+        metrics["avg_queue_latency_ms"] = metrics["queue_latency_ms_total"] / requests
+        metrics["avg_inference_ms"] = metrics["inference_ms_total"] / batches
+        metrics["queue_depth"] = self._queue.qsize()
+        metrics["model_loaded"] = self._model is not None
+        return metrics
+
+
+_rerankers: Dict[str, BatchingReranker] = {}
+_rerankers_lock = threading.Lock()
+
+
+def get_reranker(model_name: Optional[str] = None) -> BatchingReranker:
+    """Returns the process-wide reranker for `model_name`, configured from the environment."""
+    model_name = model_name or os.getenv(
+        "RERANKER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    )
+    with _rerankers_lock:
+        if model_name not in _rerankers:
+            _rerankers[model_name] = BatchingReranker(
+                model_name,
+                max_batch_size=int(os.getenv("RERANKER_MAX_BATCH_SIZE", 64)),
+                max_wait_ms=float(os.getenv("RERANKER_MAX_WAIT_MS", 5)),
+                backend=os.getenv("RERANKER_BACKEND", "torch"),
+                model_file=os.getenv("RERANKER_MODEL_FILE") or None,
+                tokenizer_args={"clean_up_tokenization_spaces": True},
+            )
+        return _rerankers[model_name]
@@ -0,0 +1,62 @@
+"""
+Tests for the batching reranker worker
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from reranker import BatchingReranker
+
+
+class FakeCrossEncoder:
+    """Scores each pair by document length; the first predict blocks until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.calls = []
+
+    def predict(self, pairs, batch_size):
+        self.calls.append(list(pairs))
+        self.started.set()
+        self.release.wait(timeout=5)
+        return [float(len(document)) for _, document in pairs]
+
+
+@pytest.fixture
+def reranker():
+    reranker = BatchingReranker("fake-model", max_wait_ms=50)
+    reranker._model = FakeCrossEncoder()
+    return reranker
+
+
+def test_cancelled_request_does_not_stop_the_worker(reranker):
+    model = reranker._model
+    first = reranker.submit([("q", "a")])
+    assert model.started.wait(timeout=5)
+
+    # Queued behind the running batch, then abandoned by its caller
+    cancelled = reranker.submit([("q", "bb")])
+    kept = reranker.submit([("q", "ccc")])
+    assert cancelled.cancel()
+    model.release.set()
+
+    assert first.result(timeout=5) == [1.0]
+    assert kept.result(timeout=5) == [3.0]
+    assert reranker.submit([("q", "dddd")]).result(timeout=5) == [4.0]
+    assert [("q", "bb")] not in model.calls
+
+
+def test_timed_out_async_caller_does_not_stop_the_worker(reranker):
+    model = reranker._model
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(reranker.ascore([("q", "a")]), timeout=0.05)
+        model.release.set()
+        return await asyncio.wait_for(reranker.ascore([("q", "bb")]), timeout=5)
+
+    assert asyncio.run(main()) == [2.0]
+    assert reranker._worker.is_alive()
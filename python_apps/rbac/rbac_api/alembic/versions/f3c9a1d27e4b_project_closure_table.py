@@ -0,0 +1,51 @@
+"""project closure table
+
+Revision ID: f3c9a1d27e4b
+Revises: a767fb5c16fa
+Create Date: 2026-10-18 10:12:44.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c9a1d27e4b'
+down_revision: Union[str, None] = 'a767fb5c16fa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('project_closure',
+    sa.Column('ancestor_id', sa.Uuid(), nullable=False),
+    sa.Column('descendant_id', sa.Uuid(), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['ancestor_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['descendant_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id')
+    )
+    op.create_index(op.f('ix_project_closure_descendant_id'), 'project_closure', ['descendant_id'], unique=False)
+
+    # backfill from the existing parent_project_id adjacency list
+    op.execute(
+        """
+        WITH RECURSIVE closure(ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM projects
+            UNION ALL
+            SELECT p.parent_project_id, c.descendant_id, c.depth + 1
+            FROM closure c
+            JOIN projects p ON p.id = c.ancestor_id
+            WHERE p.parent_project_id IS NOT NULL
+        )
+        INSERT INTO project_closure (ancestor_id, descendant_id, depth)
+        SELECT ancestor_id, descendant_id, depth FROM closure
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_project_closure_descendant_id'), table_name='project_closure')
+    op.drop_table('project_closure')
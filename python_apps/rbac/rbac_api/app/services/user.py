@@ -24,6 +24,7 @@ from rbac_lib.utils.cte import (
 )
 from elevaitelib.orm.db import models
 from rbac_lib.utils.api_error import ApiError
+from rbac_lib.utils.permission_cache import account_permissions_cache
 
 
 def get_user_profile(
@@ -369,6 +370,7 @@ def patch_user_account_roles(
             ]
             db.bulk_save_objects(new_role_user_accounts)
             db.commit()
+            account_permissions_cache.invalidate(user_to_patch_account_association.id)
             return JSONResponse(
                 content={
                     "message": f"Successfully added {len(role_list_dto.role_ids)} account-scoped role/(s) to user"
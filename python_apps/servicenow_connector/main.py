@@ -9,6 +9,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
+from snow_client import AsyncServiceNowClient, get_async_snow_client, close_async_snow_client
+
 # Load environment variables
 load_dotenv()
 
@@ -34,6 +36,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Maximum records accepted by one bulk request
+BULK_MAX_ITEMS = int(os.getenv('SNOW_BULK_MAX_ITEMS', 5000))
+
 # Pydantic models for request/response validation - INCIDENTS
 class IncidentBase(BaseModel):
     short_description: str = Field(..., min_length=1, max_length=160, description="Brief description of the incident")
@@ -64,6 +69,9 @@ class IncidentUpdate(BaseModel):
     work_notes: Optional[str] = Field(None, description="Work notes to add")
     close_notes: Optional[str] = Field(None, description="Resolution notes when closing")
 
+class IncidentBulkUpdate(IncidentUpdate):
+    sys_id: str = Field(..., description="sys_id of the incident to update")
+
 class IncidentResponse(BaseModel):
     sys_id: str
     number: str
@@ -112,6 +120,9 @@ class CaseUpdate(BaseModel):
     close_notes: Optional[str] = Field(None, description="Resolution notes when closing")
     escalation: Optional[str] = Field(None, description="Escalation level: 0=Normal, 1=Manager, 2=Executive")
 
+class CaseBulkUpdate(CaseUpdate):
+    sys_id: str = Field(..., description="sys_id of the case to update")
+
 class CaseResponse(BaseModel):
     sys_id: str
     number: str
@@ -180,6 +191,48 @@ def transform_servicenow_response(snow_data: Dict[str, Any]) -> Dict[str, Any]:
     
     return transformed
 
+def build_create_payload(data: BaseModel) -> Dict[str, Any]:
+    """Prepare a create payload - remove None values and placeholder values, set the New/Open state"""
+    payload = {}
+    for key, value in data.dict(exclude_unset=True).items():
+        if value is not None and value != "string":  # Filter out placeholder values
+            payload[key] = value
+    payload['state'] = '1'
+    return payload
+
+def summarize_bulk_results(results, response_model, action: str, noun: str) -> Dict[str, Any]:
+    """Split per-item bulk results into records and error messages, keeping per-item detail"""
+    records = []
+    errors = []
+    items = []
+    for result in results:
+        item = {"index": result.index, "success": result.success, "status_code": result.status_code}
+        record = None
+        error = result.error or "No data returned"
+        if result.success and result.data:
+            try:
+                record = response_model(**transform_servicenow_response(result.data))
+            except Exception as e:
+                logger.error(f"Error transforming {noun} {result.index + 1}: {str(e)}")
+                error = f"Invalid ServiceNow response: {str(e)}"
+        if record is not None:
+            records.append(record)
+            item["sys_id"] = record.sys_id
+            item["number"] = record.number
+        else:
+            errors.append(f"Error {action} {noun} {result.index + 1}: {error}")
+            item["success"] = False
+            item["error"] = error
+        items.append(item)
+    return {"records": records, "errors": errors, "results": items}
+
+def check_bulk_size(count: int, noun: str):
+    if count > BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Maximum {BULK_MAX_ITEMS} {noun} allowed per bulk request"
+        )
+
 class ServiceNowConnection:
     """ServiceNow connection manager using PySnow"""
     
@@ -253,6 +306,10 @@ def get_snow_connection() -> ServiceNowConnection:
         snow_connection = ServiceNowConnection()
     return snow_connection
 
+@app.on_event("shutdown")
+async def shutdown():
+    await close_async_snow_client()
+
 # API Endpoints
 
 @app.get("/", tags=["Health"])
@@ -269,14 +326,16 @@ async def root():
                 "get_by_id": "/incidents/{sys_id}",
                 "update": "/incidents/{sys_id}",
                 "get_by_number": "/incidents/search/{incident_number}",
-                "bulk_create": "/incidents/bulk"
+                "bulk_create": "/incidents/bulk",
+                "bulk_update": "/incidents/bulk/update"
             },
             "cases": {
                 "create": "/cases",
                 "get_by_id": "/cases/{sys_id}",
                 "update": "/cases/{sys_id}",
                 "get_by_number": "/cases/search/{case_number}",
-                "bulk_create": "/cases/bulk"
+                "bulk_create": "/cases/bulk",
+                "bulk_update": "/cases/bulk/update"
             }
         }
     }
@@ -481,54 +540,45 @@ async def get_incident_by_number(
 @app.post("/incidents/bulk", tags=["Incidents"])
 async def create_bulk_incidents(
     incidents: List[IncidentCreate],
-    snow_conn: ServiceNowConnection = Depends(get_snow_connection)
+    snow_client: AsyncServiceNowClient = Depends(get_async_snow_client)
 ):
-    """Create multiple incidents at once"""
-    if len(incidents) > 10:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Maximum 10 incidents allowed per bulk request"
-        )
-    
-    created_incidents = []
-    errors = []
-    
-    for i, incident_data in enumerate(incidents):
-        try:
-            incident_table = snow_conn.get_incident_table()
-            
-            # Prepare payload - remove None values and convert to proper format
-            payload = {}
-            for key, value in incident_data.dict(exclude_unset=True).items():
-                if value is not None and value != "string":  # Filter out placeholder values
-                    payload[key] = value
-            
-            payload['state'] = '1'
-            
-            logger.info(f"Creating bulk incident {i+1} with payload: {payload}")
-            
-            # Create the incident
-            response = incident_table.create(payload)
-            
-            try:
-                created_record = response.one()
-                
-                if created_record:
-                    transformed_data = transform_servicenow_response(created_record)
-                    created_incidents.append(IncidentResponse(**transformed_data))
-                else:
-                    errors.append(f"Failed to create incident {i+1}: No data returned")
-            except pysnow.exceptions.NoResults:
-                errors.append(f"Failed to create incident {i+1}: No results found")
-                
-        except Exception as e:
-            errors.append(f"Error creating incident {i+1}: {str(e)}")
-    
+    """Create multiple incidents at once via the ServiceNow batch API"""
+    check_bulk_size(len(incidents), "incidents")
+    logger.info(f"Creating {len(incidents)} incidents in bulk")
+
+    results = await snow_client.bulk_create(
+        'incident', [build_create_payload(incident_data) for incident_data in incidents]
+    )
+    summary = summarize_bulk_results(results, IncidentResponse, "creating", "incident")
+
     return {
-        "created_count": len(created_incidents),
-        "error_count": len(errors),
-        "created_incidents": created_incidents,
-        "errors": errors
+        "created_count": len(summary["records"]),
+        "error_count": len(summary["errors"]),
+        "created_incidents": summary["records"],
+        "errors": summary["errors"],
+        "results": summary["results"]
+    }
+
+@app.post("/incidents/bulk/update", tags=["Incidents"])
+async def update_bulk_incidents(
+    updates: List[IncidentBulkUpdate],
+    snow_client: AsyncServiceNowClient = Depends(get_async_snow_client)
+):
+    """Update multiple incidents at once via the ServiceNow batch API"""
+    check_bulk_size(len(updates), "incidents")
+    logger.info(f"Updating {len(updates)} incidents in bulk")
+
+    results = await snow_client.bulk_update(
+        'incident', [update.dict(exclude_unset=True) for update in updates]
+    )
+    summary = summarize_bulk_results(results, IncidentResponse, "updating", "incident")
+
+    return {
+        "updated_count": len(summary["records"]),
+        "error_count": len(summary["errors"]),
+        "updated_incidents": summary["records"],
+        "errors": summary["errors"],
+        "results": summary["results"]
     }
 
 # ==================== CSM CASE ENDPOINTS ====================
@@ -712,54 +762,45 @@ async def get_case_by_number(
 @app.post("/cases/bulk", tags=["Cases"])
 async def create_bulk_cases(
     cases: List[CaseCreate],
-    snow_conn: ServiceNowConnection = Depends(get_snow_connection)
+    snow_client: AsyncServiceNowClient = Depends(get_async_snow_client)
 ):
-    """Create multiple cases at once"""
-    if len(cases) > 10:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Maximum 10 cases allowed per bulk request"
-        )
-    
-    created_cases = []
-    errors = []
-    
-    for i, case_data in enumerate(cases):
-        try:
-            case_table = snow_conn.get_case_table()
-            
-            # Prepare payload - remove None values and convert to proper format
-            payload = {}
-            for key, value in case_data.dict(exclude_unset=True).items():
-                if value is not None and value != "string":  # Filter out placeholder values
-                    payload[key] = value
-            
-            payload['state'] = '1'  # Open state
-            
-            logger.info(f"Creating bulk case {i+1} with payload: {payload}")
-            
-            # Create the case
-            response = case_table.create(payload)
-            
-            try:
-                created_record = response.one()
-                
-                if created_record:
-                    transformed_data = transform_servicenow_response(created_record)
-                    created_cases.append(CaseResponse(**transformed_data))
-                else:
-                    errors.append(f"Failed to create case {i+1}: No data returned")
-            except pysnow.exceptions.NoResults:
-                errors.append(f"Failed to create case {i+1}: No results found")
-                
-        except Exception as e:
-            errors.append(f"Error creating case {i+1}: {str(e)}")
-    
+    """Create multiple cases at once via the ServiceNow batch API"""
+    check_bulk_size(len(cases), "cases")
+    logger.info(f"Creating {len(cases)} cases in bulk")
+
+    results = await snow_client.bulk_create(
+        'sn_customerservice_case', [build_create_payload(case_data) for case_data in cases]
+    )
+    summary = summarize_bulk_results(results, CaseResponse, "creating", "case")
+
+    return {
+        "created_count": len(summary["records"]),
+        "error_count": len(summary["errors"]),
+        "created_cases": summary["records"],
+        "errors": summary["errors"],
+        "results": summary["results"]
+    }
+
+@app.post("/cases/bulk/update", tags=["Cases"])
+async def update_bulk_cases(
+    updates: List[CaseBulkUpdate],
+    snow_client: AsyncServiceNowClient = Depends(get_async_snow_client)
+):
+    """Update multiple cases at once via the ServiceNow batch API"""
+    check_bulk_size(len(updates), "cases")
+    logger.info(f"Updating {len(updates)} cases in bulk")
+
+    results = await snow_client.bulk_update(
+        'sn_customerservice_case', [update.dict(exclude_unset=True) for update in updates]
+    )
+    summary = summarize_bulk_results(results, CaseResponse, "updating", "case")
+
     return {
-        "created_count": len(created_cases),
-        "error_count": len(errors),
-        "created_cases": created_cases,
-        "errors": errors
+        "updated_count": len(summary["records"]),
+        "error_count": len(summary["errors"]),
+        "updated_cases": summary["records"],
+        "errors": summary["errors"],
+        "results": summary["results"]
     }
 
 
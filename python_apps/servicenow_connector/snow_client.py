@@ -0,0 +1,268 @@
+import asyncio
+import base64
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Same defaults the PySnow connection applies to every table resource
+TABLE_PARAMS = "sysparm_display_value=true&sysparm_exclude_reference_link=true"
+
+
+@dataclass
+class ItemResult:
+    """Outcome of one record in a bulk operation"""
+    index: int
+    success: bool
+    status_code: int
+    data: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class _TableRequest:
+    index: int
+    method: str
+    url: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+
+
+class AsyncServiceNowClient:
+    """
+    Async ServiceNow REST client for bulk operations.
+
+    Uses one pooled httpx session per process. Bulk creates/updates are sent through the
+    ServiceNow Batch API (`/api/now/v1/batch`) in chunks of `batch_size`, with up to
+    `max_concurrency` chunks in flight; when the Batch API is disabled or unavailable the
+    same records are sent as individual table API calls, still bounded by `max_concurrency`.
+    429 responses are retried after `Retry-After` / `X-RateLimit-Reset`, and once
+    `X-RateLimit-Remaining` hits zero all requests wait for the window to reset.
+    """
+
+    def __init__(
+        self,
+        instance: str,
+        username: str,
+        password: str,
+        max_concurrency: int = 8,
+        batch_size: int = 50,
+        use_batch_api: bool = True,
+        max_retries: int = 5,
+        timeout: float = 60.0,
+    ):
+        base_url = instance if instance.startswith("http") else f"https://{instance}.service-now.com"
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self.use_batch_api = use_batch_api
+        self.max_retries = max_retries
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            auth=(username, password),
+            headers={"Accept": "application/json", "Content-Type": "application/json"},
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_concurrency, max_keepalive_connections=max_concurrency
+            ),
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._paused_until = 0.0
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    # ------------------------------------------------------------------ rate limits
+
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        reset = response.headers.get("X-RateLimit-Reset")
+        if reset:
+            try:
+                return max(float(reset) - time.time(), 0.0)
+            except ValueError:
+                pass
+        return min(2 ** attempt, 30)
+
+    def _observe_rate_limit(self, response: httpx.Response):
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        if remaining is not None and reset is not None:
+            try:
+                if int(remaining) <= 0:
+                    self._paused_until = max(
+                        self._paused_until,
+                        time.monotonic() + max(float(reset) - time.time(), 0.0),
+                    )
+            except ValueError:
+                pass
+
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                delay = self._paused_until - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                response = await self._client.request(method, url, **kwargs)
+                self._observe_rate_limit(response)
+                if response.status_code != 429 or attempt == self.max_retries:
+                    return response
+                delay = self._retry_delay(response, attempt)
+                logger.warning(f"ServiceNow rate limit hit, retrying in {delay:.1f}s")
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            return response
+
+    # ------------------------------------------------------------------ results
+
+    @staticmethod
+    def _item_result(index: int, status_code: int, body: bytes, reason: str) -> ItemResult:
+        try:
+            parsed = json.loads(body) if body else {}
+        except ValueError:
+            parsed = {}
+        if 200 <= status_code < 300:
+            return ItemResult(index, True, status_code, data=parsed.get("result"))
+        error = parsed.get("error", {}) if isinstance(parsed, dict) else {}
+        message = error.get("message") if isinstance(error, dict) else None
+        return ItemResult(index, False, status_code, error=message or reason or body.decode(errors="replace"))
+
+    async def _run_single(self, request: _TableRequest) -> ItemResult:
+        try:
+            response = await self._send(request.method, request.url, json=request.payload)
+        except httpx.HTTPError as e:
+            return ItemResult(request.index, False, 0, error=str(e))
+        return self._item_result(
+            request.index, response.status_code, response.content, response.reason_phrase
+        )
+
+    async def _run_batch(self, requests: List[_TableRequest]) -> List[ItemResult]:
+        body = {
+            "batch_request_id": str(requests[0].index),
+            "rest_requests": [
+                {
+                    "id": str(request.index),
+                    "method": request.method,
+                    "url": request.url,
+                    "headers": [
+                        {"name": "Content-Type", "value": "application/json"},
+                        {"name": "Accept", "value": "application/json"},
+                    ],
+                    "body": base64.b64encode(json.dumps(request.payload).encode()).decode(),
+                }
+                for request in requests
+            ],
+        }
+        try:
+            response = await self._send("POST", "/api/now/v1/batch", json=body)
+        except httpx.HTTPError as e:
+            return [ItemResult(request.index, False, 0, error=str(e)) for request in requests]
+
+        if response.status_code in (403, 404):
+            # Batch API not available on this instance; fall back to table API calls
+            logger.warning(
+                f"ServiceNow batch API returned {response.status_code}, using individual requests"
+            )
+            self.use_batch_api = False
+            return await asyncio.gather(*(self._run_single(request) for request in requests))
+        if response.status_code >= 300:
+            # e.g. a 400 for a malformed batch: fail its items, keep using the batch API
+            return [
+                self._item_result(
+                    request.index, response.status_code, response.content, response.reason_phrase
+                )
+                for request in requests
+            ]
+
+        by_index = {request.index: request for request in requests}
+        results: List[ItemResult] = []
+        for served in response.json().get("serviced_requests", []):
+            index = int(served["id"])
+            by_index.pop(index, None)
+            results.append(
+                self._item_result(
+                    index,
+                    int(served.get("status_code", 0)),
+                    base64.b64decode(served.get("body") or b""),
+                    served.get("status_text", ""),
+                )
+            )
+        # Requests the batch did not get to (e.g. batch time limit) are retried individually
+        if by_index:
+            results.extend(
+                await asyncio.gather(*(self._run_single(request) for request in by_index.values()))
+            )
+        return results
+
+    async def _execute(self, requests: List[_TableRequest]) -> List[ItemResult]:
+        if self.use_batch_api:
+            chunks = [
+                requests[i : i + self.batch_size] for i in range(0, len(requests), self.batch_size)
+            ]
+            nested = await asyncio.gather(*(self._run_batch(chunk) for chunk in chunks))
+            results = [result for chunk in nested for result in chunk]
+        else:
+            results = list(await asyncio.gather(*(self._run_single(request) for request in requests)))
+        return sorted(results, key=lambda result: result.index)
+
+    # ------------------------------------------------------------------ public API
+
+    async def bulk_create(self, table: str, records: Sequence[Dict[str, Any]]) -> List[ItemResult]:
+        """Create records in `table`; returns one ItemResult per record, in input order"""
+        return await self._execute(
+            [
+                _TableRequest(index, "POST", f"/api/now/table/{table}?{TABLE_PARAMS}", record)
+                for index, record in enumerate(records)
+            ]
+        )
+
+    async def bulk_update(self, table: str, updates: Sequence[Dict[str, Any]]) -> List[ItemResult]:
+        """Update records in `table`; each update is `{"sys_id": ..., **fields}`"""
+        requests = []
+        for index, update in enumerate(updates):
+            fields = {key: value for key, value in update.items() if key != "sys_id"}
+            requests.append(
+                _TableRequest(
+                    index, "PATCH", f"/api/now/table/{table}/{update['sys_id']}?{TABLE_PARAMS}", fields
+                )
+            )
+        return await self._execute(requests)
+
+
+# Global async client instance
+async_snow_client: Optional[AsyncServiceNowClient] = None
+
+
+def get_async_snow_client() -> AsyncServiceNowClient:
+    """Dependency to get the pooled async ServiceNow client"""
+    global async_snow_client
+    if async_snow_client is None:
+        instance = os.getenv('SNOW_INSTANCE')
+        username = os.getenv('SNOW_USERNAME')
+        password = os.getenv('SNOW_PASSWORD')
+        if not all([instance, username, password]):
+            raise ValueError("Missing required ServiceNow environment variables: SNOW_INSTANCE, SNOW_USERNAME, SNOW_PASSWORD")
+        async_snow_client = AsyncServiceNowClient(
+            instance,
+            username,
+            password,
+            max_concurrency=int(os.getenv('SNOW_BULK_CONCURRENCY', 8)),
+            batch_size=int(os.getenv('SNOW_BATCH_SIZE', 50)),
+            use_batch_api=os.getenv('SNOW_USE_BATCH_API', 'true').lower() == 'true',
+        )
+    return async_snow_client
+
+
+async def close_async_snow_client():
+    global async_snow_client
+    if async_snow_client is not None:
+        await async_snow_client.aclose()
+        async_snow_client = None
@@ -1,17 +1,17 @@
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 import uvicorn
-import requests
-import base64
 from fastapi.middleware.cors import CORSMiddleware
 from models import InferencePayload
 from openai import OpenAI
-from openai import AzureOpenAI
+from openai import AsyncAzureOpenAI
+from openai import AsyncOpenAI
 import json
-import openai
 import argparse
 import re
 from fuzzywuzzy import process
+from sla_index import SlaIndex
+from token_provider import CiscoTokenProvider
 
 prompt = """The months you have data on are February, March, April.
 You are an analyst who helps customers understand whether there is a breach of SLOs or not.
@@ -47,29 +47,45 @@ Use these css classes .custom-table  and .custom-list. Put your entire output in
 OpenAI.api_type = "azure"
 OpenAI.api_version = "2023-08-01-preview"
 
-event_payload = {}
+sla_index = SlaIndex('event_payload.json')
 llm_api_key = ""
 cisco_app_key = ""
 cisco_client_id = ""
 cisco_client_secret = ""
 filtered_data = [] # Global variable to maintain the state of filtered data
+# Created once at startup and reused for every request
+token_provider = None
+openai_client = None
+cisco_llm_client = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global event_payload
     global llm_api_key
     global cisco_app_key
     global cisco_client_id
     global cisco_client_secret
-    with open('event_payload.json') as f:
-        event_payload = json.load(f)
+    global token_provider
+    global openai_client
+    global cisco_llm_client
+    sla_index.all_records()
     with open("api_keys.json") as f:
         payload = json.load(f)
         llm_api_key = payload["llm_api_key"]
         cisco_app_key = payload["cisco_app_key"]
         cisco_client_id = payload["cisco_client_ID"]
         cisco_client_secret = payload["cisco_client_secret"]
+    token_provider = CiscoTokenProvider(cisco_client_id, cisco_client_secret)
+    openai_client = AsyncOpenAI(api_key=llm_api_key)
+    # The access token is set per request with with_options(), which shares this client's connections
+    cisco_llm_client = AsyncAzureOpenAI(
+        azure_endpoint = 'https://chat-ai.cisco.com',
+        api_key="unset",
+        api_version="2023-08-01-preview"
+    )
     yield
+    await token_provider.aclose()
+    await openai_client.close()
+    await cisco_llm_client.close()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -100,16 +116,12 @@ def retrieve_relevant_data(query, current_data):
     date_matches = re.findall(r'\b(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b(?:\s+(\d{4}))?', query, re.IGNORECASE)
     if not date_matches:
         print("No date found in the query.")
-        with open('event_payload.json') as f:
-            current_data = json.load(f)
-        return current_data
+        return sla_index.all_records()
 
     # If multiple months are found, return all data
     if len(date_matches) > 1:
         print(f"Multiple months detected: {[match[0] for match in date_matches]}")
-        with open('event_payload.json') as f:
-            current_data = json.load(f)
-        return current_data
+        return sla_index.all_records()
 
     month, year = date_matches[0]
     year = year if year else '2024'
@@ -137,15 +149,11 @@ def retrieve_relevant_data(query, current_data):
         return current_data
 
     print("The model thinks it is month:",month_abbr)
-    # create a list of documents (each payload as a string)
-    documents = []
-    for payload in current_data:
-        # check if the payload matches the specified month and year
-        service_date = payload.get("actual_service_date", "")
-        if len(service_date.split(' ')) == 2:
-            payload_month_abbr, payload_year = service_date.split(' ')
-            if payload_month_abbr.lower() == month_abbr and payload_year == year:
-                documents.append(payload)
+    # records of the specified month and year that are in the current data
+    documents = sla_index.lookup(year, month_abbr)
+    if current_data is not sla_index.all_records():
+        current_ids = {id(payload) for payload in current_data}
+        documents = [payload for payload in documents if id(payload) in current_ids]
 
     # debugging: print the filtered documents
     print("Filtered documents:", documents)
@@ -153,9 +161,7 @@ def retrieve_relevant_data(query, current_data):
     # if no documents match the criteria, return an empty list
     if not documents:
         print("No matching documents found.")
-        with open('event_payload.json') as f:
-            current_data = json.load(f)
-        return current_data
+        return sla_index.all_records()
 
     # directly return the filtered documents
     return documents
@@ -166,20 +172,17 @@ async def post_message(inference_payload: InferencePayload):
     global filtered_data
     if not filtered_data:
         print("Reading the Data again.")
-        with open('event_payload.json') as f:
-            filtered_data = json.load(f)
+        filtered_data = sla_index.all_records()
 
     # Check if the query contains the keyword "earnback"
     if "earnback" in inference_payload.query.lower():
-        with open('event_payload.json') as f:
-            filtered_data = json.load(f)
+        filtered_data = sla_index.all_records()
 
     relevant_data = retrieve_relevant_data(inference_payload.query, filtered_data)
     filtered_data = relevant_data # Update the global filtered data
 
     if "earnback" in inference_payload.query.lower():
-        with open('event_payload.json') as f:
-            filtered_data = json.load(f)
+        filtered_data = sla_index.all_records()
 
     populated_prompt: str = prompt
     for payload in relevant_data:
@@ -207,9 +210,8 @@ async def post_message(inference_payload: InferencePayload):
     print("Populated Prompt:",populated_prompt)
 
     if inference_payload.use_openai_directly:
-        client = openai.OpenAI(api_key=llm_api_key)
         print("Model used:",model_name)
-        response = client.chat.completions.create(
+        response = await openai_client.chat.completions.create(
             model=model_name,
             temperature=0.0,
             top_p=1e-9,
@@ -220,15 +222,14 @@ async def post_message(inference_payload: InferencePayload):
             ]
         )
     else:
-        token_response = get_cisco_access_token()
-        print("Cisco token:",token_response)
+        access_token = await token_provider.get_token()
         print("Populated Prompt:",populated_prompt)
         print("User content:",inference_payload.query)
         messages = [
             {"role": "system", "content": populated_prompt},
             {"role": "user", "content": inference_payload.query}
         ]
-        response = get_openai_response(token_response,messages)
+        response = await get_openai_response(access_token,messages)
         print(response.choices[0].message.content)
     return {
         "prompt": populated_prompt,
@@ -236,14 +237,10 @@ async def post_message(inference_payload: InferencePayload):
     }
 
 
-def get_openai_response(token_response, message_with_history):
-    client = AzureOpenAI(
-        azure_endpoint = 'https://chat-ai.cisco.com',
-        api_key=token_response.json()["access_token"],
-        api_version="2023-08-01-preview"
-    )
+async def get_openai_response(access_token, message_with_history):
+    client = cisco_llm_client.with_options(api_key=access_token)
     print("Model_used:", model_name)
-    response = client.chat.completions.create(
+    response = await client.chat.completions.create(
         model=model_name, # model = "deployment_name".
         temperature=0,
         top_p=1e-9,
@@ -253,19 +250,6 @@ def get_openai_response(token_response, message_with_history):
     )
     return response
 
-def get_cisco_access_token():
-    url = "https://id.cisco.com/oauth2/default/v1/token"
-    payload = "grant_type=client_credentials"
-
-    value = base64.b64encode(f'{cisco_client_id}:{cisco_client_secret}'.encode('utf-8')).decode('utf-8')
-    headers = {
-        "Accept": "*/*",
-        "Content-Type": "application/x-www-form-urlencoded",
-        "Authorization": f"Basic {value}"
-    }
-    token_response = requests.request("POST", url, headers=headers, data=payload)
-    return token_response
-
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run the FastAPI server with a specified model.")
     parser.add_argument("--model", type=str, choices=["gpt-3.5-turbo", "gpt-4o-mini"], default="gpt-4o-mini", help="Specify the model to use.")
@@ -0,0 +1,61 @@
+import json
+import os
+import threading
+
+
+class SlaIndex:
+    """
+    In-memory copy of the SLA records in event_payload.json, indexed by
+    (year, month abbreviation, category).
+
+    The file is re-read only when its modification time or size changes, so
+    updates written by the ingestion pipeline are picked up on the next lookup.
+    A partially written file is ignored and the previous records are kept.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._version = None
+        self._records = []
+        self._by_month = {}
+        self._by_key = {}
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        stat = os.stat(self.path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        if version == self._version:
+            return
+        with self._lock:
+            if version == self._version:
+                return
+            try:
+                with open(self.path) as f:
+                    records = json.load(f)
+            except json.JSONDecodeError as e:
+                if self._version is None:
+                    raise
+                print(f"Keeping previous SLA data, could not parse {self.path}: {e}")
+                return
+            by_month, by_key = {}, {}
+            for payload in records:
+                service_date = payload.get("actual_service_date", "")
+                if len(service_date.split(' ')) == 2:
+                    month_abbr, year = service_date.split(' ')
+                    month = (year, month_abbr.lower())
+                    by_month.setdefault(month, []).append(payload)
+                    by_key.setdefault(month + (payload.get("category"),), []).append(payload)
+            self._records, self._by_month, self._by_key = records, by_month, by_key
+            self._version = version
+            print(f"Loaded {len(records)} SLA records from {self.path}")
+
+    def all_records(self):
+        self._refresh()
+        return self._records
+
+    def lookup(self, year, month_abbr, category=None):
+        """Records of a month (and optionally one category), in file order."""
+        self._refresh()
+        if category is None:
+            return list(self._by_month.get((year, month_abbr), []))
+        return list(self._by_key.get((year, month_abbr, category), []))
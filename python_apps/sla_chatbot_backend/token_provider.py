@@ -0,0 +1,61 @@
+import asyncio
+import base64
+import time
+
+import httpx
+
+
+class CiscoTokenProvider:
+    """
+    Caches the Cisco OAuth client-credentials token until shortly before it
+    expires.
+
+    Within refresh_ahead seconds of expiry the cached token is still returned
+    while a new one is fetched in the background. Concurrent callers share a
+    single token request (single-flight), so the identity provider sees one
+    request per token lifetime.
+    """
+
+    def __init__(self, client_id, client_secret, url="https://id.cisco.com/oauth2/default/v1/token",
+                 refresh_ahead=300, http_client=None):
+        self.url = url
+        self.refresh_ahead = refresh_ahead
+        value = base64.b64encode(f'{client_id}:{client_secret}'.encode('utf-8')).decode('utf-8')
+        self._headers = {
+            "Accept": "*/*",
+            "Content-Type": "application/x-www-form-urlencoded",
+            "Authorization": f"Basic {value}"
+        }
+        self._http = http_client or httpx.AsyncClient(timeout=30)
+        self._token = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+        self._background_refresh = None
+
+    async def get_token(self):
+        now = time.monotonic()
+        if self._token and now < self._expires_at - self.refresh_ahead:
+            return self._token
+        if self._token and now < self._expires_at:
+            # Still valid: refresh ahead of expiry without making the caller wait
+            if self._background_refresh is None or self._background_refresh.done():
+                self._background_refresh = asyncio.create_task(self._refresh_if_needed())
+            return self._token
+        return await self._refresh_if_needed()
+
+    async def _refresh_if_needed(self):
+        async with self._lock:
+            if self._token and time.monotonic() < self._expires_at - self.refresh_ahead:
+                return self._token
+            response = await self._http.post(self.url, headers=self._headers, data={"grant_type": "client_credentials"})
+            response.raise_for_status()
+            payload = response.json()
+            self._token = payload["access_token"]
+            self._expires_at = time.monotonic() + float(payload.get("expires_in", 3600))
+            print("Fetched Cisco access token, expires in", payload.get("expires_in", 3600), "seconds")
+            return self._token
+
+    async def aclose(self):
+        if self._background_refresh is not None:
+            self._background_refresh.cancel()
+        await self._http.aclose()
@@ -56,88 +56,83 @@ def convert_datetime_strings(value):
         # For other types, return None
         return None
 
-def clean_value_for_asyncpg(key: str, value) -> Any:
-    """Clean individual values for AsyncPG insertion"""
-    # Handle None/NaN values
-    if value is None or pd.isna(value):
-        return None
-    
-    # Handle empty strings
-    if isinstance(value, str) and value.strip() == '':
-        return None
-    
-    # Handle datetime columns (based on column names)
-    datetime_columns = ['incident_date', 'closed_date', 'created_at', 'updated_at']
-    if any(col in key.lower() for col in datetime_columns):
-        return convert_datetime_strings(value)
-    
-    # Handle integer columns (quantity should be integer)
-    integer_columns = ['quantity']
-    if any(col in key.lower() for col in integer_columns):
-        try:
-            if isinstance(value, str):
-                # Handle string numbers like '2.0' -> 2
-                if value.strip() == '' or value.strip().lower() in ['nan', 'none', 'null']:
-                    return None
-                # Convert float string to int
-                float_val = float(value.strip())
-                return int(float_val) if not np.isnan(float_val) else None
-            elif isinstance(value, (np.integer, np.floating)):
-                return int(value) if np.isfinite(value) else None
-            elif isinstance(value, float):
-                return int(value) if not np.isnan(value) and np.isfinite(value) else None
-            else:
-                return None
-        except (ValueError, TypeError):
-            logger.warning(f"Could not convert {key} value '{value}' to integer, setting to None")
-            return None
-    
-    # Handle decimal/float columns (costs, hours)
-    decimal_columns = ['unit_cost', 'total_cost', 'travel_time_hours', 'actual_time_hours']
-    if any(col in key.lower() for col in decimal_columns):
-        try:
-            if isinstance(value, str):
-                if value.strip() == '' or value.strip().lower() in ['nan', 'none', 'null']:
-                    return None
-                return float(value.strip())
-            elif isinstance(value, (np.integer, np.floating)):
-                return float(value) if np.isfinite(value) else None
-            elif isinstance(value, (int, float)):
-                return float(value) if not (isinstance(value, float) and np.isnan(value)) else None
-            else:
-                return None
-        except (ValueError, TypeError):
-            logger.warning(f"Could not convert {key} value '{value}' to decimal, setting to None")
-            return None
-    
-    # Handle other numeric values
-    if isinstance(value, (np.integer, np.floating)):
-        if np.isfinite(value):
-            # Convert to Python native types
+# Column families that need type conversion (matched by substring of the column name)
+DATETIME_COLUMNS = ['incident_date', 'closed_date', 'created_at', 'updated_at']
+INTEGER_COLUMNS = ['quantity']
+DECIMAL_COLUMNS = ['unit_cost', 'total_cost', 'travel_time_hours', 'actual_time_hours']
+NULL_STRINGS = ['nan', 'none', 'null', '']
+
+def _strip_strings(series: pd.Series) -> pd.Series:
+    """Strip string cells and turn blank/'nan'/'null' strings into None; other cells are kept"""
+    series = series.astype(object)
+    is_str = series.apply(isinstance, args=(str,))
+    if not is_str.any():
+        return series
+    stripped = series[is_str].str.strip()
+    stripped = stripped.where(~stripped.str.lower().isin(NULL_STRINGS), None)
+    out = series.copy()
+    out[is_str] = stripped
+    return out
+
+def _to_nullable_list(series: pd.Series) -> list:
+    """Python values for asyncpg with None for missing cells"""
+    missing = series.isna().tolist()
+    return [None if m else v for v, m in zip(series.tolist(), missing)]
+
+def _to_numeric(key: str, series: pd.Series) -> pd.Series:
+    """Convert a column to floats (NaN where missing, non-numeric or not finite)"""
+    values = _strip_strings(series)
+    numbers = pd.to_numeric(values, errors='coerce').astype(float)
+    invalid = numbers.isna() & values.notna()
+    if invalid.any():
+        logger.warning(
+            f"Could not convert {int(invalid.sum())} {key} value(s) to numbers "
+            f"(e.g. '{values[invalid].iloc[0]}'), setting to None"
+        )
+    return numbers.where(np.isfinite(numbers))
+
+def clean_column_for_asyncpg(key: str, series: pd.Series) -> list:
+    """Clean a whole column for AsyncPG insertion, converting types by column name"""
+    name = key.lower()
+
+    # Datetime columns: each distinct string is parsed once
+    if any(col in name for col in DATETIME_COLUMNS):
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return [None if v is None else v.to_pydatetime() for v in _to_nullable_list(series)]
+        values = _strip_strings(series)
+        parsed = {v: convert_datetime_strings(v) for v in pd.unique(values.dropna())}
+        return [None if v is None else parsed[v] for v in _to_nullable_list(values)]
+
+    # Integer columns (quantity): '2.0' -> 2
+    if any(col in name for col in INTEGER_COLUMNS):
+        numbers = np.trunc(_to_numeric(key, series))
+        return [None if v is None else int(v) for v in _to_nullable_list(numbers)]
+
+    # Decimal/float columns (costs, hours)
+    if any(col in name for col in DECIMAL_COLUMNS):
+        return _to_nullable_list(_to_numeric(key, series))
+
+    # Numeric columns: convert to Python native types, non-finite -> None
+    if pd.api.types.is_bool_dtype(series):
+        return _to_nullable_list(series.astype(object).map(str).where(series.notna()))
+    if pd.api.types.is_float_dtype(series):
+        return _to_nullable_list(series.where(np.isfinite(series)))
+    if pd.api.types.is_integer_dtype(series):
+        return _to_nullable_list(series)
+
+    # Text columns: full strings without truncation - PostgreSQL TEXT fields can handle any length
+    values = _strip_strings(series)
+    other = values.notna() & ~values.apply(isinstance, args=(str,))
+    if other.any():
+        def to_native(value):
             if isinstance(value, np.integer):
                 return int(value)
-            else:
-                return float(value)
-        else:
-            return None
-    
-    # Handle string values
-    if isinstance(value, str):
-        # Clean up string values
-        cleaned = value.strip()
-        if cleaned.lower() in ['nan', 'none', 'null', '']:
-            return None
-        
-        # Return full string without truncation - PostgreSQL TEXT fields can handle any length
-        return cleaned
-    
-    # For other types, convert to string or return None
-    try:
-        result = str(value) if value is not None else None
-        # Return full string without length restrictions
-        return result
-    except:
-        return None
+            if isinstance(value, np.floating):
+                return float(value) if np.isfinite(value) else None
+            return str(value)
+        values = values.copy()
+        values[other] = values[other].map(to_native)
+    return _to_nullable_list(values)
 
 def parse_connection_string(conn_string: str) -> Dict[str, Any]:
     """Parse PostgreSQL connection string into components"""
@@ -275,7 +270,13 @@ async def ensure_tables_exist(connection):
         raise
 
 async def load_data_to_table(connection, table_name: str, df: pd.DataFrame):
-    """Load data to a specific table with conflict resolution"""
+    """Load data to a specific table with conflict resolution.
+
+    Rows are streamed with COPY into a temporary staging table and merged into
+    the target with a single INSERT ... SELECT (ON CONFLICT DO NOTHING for tables
+    with a natural key), so a file costs a handful of round-trips instead of one
+    per row.
+    """
     
     if df.empty:
         logger.info(f"Skipping empty DataFrame for table: {table_name}")
@@ -288,51 +289,45 @@ async def load_data_to_table(connection, table_name: str, df: pd.DataFrame):
     logger.info(f"Loading {len(df)} rows into '{table_name}'...")
     
     try:
-        # Convert DataFrame to list of dictionaries for easier processing
-        records = df.to_dict(orient="records")
+        # Clean column by column with proper type conversion
+        columns = [str(column) for column in df.columns]
+        cleaned_columns = [clean_column_for_asyncpg(key, df[key]) for key in df.columns]
+        records = list(zip(*cleaned_columns))
         
-        # Process in batches of 500 for better performance
-        batch_size = 500
-        total_inserted = 0
+        columns_str = ', '.join(columns)
+        staging_table = f"staging_{table_name}"
         
-        for i in range(0, len(records), batch_size):
-            batch = records[i:i + batch_size]
-            
-            for row in batch:
-                # Clean the row data with proper type conversion
-                cleaned_row = {}
-                for key, value in row.items():
-                    cleaned_row[key] = clean_value_for_asyncpg(key, value)
-                
-                # Build the SQL query
-                columns = list(cleaned_row.keys())
-                values = list(cleaned_row.values())
-                placeholders = ', '.join([f'${i+1}' for i in range(len(columns))])
-                columns_str = ', '.join(columns)
-                
-                if table_name in CONFLICT_KEYS:
-                    pk = CONFLICT_KEYS[table_name]
-                    # Use ON CONFLICT for tables with natural primary keys
-                    sql = f"""
-                        INSERT INTO {table_name} ({columns_str})
-                        VALUES ({placeholders})
-                        ON CONFLICT ({pk}) DO NOTHING
-                    """
-                else:
-                    # Simple insert for tables without conflicts
-                    sql = f"""
-                        INSERT INTO {table_name} ({columns_str})
-                        VALUES ({placeholders})
-                    """
-                
-                await connection.execute(sql, *values)
-            
-            total_inserted += len(batch)
-            logger.info(f"Inserted batch {i//batch_size + 1}: {len(batch)} rows")
+        if table_name in CONFLICT_KEYS:
+            pk = CONFLICT_KEYS[table_name]
+            # Use ON CONFLICT for tables with natural primary keys
+            conflict_clause = f"ON CONFLICT ({pk}) DO NOTHING"
+        else:
+            # Simple insert for tables without conflicts
+            conflict_clause = ""
+        
+        # Savepoint when the caller already opened a transaction for the file
+        async with connection.transaction():
+            # Staging table has the target's column types but no constraints or defaults
+            await connection.execute(f"""
+                CREATE TEMP TABLE {staging_table} ON COMMIT DROP AS
+                SELECT {columns_str} FROM {table_name} WITH NO DATA
+            """)
+            await connection.copy_records_to_table(
+                staging_table, records=records, columns=columns
+            )
+            status = await connection.execute(f"""
+                INSERT INTO {table_name} ({columns_str})
+                SELECT {columns_str} FROM {staging_table}
+                {conflict_clause}
+            """)
+            await connection.execute(f"DROP TABLE {staging_table}")
         
-        # Post-insert check
-        count = await connection.fetchval(f"SELECT COUNT(*) FROM {table_name}")
-        logger.info(f"Total rows in '{table_name}': {count}")
+        # Status is 'INSERT 0 <rows>'
+        total_inserted = int(status.split()[-1])
+        logger.info(
+            f"Inserted {total_inserted} rows into '{table_name}' "
+            f"({len(records) - total_inserted} already present)"
+        )
         
         return total_inserted
         
@@ -363,9 +358,10 @@ async def append_to_postgres(cleaned_data, conn_string):
         # Ensure tables exist (create if missing, but don't drop existing)
         await ensure_tables_exist(connection)
         
-        # Load data into each table (APPEND mode)
-        for table_name, df in cleaned_data.items():
-            await load_data_to_table(connection, table_name, df)
+        # Load data into each table (APPEND mode), all tables of the file in one transaction
+        async with connection.transaction():
+            for table_name, df in cleaned_data.items():
+                await load_data_to_table(connection, table_name, df)
         
         logger.info("Data appended successfully!")
         
@@ -231,3 +231,30 @@ class TestSeedTenantDataInitializer:
         seeding_idx = initializer_names.index("seed_tenant_data")
 
         assert seeding_idx > migration_idx, "Seeding should run after migrations"
+
+    def test_seeding_leaves_shared_connections_on_public(self, tmp_path):
+        """Verify seeding a tenant never changes search_path on shared-engine connections."""
+        from sqlalchemy import create_engine, event
+        from workflow_core_sdk.db import database
+        from workflow_engine_poc.seeding import initializer
+
+        shared = create_engine(f"sqlite:///{tmp_path}/shared.db")
+        tenant = create_engine(f"sqlite:///{tmp_path}/tenant.db")
+        event.listen(shared, "checkout", database._apply_tenant_schema_on_checkout)
+        event.listen(shared, "after_cursor_execute", database._forget_search_path_on_set)
+        statements = []
+        event.listen(shared, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+
+        with (
+            patch.object(database, "engine", shared),
+            patch.object(initializer, "get_tenant_engine", return_value=tenant) as get_engine,
+            patch.object(initializer, "SeedDataLoader") as mock_loader,
+        ):
+            mock_loader.return_value.load_all.return_value = {"prompts": 1}
+            initializer._seed_tenant_sync("tenant1")
+
+            get_engine.assert_called_once_with("tenant1")
+            with shared.connect() as conn:
+                assert conn.info.get("search_path", "public") == "public"
+
+        assert not any("search_path" in statement.lower() for statement in statements)
@@ -18,6 +18,7 @@ from workflow_core_sdk.streaming import (
     create_sse_stream,
     get_sse_headers,
     create_status_event,
+    parse_last_event_id,
 )
 
 from workflow_core_sdk import WorkflowEngine
@@ -334,6 +335,8 @@ async def get_execution_analytics(
     status: Optional[str] = None,
     workflow_id: Optional[str] = None,
     exclude_db: bool = False,
+    cursor: Optional[str] = None,
+    count_estimate: bool = False,
     session: Session = Depends(get_db_session),
     # RBAC headers for Swagger UI testing
     api_key: Optional[str] = Security(api_key_header),
@@ -347,6 +350,8 @@ async def get_execution_analytics(
     - Always returns engine analytics
     - By default also includes DB executions in "db_executions"
     - If exclude_db is True, only in-memory analytics are returned
+    - "db_next_cursor" pages DB executions by keyset: pass it back as cursor
+      (offset is then ignored); count_estimate adds "db_total_estimate"
     """
     try:
         workflow_engine: WorkflowEngine = request.app.state.workflow_engine
@@ -357,11 +362,29 @@ async def get_execution_analytics(
         if exclude_db:
             return analytics
 
-        db_items = ExecutionsService.list_executions(
-            session, workflow_id=workflow_id, status=status, limit=limit, offset=offset
-        )
+        try:
+            page = ExecutionsService.list_executions_page(
+                session,
+                workflow_id=workflow_id,
+                status=status,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+                include_total_estimate=count_estimate,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         # Merge: keep analytics as-is and attach db_executions; additive for clients
-        return {**analytics, "db_executions": db_items}
+        result = {
+            **analytics,
+            "db_executions": page["executions"],
+            "db_next_cursor": page["next_cursor"],
+        }
+        if count_estimate:
+            result["db_total_estimate"] = page["total_estimate"]
+        return result
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get execution analytics: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -381,8 +404,12 @@ async def stream_execution_updates(
     org_id: Optional[str] = Header(default=None, alias=HDR_ORG_ID),
     project_id: Optional[str] = Header(default=None, alias=HDR_PROJECT_ID),
     account_id: Optional[str] = Header(default=None, alias=HDR_ACCOUNT_ID),
+    last_event_id: Optional[str] = Header(default=None, alias="Last-Event-ID"),
 ):
-    """Stream real-time updates for a specific execution using Server-Sent Events (SSE)."""
+    """Stream real-time updates for a specific execution using Server-Sent Events (SSE).
+
+    Clients reconnecting with Last-Event-ID receive the buffered events they missed.
+    """
     try:
         workflow_engine: WorkflowEngine = request.app.state.workflow_engine
 
@@ -399,8 +426,10 @@ async def stream_execution_updates(
 
         async def event_generator():
             try:
-                # Add this connection to the stream manager
-                stream_manager.add_execution_stream(execution_id, queue)
+                # Add this connection to the stream manager (replaying missed events)
+                stream_manager.add_execution_stream(
+                    execution_id, queue, last_event_id=parse_last_event_id(last_event_id)
+                )
 
                 # Send initial status if execution exists
                 if execution_context:
@@ -503,13 +532,29 @@ async def step_callback(
                 "message": "Callback received and queued for worker",
             }
         else:
-            # For DBOS backend, the workflow polls for completion; nothing to do
+            # For DBOS backend, wake the workflow blocked on the step's callback topic
+            from workflow_core_sdk.dbos_impl.messaging import (
+                make_ingestion_topic,
+                send_to_workflow,
+            )
+
+            dbos_workflow_id = metadata.get("dbos_workflow_id")
+            if not dbos_workflow_id:
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"Execution {execution_id} has no DBOS workflow to notify",
+                )
+            await send_to_workflow(
+                dbos_workflow_id,
+                make_ingestion_topic(execution_id, step_id),
+                callback_data,
+            )
             logger.info(
-                f"Callback received for DBOS execution {execution_id}, workflow will poll for completion"
+                f"Callback delivered to DBOS workflow {dbos_workflow_id} for execution {execution_id}"
             )
             return {
                 "status": "ok",
-                "message": "Callback received (DBOS workflow polls for completion)",
+                "message": "Callback delivered to DBOS workflow",
             }
 
     except HTTPException:
@@ -46,6 +46,7 @@ from workflow_core_sdk.streaming import (
     create_sse_stream,
     get_sse_headers,
     create_status_event,
+    parse_last_event_id,
 )
 
 from workflow_core_sdk.execution.context_impl import ExecutionContext, UserContext
@@ -449,12 +450,14 @@ async def stream_workflow_execution(
     org_id: Optional[str] = Header(default=None, alias=HDR_ORG_ID),
     project_id: Optional[str] = Header(default=None, alias=HDR_PROJECT_ID),
     account_id: Optional[str] = Header(default=None, alias=HDR_ACCOUNT_ID),
+    last_event_id: Optional[str] = Header(default=None, alias="Last-Event-ID"),
 ) -> StreamingResponse:
     """
     Stream real-time updates for workflow executions using Server-Sent Events (SSE).
 
     If execution_id is provided, streams updates for that specific execution.
     Otherwise, streams updates for all executions of the workflow.
+    Clients reconnecting with Last-Event-ID receive the buffered events they missed.
     """
     try:
         workflow_engine: WorkflowEngine = request.app.state.workflow_engine
@@ -468,8 +471,11 @@ async def stream_workflow_execution(
 
         async def event_generator():
             try:
-                # Add this connection to the stream manager
-                stream_manager.add_workflow_stream(workflow_id, queue)
+                # Add this connection to the stream manager (replaying missed events)
+                resume_from = parse_last_event_id(last_event_id)
+                stream_manager.add_workflow_stream(
+                    workflow_id, queue, last_event_id=resume_from
+                )
 
                 # Emit an immediate 'connected' event so clients receive a first chunk promptly
                 connected_event = create_status_event(
@@ -481,7 +487,9 @@ async def stream_workflow_execution(
 
                 # If specific execution_id provided, also listen to that execution
                 if execution_id:
-                    stream_manager.add_execution_stream(execution_id, queue)
+                    stream_manager.add_execution_stream(
+                        execution_id, queue, last_event_id=resume_from
+                    )
 
                     # Send initial status for the specific execution
                     execution_context = await workflow_engine.get_execution_context(
@@ -8,24 +8,24 @@ import asyncio
 import logging
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
 from sqlmodel import Session
 
 from db_core import register_tenant_initializer
-from db_core.utils import get_schema_name
-from workflow_core_sdk.multitenancy import multitenancy_settings
-from workflow_core_sdk.db.database import engine
+from workflow_core_sdk.db.database import get_tenant_engine
 
 from .loader import SeedDataLoader
 
 logger = logging.getLogger(__name__)
 
 
-def _seed_tenant_sync(schema_name: str) -> dict[str, int]:
-    """Load seed data synchronously with the tenant's schema in search_path."""
-    with Session(engine) as session:
-        session.execute(text(f'SET search_path TO "{schema_name}", public'))
-        session.commit()
+def _seed_tenant_sync(tenant_id: str) -> dict[str, int]:
+    """
+    Load seed data synchronously through the tenant's own pool.
+
+    Its connections get the tenant's search_path when opened, so no SET runs
+    on shared-engine connections that other tenants check out later.
+    """
+    with Session(get_tenant_engine(tenant_id)) as session:
         return SeedDataLoader(session).load_all()
 
 
@@ -37,11 +37,10 @@ async def seed_tenant_data(tenant_id: str, session: AsyncSession) -> None:
     Runs after migrations and populates the schema with demo prompts, tools,
     agents, and workflows. Seeding failures are logged but don't block tenant creation.
     """
-    schema_name = get_schema_name(tenant_id, multitenancy_settings)
-    logger.info(f"Seeding demo data for tenant '{tenant_id}' in schema '{schema_name}'")
+    logger.info(f"Seeding demo data for tenant '{tenant_id}'")
 
     try:
-        results = await asyncio.to_thread(_seed_tenant_sync, schema_name)
+        results = await asyncio.to_thread(_seed_tenant_sync, tenant_id)
         total = sum(results.values())
         logger.info(
             f"Seeding completed for tenant '{tenant_id}': {total} entities created ({results})"
@@ -18,6 +18,7 @@ from db_core.audit import (
 from db_core.config import MultitenancySettings
 from db_core.db import (
     Base,
+    close_tenant_pools,
     get_tenant_async_session,
     get_tenant_session,
     init_db,
@@ -34,6 +35,7 @@ from db_core.router import (
     TenantUpdate,
     create_tenant_admin_router,
 )
+from db_core.tenant_pools import TenantEngineManager
 from db_core.tenant_registry import (
     TenantCache,
     TenantRegistry,
@@ -57,6 +59,8 @@ __all__ = [
     "Base",
     "tenant_db_session",
     "tenant_async_db_session",
+    "TenantEngineManager",
+    "close_tenant_pools",
     # Settings
     "MultitenancySettings",
     # Tenant models
@@ -25,6 +25,12 @@ class MultitenancySettings(BaseModel):
     db_pool_timeout: int = 30
     db_pool_recycle: int = 1800
 
+    # Per-tenant connection pools (see db_core.tenant_pools)
+    tenant_pool_size: int = 2
+    tenant_pool_max_overflow: int = 3
+    tenant_pool_max_connections: int = 100
+    tenant_pool_idle_timeout: int = 600
+
     # Schema/tenant management
     use_public_schema_for_admin: bool = True
 
@@ -6,13 +6,14 @@ import logging
 from functools import wraps
 from typing import Any, Dict, Optional
 
-from sqlalchemy import create_engine, event, text
+from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 from sqlalchemy.pool import NullPool
 
 from db_core.config import MultitenancySettings
 from db_core.middleware import get_current_tenant_id
+from db_core.tenant_pools import TenantEngineManager
 from db_core.utils import (
     create_tenant_schema,
     get_schema_name,
@@ -28,6 +29,10 @@ Base = declarative_base()
 sync_session_factory: Optional[sessionmaker] = None
 async_session_factory: Optional[async_sessionmaker] = None
 
+# Per-tenant pools; sessions for a tenant are bound to its pool's engine
+tenant_engine_manager: Optional[TenantEngineManager] = None
+async_tenant_engine_manager: Optional[TenantEngineManager] = None
+
 
 def init_db(
     settings: MultitenancySettings,
@@ -40,6 +45,10 @@ def init_db(
     """
     Initialize the database connections and session factories.
 
+    The main engine serves the public schema. Tenant sessions are bound to a
+    small per-tenant pool whose connections already use the tenant's schema
+    (see db_core.tenant_pools), so no search_path is set per checkout.
+
     Args:
         settings: The multitenancy settings
         db_url: Database URL (overrides settings.db_url)
@@ -52,6 +61,7 @@ def init_db(
         Dictionary with 'engine', 'session_factory', and other initialized objects
     """
     global sync_session_factory, async_session_factory
+    global tenant_engine_manager, async_tenant_engine_manager
 
     db_url = db_url or settings.db_url
     if not db_url:
@@ -77,6 +87,15 @@ def init_db(
             engine, expire_on_commit=False, class_=AsyncSession
         )
         session_factory = async_session_factory
+        async_tenant_engine_manager = TenantEngineManager(
+            db_url,
+            settings,
+            is_async=True,
+            engine_kwargs={
+                "pool_timeout": settings.db_pool_timeout,
+                "pool_recycle": settings.db_pool_recycle,
+            },
+        )
     else:
         # For sync engines
         engine = create_engine(db_url, **engine_kwargs)
@@ -85,6 +104,14 @@ def init_db(
             autocommit=False, autoflush=False, bind=engine
         )
         session_factory = sync_session_factory
+        tenant_engine_manager = TenantEngineManager(
+            db_url,
+            settings,
+            engine_kwargs={
+                "pool_timeout": settings.db_pool_timeout,
+                "pool_recycle": settings.db_pool_recycle,
+            },
+        )
 
     # Schema creation for schema-based multitenancy
     if create_schemas and tenant_ids:
@@ -100,18 +127,6 @@ def init_db(
                 if not tenant_schema_exists(engine, schema_name):
                     create_tenant_schema(engine, schema_name)
 
-    # Add event listener for schema-based multitenancy for sync engines
-    if not is_async:
-
-        @event.listens_for(engine, "connect")
-        def set_search_path(dbapi_connection, connection_record):
-            tenant_id = get_current_tenant_id()
-            if tenant_id:
-                schema = get_schema_name(tenant_id, settings)
-                cursor = dbapi_connection.cursor()
-                cursor.execute(f'SET search_path TO "{schema}", public')
-                cursor.close()
-
     # Create models in the public schema
     if not is_async:
         base_model_class.metadata.create_all(engine)
@@ -123,12 +138,17 @@ def init_db(
     }
 
 
-def get_tenant_session(settings: Optional[MultitenancySettings] = None) -> Session:
+def get_tenant_session(
+    settings: Optional[MultitenancySettings] = None,
+    tenant_id: Optional[str] = None,
+) -> Session:
     """
     Get a database session for the current tenant.
 
     Args:
-        settings: Optional multitenancy settings (if not provided, uses default settings)
+        settings: Optional multitenancy settings (kept for compatibility; the
+            settings passed to init_db determine the schema)
+        tenant_id: Optional tenant ID (defaults to the current tenant)
 
     Returns:
         SQLAlchemy session with tenant context
@@ -141,26 +161,23 @@ def get_tenant_session(settings: Optional[MultitenancySettings] = None) -> Sessi
             "Database not initialized. Call init_db() before using get_tenant_session()."
         )
 
-    session = sync_session_factory()
-
-    # Set the search path for schema-based multitenancy
-    if settings:
-        tenant_id = get_current_tenant_id()
-        if tenant_id:
-            schema = get_schema_name(tenant_id, settings)
-            session.execute(text(f'SET search_path TO "{schema}", public'))
-
-    return session
+    tenant_id = tenant_id or get_current_tenant_id()
+    if tenant_id and tenant_engine_manager is not None:
+        return sync_session_factory(bind=tenant_engine_manager.get_engine(tenant_id))
+    return sync_session_factory()
 
 
 async def get_tenant_async_session(
     settings: Optional[MultitenancySettings] = None,
+    tenant_id: Optional[str] = None,
 ) -> AsyncSession:
     """
     Get an async database session for the current tenant.
 
     Args:
-        settings: Optional multitenancy settings (if not provided, uses default settings)
+        settings: Optional multitenancy settings (kept for compatibility; the
+            settings passed to init_db determine the schema)
+        tenant_id: Optional tenant ID (defaults to the current tenant)
 
     Returns:
         SQLAlchemy async session with tenant context
@@ -173,16 +190,23 @@ async def get_tenant_async_session(
             "Async database not initialized. Call init_db(is_async=True) before using get_tenant_async_session()."
         )
 
-    session = async_session_factory()
+    tenant_id = tenant_id or get_current_tenant_id()
+    if tenant_id and async_tenant_engine_manager is not None:
+        return async_session_factory(
+            bind=async_tenant_engine_manager.get_engine(tenant_id)
+        )
+    return async_session_factory()
 
-    # Set the search path for schema-based multitenancy
-    if settings:
-        tenant_id = get_current_tenant_id()
-        if tenant_id:
-            schema = get_schema_name(tenant_id, settings)
-            await session.execute(text(f'SET search_path TO "{schema}", public'))
 
-    return session
+async def close_tenant_pools() -> None:
+    """
+    Dispose all per-tenant pools, waiting for pending async disposals.
+
+    Call on application shutdown.
+    """
+    for manager in (tenant_engine_manager, async_tenant_engine_manager):
+        if manager is not None:
+            await manager.aclose()
 
 
 def tenant_db_session(func):
@@ -206,12 +230,6 @@ def tenant_db_session(func):
 
             session = get_tenant_session(settings)
             try:
-                # Ensure tenant search path is set directly on this session
-                tenant_id = get_current_tenant_id()
-                if tenant_id:
-                    schema = get_schema_name(tenant_id, settings)
-                    session.execute(text(f'SET search_path TO "{schema}", public'))
-
                 # Add session to kwargs (remove None default from decorated function)
                 kwargs["db"] = session
                 return func(*args, **kwargs)
@@ -244,14 +262,6 @@ def tenant_async_db_session(func):
 
             session = await get_tenant_async_session(settings)
             try:
-                # Ensure tenant search path is set directly on this session
-                tenant_id = get_current_tenant_id()
-                if tenant_id:
-                    schema = get_schema_name(tenant_id, settings)
-                    await session.execute(
-                        text(f'SET search_path TO "{schema}", public')
-                    )
-
                 # Add session to kwargs
                 kwargs["db"] = session
                 return await func(*args, **kwargs)
@@ -73,17 +73,9 @@ def get_tenant_db(
     Yields:
         SQLAlchemy session with tenant context
     """
-    db = get_tenant_session(settings)
-
-    # Always set the search path explicitly for the current tenant
-    # This ensures isolation between requests even with connection pooling
-    if tenant_id:
-        from sqlalchemy import text
-
-        from db_core.utils import get_schema_name
-
-        schema = get_schema_name(tenant_id, settings)
-        db.execute(text(f'SET search_path TO "{schema}", public'))
+    # The session is bound to the tenant's own pool, whose connections
+    # already use the tenant schema
+    db = get_tenant_session(settings, tenant_id=tenant_id)
 
     try:
         yield db
@@ -105,22 +97,13 @@ async def get_tenant_async_db(
     Yields:
         SQLAlchemy async session with tenant context
     """
-    db = await get_tenant_async_session(settings)
-
-    # Always set the search path explicitly for the current tenant
-    # This ensures isolation between requests even with connection pooling
-    if tenant_id:
-        from sqlalchemy import text
-
-        from db_core.utils import get_schema_name
-
-        # Handle the case where tenant_id might be a Depends object
-        if callable(tenant_id):
-            # Skip setting schema if tenant_id is a dependency
-            pass
-        else:
-            schema = get_schema_name(tenant_id, settings)
-            await db.execute(text(f'SET search_path TO "{schema}", public'))
+    # Handle the case where tenant_id might be a Depends object
+    if not isinstance(tenant_id, str):
+        tenant_id = None
+
+    # The session is bound to the tenant's own pool, whose connections
+    # already use the tenant schema
+    db = await get_tenant_async_session(settings, tenant_id=tenant_id)
 
     try:
         yield db
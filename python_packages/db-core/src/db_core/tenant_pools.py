@@ -0,0 +1,248 @@
+"""
+Per-tenant connection pools for schema-based multitenancy.
+
+Instead of issuing ``SET search_path`` every time a connection is checked out
+of a shared pool, each active tenant schema gets its own small pool whose
+connections have the search_path set once, when they are opened. Pools of
+tenants that have been idle for a while are disposed (least recently used
+first), and the number of tenant pools is limited so that the total number of
+connections stays under a global cap. Pools with checked-out connections are
+never disposed; if all of them are busy the cap is exceeded until some become
+idle.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Union
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from db_core.config import MultitenancySettings
+from db_core.utils import get_schema_name
+
+logger = logging.getLogger(__name__)
+
+AnyEngine = Union[Engine, AsyncEngine]
+
+
+def _set_search_path_on_connect(schema_name: str):
+    """Build a connect listener that pins new connections to a tenant schema."""
+
+    def set_search_path(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f'SET search_path TO "{schema_name}", public')
+        cursor.close()
+        # Commit so the setting survives the driver's implicit transaction
+        dbapi_connection.commit()
+
+    return set_search_path
+
+
+class TenantEngineManager:
+    """
+    Keeps one small connection pool per active tenant schema.
+
+    Connections are pinned to their tenant's schema when they are opened, so a
+    checkout costs no extra round-trip. Engines are created on first use, kept
+    in LRU order, and disposed once idle for longer than ``idle_timeout``
+    seconds or when a new tenant needs room under ``max_connections``. Only
+    pools without checked-out connections are disposed: when every pool is
+    busy the cap is exceeded temporarily, and the extra pools are evicted once
+    they become idle.
+    """
+
+    def __init__(
+        self,
+        db_url: str,
+        settings: MultitenancySettings,
+        is_async: bool = False,
+        pool_size: Optional[int] = None,
+        max_overflow: Optional[int] = None,
+        max_connections: Optional[int] = None,
+        idle_timeout: Optional[int] = None,
+        engine_kwargs: Optional[Dict[str, Any]] = None,
+        on_engine_created: Optional[Callable[[AnyEngine], None]] = None,
+    ):
+        """
+        Initialize the tenant engine manager.
+
+        Args:
+            db_url: Database URL shared by all tenants
+            settings: The multitenancy settings
+            is_async: Whether to create async engines
+            pool_size: Connections kept per tenant pool (defaults to settings.tenant_pool_size)
+            max_overflow: Extra connections per tenant pool (defaults to settings.tenant_pool_max_overflow)
+            max_connections: Cap on connections across all tenant pools
+                (defaults to settings.tenant_pool_max_connections)
+            idle_timeout: Seconds after which an unused tenant pool is disposed
+                (defaults to settings.tenant_pool_idle_timeout)
+            engine_kwargs: Additional keyword arguments for engine creation
+            on_engine_created: Optional callback for each new tenant engine
+                (e.g. to attach instrumentation)
+        """
+        self.db_url = db_url
+        self.settings = settings
+        self.is_async = is_async
+        self.pool_size = settings.tenant_pool_size if pool_size is None else pool_size
+        self.max_overflow = (
+            settings.tenant_pool_max_overflow if max_overflow is None else max_overflow
+        )
+        self.max_connections = (
+            settings.tenant_pool_max_connections
+            if max_connections is None
+            else max_connections
+        )
+        self.idle_timeout = (
+            settings.tenant_pool_idle_timeout if idle_timeout is None else idle_timeout
+        )
+        self.engine_kwargs = engine_kwargs or {}
+        self.on_engine_created = on_engine_created
+        self.max_pools = max(
+            1, self.max_connections // max(1, self.pool_size + self.max_overflow)
+        )
+
+        self._engines: "OrderedDict[str, AnyEngine]" = OrderedDict()
+        self._last_used: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        # Pending AsyncEngine.dispose() tasks, awaited by aclose()
+        self._dispose_tasks: "set[asyncio.Task]" = set()
+
+    def get_engine(self, tenant_id: str) -> AnyEngine:
+        """
+        Get the engine for a tenant, creating its pool on first use.
+
+        Args:
+            tenant_id: The tenant ID
+
+        Returns:
+            Engine whose connections use the tenant's schema
+        """
+        schema_name = get_schema_name(tenant_id, self.settings)
+        now = time.monotonic()
+        with self._lock:
+            engine = self._engines.get(schema_name)
+            if engine is not None:
+                self._engines.move_to_end(schema_name)
+                self._last_used[schema_name] = now
+                return engine
+
+            self._evict_idle(now)
+            while len(self._engines) >= self.max_pools:
+                if not self._evict_one():
+                    logger.warning(
+                        f"All {len(self._engines)} tenant pools are in use; "
+                        f"exceeding the limit of {self.max_pools} for schema {schema_name}"
+                    )
+                    break
+
+            engine = self._create_engine(schema_name)
+            self._engines[schema_name] = engine
+            self._last_used[schema_name] = now
+            logger.debug(
+                f"Created connection pool for schema {schema_name} "
+                f"({len(self._engines)}/{self.max_pools} tenant pools)"
+            )
+            return engine
+
+    def _create_engine(self, schema_name: str) -> AnyEngine:
+        kwargs = {
+            **self.engine_kwargs,
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+        }
+        if self.is_async:
+            engine = create_async_engine(self.db_url, **kwargs)
+            event.listen(
+                engine.sync_engine, "connect", _set_search_path_on_connect(schema_name)
+            )
+        else:
+            engine = create_engine(self.db_url, **kwargs)
+            event.listen(engine, "connect", _set_search_path_on_connect(schema_name))
+        if self.on_engine_created:
+            self.on_engine_created(engine)
+        return engine
+
+    @staticmethod
+    def _checked_out(engine: AnyEngine) -> int:
+        sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+        try:
+            return sync_engine.pool.checkedout()
+        except AttributeError:
+            return 0
+
+    def _evict_idle(self, now: float) -> None:
+        """Dispose pools not used within idle_timeout (oldest first)."""
+        for schema_name in list(self._engines):
+            if now - self._last_used[schema_name] < self.idle_timeout:
+                break
+            if self._checked_out(self._engines[schema_name]) == 0:
+                self._dispose(schema_name)
+
+    def _evict_one(self) -> bool:
+        """Dispose the least recently used idle pool; False if every pool is busy."""
+        for schema_name, engine in self._engines.items():
+            if self._checked_out(engine) == 0:
+                self._dispose(schema_name)
+                return True
+        return False
+
+    def _dispose(self, schema_name: str) -> None:
+        engine = self._engines.pop(schema_name)
+        self._last_used.pop(schema_name, None)
+        if isinstance(engine, AsyncEngine):
+            try:
+                task = asyncio.get_running_loop().create_task(engine.dispose())
+            except RuntimeError:
+                engine.sync_engine.dispose(close=False)
+            else:
+                self._dispose_tasks.add(task)
+                task.add_done_callback(self._dispose_tasks.discard)
+        else:
+            engine.dispose()
+        logger.debug(f"Disposed connection pool for schema {schema_name}")
+
+    def dispose(self, tenant_id: Optional[str] = None) -> None:
+        """
+        Dispose the pool of one tenant, or of all tenants.
+
+        Args:
+            tenant_id: The tenant ID, or None for all tenants
+        """
+        with self._lock:
+            if tenant_id is None:
+                for schema_name in list(self._engines):
+                    self._dispose(schema_name)
+                return
+            schema_name = get_schema_name(tenant_id, self.settings)
+            if schema_name in self._engines:
+                self._dispose(schema_name)
+
+    async def aclose(self) -> None:
+        """Dispose all pools and wait for pending async disposals (e.g. on shutdown)."""
+        with self._lock:
+            engines = [self._engines.pop(schema_name) for schema_name in list(self._engines)]
+            self._last_used.clear()
+        for engine in engines:
+            if isinstance(engine, AsyncEngine):
+                await engine.dispose()
+            else:
+                engine.dispose()
+        if self._dispose_tasks:
+            await asyncio.gather(*self._dispose_tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics."""
+        with self._lock:
+            return {
+                "tenant_pools": len(self._engines),
+                "max_tenant_pools": self.max_pools,
+                "checked_out": {
+                    schema_name: self._checked_out(engine)
+                    for schema_name, engine in self._engines.items()
+                },
+            }
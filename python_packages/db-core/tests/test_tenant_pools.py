@@ -0,0 +1,104 @@
+"""
+Tests for the tenant_pools module of db-core package.
+"""
+
+import pytest
+from sqlalchemy import text
+
+from db_core import MultitenancySettings
+from db_core import tenant_pools
+from db_core.tenant_pools import TenantEngineManager
+
+
+@pytest.fixture
+def connect_calls(monkeypatch):
+    """Record connect-time search_path calls instead of running SET (SQLite)."""
+    calls = []
+
+    def fake_listener(schema_name):
+        def set_search_path(dbapi_connection, connection_record):
+            calls.append(schema_name)
+
+        return set_search_path
+
+    monkeypatch.setattr(tenant_pools, "_set_search_path_on_connect", fake_listener)
+    return calls
+
+
+@pytest.fixture
+def manager(tmp_path, connect_calls):
+    """Manager with room for two tenant pools of two connections each."""
+    manager = TenantEngineManager(
+        f"sqlite:///{tmp_path}/tenants.db",
+        MultitenancySettings(),
+        pool_size=1,
+        max_overflow=1,
+        max_connections=4,
+        idle_timeout=600,
+    )
+    yield manager
+    manager.dispose()
+
+
+class TestTenantEngineManager:
+    """Tests for TenantEngineManager."""
+
+    def test_search_path_set_once_per_connection(self, manager, connect_calls):
+        """Test that repeated checkouts reuse the tenant connection without SET."""
+        engine = manager.get_engine("tenant1")
+        for _ in range(5):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+        assert connect_calls == ["tenant_tenant1"]
+
+    def test_engine_reused_per_schema(self, manager):
+        """Test that tenant IDs map to one engine per schema."""
+        assert manager.get_engine("Tenant1") is manager.get_engine("tenant1")
+        assert manager.get_engine("tenant1") is not manager.get_engine("tenant2")
+
+    def test_lru_idle_pool_evicted_at_cap(self, manager):
+        """Test that an idle pool is evicted before a busy one."""
+        manager.get_engine("tenant1")
+        busy = manager.get_engine("tenant2").connect()
+        try:
+            manager.get_engine("tenant3")
+            pools = manager.get_stats()["checked_out"]
+            assert set(pools) == {"tenant_tenant2", "tenant_tenant3"}
+            assert pools["tenant_tenant2"] == 1
+        finally:
+            busy.close()
+
+    def test_busy_pools_not_evicted_at_cap(self, manager):
+        """Test that busy pools are kept and the cap is exceeded instead."""
+        busy = [manager.get_engine(f"tenant{i}").connect() for i in (1, 2)]
+        try:
+            manager.get_engine("tenant3")
+            pools = manager.get_stats()["checked_out"]
+            assert set(pools) == {"tenant_tenant1", "tenant_tenant2", "tenant_tenant3"}
+        finally:
+            for conn in busy:
+                conn.close()
+
+        # Back under the cap once the busy pools are idle again
+        manager.get_engine("tenant4")
+        assert manager.get_stats()["tenant_pools"] == 2
+
+    def test_idle_timeout(self, manager):
+        """Test that pools idle past the timeout are disposed."""
+        manager.idle_timeout = 0
+        manager.get_engine("tenant1")
+        manager.get_engine("tenant2")
+
+        assert list(manager.get_stats()["checked_out"]) == ["tenant_tenant2"]
+
+    def test_dispose(self, manager):
+        """Test disposing one tenant and all tenants."""
+        manager.get_engine("tenant1")
+        manager.get_engine("tenant2")
+
+        manager.dispose("tenant1")
+        assert list(manager.get_stats()["checked_out"]) == ["tenant_tenant2"]
+
+        manager.dispose()
+        assert manager.get_stats()["tenant_pools"] == 0
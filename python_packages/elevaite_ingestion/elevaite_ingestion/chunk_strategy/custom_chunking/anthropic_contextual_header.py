@@ -1,4 +1,5 @@
-from typing import List, Dict
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
 from langchain_core.prompts import (
     ChatPromptTemplate,
     HumanMessagePromptTemplate,
@@ -7,8 +8,15 @@ from langchain_core.prompts import (
 from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
 import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+
+from elevaite_ingestion.utils.logger import get_logger
 
 load_dotenv()
+logger = get_logger(__name__)
 
 # Anthropic-style context prompt
 context_prompt = PromptTemplate(
@@ -25,80 +33,225 @@ Please give a short succinct context to situate this chunk within the overall do
 
 human_prompt = HumanMessagePromptTemplate(prompt=context_prompt)
 anthropic_prompt_template = ChatPromptTemplate.from_messages([human_prompt])
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
+HEADER_MODEL = "gpt-4o-mini"
+llm = ChatOpenAI(model=HEADER_MODEL, temperature=0.3)
 
+# Max in-flight header requests per document
+HEADER_CONCURRENCY = int(os.getenv("CONTEXTUAL_HEADER_CONCURRENCY", 8))
+HEADER_TIMEOUT_SECONDS = float(os.getenv("CONTEXTUAL_HEADER_TIMEOUT", 30))
+# Optional SQLite file that keeps headers across runs; in memory only when unset
+HEADER_CACHE_PATH = os.getenv("CONTEXTUAL_HEADER_CACHE_PATH") or None
+# Max headers kept in memory (least recently used are evicted first)
+HEADER_CACHE_SIZE = int(os.getenv("CONTEXTUAL_HEADER_CACHE_SIZE", 10000))
+
+FAILED_PREFIX = "Header Generation Failed"
+
+
+class HeaderCache:
+    """Generated headers keyed by (document hash, page window, chunk hash).
+
+    The most recently used `max_size` entries are kept in memory. When a path
+    is configured they are also stored in a small SQLite file, so unchanged
+    chunks do not call the LLM again on later runs.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_size: int = HEADER_CACHE_SIZE):
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._max_size = max(1, max_size)
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            try:
+                self._conn = sqlite3.connect(path, check_same_thread=False)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS headers (key TEXT PRIMARY KEY, header TEXT)"
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Header cache disabled for {path}: {e}")
+                self._conn = None
+
+    @staticmethod
+    def make_key(
+        document_hash: str, page_window: Tuple[int, ...], chunk_text: str
+    ) -> str:
+        chunk_hash = hashlib.sha256(chunk_text.encode("utf-8")).hexdigest()
+        window = ",".join(str(page) for page in page_window)
+        return hashlib.sha256(
+            f"{HEADER_MODEL}|{document_hash}|{window}|{chunk_hash}".encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+            if self._conn is None:
+                return None
+            row = self._conn.execute(
+                "SELECT header FROM headers WHERE key = ?", (key,)
+            ).fetchone()
+            if row:
+                self._remember(key, row[0])
+                return row[0]
+        return None
+
+    def _remember(self, key: str, header: str):
+        self._memory[key] = header
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_size:
+            self._memory.popitem(last=False)
+
+    def set(self, key: str, header: str):
+        with self._lock:
+            self._remember(key, header)
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO headers (key, header) VALUES (?, ?)",
+                    (key, header),
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Failed to persist contextual header: {e}")
+
+
+header_cache = HeaderCache(HEADER_CACHE_PATH)
+
+
+class PageIndex:
+    """Paragraph texts grouped by page, built once per document."""
+
+    def __init__(self, full_paragraphs: List[Dict], total_pages: int):
+        self.total_pages = total_pages
+        self.error: Optional[str] = None
+        self.pages: Dict[int, List[str]] = {}
 
-def generate_contextual_header(
-    chunk: Dict, full_paragraphs: List[Dict], total_pages: int
-) -> str:
-    try:
-        # Validate document structure first
         if not full_paragraphs:
-            return "Header Generation Failed: Empty document"
-        if any(p["page_no"] < 1 for p in full_paragraphs):
-            return "Header Generation Failed: Invalid page numbers"
+            self.error = f"{FAILED_PREFIX}: Empty document"
+            return
+        for p in full_paragraphs:
+            if p["page_no"] < 1:
+                self.error = f"{FAILED_PREFIX}: Invalid page numbers"
+                return
+            self.pages.setdefault(p["page_no"], []).append(p["paragraph_text"])
 
-        chunk_pages = set(chunk["page_range"])
-        buffer_pages = set()
+        # The first page goes into every prompt, so its hash stands in for the document
+        self.document_hash = hashlib.sha256(
+            "\n".join(self.pages.get(1, [])).encode("utf-8")
+        ).hexdigest()
 
-        # Clamp pages to valid range using total_pages
-        for pg in chunk_pages:
-            buffer_pages.update({max(1, pg - 1), pg, min(total_pages, pg + 1)})
+    def page_window(self, chunk: Dict) -> Tuple[int, ...]:
+        """Chunk pages plus one page either side, clamped to the document."""
+        buffer_pages = set()
+        for pg in set(chunk["page_range"]):
+            buffer_pages.update({max(1, pg - 1), pg, min(self.total_pages, pg + 1)})
+        return tuple(sorted(buffer_pages))
 
+    def context_for(self, page_window: Tuple[int, ...]) -> str:
         surrounding_paragraphs = [
-            p["paragraph_text"] for p in full_paragraphs if p["page_no"] in buffer_pages
+            text for page in page_window for text in self.pages.get(page, [])
         ]
+        return " ".join(self.pages.get(1, []) + surrounding_paragraphs)
 
-        first_page_paragraphs = [
-            p["paragraph_text"] for p in full_paragraphs if p["page_no"] == 1
-        ]
 
-        whole_context = " ".join(first_page_paragraphs + surrounding_paragraphs)
-        chunk_text = chunk["chunk_text"]
+def _prepare(chunk: Dict, page_index: PageIndex):
+    """Return (cache key, prompt messages) for a chunk."""
+    page_window = page_index.page_window(chunk)
+    whole_context = page_index.context_for(page_window)
+    # The window's own text is part of the key, so edits near the chunk invalidate it
+    window_hash = hashlib.sha256(whole_context.encode("utf-8")).hexdigest()
+    key = header_cache.make_key(
+        f"{page_index.document_hash}:{window_hash}", page_window, chunk["chunk_text"]
+    )
+    prompt_input = anthropic_prompt_template.format_messages(
+        WHOLE_DOCUMENT=whole_context, CHUNK_CONTENT=chunk["chunk_text"]
+    )
+    return key, prompt_input
 
-        prompt_input = anthropic_prompt_template.format_messages(
-            WHOLE_DOCUMENT=whole_context, CHUNK_CONTENT=chunk_text
-        )
 
-        response = llm(prompt_input)
-        return response.content.strip()
+def generate_contextual_header(
+    chunk: Dict,
+    full_paragraphs: List[Dict],
+    total_pages: int,
+    page_index: Optional[PageIndex] = None,
+) -> str:
+    try:
+        page_index = page_index or PageIndex(full_paragraphs, total_pages)
+        if page_index.error:
+            return page_index.error
+
+        key, prompt_input = _prepare(chunk, page_index)
+        cached = header_cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = llm.invoke(prompt_input)
+        header = response.content.strip()
+        header_cache.set(key, header)
+        return header
     except Exception as e:
-        return f"Header Generation Failed: {e}"
+        return f"{FAILED_PREFIX}: {e}"
 
 
 async def generate_contextual_header_async(
-    chunk: Dict, full_paragraphs: List[Dict], total_pages: int
+    chunk: Dict,
+    full_paragraphs: List[Dict],
+    total_pages: int,
+    page_index: Optional[PageIndex] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
 ) -> str:
     try:
-        if not full_paragraphs:
-            return "Header Generation Failed: Empty document"
-        if any(p["page_no"] < 1 for p in full_paragraphs):
-            return "Header Generation Failed: Invalid page numbers"
-
-        chunk_pages = set(chunk["page_range"])
-        buffer_pages = set()
+        page_index = page_index or PageIndex(full_paragraphs, total_pages)
+        if page_index.error:
+            return page_index.error
 
-        for pg in chunk_pages:
-            buffer_pages.update({max(1, pg - 1), pg, min(total_pages, pg + 1)})
+        key, prompt_input = _prepare(chunk, page_index)
+        cached = header_cache.get(key)
+        if cached is not None:
+            return cached
 
-        surrounding_paragraphs = [
-            p["paragraph_text"] for p in full_paragraphs if p["page_no"] in buffer_pages
-        ]
+        if semaphore is None:
+            response = await asyncio.wait_for(
+                llm.ainvoke(prompt_input), timeout=HEADER_TIMEOUT_SECONDS
+            )
+        else:
+            async with semaphore:
+                response = await asyncio.wait_for(
+                    llm.ainvoke(prompt_input), timeout=HEADER_TIMEOUT_SECONDS
+                )
+        header = response.content.strip()
+        header_cache.set(key, header)
+        return header
+    except asyncio.TimeoutError:
+        return f"{FAILED_PREFIX}: Timeout"
+    except Exception as e:
+        return f"{FAILED_PREFIX}: {e}"
 
-        first_page_paragraphs = [
-            p["paragraph_text"] for p in full_paragraphs if p["page_no"] == 1
-        ]
 
-        whole_context = " ".join(first_page_paragraphs + surrounding_paragraphs)
-        chunk_text = chunk["chunk_text"]
+async def generate_contextual_headers(
+    chunks: List[Dict],
+    full_paragraphs: List[Dict],
+    total_pages: int,
+    max_concurrency: int = HEADER_CONCURRENCY,
+) -> List[str]:
+    """Generate headers for all chunks of one document.
 
-        prompt_input = anthropic_prompt_template.format_messages(
-            WHOLE_DOCUMENT=whole_context, CHUNK_CONTENT=chunk_text
-        )
+    The page index is built once, cached headers are reused and at most
+    `max_concurrency` LLM requests are in flight at a time.
+    """
+    page_index = PageIndex(full_paragraphs, total_pages)
+    if page_index.error:
+        return [page_index.error] * len(chunks)
 
-        response = await asyncio.wait_for(llm.ainvoke(prompt_input), timeout=30)
-        return response.content.strip()
-    except asyncio.TimeoutError:
-        return "Header Generation Failed: Timeout"
-    except Exception as e:
-        return f"Header Generation Failed: {e}"
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    headers = await asyncio.gather(
+        *[
+            generate_contextual_header_async(
+                chunk, full_paragraphs, total_pages, page_index, semaphore
+            )
+            for chunk in chunks
+        ]
+    )
+    return headers
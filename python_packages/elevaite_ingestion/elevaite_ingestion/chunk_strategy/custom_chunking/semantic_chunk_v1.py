@@ -1,12 +1,11 @@
+import os
 import uuid
 import numpy as np
 from typing import List, Dict, Tuple, Literal
-from langchain_community.utils.math import cosine_similarity
-from .anthropic_contextual_header import generate_contextual_header_async
+from .anthropic_contextual_header import generate_contextual_headers
 from dotenv import load_dotenv
 from langchain_openai import OpenAIEmbeddings
 from tiktoken import encoding_for_model
-import asyncio
 import logging
 
 load_dotenv()
@@ -29,18 +28,59 @@ def combine_paragraphs(paragraphs: List[Dict], buffer_size: int = 1) -> List[Dic
 # ---------------------------
 # Step 2: Compute Similarity
 # ---------------------------
-def calculate_cosine_distances(
-    paragraphs: List[Dict],
-) -> Tuple[List[float], List[Dict]]:
-    distances = []
-    for i in range(len(paragraphs) - 1):
-        emb1 = paragraphs[i]["combined_embedding"]
-        emb2 = paragraphs[i + 1]["combined_embedding"]
-        sim = cosine_similarity([emb1], [emb2])[0][0]
-        distance = 1 - sim
-        distances.append(distance)
-        paragraphs[i]["distance_to_next"] = distance
-    return distances, paragraphs
+def adjacent_cosine_distances(embeddings: np.ndarray) -> np.ndarray:
+    """Cosine distance between each row and the next, computed on the whole matrix."""
+    if len(embeddings) < 2:
+        return np.empty(0, dtype=np.float64)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    normalized = embeddings / np.where(norms == 0, 1.0, norms)
+    # Row-wise dot products of the matrix and itself shifted by one
+    return 1.0 - np.einsum("ij,ij->i", normalized[:-1], normalized[1:])
+
+
+def find_breakpoints(
+    distances: np.ndarray, threshold_type: str, threshold_value: float
+) -> np.ndarray:
+    """Indices after which a new chunk starts, computed in one pass."""
+    if len(distances) == 0:
+        return np.empty(0, dtype=int)
+    if threshold_type == "percentile":
+        threshold = np.percentile(distances, threshold_value)
+    elif threshold_type == "standard_deviation":
+        threshold = np.mean(distances) + threshold_value * np.std(distances)
+    else:
+        raise ValueError("Unsupported threshold type")
+    return np.flatnonzero(distances > threshold)
+
+
+# ---------------------------
+# Step 3: Embed in provider-sized batches
+# ---------------------------
+# OpenAI embedding limits: 2048 inputs and 300k tokens per request
+EMBEDDING_MAX_BATCH_INPUTS = int(os.getenv("EMBEDDING_MAX_BATCH_INPUTS", 2048))
+EMBEDDING_MAX_BATCH_TOKENS = int(os.getenv("EMBEDDING_MAX_BATCH_TOKENS", 250_000))
+
+
+def token_budget_batches(
+    texts: List[str],
+    token_counts: List[int],
+    max_inputs: int = EMBEDDING_MAX_BATCH_INPUTS,
+    max_tokens: int = EMBEDDING_MAX_BATCH_TOKENS,
+) -> List[Tuple[int, int]]:
+    """Split texts into (start, end) batches that stay within the provider limits."""
+    batches = []
+    start = 0
+    batch_tokens = 0
+    for i, tokens in enumerate(token_counts):
+        if i > start and (
+            i - start >= max_inputs or batch_tokens + tokens > max_tokens
+        ):
+            batches.append((start, i))
+            start, batch_tokens = i, 0
+        batch_tokens += tokens
+    if start < len(texts):
+        batches.append((start, len(texts)))
+    return batches
 
 
 BreakpointThresholdType = Literal["percentile", "standard_deviation"]
@@ -52,7 +92,7 @@ async def chunk_text(parsed_data: Dict, chunking_params: Dict) -> List[Dict]:
         return []
 
     embedding_model = OpenAIEmbeddings(model="text-embedding-3-small")
-    encoding_for_model("text-embedding-3-small")
+    encoding = encoding_for_model("text-embedding-3-small")
 
     buffer_size = chunking_params.get("buffer_size", 1)
     threshold_type = chunking_params.get("breakpoint_threshold_type", "percentile")
@@ -72,28 +112,20 @@ async def chunk_text(parsed_data: Dict, chunking_params: Dict) -> List[Dict]:
     paragraphs = combine_paragraphs(paragraphs, buffer_size)
     combined_texts = [p["combined_text"] for p in paragraphs]
 
-    # Batching for embeddings
-    batch_size = 50
+    # Batch by the provider's input and token limits rather than a fixed size
+    token_counts = [len(t) for t in encoding.encode_batch(combined_texts)]
     combined_embeddings = []
-    for i in range(0, len(combined_texts), batch_size):
-        batch = combined_texts[i : i + batch_size]
-        combined_embeddings.extend(embedding_model.embed_documents(batch))
-
-    for idx, emb in enumerate(combined_embeddings):
-        paragraphs[idx]["combined_embedding"] = emb
-
-    distances, paragraphs = calculate_cosine_distances(paragraphs)
+    for start, end in token_budget_batches(combined_texts, token_counts):
+        combined_embeddings.extend(
+            embedding_model.embed_documents(combined_texts[start:end])
+        )
 
-    if threshold_type == "percentile":
-        threshold = np.percentile(distances, threshold_value)
-    elif threshold_type == "standard_deviation":
-        threshold = np.mean(distances) + threshold_value * np.std(distances)
-    else:
-        raise ValueError("Unsupported threshold type")
+    distances = adjacent_cosine_distances(
+        np.asarray(combined_embeddings, dtype=np.float64)
+    )
+    breakpoints = find_breakpoints(distances, threshold_type, threshold_value)
 
     chunk_list = []
-    start = 0
-    indices_above_threshold = [i for i, d in enumerate(distances) if d > threshold]
 
     def create_chunk_obj(group):
         # if not group:
@@ -110,8 +142,7 @@ async def chunk_text(parsed_data: Dict, chunking_params: Dict) -> List[Dict]:
         }
         return chunk_obj
 
-    for idx in indices_above_threshold:
-        group = paragraphs[start : idx + 1]
+    def split_by_size(group):
         chunk_text_str = ""
         current_group = []
 
@@ -128,33 +159,15 @@ async def chunk_text(parsed_data: Dict, chunking_params: Dict) -> List[Dict]:
         if current_group:
             chunk_list.append(create_chunk_obj(current_group))
 
-        start = idx + 1
-
-    if start < len(paragraphs):
-        group = paragraphs[start:]
-        chunk_text_str = ""
-        current_group = []
-
-        for p in group:
-            if len(chunk_text_str) + len(p["paragraph_text"]) > max_chunk_size:
-                if current_group:
-                    chunk_list.append(create_chunk_obj(current_group))
-                chunk_text_str = p["paragraph_text"]
-                current_group = [p]
-            else:
-                chunk_text_str += " " + p["paragraph_text"]
-                current_group.append(p)
-
-        if current_group:
-            chunk_list.append(create_chunk_obj(current_group))
+    # Semantic groups are the slices between consecutive breakpoints
+    bounds = [0, *(int(idx) + 1 for idx in breakpoints)]
+    if bounds[-1] < len(paragraphs):
+        bounds.append(len(paragraphs))
+    for start, end in zip(bounds, bounds[1:]):
+        split_by_size(paragraphs[start:end])
 
     # --- FIX: Pass total_pages to header generation ---
-    headers = await asyncio.gather(
-        *[
-            generate_contextual_header_async(chunk, paragraphs, total_pages)
-            for chunk in chunk_list
-        ]
-    )
+    headers = await generate_contextual_headers(chunk_list, paragraphs, total_pages)
     for i, header in enumerate(headers):
         chunk_list[i]["contextual_header"] = header
 
@@ -66,6 +66,29 @@ class VectorDBConfig:
     settings: dict = field(default_factory=dict)
 
 
+@dataclass
+class StreamingConfig:
+    """In-process streaming mode configuration (parse -> chunk -> embed -> vector DB)."""
+
+    enabled: bool = False
+    queue_size: int = 64  # Max items buffered between two stages
+    parse_concurrency: int = 4
+    chunk_concurrency: int = 4
+    embed_concurrency: int = 8
+    upsert_concurrency: int = 4
+
+
+@dataclass
+class ManifestConfig:
+    """Incremental ingestion manifest configuration."""
+
+    # Skip unchanged sources/chunks and delete stale vectors. Opt-in: vector IDs
+    # become content hashes, so enable it only on an empty index/collection.
+    enabled: bool = False
+    # Defaults to one manifest per vector DB collection/index
+    prefix: Optional[str] = None
+
+
 @dataclass
 class PipelineConfig:
     """
@@ -80,6 +103,8 @@ class PipelineConfig:
     chunker: ChunkerConfig = field(default_factory=ChunkerConfig)
     embedder: EmbedderConfig = field(default_factory=EmbedderConfig)
     vector_db: VectorDBConfig = field(default_factory=VectorDBConfig)
+    streaming: StreamingConfig = field(default_factory=StreamingConfig)
+    manifest: ManifestConfig = field(default_factory=ManifestConfig)
 
     @classmethod
     def from_dict(cls, data: dict) -> "PipelineConfig":
@@ -97,6 +122,8 @@ class PipelineConfig:
         chunker_data = data.get("chunker", {})
         embedder_data = data.get("embedder", {})
         vector_db_data = data.get("vector_db", {})
+        streaming_data = data.get("streaming", {})
+        manifest_data = data.get("manifest", {})
 
         return cls(
             aws=AWSConfig(
@@ -129,6 +156,18 @@ class PipelineConfig:
                 collection_name=vector_db_data.get("collection_name"),
                 settings=vector_db_data.get("settings", {}),
             ),
+            streaming=StreamingConfig(
+                enabled=streaming_data.get("enabled", False),
+                queue_size=streaming_data.get("queue_size", 64),
+                parse_concurrency=streaming_data.get("parse_concurrency", 4),
+                chunk_concurrency=streaming_data.get("chunk_concurrency", 4),
+                embed_concurrency=streaming_data.get("embed_concurrency", 8),
+                upsert_concurrency=streaming_data.get("upsert_concurrency", 4),
+            ),
+            manifest=ManifestConfig(
+                enabled=manifest_data.get("enabled", False),
+                prefix=manifest_data.get("prefix"),
+            ),
         )
 
     def to_dict(self) -> dict:
@@ -163,4 +202,16 @@ class PipelineConfig:
                 "collection_name": self.vector_db.collection_name,
                 "settings": self.vector_db.settings,
             },
+            "streaming": {
+                "enabled": self.streaming.enabled,
+                "queue_size": self.streaming.queue_size,
+                "parse_concurrency": self.streaming.parse_concurrency,
+                "chunk_concurrency": self.streaming.chunk_concurrency,
+                "embed_concurrency": self.streaming.embed_concurrency,
+                "upsert_concurrency": self.streaming.upsert_concurrency,
+            },
+            "manifest": {
+                "enabled": self.manifest.enabled,
+                "prefix": self.manifest.prefix,
+            },
         }
@@ -1,8 +1,27 @@
 import fitz
+import os
 import re
-from typing import List, Dict
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Tuple
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
+from elevaite_ingestion.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Page-level parallelism for large PDFs. Text extraction and splitting are
+# CPU-bound and hold the GIL, so page ranges are spread over worker processes.
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 40))
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", 20))
+PDF_PARSE_PROCESSES = int(os.getenv("PDF_PARSE_PROCESSES", os.cpu_count() or 1))
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+_worker_parser = None
+
 
 class ParagraphDocument:
     """Represents a paragraph in a PDF with metadata."""
@@ -48,6 +67,39 @@ class PdfParser:
         text = self.clean_text(text)
         return self.text_splitter.split_text(text)
 
+    def extract_pages(self, doc, start: int, end: int) -> List[Tuple[int, List[str]]]:
+        """Split pages [start, end) of an open document into paragraphs.
+
+        Returns:
+            list: (page_no, paragraphs) for every page with text, in page order.
+        """
+        pages = []
+        for page_num in range(start, end):
+            text = doc[page_num].get_text("text").strip()
+            if text:
+                pages.append((page_num + 1, self.split_into_paragraphs(text)))
+        return pages
+
+    def _extract_pages_parallel(
+        self, file_path: str, page_count: int
+    ) -> List[Tuple[int, List[str]]]:
+        """Extract pages in the process pool; results are merged back in page order."""
+        ranges = split_page_ranges(page_count, PDF_PAGES_PER_TASK)
+        try:
+            pool = _get_process_pool()
+            futures = [
+                pool.submit(_parse_page_range, file_path, start, end)
+                for start, end in ranges
+            ]
+            return [page for future in futures for page in future.result()]
+        except BrokenProcessPool as e:
+            logger.warning(
+                f"⚠️ PDF process pool failed ({e}); parsing {file_path} in-process."
+            )
+            _reset_process_pool()
+            with fitz.open(file_path) as doc:
+                return self.extract_pages(doc, 0, page_count)
+
     def parse(self, file_path: str, original_filename: str) -> Dict:
         """
         Parses a PDF file and extracts paragraphs with metadata.
@@ -60,26 +112,31 @@ class PdfParser:
             dict: Extracted content with paragraph metadata.
         """
         try:
-            doc = fitz.open(file_path)
+            with fitz.open(file_path) as doc:
+                page_count = len(doc)
+                parallel = (
+                    PDF_PARSE_PROCESSES > 1 and page_count >= PDF_PARALLEL_MIN_PAGES
+                )
+                if not parallel:
+                    pages = self.extract_pages(doc, 0, page_count)
+
+            if parallel:
+                pages = self._extract_pages_parallel(file_path, page_count)
+
             extracted_paragraphs = []
             paragraph_count = 1
 
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                text = page.get_text("text").strip()
-
-                if text:
-                    paragraphs = self.split_into_paragraphs(text)
-                    for paragraph_text in paragraphs:
-                        extracted_paragraphs.append(
-                            ParagraphDocument(
-                                paragraph_text,
-                                page_num + 1,
-                                paragraph_count,
-                                original_filename,
-                            )
+            for page_no, paragraphs in pages:
+                for paragraph_text in paragraphs:
+                    extracted_paragraphs.append(
+                        ParagraphDocument(
+                            paragraph_text,
+                            page_no,
+                            paragraph_count,
+                            original_filename,
                         )
-                        paragraph_count += 1
+                    )
+                    paragraph_count += 1
 
             if not extracted_paragraphs:
                 raise ValueError(f"No extractable content found in {file_path}")
@@ -94,3 +151,42 @@ class PdfParser:
 
         except Exception as e:
             raise Exception(f"Failed to parse PDF file: {file_path}. Error: {e}")
+
+
+def split_page_ranges(page_count: int, pages_per_task: int) -> List[Tuple[int, int]]:
+    """Split [0, page_count) into consecutive (start, end) ranges."""
+    pages_per_task = max(1, pages_per_task)
+    return [
+        (start, min(start + pages_per_task, page_count))
+        for start in range(0, page_count, pages_per_task)
+    ]
+
+
+def _parse_page_range(file_path: str, start: int, end: int):
+    """Process pool task: open the PDF by path and extract pages [start, end)."""
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = PdfParser()
+    with fitz.open(file_path) as doc:
+        return _worker_parser.extract_pages(doc, start, end)
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Process pool shared by all parses in this process, created on first use."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            # spawn: the parse stage runs parsers from threads, where fork is unsafe
+            _process_pool = ProcessPoolExecutor(
+                max_workers=PDF_PARSE_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pool
+
+
+def _reset_process_pool():
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False)
+        _process_pool = None
@@ -12,6 +12,8 @@ from elevaite_ingestion.config.pipeline_config import PipelineConfig
 from elevaite_ingestion.config.load_config import LOADING_CONFIG
 from elevaite_ingestion.config.aws_config import AWS_CONFIG
 from elevaite_ingestion.utils.logger import get_logger
+from elevaite_ingestion.utils.ingestion_manifest import DEFAULT_MANIFEST_PREFIX
+from elevaite_ingestion.utils.s3_utils import iter_s3_objects
 from elevaite_ingestion.stage.chunk_stage.chunk_pipeline import execute_chunking_stage
 
 load_dotenv()
@@ -31,11 +33,10 @@ def clean_s3_bucket_name(bucket_name):
 def list_s3_files(bucket_name, prefix=""):
     try:
         bucket_name = clean_s3_bucket_name(bucket_name)
-        response = s3_client.list_objects_v2(Bucket=bucket_name, Prefix=prefix)
-        if "Contents" not in response:
-            return []
         return [
-            obj["Key"] for obj in response["Contents"] if obj["Key"].endswith(".json")
+            obj["key"]
+            for obj in iter_s3_objects(bucket_name, prefix, client=s3_client)
+            if obj["key"].endswith(".json")
         ]
     except Exception as e:
         logger.error(f"Error listing files from {bucket_name}: {e}")
@@ -77,7 +78,12 @@ async def execute_chunking_pipeline(config: Optional[PipelineConfig] = None) ->
         return {"error": "Invalid mode. This script supports S3 only."}
 
     intermediate_bucket_clean = clean_s3_bucket_name(intermediate_bucket)
-    parsed_files = list_s3_files(intermediate_bucket_clean)
+    manifest_prefix = config.manifest.prefix if config else DEFAULT_MANIFEST_PREFIX
+    parsed_files = [
+        key
+        for key in list_s3_files(intermediate_bucket_clean)
+        if not key.startswith(manifest_prefix)
+    ]
 
     if not parsed_files:
         logger.error("No parsed files found in S3. Aborting chunking stage.")
@@ -12,6 +12,7 @@ from elevaite_ingestion.config.chunker_config import CHUNKER_CONFIG
 from elevaite_ingestion.config.aws_config import AWS_CONFIG
 from elevaite_ingestion.utils.logger import get_logger
 from elevaite_ingestion.utils.s3_utils import fetch_json_from_s3
+from elevaite_ingestion.utils.ingestion_manifest import IngestionManifest, chunk_hash
 
 load_dotenv()
 logger = get_logger(__name__)
@@ -75,7 +76,12 @@ def load_chunking_function(config: Optional[PipelineConfig] = None):
 
 
 async def process_single_file(
-    file_key, chunk_text, chunking_params, output_s3_bucket, output_s3_prefix
+    file_key,
+    chunk_text,
+    chunking_params,
+    output_s3_bucket,
+    output_s3_prefix,
+    manifest: Optional[IngestionManifest] = None,
 ):
     parsed_content = fetch_json_from_s3(output_s3_bucket, file_key)
     event_result = {
@@ -89,6 +95,16 @@ async def process_single_file(
         return event_result
 
     filename = parsed_content.get("filename", file_key)
+    source_key = parsed_content.get("source_key")
+    source_version = parsed_content.get("source_version")
+
+    if manifest and source_key:
+        record = manifest.load(source_key)
+        if not manifest.is_pending(record, source_version):
+            # Unchanged since the last ingestion, or superseded by a newer version
+            logger.info(f"⏭️ Skipping {file_key}: nothing new to chunk.")
+            event_result["status"] = "Skipped"
+            return event_result
 
     if "paragraphs" in parsed_content:
         logger.info(f"📄 Processing PDF Chunking: {filename}")
@@ -114,6 +130,10 @@ async def process_single_file(
         return event_result
 
     for i, chunk in enumerate(chunks):
+        if source_key:
+            chunk["chunk_hash"] = chunk_hash(chunk)
+            chunk["source_key"] = source_key
+            chunk["source_version"] = source_version
         chunk["filename"] = filename
         chunk_key = f"{output_s3_prefix}{filename}_chunk_{i + 1}.json"
         chunk_data = json.dumps(chunk, indent=4, ensure_ascii=False)
@@ -133,6 +153,9 @@ async def process_single_file(
             event_result["status"] = f"Failed - S3 Upload error: {e}"
             return event_result
 
+    if manifest and source_key:
+        manifest.set_pending_chunks(source_key, [c["chunk_hash"] for c in chunks])
+
     event_result.update(
         {
             "output_url": f"s3://{output_s3_bucket}/{output_s3_prefix}{filename}_chunk_*.json",
@@ -169,6 +192,10 @@ async def execute_chunking_stage(
 
     create_s3_folder(output_s3_bucket, output_s3_prefix)
 
+    manifest = None
+    if config is not None and config.manifest.enabled:
+        manifest = IngestionManifest.for_config(config, mode="s3")
+
     pipeline_status = {
         "STAGE_3: CHUNKING": {
             "DATA_SOURCE": mode,
@@ -189,11 +216,12 @@ async def execute_chunking_stage(
                 chunking_params,
                 output_s3_bucket,
                 output_s3_prefix,
+                manifest,
             )
             pipeline_status["STAGE_3: CHUNKING"]["EVENT_DETAILS"].append(result)
 
         all_success = all(
-            e["status"].startswith("Success")
+            e["status"].startswith(("Success", "Skipped"))
             for e in pipeline_status["STAGE_3: CHUNKING"]["EVENT_DETAILS"]
         )
         pipeline_status["STAGE_3: CHUNKING"]["STATUS"] = (
@@ -206,6 +234,9 @@ async def execute_chunking_stage(
             {"input": "All parsed files", "status": f"Failed - {e}"}
         )
 
+    if manifest:
+        manifest.flush()
+
     json_output = json.dumps(pipeline_status, indent=4)
     logger.info(f"📌 Pipeline Execution Summary (CHUNKING):\n{json_output}")
 
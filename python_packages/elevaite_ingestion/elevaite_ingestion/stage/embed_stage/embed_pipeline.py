@@ -10,6 +10,7 @@ from elevaite_ingestion.config.pipeline_config import PipelineConfig
 from elevaite_ingestion.config.aws_config import AWS_CONFIG
 from elevaite_ingestion.config.embedder_config import EMBEDDER_CONFIG, get_embedder
 from elevaite_ingestion.utils.logger import get_logger
+from elevaite_ingestion.utils.ingestion_manifest import IngestionManifest, vector_id_for
 from elevaite_ingestion.utils.s3_utils import (
     list_s3_files,
     fetch_json_from_s3,
@@ -35,12 +36,55 @@ def _get_embedding_function(config: Optional[PipelineConfig] = None) -> Callable
     return get_embedding
 
 
+def build_embedding_output(
+    chunk_data: dict, get_embedding_fn: Callable, model: Optional[str] = None
+) -> dict:
+    """Embed one chunk and return the embedding record stored for the vector DB stage.
+
+    Args:
+        chunk_data: Chunk dictionary with at least 'chunk_text'
+        get_embedding_fn: Function to generate embeddings
+        model: Optional embedding model name
+    """
+    contextual_header = chunk_data.get("contextual_header", "NA")
+    chunk_content = chunk_data["chunk_text"]
+
+    embedding_vector = get_embedding_fn(chunk_content + contextual_header, model=model)
+
+    embedding_output = {
+        "chunk_id": chunk_data.get("chunk_id", "UNKNOWN"),
+        "contextual_header": contextual_header,
+        "chunk_text": chunk_content,
+        "filename": chunk_data.get("filename", "unknown_file"),
+        "page_range": chunk_data.get("page_range", "NA"),
+        "start_paragraph": chunk_data.get("start_paragraph", "UNKNOWN"),
+        "end_paragraph": chunk_data.get("end_paragraph", "UNKNOWN"),
+        "chunk_embedding": embedding_vector,
+    }
+
+    # Manifest-tracked chunks keep their source and get a deterministic vector ID
+    if chunk_data.get("source_key") and chunk_data.get("chunk_hash"):
+        embedding_output.update(
+            {
+                "source_key": chunk_data["source_key"],
+                "source_version": chunk_data.get("source_version"),
+                "chunk_hash": chunk_data["chunk_hash"],
+                "vector_id": vector_id_for(
+                    chunk_data["source_key"], chunk_data["chunk_hash"]
+                ),
+            }
+        )
+
+    return embedding_output
+
+
 def process_single_chunk(
     chunk_key,
     input_s3_bucket,
     output_s3_prefix,
     get_embedding_fn: Callable,
     model: Optional[str] = None,
+    manifest: Optional[IngestionManifest] = None,
 ):
     """Process a single chunk and generate embeddings.
 
@@ -50,34 +94,32 @@ def process_single_chunk(
         output_s3_prefix: Output prefix for embeddings
         get_embedding_fn: Function to generate embeddings
         model: Optional embedding model name
+        manifest: Optional IngestionManifest; chunks with a stored vector are skipped
     """
     try:
         chunk_data = fetch_json_from_s3(input_s3_bucket, chunk_key)
         if not chunk_data or "chunk_text" not in chunk_data:
             raise ValueError(f"Missing 'chunk_text' in {chunk_key}")
 
-        chunk_id = chunk_data.get("chunk_id", "UNKNOWN")
-        contextual_header = chunk_data.get("contextual_header", "NA")
-        chunk_content = chunk_data["chunk_text"]
-        filename = chunk_data.get("filename", "unknown_file")
-        page_no = chunk_data.get("page_range", "NA")
-        start_paragraph = chunk_data.get("start_paragraph", "UNKNOWN")
-        end_paragraph = chunk_data.get("end_paragraph", "UNKNOWN")
-
-        embedding_vector = get_embedding_fn(
-            chunk_content + contextual_header, model=model
-        )
-
-        embedding_output = {
-            "chunk_id": chunk_id,
-            "contextual_header": contextual_header,
-            "chunk_text": chunk_content,
-            "filename": filename,
-            "page_range": page_no,
-            "start_paragraph": start_paragraph,
-            "end_paragraph": end_paragraph,
-            "chunk_embedding": embedding_vector,
-        }
+        source_key = chunk_data.get("source_key")
+        if manifest and source_key:
+            record = manifest.load(source_key)
+            if not manifest.is_pending(record, chunk_data.get("source_version")):
+                return {
+                    "input": f"s3://{input_s3_bucket}/{chunk_key}",
+                    "status": "Skipped",
+                }
+            if chunk_data.get("chunk_hash") in record.get("chunks", {}):
+                return {
+                    "input": f"s3://{input_s3_bucket}/{chunk_key}",
+                    "status": "Skipped - unchanged",
+                }
+
+        embedding_output = build_embedding_output(chunk_data, get_embedding_fn, model)
+        chunk_id = embedding_output["chunk_id"]
+        chunk_content = embedding_output["chunk_text"]
+        filename = embedding_output["filename"]
+        page_no = embedding_output["page_range"]
 
         embedding_key = f"{output_s3_prefix}{filename}_chunk_{chunk_id}.json"
         save_json_to_s3(embedding_output, input_s3_bucket, embedding_key)
@@ -144,6 +186,10 @@ def execute_embedding_stage(config: Optional[PipelineConfig] = None) -> dict:
         }
     }
 
+    manifest = None
+    if config is not None and config.manifest.enabled:
+        manifest = IngestionManifest.for_config(config, mode="s3")
+
     results = []
     max_workers = int(os.getenv("MAX_EMBED_WORKERS", 10))
 
@@ -156,13 +202,18 @@ def execute_embedding_stage(config: Optional[PipelineConfig] = None) -> dict:
                 output_s3_prefix,
                 get_embedding_fn,
                 embedding_model,
+                manifest,
             )
             for chunk_file in chunk_files
         ]
         for future in as_completed(futures):
             results.append(future.result())
 
-    processed_chunks = [r for r in results if r["status"] == "Success"]
+    processed_chunks = [
+        r
+        for r in results
+        if r["status"] == "Success" or r["status"].startswith("Skipped")
+    ]
     # failed_chunks = [r for r in results if r["status"] != "Success"]
 
     pipeline_status["STAGE_4: GET_EMBEDDING"].update(
@@ -107,10 +107,16 @@ def execute_pipeline(
         logger.info(f"📌 Running {parsing_mode} mode for S3 files...")
 
         try:
-            event_status = process_s3_files(input_bucket, intermediate_bucket)
+            event_status = process_s3_files(
+                input_bucket, intermediate_bucket, config=config
+            )
 
-            successful_files = [e for e in event_status if e["status"] == "Success"]
-            [e for e in event_status if e["status"] != "Success"]
+            # Unchanged (skipped) and removed sources count as handled
+            successful_files = [
+                e
+                for e in event_status
+                if e["status"] in ("Success", "Skipped", "Deleted")
+            ]
 
             pipeline_status["STAGE_2: PARSING"].update(
                 {
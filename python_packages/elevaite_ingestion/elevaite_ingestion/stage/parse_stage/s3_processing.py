@@ -1,12 +1,14 @@
 import os
 import json
+import asyncio
 import tempfile
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 
 import boto3
 from dotenv import load_dotenv
 
 from elevaite_ingestion.utils.logger import get_logger
+from elevaite_ingestion.utils.s3_utils import iter_s3_objects, stream_s3_objects
 
 load_dotenv()
 logger = get_logger(__name__)
@@ -15,98 +17,181 @@ s3_client = boto3.client("s3")
 
 def list_s3_files(bucket_name):
     """List all files in the given S3 bucket."""
-    response = s3_client.list_objects_v2(Bucket=bucket_name)
-    if "Contents" not in response:
-        return []
-    return [obj["Key"] for obj in response["Contents"]]
+    return [obj["key"] for obj in iter_s3_objects(bucket_name, client=s3_client)]
 
 
-def process_single_s3_file(file_key, input_bucket, intermediate_bucket, config=None):
-    """Process a single S3 file.
+def parse_s3_object(file_key, input_bucket, config=None):
+    """Download a single S3 object and parse it.
 
     Args:
         file_key: S3 object key
         input_bucket: Source bucket name
-        intermediate_bucket: Destination bucket name
         config: Optional PipelineConfig object
+
+    Returns:
+        Parsed structured data with the original filename, or None if the file could not be parsed
     """
     # Import here to avoid circular imports
     from elevaite_ingestion.stage.parse_stage.parse_pipeline import process_file
 
-    try:
-        original_filename = os.path.basename(file_key)
-        response = s3_client.get_object(Bucket=input_bucket, Key=file_key)
-        file_stream = response["Body"].read()
+    original_filename = os.path.basename(file_key)
+    response = s3_client.get_object(Bucket=input_bucket, Key=file_key)
+    file_stream = response["Body"].read()
 
-        with tempfile.NamedTemporaryFile(
-            delete=False, suffix=os.path.splitext(file_key)[-1]
-        ) as tmp_file:
-            tmp_file.write(file_stream)
-            tmp_file_path = tmp_file.name
+    with tempfile.NamedTemporaryFile(
+        delete=False, suffix=os.path.splitext(file_key)[-1]
+    ) as tmp_file:
+        tmp_file.write(file_stream)
+        tmp_file_path = tmp_file.name
 
+    try:
         md_path, structured_data = process_file(
             tmp_file_path,
             output_dir="/tmp",
             original_filename=original_filename,
             config=config,
         )
+    finally:
+        os.remove(tmp_file_path)
 
-        if md_path:
-            structured_data["filename"] = original_filename
+    if not md_path:
+        return None
 
-            json_content = json.dumps(structured_data, indent=4)
-            json_file_key = file_key.rsplit(".", 1)[0] + ".json"
+    structured_data["filename"] = original_filename
+    return structured_data
 
-            s3_client.put_object(
-                Bucket=intermediate_bucket,
-                Key=json_file_key,
-                Body=json_content,
-                ContentType="application/json",
-            )
 
-            logger.info(f"✅ Processed {file_key} -> {json_file_key} successfully.")
+def process_single_s3_file(
+    file_key, input_bucket, intermediate_bucket, config=None, etag=None, manifest=None
+):
+    """Process a single S3 file.
+
+    Args:
+        file_key: S3 object key
+        input_bucket: Source bucket name
+        intermediate_bucket: Destination bucket name
+        config: Optional PipelineConfig object
+        etag: ETag of the source object, used as its version in the manifest
+        manifest: Optional IngestionManifest; unchanged sources are skipped
+    """
+    try:
+        if manifest and etag and manifest.is_unchanged(file_key, etag):
+            logger.info(f"⏭️ Skipping unchanged file {file_key}")
+            return {"input_key": file_key, "output_key": None, "status": "Skipped"}
+
+        structured_data = parse_s3_object(file_key, input_bucket, config=config)
 
+        if structured_data is None:
             return {
                 "input_key": file_key,
-                "output_key": json_file_key,
-                "status": "Success",
+                "output_key": None,
+                "status": "Failed - no content parsed",
             }
 
-        os.remove(tmp_file_path)
+        structured_data["source_key"] = file_key
+        structured_data["source_version"] = etag
+        json_content = json.dumps(structured_data, indent=4)
+        json_file_key = file_key.rsplit(".", 1)[0] + ".json"
+
+        s3_client.put_object(
+            Bucket=intermediate_bucket,
+            Key=json_file_key,
+            Body=json_content,
+            ContentType="application/json",
+        )
+
+        if manifest and etag:
+            manifest.mark_parsed(file_key, structured_data["filename"], etag)
+
+        logger.info(f"✅ Processed {file_key} -> {json_file_key} successfully.")
+
+        return {
+            "input_key": file_key,
+            "output_key": json_file_key,
+            "status": "Success",
+        }
 
     except Exception as e:
         logger.error(f"Error processing {file_key}: {e}")
         return {"input_key": file_key, "output_key": None, "status": f"Failed - {e}"}
 
 
-def process_s3_files(input_bucket, intermediate_bucket, config=None):
-    """Processes files from S3 and uploads parsed content back to S3.
+async def process_s3_files_async(input_bucket, intermediate_bucket, config=None):
+    """Parse files from S3 while the bucket is still being listed.
+
+    Objects from the streaming listing go straight to the parse workers; at
+    most 2 x MAX_PARSING_WORKERS files are queued at a time.
 
     Args:
         input_bucket: Source S3 bucket name
         intermediate_bucket: Destination S3 bucket name
         config: Optional PipelineConfig object
     """
-    file_keys = list_s3_files(input_bucket)
-    if not file_keys:
-        logger.info("No files found in the input bucket.")
-        return []
+    manifest = None
+    if config is not None and config.manifest.enabled:
+        from elevaite_ingestion.utils.ingestion_manifest import IngestionManifest
 
-    event_status = []
+        manifest = IngestionManifest.for_config(config, mode="s3")
+
+    loop = asyncio.get_running_loop()
     max_workers = int(os.getenv("MAX_PARSING_WORKERS", 5))
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    event_status = []
+    present = set()
+    in_flight = set()
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [
-            executor.submit(
-                process_single_s3_file,
-                file_key,
-                input_bucket,
-                intermediate_bucket,
-                config,
+    try:
+        async for obj in stream_s3_objects(input_bucket, client=s3_client):
+            present.add(obj["key"])
+            if len(in_flight) >= max_workers * 2:
+                done, in_flight = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED
+                )
+                event_status.extend(future.result() for future in done)
+            in_flight.add(
+                loop.run_in_executor(
+                    executor,
+                    process_single_s3_file,
+                    obj["key"],
+                    input_bucket,
+                    intermediate_bucket,
+                    config,
+                    obj["etag"],
+                    manifest,
+                )
             )
-            for file_key in file_keys
-        ]
-        for future in as_completed(futures):
-            event_status.append(future.result())
+        if in_flight:
+            done, _ = await asyncio.wait(in_flight)
+            event_status.extend(future.result() for future in done)
+    finally:
+        executor.shutdown(wait=True)
+
+    if not present:
+        logger.info("No files found in the input bucket.")
+
+    if manifest:
+        # Sources that were ingested before but are gone from the input bucket
+        for source_key in sorted(manifest.keys() - present):
+            record = manifest.load(source_key) or {}
+            if record.get("status") != "Deleted":
+                manifest.mark_deleted(source_key)
+                logger.info(f"🗑️ Source removed from input bucket: {source_key}")
+                event_status.append(
+                    {"input_key": source_key, "output_key": None, "status": "Deleted"}
+                )
+        manifest.flush()
 
     return event_status
+
+
+def process_s3_files(input_bucket, intermediate_bucket, config=None):
+    """Processes files from S3 and uploads parsed content back to S3.
+
+    Args:
+        input_bucket: Source S3 bucket name
+        intermediate_bucket: Destination S3 bucket name
+        config: Optional PipelineConfig object
+    """
+    return asyncio.run(
+        process_s3_files_async(input_bucket, intermediate_bucket, config=config)
+    )
@@ -0,0 +1,470 @@
+"""
+Streaming ingestion pipeline.
+
+Runs parse -> chunk -> embed -> vector DB in a single process. The stages are
+connected by bounded asyncio queues instead of intermediate S3 objects, so
+parsed documents go straight to chunking, chunks straight to embedding and
+embeddings straight to the vector upsert. A full queue blocks the stage in
+front of it (backpressure), and each stage runs with its own concurrency.
+
+With the ingestion manifest enabled, documents whose version is
+unchanged are skipped, only chunks of a changed document whose hash is not
+recorded yet are embedded and upserted, and vectors of chunks (or whole
+documents) that disappeared are deleted.
+"""
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set
+
+from elevaite_ingestion.config.pipeline_config import PipelineConfig, StreamingConfig
+from elevaite_ingestion.utils.ingestion_manifest import IngestionManifest, chunk_hash
+from elevaite_ingestion.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Queue sentinel telling a worker that its upstream stage has finished
+_DONE = object()
+
+
+@dataclass
+class _Document:
+    """A source document moving through the pipeline."""
+
+    key: str
+    filename: str
+    source_version: str
+    pending_chunks: int = 0
+    total_chunks: int = 0
+    error: Optional[str] = None
+    # chunk hash -> vector ID of every chunk that has a vector in the DB
+    stored_chunks: Dict[str, str] = field(default_factory=dict)
+    current_hashes: List[str] = field(default_factory=list)
+
+
+class StreamingIngestionPipeline:
+    """Fused parse/chunk/embed/upsert pipeline for one PipelineConfig."""
+
+    def __init__(self, config: PipelineConfig):
+        self.config = config
+        self.settings: StreamingConfig = config.streaming
+        self.mode = config.parser.mode
+        self.output_directory = (
+            config.parser.output_directory or config.parser.input_directory
+        )
+
+        self.event_details: List[Dict[str, Any]] = []
+        self.skipped_files = 0
+        self.unchanged_chunks = 0
+        self.deleted_vectors = 0
+        self.total_chunks = 0
+        self.total_embeddings = 0
+        self.started_at = 0.0
+        self.first_vector_at: Optional[float] = None
+
+    # ------------------------------------------------------------------ sources
+
+    async def _iter_sources(self) -> AsyncIterator[_Document]:
+        """Yield source documents as the listing produces them."""
+        if self.mode == "s3":
+            from elevaite_ingestion.stage.parse_stage.s3_processing import s3_client
+            from elevaite_ingestion.utils.s3_utils import stream_s3_objects
+
+            async for obj in stream_s3_objects(
+                self.config.aws.input_bucket, client=s3_client
+            ):
+                yield _Document(
+                    key=obj["key"],
+                    filename=os.path.basename(obj["key"]),
+                    source_version=obj["etag"],
+                )
+            return
+
+        input_dir = self.config.parser.input_directory
+        for file_name in sorted(os.listdir(input_dir)):
+            path = os.path.join(input_dir, file_name)
+            if not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            yield _Document(
+                key=file_name,
+                filename=file_name,
+                source_version=f"{stat.st_mtime_ns}-{stat.st_size}",
+            )
+
+    def _parse(self, document: _Document) -> Optional[dict]:
+        if self.mode == "s3":
+            from elevaite_ingestion.stage.parse_stage.s3_processing import (
+                parse_s3_object,
+            )
+
+            return parse_s3_object(
+                document.key, self.config.aws.input_bucket, config=self.config
+            )
+
+        from elevaite_ingestion.stage.parse_stage.parse_pipeline import process_file
+
+        md_path, structured_data = process_file(
+            os.path.join(self.config.parser.input_directory, document.key),
+            self.output_directory,
+            document.filename,
+            config=self.config,
+        )
+        if not md_path:
+            return None
+        structured_data["filename"] = document.filename
+        return structured_data
+
+    # ------------------------------------------------------------------ results
+
+    def _finish_document(
+        self, document: _Document, manifest: Optional[IngestionManifest], delete_fn
+    ):
+        if document.error:
+            status = f"Failed - {document.error}"
+            if manifest and document.stored_chunks:
+                # Remember vectors written so far so they are not orphaned
+                manifest.save(
+                    document.key,
+                    {
+                        **(manifest.load(document.key) or {}),
+                        "filename": document.filename,
+                        "status": "Parsed",
+                        "source_version": document.source_version,
+                        "chunks": document.stored_chunks,
+                    },
+                )
+        else:
+            status = "Success"
+            if manifest:
+                stale = manifest.mark_completed(
+                    document.key,
+                    {h: document.stored_chunks[h] for h in document.current_hashes},
+                    filename=document.filename,
+                    source_version=document.source_version,
+                )
+                if stale:
+                    delete_fn(stale)
+                    self.deleted_vectors += len(stale)
+        logger.info(f"📌 Streaming ingestion of {document.filename}: {status}")
+        self.event_details.append(
+            {
+                "input": document.key,
+                "filename": document.filename,
+                "total_chunks": document.total_chunks,
+                "status": status,
+            }
+        )
+
+    def _delete_removed_sources(
+        self,
+        present: Set[str],
+        manifest: IngestionManifest,
+        delete_fn,
+    ):
+        """Delete vectors and records of sources that no longer exist."""
+        for source_key in sorted(manifest.keys() - present):
+            record = manifest.load(source_key) or {}
+            vector_ids = list(record.get("chunks", {}).values())
+            try:
+                delete_fn(vector_ids)
+                manifest.delete(source_key)
+            except Exception as e:
+                logger.error(f"❌ Failed to remove vectors of {source_key}: {e}")
+                continue
+            self.deleted_vectors += len(vector_ids)
+            logger.info(
+                f"🗑️ Removed {len(vector_ids)} vectors of deleted source {source_key}"
+            )
+            self.event_details.append(
+                {
+                    "input": source_key,
+                    "filename": record.get("filename"),
+                    "status": "Deleted",
+                }
+            )
+
+    # ------------------------------------------------------------------ run
+
+    async def run(self) -> dict:
+        from elevaite_ingestion.stage.chunk_stage.chunk_pipeline import (
+            load_chunking_function,
+        )
+        from elevaite_ingestion.stage.embed_stage.embed_pipeline import (
+            _get_embedding_function,
+            build_embedding_output,
+        )
+        from elevaite_ingestion.stage.vectorstore_stage.vectordb_pipeline import (
+            delete_embeddings,
+            store_embedding,
+        )
+        from elevaite_ingestion.vectorstore.vectordb_factory import VectorDBFactory
+
+        settings = self.settings
+        chunk_text, chunking_params = load_chunking_function(config=self.config)
+        get_embedding_fn = _get_embedding_function(self.config)
+        embedding_model = self.config.embedder.model
+        vector_db_type = self.config.vector_db.vector_db
+        vector_db_settings = self.config.vector_db.settings
+        vector_db_client = VectorDBFactory.get_client(
+            vector_db_type, **vector_db_settings
+        )
+        manifest = (
+            IngestionManifest.for_config(self.config, mode=self.mode)
+            if self.config.manifest.enabled
+            else None
+        )
+
+        def delete_vectors(vector_ids):
+            delete_embeddings(
+                vector_ids, vector_db_client, vector_db_type, vector_db_settings
+            )
+
+        loop = asyncio.get_running_loop()
+        parse_executor = ThreadPoolExecutor(
+            settings.parse_concurrency, thread_name_prefix="stream-parse"
+        )
+        embed_executor = ThreadPoolExecutor(
+            settings.embed_concurrency, thread_name_prefix="stream-embed"
+        )
+        upsert_executor = ThreadPoolExecutor(
+            settings.upsert_concurrency, thread_name_prefix="stream-upsert"
+        )
+
+        parse_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.queue_size)
+        chunk_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.queue_size)
+        embed_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.queue_size)
+        upsert_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.queue_size)
+        ensured_collection = False
+
+        def chunk_failed(document: _Document, error: str):
+            document.error = document.error or error
+            document.pending_chunks -= 1
+            if document.pending_chunks == 0:
+                self._finish_document(document, manifest, delete_vectors)
+
+        async def parse_worker(document: _Document):
+            try:
+                if manifest:
+                    record = await loop.run_in_executor(
+                        parse_executor, manifest.load, document.key
+                    )
+                    if manifest.is_unchanged(document.key, document.source_version):
+                        logger.info(f"⏭️ Skipping unchanged document {document.key}")
+                        self.skipped_files += 1
+                        return
+                    document.stored_chunks = dict((record or {}).get("chunks", {}))
+                parsed = await loop.run_in_executor(
+                    parse_executor, self._parse, document
+                )
+            except Exception as e:
+                parsed = None
+                document.error = f"Parsing error: {e}"
+            if not parsed:
+                document.error = document.error or "Parsing produced no content"
+                self._finish_document(document, manifest, delete_vectors)
+                return
+            await chunk_queue.put((document, parsed))
+
+        async def chunk_worker(item):
+            document, parsed = item
+            try:
+                chunks = await chunk_text(parsed, chunking_params)
+            except Exception as e:
+                document.error = f"Chunking error: {e}"
+                chunks = []
+            if not chunks:
+                document.error = document.error or "No chunks created"
+                self._finish_document(document, manifest, delete_vectors)
+                return
+            new_chunks = []
+            for chunk in chunks:
+                hash_value = chunk_hash(chunk)
+                document.current_hashes.append(hash_value)
+                if manifest and hash_value in document.stored_chunks:
+                    continue
+                chunk["filename"] = document.filename
+                if manifest:
+                    chunk["source_key"] = document.key
+                    chunk["source_version"] = document.source_version
+                    chunk["chunk_hash"] = hash_value
+                new_chunks.append(chunk)
+
+            document.total_chunks = len(chunks)
+            document.pending_chunks = len(new_chunks)
+            self.total_chunks += len(chunks)
+            self.unchanged_chunks += len(chunks) - len(new_chunks)
+            if not new_chunks:
+                await loop.run_in_executor(
+                    upsert_executor,
+                    self._finish_document,
+                    document,
+                    manifest,
+                    delete_vectors,
+                )
+                return
+            for chunk in new_chunks:
+                await embed_queue.put((document, chunk))
+
+        async def embed_worker(item):
+            document, chunk = item
+            try:
+                record = await loop.run_in_executor(
+                    embed_executor,
+                    build_embedding_output,
+                    chunk,
+                    get_embedding_fn,
+                    embedding_model,
+                )
+            except Exception as e:
+                chunk_failed(document, f"Embedding error: {e}")
+                return
+            self.total_embeddings += 1
+            await upsert_queue.put((document, record))
+
+        async def upsert_worker(item):
+            nonlocal ensured_collection
+            document, record = item
+            try:
+                await loop.run_in_executor(
+                    upsert_executor,
+                    store_embedding,
+                    record,
+                    vector_db_client,
+                    vector_db_type,
+                    vector_db_settings,
+                    not ensured_collection,
+                )
+                ensured_collection = True
+            except Exception as e:
+                chunk_failed(document, f"Vector DB error: {e}")
+                return
+            if self.first_vector_at is None:
+                self.first_vector_at = time.perf_counter()
+            if record.get("vector_id"):
+                document.stored_chunks[record["chunk_hash"]] = record["vector_id"]
+            document.pending_chunks -= 1
+            if document.pending_chunks == 0:
+                await loop.run_in_executor(
+                    upsert_executor,
+                    self._finish_document,
+                    document,
+                    manifest,
+                    delete_vectors,
+                )
+
+        async def run_stage(worker: Callable, inbox: asyncio.Queue, concurrency: int):
+            async def consume():
+                while True:
+                    item = await inbox.get()
+                    if item is _DONE:
+                        return
+                    await worker(item)
+
+            await asyncio.gather(*(consume() for _ in range(concurrency)))
+
+        async def close(queue: asyncio.Queue, concurrency: int):
+            for _ in range(concurrency):
+                await queue.put(_DONE)
+
+        self.started_at = time.perf_counter()
+        logger.info("🔹 Streaming ingestion started...")
+        present: Set[str] = set()
+
+        stages = [
+            (parse_worker, parse_queue, settings.parse_concurrency),
+            (chunk_worker, chunk_queue, settings.chunk_concurrency),
+            (embed_worker, embed_queue, settings.embed_concurrency),
+            (upsert_worker, upsert_queue, settings.upsert_concurrency),
+        ]
+        stage_tasks = [
+            asyncio.create_task(run_stage(worker, inbox, concurrency))
+            for worker, inbox, concurrency in stages
+        ]
+
+        try:
+            # Documents enter the pipeline while the source is still being listed
+            async for document in self._iter_sources():
+                present.add(document.key)
+                await parse_queue.put(document)
+            if manifest:
+                await loop.run_in_executor(
+                    upsert_executor,
+                    self._delete_removed_sources,
+                    present,
+                    manifest,
+                    delete_vectors,
+                )
+            # Shut the stages down in order once each upstream stage has drained
+            for index, (_, inbox, concurrency) in enumerate(stages):
+                await close(inbox, concurrency)
+                await stage_tasks[index]
+        finally:
+            for task in stage_tasks:
+                task.cancel()
+            if manifest:
+                await loop.run_in_executor(None, manifest.flush)
+            parse_executor.shutdown(wait=False)
+            embed_executor.shutdown(wait=False)
+            upsert_executor.shutdown(wait=False)
+
+        return self._summary(len(present))
+
+    def _summary(self, total_files: int) -> dict:
+        finished_at = time.perf_counter()
+        failed = [
+            e for e in self.event_details if e["status"] not in ("Success", "Deleted")
+        ]
+        if not failed:
+            status = "Completed"
+        elif len(failed) < len(self.event_details):
+            status = "Partial Success"
+        else:
+            status = "Failed"
+
+        pipeline_status = {
+            "STREAMING_PIPELINE": {
+                "MODE": self.mode,
+                "INPUT": (
+                    f"s3://{self.config.aws.input_bucket}"
+                    if self.mode == "s3"
+                    else self.config.parser.input_directory
+                ),
+                "VECTOR_DB": self.config.vector_db.vector_db,
+                "TOTAL_FILES": total_files,
+                "SKIPPED_FILES": self.skipped_files,
+                "TOTAL_CHUNKS": self.total_chunks,
+                "UNCHANGED_CHUNKS": self.unchanged_chunks,
+                "TOTAL_EMBEDDINGS": self.total_embeddings,
+                "DELETED_VECTORS": self.deleted_vectors,
+                "TIME_TO_FIRST_VECTOR_SECONDS": (
+                    round(self.first_vector_at - self.started_at, 3)
+                    if self.first_vector_at is not None
+                    else None
+                ),
+                "TOTAL_SECONDS": round(finished_at - self.started_at, 3),
+                "EVENT_DETAILS": self.event_details,
+                "STATUS": status,
+            }
+        }
+
+        json_output = json.dumps(pipeline_status, indent=4)
+        logger.info(f"📌 Pipeline Execution Summary (STREAMING):\n{json_output}")
+        return pipeline_status
+
+
+async def execute_streaming_pipeline(config: PipelineConfig) -> dict:
+    """Run parse, chunk, embed and vector DB stages as one streaming pipeline.
+
+    Args:
+        config: PipelineConfig object; `config.streaming` controls queue sizes and
+            per-stage concurrency.
+
+    Returns:
+        Dictionary with pipeline execution status.
+    """
+    return await StreamingIngestionPipeline(config).run()
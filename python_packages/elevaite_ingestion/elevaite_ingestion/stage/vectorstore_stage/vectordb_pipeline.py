@@ -10,6 +10,7 @@ from elevaite_ingestion.config.pipeline_config import PipelineConfig
 from elevaite_ingestion.config.vector_db_config import VECTOR_DB_CONFIG
 from elevaite_ingestion.config.aws_config import AWS_CONFIG
 from elevaite_ingestion.utils.logger import get_logger
+from elevaite_ingestion.utils.ingestion_manifest import IngestionManifest
 from elevaite_ingestion.vectorstore.vectordb_factory import VectorDBFactory
 from elevaite_ingestion.utils.s3_utils import list_s3_files, fetch_json_from_s3
 
@@ -17,85 +18,157 @@ load_dotenv()
 logger = get_logger(__name__)
 
 
+def store_embedding(
+    embedding_data,
+    vector_db_client,
+    vector_db_type,
+    vector_db_settings,
+    ensure_collection=True,
+):
+    """Upsert one embedding record into the configured vector DB.
+
+    Args:
+        embedding_data: Embedding record with 'chunk_embedding' and chunk metadata
+        vector_db_client: Client from VectorDBFactory
+        vector_db_type: "pinecone", "chroma" or "qdrant"
+        vector_db_settings: Provider-specific settings
+        ensure_collection: Whether to create the Qdrant collection if missing
+
+    Returns:
+        Tuple of (filename, chunk_id)
+    """
+    chunk_id = embedding_data.get("chunk_id", "UNKNOWN")
+    contextual_header = embedding_data.get("contextual_header", "NA")
+    chunk_content = embedding_data.get("chunk_text", "")
+    filename = embedding_data.get("filename", "unknown_file")
+    page_range = embedding_data.get("page_range", None)
+    chunk_embedding = embedding_data["chunk_embedding"]
+    start_paragraph = embedding_data.get("start_paragraph")
+    end_paragraph = embedding_data.get("end_paragraph")
+
+    metadata = {
+        "chunk_id": chunk_id,
+        "contexual_header": contextual_header,
+        "chunk_text": chunk_content,
+        "filename": filename,
+        "page_range": page_range if page_range is not None else [],
+        "start_paragraph": start_paragraph if start_paragraph is not None else [],
+        "end_paragraph": end_paragraph if end_paragraph is not None else [],
+    }
+
+    # Manifest-tracked chunks carry a deterministic ID; others use filename/chunk
+    vector_id = embedding_data.get("vector_id")
+
+    if vector_db_type == "pinecone":
+        vector_db_client.upsert_vectors(
+            vectors=[
+                {
+                    "id": vector_id or f"{filename}_chunk_{chunk_id}",
+                    "values": chunk_embedding,
+                    "metadata": metadata,
+                }
+            ]
+        )
+        logger.info(f"✅ Upserted {filename} - Chunk {chunk_id} into Pinecone.")
+
+    elif vector_db_type == "chroma":
+        collection = vector_db_client.init_collection(
+            vector_db_settings["collection_name"]
+        )
+        # Chroma doesn't support list values in metadata, convert to JSON strings
+        chroma_metadata = {
+            k: json.dumps(v) if isinstance(v, list) else v
+            for k, v in metadata.items()
+        }
+        vector_db_client.add(
+            collection=collection,
+            documents=[chunk_content],
+            embeddings=[chunk_embedding],
+            metadatas=[chroma_metadata],
+            ids=[vector_id or f"{filename}_chunk_{chunk_id}"],
+        )
+        logger.info(f"✅ Upserted {filename} - Chunk {chunk_id} into Chroma.")
+
+    elif vector_db_type == "qdrant":
+        collection_name = vector_db_settings["collection_name"]
+        # Get vector size from the actual embedding dimension
+        vector_size = len(chunk_embedding)
+        if ensure_collection:
+            vector_db_client.ensure_collection(collection_name, vector_size=vector_size)
+
+        vector_db_client.upsert_vectors(
+            collection_name=collection_name,
+            vectors=[
+                {
+                    "id": vector_id or chunk_id,
+                    "vector": chunk_embedding,
+                    "payload": metadata,
+                }
+            ],
+        )
+        logger.info(f"✅ Upserted {filename} - Chunk {chunk_id} into Qdrant.")
+
+    return filename, chunk_id
+
+
+def delete_embeddings(vector_ids, vector_db_client, vector_db_type, vector_db_settings):
+    """Delete vectors by ID from the configured vector DB."""
+    if not vector_ids:
+        return
+    if vector_db_type == "pinecone":
+        vector_db_client.delete_vectors(ids=list(vector_ids))
+    elif vector_db_type == "chroma":
+        collection = vector_db_client.init_collection(
+            vector_db_settings["collection_name"]
+        )
+        vector_db_client.delete(collection=collection, ids=list(vector_ids))
+    elif vector_db_type == "qdrant":
+        vector_db_client.delete_vectors(
+            collection_name=vector_db_settings["collection_name"],
+            ids=list(vector_ids),
+        )
+    logger.info(f"🗑️ Deleted {len(vector_ids)} stale vectors from {vector_db_type}.")
+
+
 def process_single_embedding_file(
     embedding_file,
     input_s3_bucket,
     vector_db_client,
     vector_db_type,
     vector_db_settings,
+    manifest: Optional[IngestionManifest] = None,
 ):
     try:
         embedding_data = fetch_json_from_s3(input_s3_bucket, embedding_file)
         if not embedding_data or "chunk_embedding" not in embedding_data:
             raise ValueError(f"❌ Missing 'chunk_embedding' in {embedding_file}")
 
-        chunk_id = embedding_data.get("chunk_id", "UNKNOWN")
-        contextual_header = embedding_data.get("contextual_header", "NA")
-        chunk_content = embedding_data.get("chunk_text", "")
-        filename = embedding_data.get("filename", "unknown_file")
-        page_range = embedding_data.get("page_range", None)
-        chunk_embedding = embedding_data["chunk_embedding"]
-        start_paragraph = embedding_data.get("start_paragraph")
-        end_paragraph = embedding_data.get("end_paragraph")
+        source_key = embedding_data.get("source_key")
+        if manifest and source_key:
+            record = manifest.load(source_key)
+            if not manifest.is_pending(record, embedding_data.get("source_version")):
+                # Left over from an older version of the source
+                return {
+                    "input": f"s3://{input_s3_bucket}/{embedding_file}",
+                    "status": "Skipped",
+                }
+            if embedding_data.get("chunk_hash") in record.get("chunks", {}):
+                return {
+                    "input": f"s3://{input_s3_bucket}/{embedding_file}",
+                    "status": "Skipped - unchanged",
+                }
 
-        metadata = {
-            "chunk_id": chunk_id,
-            "contexual_header": contextual_header,
-            "chunk_text": chunk_content,
-            "filename": filename,
-            "page_range": page_range if page_range is not None else [],
-            "start_paragraph": start_paragraph if start_paragraph is not None else [],
-            "end_paragraph": end_paragraph if end_paragraph is not None else [],
-        }
-
-        if vector_db_type == "pinecone":
-            vector_db_client.upsert(
-                vectors=[
-                    {
-                        "id": f"{filename}_chunk_{chunk_id}",
-                        "values": chunk_embedding,
-                        "metadata": metadata,
-                    }
-                ]
-            )
-            logger.info(f"✅ Upserted {filename} - Chunk {chunk_id} into Pinecone.")
-
-        elif vector_db_type == "chroma":
-            collection = vector_db_client.init_collection(
-                vector_db_settings["collection_name"]
-            )
-            # Chroma doesn't support list values in metadata, convert to JSON strings
-            chroma_metadata = {
-                k: json.dumps(v) if isinstance(v, list) else v
-                for k, v in metadata.items()
-            }
-            vector_db_client.add(
-                collection=collection,
-                documents=[chunk_content],
-                embeddings=[chunk_embedding],
-                metadatas=[chroma_metadata],
-                ids=[f"{filename}_chunk_{chunk_id}"],
-            )
-            logger.info(f"✅ Upserted {filename} - Chunk {chunk_id} into Chroma.")
-
-        elif vector_db_type == "qdrant":
-            collection_name = vector_db_settings["collection_name"]
-            # Get vector size from the actual embedding dimension
-            vector_size = len(chunk_embedding)
-            vector_db_client.ensure_collection(collection_name, vector_size=vector_size)
-
-            vector_db_client.upsert_vectors(
-                collection_name=collection_name,
-                vectors=[
-                    {"id": chunk_id, "vector": chunk_embedding, "payload": metadata}
-                ],
-            )
-            logger.info(f"✅ Upserted {filename} - Chunk {chunk_id} into Qdrant.")
+        filename, chunk_id = store_embedding(
+            embedding_data, vector_db_client, vector_db_type, vector_db_settings
+        )
 
         return {
             "filename": filename,
             "chunk_id": chunk_id,
             "input": f"s3://{input_s3_bucket}/{embedding_file}",
+            "source_key": source_key,
+            "chunk_hash": embedding_data.get("chunk_hash"),
+            "vector_id": embedding_data.get("vector_id"),
             "status": "Success",
         }
 
@@ -107,6 +180,74 @@ def process_single_embedding_file(
         }
 
 
+def reconcile_manifest(
+    manifest: IngestionManifest,
+    results,
+    vector_db_client,
+    vector_db_type,
+    vector_db_settings,
+):
+    """Bring manifest records up to date after the upserts of this run.
+
+    Parsed sources whose pending chunks all have a vector are marked Completed and
+    the vectors of chunks that disappeared are deleted. Deleted sources lose all
+    their vectors and their record.
+    """
+    upserted = {}
+    for result in results:
+        if result["status"] == "Success" and result.get("source_key"):
+            upserted.setdefault(result["source_key"], {})[result["chunk_hash"]] = (
+                result["vector_id"]
+            )
+
+    events = []
+    for source_key in sorted(manifest.keys()):
+        record = manifest.load(source_key) or {}
+        try:
+            if record.get("status") == "Deleted":
+                delete_embeddings(
+                    list(record.get("chunks", {}).values()),
+                    vector_db_client,
+                    vector_db_type,
+                    vector_db_settings,
+                )
+                manifest.delete(source_key)
+                events.append({"source_key": source_key, "status": "Deleted"})
+                continue
+
+            if record.get("status") != "Parsed" or "pending_chunks" not in record:
+                continue
+
+            stored = {**record.get("chunks", {}), **upserted.get(source_key, {})}
+            pending = record["pending_chunks"]
+            if any(hash_value not in stored for hash_value in pending):
+                # Keep what was stored so far; the source is retried on the next run
+                manifest.save(source_key, {**record, "chunks": stored})
+                events.append({"source_key": source_key, "status": "Incomplete"})
+                continue
+
+            stale = manifest.mark_completed(
+                source_key, {hash_value: stored[hash_value] for hash_value in pending}
+            )
+            delete_embeddings(
+                stale, vector_db_client, vector_db_type, vector_db_settings
+            )
+            events.append(
+                {
+                    "source_key": source_key,
+                    "total_chunks": len(pending),
+                    "new_chunks": len(upserted.get(source_key, {})),
+                    "deleted_chunks": len(stale),
+                    "status": "Completed",
+                }
+            )
+        except Exception as e:
+            logger.error(f"❌ Failed to update manifest for {source_key}. Error: {e}")
+            events.append({"source_key": source_key, "status": f"Failed - {e}"})
+
+    return events
+
+
 def execute_vector_db_stage(config: Optional[PipelineConfig] = None) -> dict:
     """Execute the vector database stage.
 
@@ -136,7 +277,11 @@ def execute_vector_db_stage(config: Optional[PipelineConfig] = None) -> dict:
     # Filter out non-embedding files (e.g., stage_4_output.json summary file)
     embedding_files = [f for f in all_files if not f.endswith("stage_4_output.json")]
 
-    if not embedding_files:
+    manifest = None
+    if config is not None and config.manifest.enabled:
+        manifest = IngestionManifest.for_config(config, mode="s3")
+
+    if not embedding_files and not (manifest and manifest.keys()):
         logger.warning("⚠️ No embeddings found in S3. Aborting STAGE_5.")
         return {"error": "STAGE_4 output not found"}
 
@@ -162,22 +307,35 @@ def execute_vector_db_stage(config: Optional[PipelineConfig] = None) -> dict:
                 vector_db_client,
                 vector_db_type,
                 vector_db_settings,
+                manifest,
             )
             for embedding_file in embedding_files
         ]
         for future in as_completed(futures):
             results.append(future.result())
 
-    processed_entries = [r for r in results if r["status"] == "Success"]
+    processed_entries = [
+        r
+        for r in results
+        if r["status"] == "Success" or r["status"].startswith("Skipped")
+    ]
 
     pipeline_status["STAGE_5: VECTORSTORE"].update(
         {
             "TOTAL_FILES": len(results),
             "EVENT_DETAILS": results,
-            "STATUS": "Completed" if processed_entries else "Failed",
+            "STATUS": "Completed" if processed_entries or not results else "Failed",
         }
     )
 
+    if manifest:
+        pipeline_status["STAGE_5: VECTORSTORE"]["MANIFEST_DETAILS"] = (
+            reconcile_manifest(
+                manifest, results, vector_db_client, vector_db_type, vector_db_settings
+            )
+        )
+        manifest.flush()
+
     json_output = json.dumps(pipeline_status, indent=4)
     logger.info(f"📌 Pipeline Execution Summary (VECTORSTORE):\n{json_output}")
 
@@ -0,0 +1,304 @@
+"""
+Incremental ingestion manifest.
+
+Keeps one small record per source object describing what has been ingested
+from it. The manifest is opt-in (``ManifestConfig.enabled``): its vector IDs
+are derived from the chunk hash, so turning it on for an index that already
+holds vectors from earlier runs stores every chunk a second time. Start from
+an empty index (or collection) when enabling it.
+
+Record layout:
+
+    {
+        "source_key": "docs/guide.pdf",
+        "filename": "guide.pdf",
+        "source_version": "<S3 ETag, or mtime-size for local files>",
+        "status": "Parsed" | "Completed" | "Deleted",
+        "chunks": {"<chunk hash>": "<vector id>", ...},
+        "pending_chunks": ["<chunk hash>", ...],
+        "updated_at": "<ISO timestamp>"
+    }
+
+All records live in a single index object under a prefix of the intermediate
+bucket (or the local output directory); the prefix defaults to one per
+collection. A run reads the index once, updates records in memory and writes
+them back with ``flush()`` when it is done. ``flush()`` only applies the
+records this run changed: in S3 it writes with a conditional put on the ETag
+it read, and when another job wrote the index in between it re-reads the
+index, re-applies its changes and tries again. Unchanged sources are skipped
+by comparing their version, and within a changed source only chunks whose
+hash is not yet recorded are embedded and upserted; vectors of chunks that
+disappeared are deleted.
+
+In the staged pipeline the parse stage marks a changed source as "Parsed",
+the chunk stage records the hashes of its new chunks as "pending_chunks", and
+the vector DB stage reconciles the record to "Completed" once every pending
+chunk has a vector. The streaming pipeline does all of this in one pass.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Set, Tuple
+
+from elevaite_ingestion.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MANIFEST_PREFIX = "ingestion_manifest/"
+INDEX_NAME = "index.json"
+# Conditional writes of the index before giving up on a busy manifest
+MAX_FLUSH_ATTEMPTS = 5
+# S3 error codes of a conditional write that lost against another writer
+_WRITE_CONFLICT_CODES = ("PreconditionFailed", "ConditionalRequestConflict")
+
+# Namespace for deterministic vector IDs (uuid5 of source key + chunk hash)
+VECTOR_ID_NAMESPACE = uuid.UUID("6f1d8c6e-4a57-4b1a-9a43-2f0f6f3f6c1e")
+
+
+def chunk_hash(chunk: Dict[str, Any]) -> str:
+    """Hash the parts of a chunk that end up in the vector or its metadata."""
+    content = {
+        "chunk_text": chunk.get("chunk_text", ""),
+        "contextual_header": chunk.get("contextual_header", "NA"),
+        "page_range": chunk.get("page_range"),
+        "start_paragraph": chunk.get("start_paragraph"),
+        "end_paragraph": chunk.get("end_paragraph"),
+    }
+    return hashlib.sha256(
+        json.dumps(content, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def vector_id_for(source_key: str, hash_value: str) -> str:
+    """Deterministic vector ID for a chunk; valid for Qdrant, Pinecone and Chroma."""
+    return str(uuid.uuid5(VECTOR_ID_NAMESPACE, f"{source_key}#{hash_value}"))
+
+
+def default_prefix_for(config) -> str:
+    """Manifest prefix of the collection (or index) a pipeline writes to."""
+    target = config.vector_db.collection_name or config.vector_db.index_name
+    if not target:
+        return DEFAULT_MANIFEST_PREFIX
+    return f"{DEFAULT_MANIFEST_PREFIX}{config.vector_db.vector_db}/{target}/"
+
+
+class IngestionManifest:
+    """Manifest index stored in S3 (bucket) or on disk (directory)."""
+
+    def __init__(
+        self,
+        bucket: Optional[str] = None,
+        directory: Optional[str] = None,
+        prefix: str = DEFAULT_MANIFEST_PREFIX,
+    ):
+        if not bucket and not directory:
+            raise ValueError("IngestionManifest needs either a bucket or a directory")
+        self.bucket = bucket
+        self.directory = directory
+        self.prefix = prefix
+        self._records: Optional[Dict[str, Dict[str, Any]]] = None
+        # ETag of the index object that was read (None when it did not exist)
+        self._etag: Optional[str] = None
+        # Source key -> new record (None when deleted) since the last flush
+        self._changes: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def for_config(cls, config=None, mode: str = "s3") -> "IngestionManifest":
+        """Build the manifest for a PipelineConfig (or the legacy global config)."""
+        if config:
+            prefix = config.manifest.prefix or default_prefix_for(config)
+            bucket = config.aws.intermediate_bucket
+            directory = config.parser.output_directory or config.parser.input_directory
+        else:
+            from elevaite_ingestion.config.aws_config import AWS_CONFIG
+
+            prefix = DEFAULT_MANIFEST_PREFIX
+            bucket = AWS_CONFIG["intermediate_bucket"]
+            directory = None
+
+        if mode == "s3":
+            return cls(bucket=bucket, prefix=prefix)
+        return cls(directory=directory, prefix=prefix)
+
+    # ------------------------------------------------------------------ storage
+
+    @property
+    def _index_key(self) -> str:
+        return f"{self.prefix}{INDEX_NAME}"
+
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, self.prefix, INDEX_NAME)
+
+    def _index(self) -> Dict[str, Dict[str, Any]]:
+        """All records keyed by source key, read with a single request on first use."""
+        with self._lock:
+            if self._records is None:
+                self._records, self._etag = self._read_index()
+            return self._records
+
+    def _read_index(self) -> Tuple[Dict[str, Dict[str, Any]], Optional[str]]:
+        """Records of the stored index and the ETag to write it back against."""
+        if self.bucket:
+            from elevaite_ingestion.utils.s3_utils import s3_client
+
+            try:
+                response = s3_client.get_object(Bucket=self.bucket, Key=self._index_key)
+            except s3_client.exceptions.NoSuchKey:
+                return {}, None
+            data = json.loads(response["Body"].read().decode("utf-8"))
+            return data.get("sources", {}), response["ETag"]
+        path = self._index_path()
+        if not os.path.exists(path):
+            return {}, None
+        with open(path) as f:
+            return json.load(f).get("sources", {}), None
+
+    def _write_index(self, records: Dict[str, Dict[str, Any]]) -> bool:
+        """Write the index; False when another writer changed it since it was read."""
+        body = json.dumps({"sources": records}, indent=4)
+        if not self.bucket:
+            path = self._index_path()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(f"{path}.tmp", "w") as f:
+                f.write(body)
+            os.replace(f"{path}.tmp", path)
+            return True
+
+        from elevaite_ingestion.utils.s3_utils import s3_client
+
+        condition = {"IfMatch": self._etag} if self._etag else {"IfNoneMatch": "*"}
+        try:
+            response = s3_client.put_object(
+                Bucket=self.bucket,
+                Key=self._index_key,
+                Body=body,
+                ContentType="application/json",
+                **condition,
+            )
+        except s3_client.exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") in _WRITE_CONFLICT_CODES:
+                return False
+            raise
+        self._etag = response["ETag"]
+        return True
+
+    def flush(self):
+        """Write the records changed since the last flush back to the index.
+
+        Records of other sources are taken from the stored index, so jobs
+        sharing a manifest do not overwrite each other's changes.
+        """
+        with self._lock:
+            if not self._changes:
+                return
+            records = self._index()
+            if not self.bucket:
+                # A local index has no ETag; merge into whatever is on disk now
+                records, self._etag = self._read_index()
+            for attempt in range(MAX_FLUSH_ATTEMPTS):
+                for source_key, record in self._changes.items():
+                    if record is None:
+                        records.pop(source_key, None)
+                    else:
+                        records[source_key] = record
+                if self._write_index(records):
+                    break
+                logger.info(
+                    f"Ingestion manifest changed by another job, retrying ({attempt + 1})"
+                )
+                records, self._etag = self._read_index()
+            else:
+                raise RuntimeError(
+                    f"Could not write ingestion manifest {self._index_key}: "
+                    f"still changing after {MAX_FLUSH_ATTEMPTS} attempts"
+                )
+            self._records = records
+            self._changes = {}
+        logger.info(f"✅ Saved ingestion manifest ({len(records)} sources)")
+
+    def keys(self) -> Set[str]:
+        """Source keys that have a manifest record."""
+        with self._lock:
+            return set(self._index())
+
+    def load(self, source_key: str) -> Optional[Dict[str, Any]]:
+        return self._index().get(source_key)
+
+    def save(self, source_key: str, record: Dict[str, Any]):
+        record = {
+            **record,
+            "source_key": source_key,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        with self._lock:
+            self._index()[source_key] = record
+            self._changes[source_key] = record
+
+    def delete(self, source_key: str):
+        with self._lock:
+            if self._index().pop(source_key, None) is not None:
+                self._changes[source_key] = None
+
+    # ------------------------------------------------------------------ helpers
+
+    def is_unchanged(self, source_key: str, source_version: str) -> bool:
+        """Whether the source was fully ingested at exactly this version."""
+        record = self.load(source_key)
+        return bool(
+            record
+            and record.get("status") == "Completed"
+            and record.get("source_version") == source_version
+        )
+
+    @staticmethod
+    def is_pending(record: Optional[Dict[str, Any]], source_version: str) -> bool:
+        """Whether data produced from `source_version` still has to be stored."""
+        return bool(
+            record
+            and record.get("status") == "Parsed"
+            and record.get("source_version") == source_version
+        )
+
+    def mark_parsed(self, source_key: str, filename: str, source_version: str):
+        """Record a new source version whose chunks have not been stored yet."""
+        previous = self.load(source_key) or {}
+        self.save(
+            source_key,
+            {
+                "filename": filename,
+                "source_version": source_version,
+                "status": "Parsed",
+                "chunks": previous.get("chunks", {}),
+            },
+        )
+
+    def set_pending_chunks(self, source_key: str, hashes):
+        """Record the full set of chunk hashes of the parsed source version."""
+        previous = self.load(source_key) or {}
+        self.save(source_key, {**previous, "pending_chunks": list(hashes)})
+
+    def mark_completed(
+        self, source_key: str, chunks: Dict[str, str], **fields
+    ) -> Set[str]:
+        """Store the final chunk map and return the vector IDs that became stale."""
+        previous = self.load(source_key) or {}
+        stale = {
+            vector_id
+            for hash_value, vector_id in previous.get("chunks", {}).items()
+            if hash_value not in chunks
+        }
+        record = {k: v for k, v in previous.items() if k != "pending_chunks"}
+        self.save(
+            source_key, {**record, **fields, "status": "Completed", "chunks": chunks}
+        )
+        return stale
+
+    def mark_deleted(self, source_key: str):
+        """Flag a source that disappeared; its vectors are removed by the vector DB stage."""
+        previous = self.load(source_key) or {}
+        self.save(source_key, {**previous, "status": "Deleted"})
@@ -1,5 +1,10 @@
+import asyncio
 import json
+import os
+import threading
 import boto3
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
 from elevaite_ingestion.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -7,14 +12,146 @@ logger = get_logger(__name__)
 s3_client = boto3.client("s3")
 
 
+# Parallel listers used when a bucket listing is sharded by top-level prefix
+S3_LIST_CONCURRENCY = int(os.getenv("S3_LIST_CONCURRENCY", 4))
+
+
+def _object_info(obj) -> Dict:
+    return {
+        "key": obj["Key"],
+        "size": obj.get("Size", 0),
+        "etag": obj.get("ETag", "").strip('"'),
+    }
+
+
+def iter_s3_objects(bucket_name, prefix="", client=None) -> Iterator[Dict]:
+    """Yield key, size and etag of every object under `prefix`, page by page."""
+    paginator = (client or s3_client).get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+        for obj in page.get("Contents", []):
+            yield _object_info(obj)
+
+
+def iter_s3_level(
+    bucket_name, prefix="", delimiter="/", client=None
+) -> Iterator[Tuple[List[str], List[Dict]]]:
+    """Page through the level directly below `prefix`.
+
+    Yields:
+        Tuple of (sub-prefixes, objects stored directly under `prefix`) per page.
+    """
+    paginator = (client or s3_client).get_paginator("list_objects_v2")
+    for page in paginator.paginate(
+        Bucket=bucket_name, Prefix=prefix, Delimiter=delimiter
+    ):
+        yield (
+            [p["Prefix"] for p in page.get("CommonPrefixes", [])],
+            [_object_info(obj) for obj in page.get("Contents", [])],
+        )
+
+
+class _Shards:
+    """Sub-prefixes found by the level lister, handed over to the shard listers"""
+
+    def __init__(self, prefixes: List[str]):
+        self.prefixes = prefixes
+
+
+async def stream_s3_objects(
+    bucket_name,
+    prefix="",
+    concurrency: Optional[int] = None,
+    queue_size: int = 1000,
+    client=None,
+) -> AsyncIterator[Dict]:
+    """Async generator over key, size and etag of every object under `prefix`.
+
+    Objects are yielded as listing pages arrive, so consumers can start work
+    before the listing finishes. With `concurrency` > 1 the listing is sharded
+    by the sub-prefixes one level below `prefix` and the shards are listed in
+    parallel threads. A bounded queue keeps slow consumers from buffering the
+    whole bucket in memory.
+    """
+    concurrency = concurrency or S3_LIST_CONCURRENCY
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    done = object()
+    cancelled = threading.Event()
+
+    def put(item):
+        asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+    def list_into_queue(shard_prefixes: List[str]):
+        try:
+            for shard in shard_prefixes:
+                for obj in iter_s3_objects(bucket_name, shard, client=client):
+                    if cancelled.is_set():
+                        return
+                    put(obj)
+        except Exception as e:
+            put(e)
+        finally:
+            if not cancelled.is_set():
+                put(done)
+
+    def list_level_into_queue():
+        # Objects directly under the prefix are streamed like any shard; only
+        # the sub-prefixes are collected before the shard listers start
+        shards = []
+        try:
+            for sub_prefixes, objects in iter_s3_level(
+                bucket_name, prefix, client=client
+            ):
+                shards.extend(sub_prefixes)
+                for obj in objects:
+                    if cancelled.is_set():
+                        return
+                    put(obj)
+            put(_Shards(shards))
+        except Exception as e:
+            put(e)
+        finally:
+            if not cancelled.is_set():
+                put(done)
+
+    if concurrency > 1:
+        loop.run_in_executor(None, list_level_into_queue)
+    else:
+        loop.run_in_executor(None, list_into_queue, [prefix])
+
+    remaining = 1
+    try:
+        while remaining:
+            item = await queue.get()
+            if item is done:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            elif isinstance(item, _Shards):
+                # Round-robin the shards over the listers
+                listers = [
+                    item.prefixes[i::concurrency]
+                    for i in range(min(concurrency, len(item.prefixes)))
+                ]
+                for group in listers:
+                    loop.run_in_executor(None, list_into_queue, group)
+                remaining += len(listers)
+            else:
+                yield item
+    finally:
+        cancelled.set()
+        # Unblock listers waiting on a full queue so their threads can exit
+        while not queue.empty():
+            queue.get_nowait()
+
+
 def list_s3_files(bucket_name, prefix=""):
     """List all JSON files in the given S3 bucket."""
     try:
-        response = s3_client.list_objects_v2(Bucket=bucket_name, Prefix=prefix)
-        if "Contents" not in response:
-            return []
         return [
-            obj["Key"] for obj in response["Contents"] if obj["Key"].endswith(".json")
+            obj["key"]
+            for obj in iter_s3_objects(bucket_name, prefix)
+            if obj["key"].endswith(".json")
         ]
     except Exception as e:
         logger.error(f"❌ Error listing files from {bucket_name}: {e}")
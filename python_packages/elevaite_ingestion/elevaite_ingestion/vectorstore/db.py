@@ -32,6 +32,9 @@ class PineconeClient:
     def upsert_vectors(self, vectors):
         self.index.upsert(vectors=vectors)
 
+    def delete_vectors(self, ids):
+        self.index.delete(ids=ids)
+
     def query(self, vector, top_k):
         return self.index.query(vector=vector, top_k=top_k, include_metadata=True)
 
@@ -51,6 +54,9 @@ class ChromaClient:
             documents=documents, embeddings=embeddings, metadatas=metadatas, ids=ids
         )
 
+    def delete(self, collection, ids):
+        collection.delete(ids=ids)
+
 
 class QdrantClientWrapper:
     # Lock to prevent race conditions when creating collections
@@ -116,3 +122,11 @@ class QdrantClientWrapper:
         """
         self.client.upsert(collection_name=collection_name, points=vectors)
         print(f"✅ Upserted {len(vectors)} vectors into '{collection_name}'.")
+
+    def delete_vectors(self, collection_name: str, ids: list):
+        """Delete points by ID from the collection."""
+        self.client.delete(
+            collection_name=collection_name,
+            points_selector=models.PointIdsList(points=ids),
+        )
+        print(f"🗑️ Deleted {len(ids)} vectors from '{collection_name}'.")
@@ -0,0 +1,30 @@
+"""
+Tests for the contextual header cache
+"""
+
+from elevaite_ingestion.chunk_strategy.custom_chunking.anthropic_contextual_header import (
+    HeaderCache,
+)
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = HeaderCache(max_size=2)
+    cache.set("a", "header a")
+    cache.set("b", "header b")
+    assert cache.get("a") == "header a"
+
+    cache.set("c", "header c")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "header a"
+    assert cache.get("c") == "header c"
+
+
+def test_disk_cache_outlives_memory_eviction(tmp_path):
+    path = str(tmp_path / "headers.sqlite3")
+    cache = HeaderCache(path, max_size=1)
+    cache.set("a", "header a")
+    cache.set("b", "header b")
+
+    assert cache.get("a") == "header a"
+    assert HeaderCache(path).get("b") == "header b"
@@ -0,0 +1,97 @@
+"""
+Tests for the incremental ingestion manifest
+"""
+
+import io
+import itertools
+
+import pytest
+
+from elevaite_ingestion.utils import s3_utils
+from elevaite_ingestion.utils.ingestion_manifest import IngestionManifest
+
+
+class FakeS3Client:
+    """In-memory bucket that honours IfMatch/IfNoneMatch on put_object"""
+
+    class exceptions:
+        class NoSuchKey(Exception):
+            pass
+
+        class ClientError(Exception):
+            def __init__(self, code):
+                super().__init__(code)
+                self.response = {"Error": {"Code": code}}
+
+    def __init__(self):
+        self.objects = {}
+        self.puts = 0
+        self._etags = itertools.count(1)
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise self.exceptions.NoSuchKey(Key)
+        body, etag = self.objects[Key]
+        return {"Body": io.BytesIO(body.encode("utf-8")), "ETag": etag}
+
+    def put_object(self, Bucket, Key, Body, ContentType, IfMatch=None, IfNoneMatch=None):
+        current = self.objects.get(Key)
+        if (IfNoneMatch == "*" and current) or (
+            IfMatch and (not current or current[1] != IfMatch)
+        ):
+            raise self.exceptions.ClientError("PreconditionFailed")
+        etag = f'"{next(self._etags)}"'
+        self.objects[Key] = (Body, etag)
+        self.puts += 1
+        return {"ETag": etag}
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    client = FakeS3Client()
+    monkeypatch.setattr(s3_utils, "s3_client", client)
+    return client
+
+
+def test_interleaved_flushes_keep_both_jobs_changes(s3):
+    seed = IngestionManifest(bucket="bucket")
+    seed.mark_completed("old.pdf", {"h0": "v0"})
+    seed.mark_completed("gone.pdf", {"h1": "v1"})
+    seed.flush()
+
+    first = IngestionManifest(bucket="bucket")
+    second = IngestionManifest(bucket="bucket")
+    # Both jobs read the index before either of them writes it back
+    assert first.keys() == second.keys() == {"old.pdf", "gone.pdf"}
+
+    first.mark_completed("a.pdf", {"ha": "va"})
+    second.mark_completed("b.pdf", {"hb": "vb"})
+    second.delete("gone.pdf")
+    first.flush()
+    second.flush()
+
+    stored = IngestionManifest(bucket="bucket")
+    assert stored.keys() == {"old.pdf", "a.pdf", "b.pdf"}
+    assert stored.load("a.pdf")["chunks"] == {"ha": "va"}
+    assert second.keys() == {"old.pdf", "a.pdf", "b.pdf"}
+
+
+def test_flush_without_changes_does_not_write(s3):
+    manifest = IngestionManifest(bucket="bucket")
+    manifest.mark_completed("a.pdf", {"ha": "va"})
+    manifest.flush()
+    manifest.flush()
+    assert s3.puts == 1
+
+
+def test_local_index_merges_changes_of_other_runs(tmp_path):
+    first = IngestionManifest(directory=str(tmp_path))
+    second = IngestionManifest(directory=str(tmp_path))
+    assert first.keys() == second.keys() == set()
+
+    first.mark_completed("a.pdf", {"ha": "va"})
+    second.mark_completed("b.pdf", {"hb": "vb"})
+    first.flush()
+    second.flush()
+
+    assert IngestionManifest(directory=str(tmp_path)).keys() == {"a.pdf", "b.pdf"}
@@ -0,0 +1,68 @@
+"""
+Tests for streaming S3 listings
+"""
+
+import asyncio
+import threading
+
+from elevaite_ingestion.utils.s3_utils import stream_s3_objects
+
+
+class FakePaginator:
+    """Serves pages lazily; the last page of each listing waits until released"""
+
+    def __init__(self, listings, release):
+        self.listings = listings
+        self.release = release
+        self.fetched = []
+
+    def paginate(self, Bucket, Prefix, Delimiter=None):
+        pages = self.listings[(Prefix, Delimiter)]
+        for i, page in enumerate(pages):
+            if i == len(pages) - 1:
+                self.release.wait(timeout=5)
+            self.fetched.append((Prefix, i))
+            yield page
+
+
+class FakeS3Client:
+    def __init__(self, paginator):
+        self.paginator = paginator
+
+    def get_paginator(self, name):
+        assert name == "list_objects_v2"
+        return self.paginator
+
+
+def _page(*keys, prefixes=()):
+    return {
+        "Contents": [{"Key": key, "Size": 1, "ETag": '"e"'} for key in keys],
+        "CommonPrefixes": [{"Prefix": prefix} for prefix in prefixes],
+    }
+
+
+def test_root_objects_are_yielded_before_the_last_page_is_fetched():
+    release = threading.Event()
+    paginator = FakePaginator(
+        {
+            ("", "/"): [_page("a.pdf", prefixes=["docs/"]), _page("b.pdf")],
+            ("docs/", None): [_page("docs/c.pdf")],
+        },
+        release,
+    )
+
+    async def main():
+        objects = stream_s3_objects(
+            "bucket", concurrency=2, client=FakeS3Client(paginator)
+        )
+        first = await asyncio.wait_for(objects.__anext__(), timeout=1)
+        fetched_before_first = list(paginator.fetched)
+        release.set()
+        rest = [obj async for obj in objects]
+        return first, fetched_before_first, rest
+
+    first, fetched_before_first, rest = asyncio.run(main())
+
+    assert first["key"] == "a.pdf"
+    assert fetched_before_first == [("", 0)]
+    assert sorted(obj["key"] for obj in rest) == ["b.pdf", "docs/c.pdf"]
@@ -8,12 +8,18 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Integer,
     String,
     Table,
     Uuid,
     UniqueConstraint,
+    delete,
+    event,
+    insert,
+    literal,
+    select,
 )
-from sqlalchemy.orm import relationship, Mapped, mapped_column
+from sqlalchemy.orm import relationship, Mapped, mapped_column, attributes
 from sqlalchemy_json import MutableJson
 from sqlalchemy.dialects.postgresql import JSONB
 from qdrant_client.http.models import Distance
@@ -310,6 +316,82 @@ class Project(Base):
     collections = relationship("Collection", back_populates="project")
 
 
+# Closure table for the project hierarchy; holds one row per (ancestor, descendant) pair, including the
+# (project, project, 0) self-link, so ancestor/descendant lookups are single indexed queries instead of recursive CTEs.
+# Maintained incrementally by the Project mapper events below.
+class Project_Closure(Base):
+    __tablename__ = "project_closure"
+    ancestor_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    descendant_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+@event.listens_for(Project, "after_insert")
+def _insert_project_closure_rows(mapper, connection, target: Project):
+    closure = Project_Closure.__table__
+    self_link = select(
+        literal(target.id, Uuid(as_uuid=True)).label("ancestor_id"),
+        literal(target.id, Uuid(as_uuid=True)).label("descendant_id"),
+        literal(0, Integer).label("depth"),
+    )
+    if target.parent_project_id is not None:
+        self_link = self_link.union_all(
+            select(
+                closure.c.ancestor_id,
+                literal(target.id, Uuid(as_uuid=True)),
+                closure.c.depth + 1,
+            ).where(closure.c.descendant_id == target.parent_project_id)
+        )
+    connection.execute(
+        insert(closure).from_select(
+            ["ancestor_id", "descendant_id", "depth"], self_link
+        )
+    )
+
+
+@event.listens_for(Project, "after_update")
+def _reparent_project_closure_rows(mapper, connection, target: Project):
+    if not attributes.get_history(target, "parent_project_id").has_changes():
+        return
+    closure = Project_Closure.__table__
+    subtree = select(closure.c.descendant_id).where(closure.c.ancestor_id == target.id)
+
+    # detach the moved subtree from all of its former ancestors
+    connection.execute(
+        delete(closure).where(
+            closure.c.descendant_id.in_(subtree),
+            closure.c.ancestor_id.not_in(subtree),
+        )
+    )
+
+    # attach the subtree under every ancestor of the new parent
+    if target.parent_project_id is not None:
+        supertree_alias = closure.alias("supertree")
+        subtree_alias = closure.alias("subtree")
+        connection.execute(
+            insert(closure).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(
+                    supertree_alias.c.ancestor_id,
+                    subtree_alias.c.descendant_id,
+                    supertree_alias.c.depth + subtree_alias.c.depth + 1,
+                )
+                .select_from(supertree_alias)
+                .join(subtree_alias, subtree_alias.c.ancestor_id == target.id)
+                .where(supertree_alias.c.descendant_id == target.parent_project_id),
+            )
+        )
+
+
 class Collection(Base):
     __tablename__ = "collections"
 
@@ -7,3 +7,11 @@ SMTP_EMAIL_HOST = "smtp.gmail.com"
 SMTP_EMAIL_PORT = 587
 ELEVAITE_QUERY_API_URL = "https://api.iopex.ai/email"
 TIME_INTERVAL = 5
+# Listener tuning
+WORKER_COUNT = 4  # messages processed concurrently
+QUEUE_SIZE = 100  # fetched messages waiting for a worker
+FETCH_BATCH_SIZE = 50  # UIDs per FETCH command
+IDLE_TIMEOUT = 300  # seconds before an IDLE is renewed (servers drop it after ~29 min)
+IDLE_WAKEUP_INTERVAL = 1  # seconds between checks for answered messages while idling
+SOCKET_TIMEOUT = 30
+STATE_FILE = "imap_state.json"  # UIDVALIDITY and the UID up to which all mail is answered
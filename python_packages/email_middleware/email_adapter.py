@@ -1,9 +1,16 @@
+import asyncio
 import logging
 import imaplib
+import os
+import re
+import select
 import socket
+import ssl
 import email
+import threading
 import time
 import requests
+from requests.adapters import HTTPAdapter
 from email.header import decode_header
 import config as cfg
 import json
@@ -41,142 +48,340 @@ def makeconnection(params):
         return "Error: Provide valid inputs"
 
 
-def readmessage(params):
-    while cfg.TIME_INTERVAL:
-        logger.info("Checking any new emails...")
+class ImapListener:
+    """
+    Keeps one IMAP connection open and hands new INBOX messages to a callback.
+
+    New mail is waited for with IDLE (or a NOOP poll every TIME_INTERVAL seconds
+    when the server lacks IDLE) and fetched by UID in batches with BODY.PEEK[],
+    so fetching does not mark it read. on_message(uid, raw) hands a message on;
+    once it has been answered, complete(uid, True) is called from any thread.
+    Answered messages are then flagged \\Seen, and STATE_FILE keeps UIDVALIDITY
+    and the UID up to which every message has been answered, so a restart
+    fetches again whatever was still in flight or failed.
+    """
+
+    def __init__(self, params, on_message, state_file=cfg.STATE_FILE):
+        self.params = params
+        self.on_message = on_message
+        self.state_file = state_file
+        self.imap = None
+        self.uidvalidity, self.last_uid = self._load_state()
+        self._reset_progress()
+        self._finished = []  # (uid, ok) reported by complete(), not applied yet
+        self._finished_lock = threading.Lock()
+
+    def _reset_progress(self):
+        self._highest_uid = self.last_uid  # highest UID handed to on_message
+        self._in_flight = set()
+        self._failed = set()  # retried after a restart, they stay unseen
+
+    def complete(self, uid, ok):
+        """Report that the message with this UID was answered (or failed)."""
+        with self._finished_lock:
+            self._finished.append((uid, ok))
+
+    def _load_state(self):
         try:
-            socket.setdefaulttimeout(5)
-            if params["port"]:
-                imap_server = imaplib.IMAP4_SSL(
-                    host=params["hostname"], port=params["port"]
-                )
+            with open(self.state_file) as f:
+                state = json.load(f)
+            return state["uidvalidity"], state["last_uid"]
+        except (OSError, ValueError, KeyError):
+            return None, 0
+
+    def _save_state(self):
+        tmp = self.state_file + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"uidvalidity": self.uidvalidity, "last_uid": self.last_uid}, f)
+        os.replace(tmp, self.state_file)
+
+    def run(self):
+        while cfg.TIME_INTERVAL:
+            try:
+                self._connect()
+                while True:
+                    self._fetch_new()
+                    if "IDLE" in self.imap.capabilities:
+                        self._idle(cfg.IDLE_TIMEOUT)
+                    else:
+                        time.sleep(cfg.TIME_INTERVAL)
+                        self.imap.noop()
+            except socket.error as socketerror:
+                logger.error(socketerror)
+            except imaplib.IMAP4.error as e:
+                logger.error(e)
+            except Exception as ge:
+                logger.error(ge)
+            self._disconnect()
+            logger.info("Reconnecting in %s seconds", cfg.TIME_INTERVAL)
+            time.sleep(cfg.TIME_INTERVAL)
+
+    def _connect(self):
+        if self.params["port"]:
+            self.imap = imaplib.IMAP4_SSL(
+                host=self.params["hostname"],
+                port=self.params["port"],
+                timeout=cfg.SOCKET_TIMEOUT,
+            )
+        else:
+            self.imap = imaplib.IMAP4_SSL(
+                host=self.params["hostname"], timeout=cfg.SOCKET_TIMEOUT
+            )
+        self.imap.login(self.params["username"], self.params["password"])
+        self.imap.select("INBOX")
+        _, data = self.imap.response("UIDVALIDITY")
+        uidvalidity = int(data[0]) if data and data[0] else None
+        if uidvalidity != self.uidvalidity:
+            # UIDs of another mailbox generation mean nothing; rescan unseen mail
+            logger.info("UIDVALIDITY changed to %s, rescanning", uidvalidity)
+            self.uidvalidity, self.last_uid = uidvalidity, 0
+            self._reset_progress()
+            with self._finished_lock:
+                self._finished = []
+            self._save_state()
+        logger.info("Listening for new emails...")
+
+    def _disconnect(self):
+        if self.imap is None:
+            return
+        try:
+            self.imap.logout()
+        except Exception:
+            pass
+        self.imap = None
+
+    def _apply_completions(self):
+        """Flag answered messages as seen and move the saved UID past them."""
+        with self._finished_lock:
+            finished, self._finished = self._finished, []
+        answered = []
+        for uid, ok in finished:
+            if uid not in self._in_flight:
+                continue  # handed out before a UIDVALIDITY change
+            self._in_flight.discard(uid)
+            if ok:
+                answered.append(uid)
             else:
-                imap_server = imaplib.IMAP4_SSL(host=params["hostname"])
-            imap_server.login(params["username"], params["password"])
-            imap_server.select("INBOX")
-            status, messages = imap_server.search(None, "(UNSEEN)")
-            # for i in range(messages, messages-N, -1):
-            for i in messages[0].split():
-                # fetch the email message by ID
-                res, msg = imap_server.fetch(i, "(RFC822)")
-                for response in msg:
-                    if isinstance(response, tuple):
-                        # parse a bytes email into a message object
-                        logger.info("New Email Received")
-                        msg = email.message_from_bytes(response[1])
-                        msg_id, encoding = decode_header(msg["Message-ID"])[0]
-                        if isinstance(msg_id, bytes):
-                            # if it's a bytes, decode to str
-                            msg_id = msg_id.decode(encoding)
-                            # logger.info(msg_id)
-                        # decode the email subject
-                        subject, encoding = decode_header(msg["Subject"])[0]
-                        if isinstance(subject, bytes):
-                            # if it's a bytes, decode to str
-                            subject = subject.decode(encoding)
-                            logger.info("Subject: %s", subject)
-                        # decode email sender
-                        From, encoding = decode_header(msg.get("From"))[0]
-                        if isinstance(From, bytes):
-                            From = From.decode(encoding)
-                        # logger.info("From:", From)
-                        # if the email message is multipart
-                        if msg.is_multipart():
-                            # iterate over email parts
-                            for part in msg.walk():
-                                # extract content type of email
-                                content_type = part.get_content_type()
-                                content_disposition = str(
-                                    part.get("Content-Disposition")
-                                )
-                                try:
-                                    # get the email body
-                                    # body = part.get_payload(
-                                    #    decode=True).decode()
-                                    body = part.get_payload(decode=False)
-                                except:
-                                    pass
-                                if (
-                                    content_type == "text/plain"
-                                    and "attachment" not in content_disposition
-                                ):
-                                    # print text/plain emails and skip attachments
-                                    # logger.info(body)
-                                    logger.info("Sent query to elevaite for processing")
-                                    query_result = elevaitequery(str(body))
-                                    logger.info("Query processed by elevaite")
-                                    send_email(
-                                        cfg.EMAIL_TO_LISTEN,
-                                        From,
-                                        subject,
-                                        query_result,
-                                        msg_id,
-                                        msg,
-                                    )
-                                    logger.info("Email response sent")
-                                # elif "attachment" in content_disposition:
-                                #     # download attachment
-                                #     filename = part.get_filename()
-                                #     if filename:
-                                #         folder_name = clean(subject)
-                                #         if not os.path.isdir(folder_name):
-                                #             # make a folder for this email (named after the subject)
-                                #             os.mkdir(folder_name)
-                                #         filepath = os.path.join(
-                                #             folder_name, filename)
-                                #         # download attachment and save it
-                                #         open(filepath, "wb").write(
-                                #             part.get_payload(decode=True))
-                        else:
-                            # extract content type of email
-                            content_type = msg.get_content_type()
-                            # get the email body
-                            body = msg.get_payload(decode=True).decode()
-                            if content_type == "text/plain":
-                                # print only text email parts
-                                logger.info("Sent query to elevaite for processing")
-                                query_result = elevaitequery(str(body))
-                                logger.info("Query processed by elevaite")
-                                send_email(
-                                    cfg.EMAIL_TO_LISTEN,
-                                    From,
-                                    subject,
-                                    query_result,
-                                    msg_id,
-                                    msg,
-                                )
-                                logger.info("Email response sent")
-                        # if content_type == "text/html":
-                        #     # if it's HTML, create a new HTML file and open it in browser
-                        #     folder_name = clean(subject)
-                        #     if not os.path.isdir(folder_name):
-                        #         # make a folder for this email (named after the subject)
-                        #         os.mkdir(folder_name)
-                        #     filename = "index.html"
-                        #     filepath = os.path.join(folder_name, filename)
-                        #     # write the file
-                        #     open(filepath, "w").write(body)
-                        #     # open in the default browser
-                        #     webbrowser.open(filepath)
-                        print("=" * 100)
-            # close the connection and logout
-            imap_server.close()
-            imap_server.logout()
-        except socket.error as socketerror:
-            logger.error(socketerror)
-        except imaplib.IMAP4.error as e:
+                self._failed.add(uid)
+        if answered:
+            self.imap.uid("STORE", ",".join(map(str, answered)), "+FLAGS", "(\\Seen)")
+        outstanding = self._in_flight | self._failed
+        last_uid = min(outstanding) - 1 if outstanding else self._highest_uid
+        if last_uid > self.last_uid:
+            self.last_uid = last_uid
+            self._save_state()
+
+    def _fetch_new(self):
+        self._apply_completions()
+        criteria = ["UNSEEN"]
+        if self.last_uid:
+            criteria.append(f"UID {self.last_uid + 1}:*")
+        _, data = self.imap.uid("SEARCH", None, *criteria)
+        # "n:*" always matches the newest message, even when its UID is below n
+        skip = self._in_flight | self._failed
+        uids = sorted(
+            u for u in map(int, data[0].split()) if u > self.last_uid and u not in skip
+        )
+        for start in range(0, len(uids), cfg.FETCH_BATCH_SIZE):
+            batch = uids[start : start + cfg.FETCH_BATCH_SIZE]
+            _, data = self.imap.uid(
+                "FETCH", ",".join(map(str, batch)), "(UID BODY.PEEK[])"
+            )
+            # UIDs without data (expunged meanwhile) need no answer
+            self._highest_uid = max(self._highest_uid, batch[-1])
+            for uid, raw in _parse_fetch(data):
+                logger.info("New Email Received")
+                self._in_flight.add(uid)
+                self.on_message(uid, raw)
+
+    def _idle(self, timeout):
+        """
+        Wait in IDLE until the server reports mailbox changes, a handed out
+        message is answered, or timeout.
+        """
+        tag = self.imap._new_tag()
+        self.imap.send(tag + b" IDLE\r\n")
+        line = self.imap.readline()
+        if not line.startswith(b"+"):
+            raise imaplib.IMAP4.error(f"IDLE rejected: {line!r}")
+        deadline = time.monotonic() + timeout
+        while not self._finished and not _response_buffered(self.imap):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            readable, _, _ = select.select(
+                [self.imap.sock], [], [], min(remaining, cfg.IDLE_WAKEUP_INTERVAL)
+            )
+            if readable:
+                break
+        self.imap.send(b"DONE\r\n")
+        # Drain untagged updates up to the IDLE completion
+        while True:
+            line = self.imap.readline()
+            if not line:
+                raise imaplib.IMAP4.abort("connection closed during IDLE")
+            if line.startswith(tag):
+                break
+
+
+def _response_buffered(imap):
+    """
+    Whether server data already sits in the client's buffers (TLS or imaplib's
+    file), where select() on the socket would not see it.
+    """
+    sock = imap.sock
+    if getattr(sock, "pending", lambda: 0)():
+        return True
+    timeout = sock.gettimeout()
+    sock.settimeout(0)
+    try:
+        return bool(imap.file.peek(1))
+    except (ssl.SSLWantReadError, BlockingIOError):
+        return False
+    finally:
+        sock.settimeout(timeout)
+
+
+def _parse_fetch(data):
+    """Yield (uid, raw message) pairs from a UID FETCH response."""
+    for item in data:
+        if not isinstance(item, tuple):
+            continue
+        match = re.search(rb"UID (\d+)", item[0])
+        if match:
+            yield int(match.group(1)), item[1]
+
+
+def handle_message(raw, http=None, smtp=None):
+    # parse a bytes email into a message object
+    msg = email.message_from_bytes(raw)
+    msg_id, encoding = decode_header(msg["Message-ID"])[0]
+    if isinstance(msg_id, bytes):
+        # if it's a bytes, decode to str
+        msg_id = msg_id.decode(encoding)
+    # decode the email subject
+    subject, encoding = decode_header(msg["Subject"])[0]
+    if isinstance(subject, bytes):
+        # if it's a bytes, decode to str
+        subject = subject.decode(encoding)
+        logger.info("Subject: %s", subject)
+    # decode email sender
+    From, encoding = decode_header(msg.get("From"))[0]
+    if isinstance(From, bytes):
+        From = From.decode(encoding)
+
+    bodies = []
+    # if the email message is multipart
+    if msg.is_multipart():
+        # iterate over email parts
+        for part in msg.walk():
+            # extract content type of email
+            content_type = part.get_content_type()
+            content_disposition = str(part.get("Content-Disposition"))
+            if (
+                content_type == "text/plain"
+                and "attachment" not in content_disposition
+            ):
+                # text/plain emails only, skip attachments
+                bodies.append(part.get_payload(decode=False))
+    elif msg.get_content_type() == "text/plain":
+        bodies.append(msg.get_payload(decode=True).decode())
+
+    for body in bodies:
+        logger.info("Sent query to elevaite for processing")
+        query_result = elevaitequery(str(body), http=http)
+        logger.info("Query processed by elevaite")
+        send_email(cfg.EMAIL_TO_LISTEN, From, subject, query_result, msg_id, msg, smtp)
+        logger.info("Email response sent")
+
+
+class SharedSMTP:
+    """One authenticated SMTP connection shared by the workers."""
+
+    def __init__(self):
+        self._smtp = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        smtp = smtplib.SMTP(
+            cfg.SMTP_EMAIL_HOST, cfg.SMTP_EMAIL_PORT, timeout=cfg.SOCKET_TIMEOUT
+        )
+        smtp.ehlo()
+        smtp.starttls()
+        smtp.login(cfg.EMAIL_TO_LISTEN, cfg.EMAIL_TOKEN)
+        return smtp
+
+    def sendmail(self, sender, recipient, message):
+        with self._lock:
+            if self._smtp is None:
+                self._smtp = self._connect()
+            try:
+                self._smtp.sendmail(sender, recipient, message)
+            except smtplib.SMTPServerDisconnected:
+                # Servers close idle connections; reconnect once
+                self._smtp = self._connect()
+                self._smtp.sendmail(sender, recipient, message)
+
+    def close(self):
+        with self._lock:
+            if self._smtp is not None:
+                try:
+                    self._smtp.quit()
+                except smtplib.SMTPException:
+                    pass
+                self._smtp = None
+
+
+async def _worker(queue, listener, http, smtp):
+    while True:
+        uid, raw = await queue.get()
+        ok = False
+        try:
+            await asyncio.to_thread(handle_message, raw, http, smtp)
+            ok = True
+        except Exception as e:
             logger.error(e)
-        except Exception as ge:
-            logger.error(ge)
-        logger.info("Thread going to sleep for 60 seconds")
-        time.sleep(cfg.TIME_INTERVAL)
+        finally:
+            listener.complete(uid, ok)
+            queue.task_done()
+
+
+async def serve(params, state_file=cfg.STATE_FILE):
+    """Listen for new emails and answer them with WORKER_COUNT concurrent workers."""
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=cfg.QUEUE_SIZE)
+    http = requests.Session()
+    http.mount("https://", HTTPAdapter(pool_maxsize=cfg.WORKER_COUNT))
+    http.mount("http://", HTTPAdapter(pool_maxsize=cfg.WORKER_COUNT))
+    smtp = SharedSMTP()
+
+    def enqueue(uid, raw):
+        # Blocks the IMAP thread while the queue is full (backpressure)
+        asyncio.run_coroutine_threadsafe(queue.put((uid, raw)), loop).result()
+
+    listener = ImapListener(params, enqueue, state_file=state_file)
+    workers = [
+        asyncio.create_task(_worker(queue, listener, http, smtp))
+        for _ in range(cfg.WORKER_COUNT)
+    ]
+    try:
+        await asyncio.to_thread(listener.run)
+        await queue.join()
+    finally:
+        for worker in workers:
+            worker.cancel()
+        smtp.close()
+        http.close()
+
+
+def readmessage(params):
+    asyncio.run(serve(params))
 
 
-def elevaitequery(query1):
-    print("Here is teh queryasldkfjaslkdfjlaskdjflksjd", query1)
+def elevaitequery(query1, http=None):
     req_json = {"email_query": query1}
     headers = {"Content-Type": "application/json"}
-    data = requests.post(
+    data = (http or requests).post(
         cfg.ELEVAITE_QUERY_API_URL, data=json.dumps(req_json), headers=headers
     )
     resp = data.json()
@@ -185,7 +390,7 @@ def elevaitequery(query1):
     return query_result
 
 
-def send_email(sender, recipient, subject, body, msgId, original_msg):
+def send_email(sender, recipient, subject, body, msgId, original_msg, smtp=None):
     message = MIMEMultipart("mixed")
     message["From"] = sender
     message["To"] = recipient
@@ -214,7 +419,9 @@ def send_email(sender, recipient, subject, body, msgId, original_msg):
     #     th_index = original_msg.decode(encoding)
     # message['Thread-Index'] = th_index
 
-    print("after attach")
+    if smtp is not None:
+        smtp.sendmail(sender, recipient, message.as_string())
+        return
     with smtplib.SMTP(cfg.SMTP_EMAIL_HOST, cfg.SMTP_EMAIL_PORT) as smtp:
         smtp.ehlo()
         smtp.starttls()
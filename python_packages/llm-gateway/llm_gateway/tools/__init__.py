@@ -6,6 +6,14 @@ by all providers (e.g., web search for Bedrock and On-Prem).
 """
 
 from .web_search import web_search, WebSearchResult
+from .web_fetch import WebContentFetcher, get_web_fetcher
 from .code_execution import execute_python, EXECUTE_PYTHON_SCHEMA
 
-__all__ = ["web_search", "WebSearchResult", "execute_python", "EXECUTE_PYTHON_SCHEMA"]
+__all__ = [
+    "web_search",
+    "WebSearchResult",
+    "WebContentFetcher",
+    "get_web_fetcher",
+    "execute_python",
+    "EXECUTE_PYTHON_SCHEMA",
+]
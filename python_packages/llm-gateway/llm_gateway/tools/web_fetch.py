@@ -0,0 +1,283 @@
+"""
+Shared async web fetch-and-extract service.
+
+Fetches pages concurrently over one pooled aiohttp session with per-host
+connection limits and timeouts, converts the HTML body to Markdown and keeps
+the result in a TTL cache keyed by URL. Expired entries are revalidated with a
+conditional GET (ETag/Last-Modified), and extraction is memoized by content
+hash so unchanged pages are neither re-downloaded nor re-parsed.
+
+The service runs on its own background event loop, so it can be shared by
+async callers (``await fetcher.fetch_markdown_many(...)``) and blocking
+callers (``fetcher.fetch_markdown_many_sync(...)``) alike.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+import aiohttp
+import markdownify
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (compatible; LLMGateway/1.0)"
+
+
+def html_to_markdown(html: str) -> str:
+    """
+    Convert an HTML document's body to Markdown, dropping scripts, styles and page chrome.
+
+    Args:
+        html: The raw HTML document
+
+    Returns:
+        The body content in Markdown format, or a message if the page has no body
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Remove script and style elements
+    for element in soup(["script", "style", "nav", "footer", "header"]):
+        element.decompose()
+
+    content = soup.find("body")
+    if not content:
+        return "No content found in the webpage body."
+    return markdownify.markdownify(str(content), heading_style="ATX")
+
+
+@dataclass
+class CachedPage:
+    """A fetched page and the validators needed to revalidate it."""
+
+    url: str
+    content: str
+    content_hash: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+
+
+class WebContentFetcher:
+    """
+    Concurrent, caching URL-to-text fetcher.
+
+    Args:
+        ttl_seconds: How long a fetched page is served without revalidation
+        max_entries: Maximum number of cached pages (least recently used are evicted)
+        timeout_seconds: Total timeout per request
+        max_connections: Maximum concurrent connections overall
+        max_connections_per_host: Maximum concurrent connections per host
+        extractor: Callable converting raw HTML to text (default: Markdown)
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 900,
+        max_entries: int = 512,
+        timeout_seconds: float = 10,
+        max_connections: int = 32,
+        max_connections_per_host: int = 4,
+        user_agent: str = DEFAULT_USER_AGENT,
+        extractor: Callable[[str], str] = html_to_markdown,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.timeout_seconds = timeout_seconds
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.user_agent = user_agent
+        self.extractor = extractor
+
+        self._pages: "OrderedDict[str, CachedPage]" = OrderedDict()
+        self._extracted_by_hash: "OrderedDict[str, str]" = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+
+    # ------------------------------------------------------------------ loop
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is not None:
+            return self._loop
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="web-fetcher", daemon=True
+                ).start()
+                self._loop = loop
+        return self._loop
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    limit_per_host=self.max_connections_per_host,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout_seconds),
+                headers={"User-Agent": self.user_agent},
+            )
+        return self._session
+
+    # ----------------------------------------------------------------- cache
+
+    def _store_page(self, page: CachedPage) -> None:
+        self._pages[page.url] = page
+        self._pages.move_to_end(page.url)
+        while len(self._pages) > self.max_entries:
+            self._pages.popitem(last=False)
+
+    async def _extract(self, html: str, content_hash: str) -> str:
+        cached = self._extracted_by_hash.get(content_hash)
+        if cached is not None:
+            self._extracted_by_hash.move_to_end(content_hash)
+            return cached
+        # HTML parsing is CPU-bound; keep it off the fetch loop
+        content = await asyncio.get_running_loop().run_in_executor(
+            None, self.extractor, html
+        )
+        self._extracted_by_hash[content_hash] = content
+        while len(self._extracted_by_hash) > self.max_entries:
+            self._extracted_by_hash.popitem(last=False)
+        return content
+
+    # ----------------------------------------------------------------- fetch
+
+    async def _fetch(self, url: str) -> str:
+        cached = self._pages.get(url)
+        if cached is not None and cached.expires_at > time.monotonic():
+            self._pages.move_to_end(url)
+            return cached.content
+
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        async with self._get_session().get(url, headers=headers) as response:
+            if response.status == 304 and cached is not None:
+                cached.expires_at = time.monotonic() + self.ttl_seconds
+                self._pages.move_to_end(url)
+                return cached.content
+            response.raise_for_status()
+            body = await response.read()
+            html = body.decode(response.get_encoding() or "utf-8", errors="replace")
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+
+        content_hash = hashlib.sha256(body).hexdigest()
+        content = await self._extract(html, content_hash)
+        self._store_page(
+            CachedPage(
+                url=url,
+                content=content,
+                content_hash=content_hash,
+                etag=etag,
+                last_modified=last_modified,
+                expires_at=time.monotonic() + self.ttl_seconds,
+            )
+        )
+        return content
+
+    async def _fetch_single_flight(self, url: str) -> str:
+        # Concurrent requests for the same URL share one download
+        inflight = self._inflight.get(url)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        task = asyncio.ensure_future(self._fetch(url))
+        self._inflight[url] = task
+        try:
+            return await task
+        finally:
+            self._inflight.pop(url, None)
+
+    async def _fetch_text(self, url: str, max_chars: int) -> str:
+        try:
+            return (await self._fetch_single_flight(url))[:max_chars]
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Error fetching URL {url}: {e}")
+            return f"Error fetching URL: {e}"
+
+    async def _fetch_many(self, urls: Sequence[str], max_chars: int) -> List[str]:
+        return list(
+            await asyncio.gather(*(self._fetch_text(url, max_chars) for url in urls))
+        )
+
+    # ------------------------------------------------------------ public API
+
+    async def fetch_markdown_many(
+        self, urls: Sequence[str], max_chars: int = 20000
+    ) -> List[str]:
+        """
+        Fetch and extract several URLs concurrently.
+
+        Args:
+            urls: The URLs to fetch
+            max_chars: Maximum characters to return per page
+
+        Returns:
+            The extracted content of each URL, in input order; failed fetches
+            yield an error message instead of raising
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self._fetch_many(urls, max_chars), self._ensure_loop()
+        )
+        return await asyncio.wrap_future(future)
+
+    async def fetch_markdown(self, url: str, max_chars: int = 20000) -> str:
+        """Fetch and extract a single URL. See ``fetch_markdown_many``."""
+        return (await self.fetch_markdown_many([url], max_chars))[0]
+
+    def fetch_markdown_many_sync(
+        self, urls: Sequence[str], max_chars: int = 20000
+    ) -> List[str]:
+        """Blocking variant of ``fetch_markdown_many`` for synchronous callers."""
+        future = asyncio.run_coroutine_threadsafe(
+            self._fetch_many(urls, max_chars), self._ensure_loop()
+        )
+        return future.result()
+
+    def fetch_markdown_sync(self, url: str, max_chars: int = 20000) -> str:
+        """Blocking variant of ``fetch_markdown`` for synchronous callers."""
+        return self.fetch_markdown_many_sync([url], max_chars)[0]
+
+
+_web_fetcher: Optional[WebContentFetcher] = None
+_web_fetcher_lock = threading.Lock()
+
+
+def get_web_fetcher() -> WebContentFetcher:
+    """
+    Return the process-wide fetcher, configured from the environment.
+
+    Environment variables:
+        WEB_FETCH_CACHE_TTL_SECONDS: Page cache TTL (default: 900)
+        WEB_FETCH_CACHE_MAX_ENTRIES: Maximum cached pages (default: 512)
+        WEB_FETCH_TIMEOUT_SECONDS: Per-request timeout (default: 10)
+        WEB_FETCH_MAX_CONNECTIONS_PER_HOST: Per-host connection limit (default: 4)
+    """
+    global _web_fetcher
+    if _web_fetcher is None:
+        with _web_fetcher_lock:
+            if _web_fetcher is None:
+                _web_fetcher = WebContentFetcher(
+                    ttl_seconds=float(os.getenv("WEB_FETCH_CACHE_TTL_SECONDS", "900")),
+                    max_entries=int(os.getenv("WEB_FETCH_CACHE_MAX_ENTRIES", "512")),
+                    timeout_seconds=float(os.getenv("WEB_FETCH_TIMEOUT_SECONDS", "10")),
+                    max_connections_per_host=int(
+                        os.getenv("WEB_FETCH_MAX_CONNECTIONS_PER_HOST", "4")
+                    ),
+                )
+    return _web_fetcher
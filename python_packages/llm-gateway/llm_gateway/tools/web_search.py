@@ -10,8 +10,8 @@ import logging
 import requests
 from typing import Optional, List
 from dataclasses import dataclass
-from bs4 import BeautifulSoup
-import markdownify
+
+from .web_fetch import get_web_fetcher
 
 
 # Environment variables for Google Custom Search API
@@ -33,6 +33,9 @@ def url_to_markdown(url: str, max_chars: int = 20000) -> str:
     """
     Convert a webpage URL to Markdown format.
 
+    Pages are fetched through the shared web fetcher, so repeated lookups of
+    the same URL are served from its cache.
+
     Args:
         url: The URL of the webpage to convert
         max_chars: Maximum characters to return (default: 20000)
@@ -40,33 +43,7 @@ def url_to_markdown(url: str, max_chars: int = 20000) -> str:
     Returns:
         The webpage content in Markdown format or an error message
     """
-    try:
-        response = requests.get(
-            url,
-            headers={"User-Agent": "Mozilla/5.0 (compatible; LLMGateway/1.0)"},
-            timeout=10,
-        )
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Remove script and style elements
-        for element in soup(["script", "style", "nav", "footer", "header"]):
-            element.decompose()
-
-        content = soup.find("body")
-
-        if content:
-            markdown_content = markdownify.markdownify(
-                str(content), heading_style="ATX"
-            )
-            return markdown_content[:max_chars]
-        else:
-            return "No content found in the webpage body."
-
-    except requests.RequestException as e:
-        logging.warning(f"Error fetching URL {url}: {e}")
-        return f"Error fetching URL: {e}"
+    return get_web_fetcher().fetch_markdown_sync(url, max_chars)
 
 
 def web_search(
@@ -121,19 +98,23 @@ def web_search(
             logging.info(f"No search results found for query: {query}")
             return []
 
-        results = []
-        for item in search_data["items"]:
-            result = WebSearchResult(
+        results = [
+            WebSearchResult(
                 title=item.get("title", ""),
                 url=item.get("link", ""),
                 snippet=item.get("snippet", ""),
             )
+            for item in search_data["items"]
+        ]
 
-            # Optionally fetch full page content
-            if fetch_content and result.url:
-                result.content = url_to_markdown(result.url, max_content_chars)
-
-            results.append(result)
+        # Optionally fetch full page content, all result pages concurrently
+        if fetch_content:
+            to_fetch = [result for result in results if result.url]
+            contents = get_web_fetcher().fetch_markdown_many_sync(
+                [result.url for result in to_fetch], max_content_chars
+            )
+            for result, content in zip(to_fetch, contents):
+                result.content = content
 
         return results
 
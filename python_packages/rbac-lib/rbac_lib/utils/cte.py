@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session, aliased
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import and_, select, Integer, literal_column
+from sqlalchemy import and_, func, select
 from typing import List, Union
 from uuid import UUID
 
@@ -11,72 +11,29 @@ def is_user_project_association_till_root(
     db: Session, starting_project_id: UUID, user_id: UUID
 ):
     try:
-        # Base part of the CTE: start from the given project and ensure there's a User_Project association
-        base_cte = (
+        # Every ancestor of the starting project (including itself) comes from a single indexed lookup on the
+        # closure table; the user must be associated with each of them for the chain to reach the root.
+        ancestors = (
+            select(models.Project_Closure.ancestor_id)
+            .where(models.Project_Closure.descendant_id == starting_project_id)
+            .subquery()
+        )
+        ancestor_count, associated_count = db.execute(
             select(
-                models.Project.id.label("project_id"),
-                models.Project.parent_project_id,
-                literal_column("1", Integer).label("height"),  # Start height at 1
-            )
-            .join(
-                models.User_Project,
-                and_(
-                    models.User_Project.project_id == models.Project.id,
-                    models.User_Project.user_id == user_id,
-                ),
+                func.count(ancestors.c.ancestor_id),
+                func.count(models.User_Project.id),
             )
-            .filter(models.Project.id == starting_project_id)
-            .cte(name="ancestor_path", recursive=True)
-        )
-
-        # Aliases for the recursive part
-        ancestor_cte = aliased(base_cte, name="ancestor")
-        project_alias = aliased(models.Project, name="project")
-
-        # Recursive part: move upwards in the project hierarchy, ensuring User_Project association at each step
-        recursive_part = select(
-            project_alias.id,
-            project_alias.parent_project_id,
-            (ancestor_cte.c.height + 1).label(
-                "height"
-            ),  # Increment height at each step
-            # (ancestor_cte.c.read_permission_count + read_permission_case).label('read_permission_count') # conditionally increment read permission count if it exists
-        ).select_from(
-            ancestor_cte.join(
-                project_alias, project_alias.id == ancestor_cte.c.parent_project_id
-            ).join(
+            .select_from(ancestors)
+            .outerjoin(
                 models.User_Project,
                 and_(
-                    models.User_Project.project_id == project_alias.id,
+                    models.User_Project.project_id == ancestors.c.ancestor_id,
                     models.User_Project.user_id == user_id,
                 ),
             )
-        )
-
-        base_cte = base_cte.union_all(recursive_part)
+        ).one()
 
-        # Query the CTE, order by height to get the project with the greatest height
-        last_project = db.query(base_cte).order_by(base_cte.c.height.desc()).first()
-
-        # if last_project:
-        #    print(f"last_project.height = {last_project.height}")
-
-        # all_projects = db.query(base_cte).order_by(base_cte.c.height.desc()).all()
-        # for project in all_projects:
-        #    print(f'project.id = {project[0]}')
-        #    print(f'project.parent_project_id = {project[1]}')
-        #    print(f'project.height = {project[2]}')
-        #    print('-------------------------')
-        # if last_project:
-        #    print(f'last_project.id = {last_project[0]}')
-        #    print(f'last_project.parent_project_id = {last_project[1]}')
-        #    print(f'last_project.height = {last_project[2]}')
-        # Check if the last project (greatest height) is the root
-
-        if last_project and last_project.parent_project_id is None:
-            return True
-        else:
-            return False
+        return ancestor_count > 0 and ancestor_count == associated_count
     except SQLAlchemyError as e:
         db.rollback()
         print(f"INSIDE is_user_project_association_till_root method, DB Error : {e}")
@@ -105,43 +62,22 @@ def delete_user_project_associations_for_subprojects(
     db: Session, starting_project_id: UUID, user_id_or_user_ids: Union[List[UUID], UUID]
 ):
     try:
-        # Define the base part of the CTE
-        cte = (
-            select(
-                models.Project.id.label("project_id"),
-            )
-            .where(models.Project.id == starting_project_id)
-            .cte(name="descendants", recursive=True)
-        )
-
-        # Define aliases for recursive part
-        descendant_alias = aliased(cte, name="d")
-        project_alias = aliased(models.Project, name="p")
-
-        # Recursive part of the CTE
-        union_query = select(
-            project_alias.id.label("project_id"),
-        ).select_from(
-            descendant_alias.join(
-                project_alias,
-                project_alias.parent_project_id == descendant_alias.c.project_id,
-            )
+        # All descendants of the starting project (including itself) from the closure table
+        descendant_project_ids = select(models.Project_Closure.descendant_id).where(
+            models.Project_Closure.ancestor_id == starting_project_id
         )
 
-        # Combine base and recursive parts
-        cte = cte.union_all(union_query)
-
         if isinstance(user_id_or_user_ids, list):
             # If user_id_or_user_ids is a list, use the `in_` operator
             delete_query = db.query(models.User_Project).filter(
                 models.User_Project.user_id.in_(user_id_or_user_ids),
-                models.User_Project.project_id.in_(db.query(cte.c.project_id)),
+                models.User_Project.project_id.in_(descendant_project_ids),
             )
         else:
             # If user_id_or_user_ids is a single UUID, use the `==` operator
             delete_query = db.query(models.User_Project).filter(
                 models.User_Project.user_id == user_id_or_user_ids,
-                models.User_Project.project_id.in_(db.query(cte.c.project_id)),
+                models.User_Project.project_id.in_(descendant_project_ids),
             )
         delete_query.delete(synchronize_session=False)
         # print(f'deleted User_Project count = {delete_count}')
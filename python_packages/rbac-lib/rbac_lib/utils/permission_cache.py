@@ -0,0 +1,149 @@
+import os
+import time
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from elevaitelib.orm.db import models
+
+
+class CompiledAccountPermissions:
+    """
+    The union of all role permissions assigned to one user in one account (a single User_Account row),
+    loaded with one query so that repeated account-scoped permission checks during a validation
+    are dictionary lookups instead of one JSONB query per model in the validation precedence order.
+    """
+
+    def __init__(self, role_permissions: List[Dict[str, Any]]):
+        self._role_permissions = role_permissions
+
+    def has_action(self, permission_path: List[str], action: str) -> bool:
+        for permissions in self._role_permissions:
+            current = permissions
+            for key in permission_path:
+                if not isinstance(current, dict) or key not in current:
+                    current = None
+                    break
+                current = current[key]
+            if current == action:
+                return True
+        return False
+
+
+# Key in Session.info holding the permissions compiled during that session (i.e. one request)
+_SESSION_INFO_KEY = "rbac_compiled_account_permissions"
+
+
+class _AccountPermissionsCache:
+    """
+    Process-wide cache of compiled account permissions, shared across requests.
+
+    Invalidation is process-local: writes made through this process are seen immediately, but role
+    changes made by another process (another worker or service) are only picked up once the entry
+    expires, so permissions may be stale for up to RBAC_PERMISSION_CACHE_TTL_SECONDS. The default
+    of 0 disables this cache; within one session the compiled permissions are always reused.
+    """
+
+    _lock: Lock = Lock()
+
+    def __init__(self):
+        self._entries: Dict[UUID, Tuple[float, CompiledAccountPermissions]] = {}
+
+    @property
+    def ttl_seconds(self) -> float:
+        # Upper bound on how long a role change made by another process can go unnoticed; 0 disables
+        return float(os.getenv("RBAC_PERMISSION_CACHE_TTL_SECONDS", "0"))
+
+    def get(self, user_account_id: UUID) -> Optional[CompiledAccountPermissions]:
+        with self._lock:
+            entry = self._entries.get(user_account_id)
+            if entry is None:
+                return None
+            expires_at, compiled = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_account_id]
+                return None
+            return compiled
+
+    def put(self, user_account_id: UUID, compiled: CompiledAccountPermissions):
+        ttl_seconds = self.ttl_seconds
+        if ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[user_account_id] = (time.monotonic() + ttl_seconds, compiled)
+
+    def invalidate(self, user_account_id: UUID):
+        with self._lock:
+            self._entries.pop(user_account_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+account_permissions_cache = _AccountPermissionsCache()
+
+
+def get_compiled_account_permissions(
+    db: Session, user_account_id: UUID
+) -> CompiledAccountPermissions:
+    session_cache = db.info.setdefault(_SESSION_INFO_KEY, {})
+    compiled = session_cache.get(user_account_id)
+    if compiled is not None:
+        return compiled
+    compiled = account_permissions_cache.get(user_account_id)
+    if compiled is not None:
+        session_cache[user_account_id] = compiled
+        return compiled
+
+    role_permissions = (
+        db.execute(
+            select(models.Role.permissions)
+            .join(
+                models.Role_User_Account,
+                models.Role_User_Account.role_id == models.Role.id,
+            )
+            .where(models.Role_User_Account.user_account_id == user_account_id)
+        )
+        .scalars()
+        .all()
+    )
+    compiled = CompiledAccountPermissions(
+        [permissions for permissions in role_permissions if permissions]
+    )
+    session_cache[user_account_id] = compiled
+    account_permissions_cache.put(user_account_id, compiled)
+    return compiled
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_changed_account_permissions(session: Session, flush_context):
+    # Local writes invalidate immediately; other processes pick up changes once their TTL expires.
+    session_cache = session.info.get(_SESSION_INFO_KEY, {})
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, models.Role):
+            session_cache.clear()
+            account_permissions_cache.clear()
+            return
+        if isinstance(instance, models.Role_User_Account):
+            session_cache.pop(instance.user_account_id, None)
+            account_permissions_cache.invalidate(instance.user_account_id)
+        elif isinstance(instance, models.User_Account):
+            session_cache.pop(instance.id, None)
+            account_permissions_cache.invalidate(instance.id)
+
+
+@event.listens_for(Session, "after_bulk_delete")
+@event.listens_for(Session, "after_bulk_update")
+def _invalidate_bulk_changed_account_permissions(update_context):
+    # Query.delete()/Query.update() bypass the unit of work, so the affected rows are unknown here.
+    if update_context.mapper.class_ in (
+        models.Role,
+        models.Role_User_Account,
+        models.User_Account,
+    ):
+        update_context.session.info.pop(_SESSION_INFO_KEY, None)
+        account_permissions_cache.clear()
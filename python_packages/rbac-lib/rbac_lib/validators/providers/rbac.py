@@ -12,11 +12,11 @@ from rbac_lib.utils.api_error import ApiError
 
 from rbac_lib.utils.funcs import (
     snake_to_camel,
-    construct_jsonb_path_expression,
 )
 from rbac_lib.utils.cte import (
     is_user_project_association_till_root,
 )
+from rbac_lib.utils.permission_cache import get_compiled_account_permissions
 from .config import (
     account_scoped_permissions as account_scoped_permissions_schema,
     project_scoped_permissions as project_scoped_permissions_schema,
@@ -1470,29 +1470,13 @@ class RBACProvider:
         permission_path: list[str],
         action: str,
     ) -> bool:
-        # Construct the JSONB path expression for the permission check
-        jsonb_path_expression = construct_jsonb_path_expression(
-            JSONB_obj=models.Role.permissions,
-            permission_path=permission_path,
-            action_value=action,
-        )
-
-        # Check if the permission exists for any of the user's roles
-        permission_exists = db.query(
-            db.query(models.Role)
-            .join(
-                models.Role_User_Account,
-                models.Role_User_Account.role_id == models.Role.id,
-            )
-            .filter(
-                models.Role_User_Account.user_account_id
-                == logged_in_user_account_association_id,
-                jsonb_path_expression,
-            )
-            .exists()
-        ).scalar()
-
-        return permission_exists
+        # Check if the permission exists for any of the user's roles, using the user's compiled
+        # account permission set so repeated checks within a validation do not re-query the roles
+        if logged_in_user_account_association_id is None:
+            return False
+        return get_compiled_account_permissions(
+            db, logged_in_user_account_association_id
+        ).has_action(permission_path, action)
 
     async def _check_project_scoped_permission_overrides_exist(
         self,
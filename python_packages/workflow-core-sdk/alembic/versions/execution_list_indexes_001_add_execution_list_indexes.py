@@ -0,0 +1,53 @@
+"""add execution listing indexes
+
+Revision ID: execution_list_indexes_001
+Revises: workflow_schedules_001
+Create Date: 2026-10-18
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "execution_list_indexes_001"
+down_revision: Union[str, None] = "workflow_schedules_001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add composite indexes for keyset-paginated execution listings."""
+    # ORDER BY created_at DESC, id DESC (unfiltered listing)
+    op.create_index(
+        "ix_workflowexecution_created_at_id",
+        "workflowexecution",
+        ["created_at", "id"],
+        unique=False,
+    )
+    # WHERE workflow_id = ? ORDER BY created_at DESC, id DESC
+    op.create_index(
+        "ix_workflowexecution_workflow_id_created_at",
+        "workflowexecution",
+        ["workflow_id", "created_at", "id"],
+        unique=False,
+    )
+    # WHERE status = ? ORDER BY created_at DESC, id DESC
+    op.create_index(
+        "ix_workflowexecution_status_created_at",
+        "workflowexecution",
+        ["status", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Remove execution listing indexes."""
+    op.drop_index(
+        "ix_workflowexecution_status_created_at", table_name="workflowexecution"
+    )
+    op.drop_index(
+        "ix_workflowexecution_workflow_id_created_at", table_name="workflowexecution"
+    )
+    op.drop_index("ix_workflowexecution_created_at_id", table_name="workflowexecution")
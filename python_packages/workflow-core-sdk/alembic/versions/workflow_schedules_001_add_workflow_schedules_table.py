@@ -0,0 +1,64 @@
+"""add workflow_schedules table
+
+Revision ID: workflow_schedules_001
+Revises: a2a_agents_001
+Create Date: 2026-10-18
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = "workflow_schedules_001"
+down_revision: Union[str, None] = "a2a_agents_001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add workflow_schedules table holding the next run of scheduled workflows."""
+    op.create_table(
+        "workflow_schedules",
+        sa.Column("workflow_id", sa.Uuid(), nullable=False),
+        # Schedule definition (copied from the workflow's trigger step)
+        sa.Column("mode", sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+        sa.Column("cron", sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+        sa.Column(
+            "timezone", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False
+        ),
+        sa.Column("seconds_at_beginning", sa.Boolean(), nullable=False),
+        sa.Column("interval_seconds", sa.Integer(), nullable=True),
+        sa.Column("jitter_seconds", sa.Integer(), nullable=False),
+        sa.Column(
+            "backend", sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False
+        ),
+        sa.Column(
+            "signature", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False
+        ),
+        # Scheduler state
+        sa.Column("next_run_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_run_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["workflow_id"], ["workflow.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("workflow_id"),
+    )
+
+    # Due-schedule lookups: WHERE next_run_at <= now() ORDER BY next_run_at
+    op.create_index(
+        "ix_workflow_schedules_next_run_at",
+        "workflow_schedules",
+        ["next_run_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Remove workflow_schedules table."""
+    op.drop_index(
+        "ix_workflow_schedules_next_run_at", table_name="workflow_schedules"
+    )
+    op.drop_table("workflow_schedules")
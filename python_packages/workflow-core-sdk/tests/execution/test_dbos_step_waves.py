@@ -0,0 +1,103 @@
+"""
+Unit tests for DBOS step scheduling helpers
+
+Tests grouping of topologically sorted steps into concurrent waves, and how
+a wave runs them.
+"""
+
+import asyncio
+
+import pytest
+
+from workflow_core_sdk.dbos_impl.workflows import (
+    _PendingStep,
+    _dependency_waves,
+    _run_wave,
+    _topological_sort_steps,
+)
+
+
+def _ids(waves):
+    return [[step["step_id"] for step in wave] for wave in waves]
+
+
+class TestDependencyWaves:
+    def test_independent_steps_share_a_wave(self):
+        steps = _topological_sort_steps(
+            [
+                {"step_id": "trigger"},
+                {"step_id": "a", "dependencies": ["trigger"]},
+                {"step_id": "b", "dependencies": ["trigger"]},
+                {"step_id": "merge", "dependencies": ["a", "b"]},
+            ]
+        )
+        assert _ids(_dependency_waves(steps)) == [["trigger"], ["a", "b"], ["merge"]]
+
+    def test_input_mapping_counts_as_dependency(self):
+        steps = [
+            {"step_id": "a"},
+            {"step_id": "b", "input_mapping": {"text": "a.output.text"}},
+            {"step_id": "c", "config": {"input_mapping": {"x": "b.value"}}},
+        ]
+        assert _ids(_dependency_waves(steps)) == [["a"], ["b"], ["c"]]
+
+    def test_unknown_dependencies_are_ignored(self):
+        steps = [{"step_id": "a", "dependencies": ["missing"]}, {"step_id": "b"}]
+        assert _ids(_dependency_waves(steps)) == [["a", "b"]]
+
+
+class FakeSteps:
+    """Records step attempts; statuses maps step_id to the first attempt's status"""
+
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.log = []
+        self.active_resumes = 0
+        self.max_active_resumes = 0
+
+    async def run_step(self, step, defer_waits=False, resume_with=None):
+        step_id = step["step_id"]
+        if resume_with is not None:
+            self.active_resumes += 1
+            self.max_active_resumes = max(self.max_active_resumes, self.active_resumes)
+            self.log.append(("resume", step_id))
+            await asyncio.sleep(0.01)
+            self.active_resumes -= 1
+            return None
+        self.log.append(("start", step_id))
+        await asyncio.sleep(0)
+        status = self.statuses.get(step_id, "completed")
+        if status == "failed":
+            return {"success": False, "failed_step": step_id}
+        if status in ("waiting", "ingesting"):
+            assert defer_waits
+            return _PendingStep({"status": status})
+        return None
+
+
+class TestRunWave:
+    @pytest.mark.asyncio
+    async def test_waiting_steps_resume_one_at_a_time_in_wave_order(self):
+        steps = FakeSteps({"a": "ingesting", "c": "waiting"})
+        wave = [{"step_id": sid} for sid in ("a", "b", "c")]
+
+        assert await _run_wave(wave, steps.run_step) is None
+
+        assert steps.log == [
+            ("start", "a"),
+            ("start", "b"),
+            ("start", "c"),
+            ("resume", "a"),
+            ("resume", "c"),
+        ]
+        assert steps.max_active_resumes == 1
+
+    @pytest.mark.asyncio
+    async def test_failure_is_returned_without_resuming_waiting_siblings(self):
+        steps = FakeSteps({"a": "waiting", "b": "failed"})
+        wave = [{"step_id": "a"}, {"step_id": "b"}]
+
+        failure = await _run_wave(wave, steps.run_step)
+
+        assert failure["failed_step"] == "b"
+        assert ("resume", "a") not in steps.log
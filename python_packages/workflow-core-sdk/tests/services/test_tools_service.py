@@ -6,7 +6,7 @@ Tests the business logic of tools, categories, and MCP server operations with mo
 
 import uuid
 from datetime import datetime, timezone
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -22,6 +22,11 @@ from workflow_core_sdk.db.models import (
     MCPServerUpdate,
 )
 from workflow_core_sdk.services.tools_service import ToolsService
+from workflow_core_sdk.tools.registry import (
+    ToolRegistry,
+    UnifiedTool,
+    get_tool_registry_version,
+)
 
 
 @pytest.fixture
@@ -563,3 +568,93 @@ class TestMCPServerOperations:
 
         assert result is False
         mock_session.delete.assert_not_called()
+
+
+class TestToolRegistryInvalidation:
+    """Tests that tool writes invalidate cached tool registries"""
+
+    def test_delete_db_tool_bumps_registry_version(self, mock_session, sample_tool):
+        """Test that a successful write bumps the registry version"""
+        mock_result = MagicMock()
+        mock_result.first.return_value = sample_tool
+        mock_session.exec.return_value = mock_result
+
+        before = get_tool_registry_version()
+        ToolsService.delete_db_tool(mock_session, str(sample_tool.id))
+
+        assert get_tool_registry_version() == before + 1
+
+    def test_failed_write_keeps_registry_version(self, mock_session):
+        """Test that a write that finds nothing leaves the version alone"""
+        mock_result = MagicMock()
+        mock_result.first.return_value = None
+        mock_session.exec.return_value = mock_result
+
+        before = get_tool_registry_version()
+        ToolsService.delete_mcp_server(mock_session, str(uuid.uuid4()))
+
+        assert get_tool_registry_version() == before
+
+
+def _unified_tool(name, source):
+    return UnifiedTool(
+        name=name,
+        description=f"{source} {name}",
+        parameters_schema={"type": "object", "properties": {}},
+        return_schema=None,
+        execution_type="function" if source == "local" else "api",
+        version="1.0.0",
+        source=source,
+        uri=f"{source}://{name}",
+    )
+
+
+class TestToolRegistryPrecedence:
+    """Tests the DB > Local > MCP precedence of the merged tool map"""
+
+    @pytest.fixture
+    def registry(self):
+        registry = ToolRegistry()
+        registry.invalidate()
+        yield registry
+        registry.invalidate()
+
+    def test_mcp_tool_does_not_shadow_local_tool(self, registry, mock_session):
+        """Test that a local tool wins over an MCP tool with the same name"""
+        with (
+            patch.object(registry, "_load_db", return_value={}),
+            patch.object(
+                registry,
+                "_load_local",
+                return_value={"add_numbers": _unified_tool("add_numbers", "local")},
+            ),
+            patch.object(
+                registry,
+                "_load_mcp",
+                return_value={
+                    "add_numbers": _unified_tool("add_numbers", "mcp"),
+                    "remote_only": _unified_tool("remote_only", "mcp"),
+                },
+            ),
+        ):
+            assert registry.get_tool_by_name(mock_session, "add_numbers").source == "local"
+            assert registry.get_tool_by_name(mock_session, "remote_only").source == "mcp"
+
+    def test_db_tool_wins_over_local_and_mcp(self, registry, mock_session):
+        """Test that a DB tool wins over local and MCP tools with the same name"""
+        with (
+            patch.object(
+                registry, "_load_db", return_value={"add_numbers": _unified_tool("add_numbers", "db")}
+            ),
+            patch.object(
+                registry,
+                "_load_local",
+                return_value={"add_numbers": _unified_tool("add_numbers", "local")},
+            ),
+            patch.object(
+                registry,
+                "_load_mcp",
+                return_value={"add_numbers": _unified_tool("add_numbers", "mcp")},
+            ),
+        ):
+            assert registry.get_tool_by_name(mock_session, "add_numbers").source == "db"
@@ -0,0 +1,89 @@
+"""
+Tests for keyset-paginated execution listing in DatabaseService
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy.pool import StaticPool
+
+from workflow_core_sdk.db.models import ExecutionStatus, WorkflowExecution
+from workflow_core_sdk.db.service import DatabaseService
+
+
+@pytest.fixture(name="session")
+def session_fixture():
+    """Create an in-memory SQLite database with seven executions"""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def workflow_ids(session: Session):
+    workflow_ids = [uuid.uuid4(), uuid.uuid4()]
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i in range(7):
+        session.add(
+            WorkflowExecution(
+                workflow_id=workflow_ids[i % 2],
+                status=ExecutionStatus.COMPLETED if i % 3 else ExecutionStatus.FAILED,
+                # Two executions share each timestamp to exercise the id tie-break
+                created_at=base + timedelta(minutes=i // 2),
+                step_io_data={"large": "x" * 1000},
+            )
+        )
+    session.commit()
+    return workflow_ids
+
+
+def test_cursor_pages_cover_all_executions(session: Session, workflow_ids):
+    db = DatabaseService()
+    seen = []
+    cursor = None
+    while True:
+        page = db.list_executions_page(session, limit=3, cursor=cursor)
+        seen.extend(page["executions"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 7
+    assert len({e["execution_id"] for e in seen}) == 7
+    keys = [(e["created_at"], e["execution_id"]) for e in seen]
+    assert keys == sorted(keys, reverse=True)
+    assert "step_io_data" not in seen[0]
+
+
+def test_filters_and_offset_match_cursor(session: Session, workflow_ids):
+    db = DatabaseService()
+    workflow_id = str(workflow_ids[0])
+
+    first = db.list_executions_page(session, workflow_id=workflow_id, limit=2)
+    by_cursor = db.list_executions(
+        session, workflow_id=workflow_id, limit=2, cursor=first["next_cursor"]
+    )
+    by_offset = db.list_executions(session, workflow_id=workflow_id, limit=2, offset=2)
+
+    assert by_cursor == by_offset
+    assert all(e["workflow_id"] == workflow_id for e in by_cursor)
+
+
+def test_total_estimate(session: Session, workflow_ids):
+    page = DatabaseService().list_executions_page(
+        session, status="failed", include_total_estimate=True
+    )
+    assert page["total_estimate"] == len(page["executions"]) == 3
+    assert page["next_cursor"] is None
+
+
+def test_invalid_cursor(session: Session):
+    with pytest.raises(ValueError):
+        DatabaseService().list_executions(session, cursor="not-a-cursor")
@@ -0,0 +1,76 @@
+"""
+Tests for the search_path bookkeeping of shared-engine connections
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from workflow_core_sdk.db import database
+from workflow_core_sdk.multitenancy import multitenancy_settings
+
+
+class FakeDBAPIConnection:
+    """Records the statements run by the checkout listener"""
+
+    def __init__(self):
+        self.statements = []
+
+    def cursor(self):
+        return SimpleNamespace(execute=self.statements.append, close=lambda: None)
+
+    def commit(self):
+        pass
+
+
+@pytest.fixture
+def tenant_context():
+    from db_core.middleware import set_current_tenant_id
+
+    yield set_current_tenant_id
+    set_current_tenant_id(None)
+
+
+def checkout(connection, record):
+    database._apply_tenant_schema_on_checkout(connection, record, None)
+
+
+def test_checkout_sets_search_path_only_on_tenant_switch(tenant_context):
+    connection, record = FakeDBAPIConnection(), SimpleNamespace(info={})
+
+    checkout(connection, record)
+    assert connection.statements == []
+
+    tenant_context("tenant1")
+    checkout(connection, record)
+    checkout(connection, record)
+    schema = f"{multitenancy_settings.schema_prefix}tenant1"
+    assert connection.statements == [f'SET search_path TO "{schema}", public']
+
+    tenant_context(None)
+    checkout(connection, record)
+    assert connection.statements[-1] == 'SET search_path TO "public", public'
+    assert record.info["search_path"] == "public"
+
+
+def test_search_path_set_by_other_code_is_reset_on_next_checkout():
+    connection, record = FakeDBAPIConnection(), SimpleNamespace(info={})
+    checkout(connection, record)
+    assert connection.statements == []
+
+    # e.g. a session on the shared engine pointing itself at a tenant schema
+    database._forget_search_path_on_set(
+        record, None, 'SET search_path TO "tenant_x", public', None, None, False
+    )
+    checkout(connection, record)
+
+    assert connection.statements == ['SET search_path TO "public", public']
+    assert record.info["search_path"] == "public"
+
+
+def test_other_statements_keep_remembered_search_path():
+    record = SimpleNamespace(info={"search_path": "public"})
+
+    database._forget_search_path_on_set(record, None, "SELECT 1", None, None, False)
+
+    assert record.info["search_path"] == "public"
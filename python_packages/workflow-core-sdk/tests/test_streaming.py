@@ -0,0 +1,162 @@
+"""
+Tests for SSE fan-out in workflow_core_sdk.streaming
+"""
+
+import asyncio
+import json
+
+import pytest
+from workflow_core_sdk.streaming import (
+    StreamManager,
+    create_sse_stream,
+    create_status_event,
+    create_step_event,
+    parse_last_event_id,
+)
+
+
+def _data(frame: str) -> dict:
+    line = next(ln for ln in frame.split("\n") if ln.startswith("data: "))
+    return json.loads(line[6:])
+
+
+def _event_id(frame: str) -> int:
+    line = next(ln for ln in frame.split("\n") if ln.startswith("id: "))
+    return int(line[4:])
+
+
+async def _collect(queue: asyncio.Queue, **kwargs) -> list:
+    return [frame async for frame in create_sse_stream(queue, **kwargs)]
+
+
+@pytest.mark.asyncio
+async def test_event_serialized_once_for_all_subscribers():
+    manager = StreamManager()
+    queues = [asyncio.Queue(maxsize=10) for _ in range(3)]
+    for queue in queues:
+        manager.add_execution_stream("exec-1", queue)
+
+    await manager.emit_execution_event(create_step_event("exec-1", "s1", "running"))
+
+    frames = [queue.get_nowait() for queue in queues]
+    assert frames[0] is frames[1] is frames[2]
+    assert _data(frames[0].payload)["data"]["step_id"] == "s1"
+
+
+@pytest.mark.asyncio
+async def test_stream_ends_on_terminal_event():
+    manager = StreamManager()
+    queue = asyncio.Queue(maxsize=10)
+    manager.add_execution_stream("exec-1", queue)
+
+    await manager.emit_execution_event(create_step_event("exec-1", "s1", "completed"))
+    await manager.emit_execution_event(create_status_event("exec-1", "completed"))
+
+    frames = await asyncio.wait_for(_collect(queue), timeout=1)
+    assert [_data(f)["type"] for f in frames] == ["step", "status", "complete"]
+    assert _data(frames[-1])["data"]["events_sent"] == 2
+
+
+@pytest.mark.asyncio
+async def test_resume_from_last_event_id():
+    manager = StreamManager()
+    events = [create_step_event("exec-1", f"s{i}", "completed") for i in range(3)]
+    for event in events:
+        await manager.emit_execution_event(event)
+
+    queue = asyncio.Queue(maxsize=10)
+    manager.add_execution_stream(
+        "exec-1", queue, last_event_id=events[0].to_frame().id
+    )
+    await manager.emit_execution_event(create_status_event("exec-1", "completed"))
+
+    frames = await asyncio.wait_for(_collect(queue), timeout=1)
+    assert [_data(f)["data"].get("step_id") for f in frames[:2]] == ["s1", "s2"]
+    ids = [_event_id(f) for f in frames[:3]]
+    assert ids == sorted(ids)
+
+
+@pytest.mark.asyncio
+async def test_replay_larger_than_queue_resumes_in_parts():
+    manager = StreamManager()
+    events = [create_step_event("exec-1", f"s{i}", "running") for i in range(5)]
+    for event in events:
+        await manager.emit_execution_event(event)
+
+    queue = asyncio.Queue(maxsize=3)
+    manager.add_execution_stream("exec-1", queue, last_event_id=0)
+    assert "exec-1" not in manager.execution_streams
+
+    # The stream ends after the replayed frames that fit, without a completion event
+    frames = await asyncio.wait_for(_collect(queue), timeout=1)
+    assert [_data(f)["data"]["step_id"] for f in frames] == ["s0", "s1"]
+
+    queue = asyncio.Queue(maxsize=10)
+    manager.add_execution_stream("exec-1", queue, last_event_id=_event_id(frames[-1]))
+    assert [_data(queue.get_nowait().payload)["data"]["step_id"] for _ in range(3)] == [
+        "s2",
+        "s3",
+        "s4",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_replay_buffer_is_bounded():
+    manager = StreamManager(replay_buffer_size=2, max_replay_streams=1)
+    for i in range(5):
+        await manager.emit_execution_event(create_step_event("exec-1", f"s{i}", "running"))
+    await manager.emit_execution_event(create_step_event("exec-2", "s0", "running"))
+
+    assert manager.get_stats()["replay_buffers"] == 1
+    queue = asyncio.Queue(maxsize=10)
+    manager.add_execution_stream("exec-1", queue, last_event_id=0)
+    assert queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_disconnected():
+    manager = StreamManager()
+    slow = asyncio.Queue(maxsize=2)
+    fast = asyncio.Queue(maxsize=10)
+    manager.add_execution_stream("exec-1", slow)
+    manager.add_execution_stream("exec-1", fast)
+
+    for i in range(3):
+        await manager.emit_execution_event(create_step_event("exec-1", f"s{i}", "running"))
+
+    assert manager.execution_streams["exec-1"] == {fast}
+    assert fast.qsize() == 3
+    # The slow stream ends without a completion event so the client reconnects
+    frames = await asyncio.wait_for(_collect(slow), timeout=1)
+    assert frames == []
+    assert manager.get_stats()["dropped_subscribers"] == 1
+
+
+@pytest.mark.asyncio
+async def test_duplicate_frames_are_skipped():
+    manager = StreamManager()
+    queue = asyncio.Queue(maxsize=10)
+    manager.add_workflow_stream("wf-1", queue)
+    manager.add_execution_stream("exec-1", queue)
+
+    event = create_status_event("exec-1", "completed", workflow_id="wf-1")
+    await manager.emit_execution_event(event)
+    await manager.emit_workflow_event(event)
+
+    frames = await asyncio.wait_for(_collect(queue), timeout=1)
+    assert [_data(f)["type"] for f in frames] == ["status", "complete"]
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_without_events():
+    queue = asyncio.Queue()
+    stream = create_sse_stream(queue, heartbeat_interval=0.05)
+    frame = await asyncio.wait_for(stream.__anext__(), timeout=1)
+    assert _data(frame)["type"] == "heartbeat"
+    await stream.aclose()
+
+
+def test_parse_last_event_id():
+    assert parse_last_event_id("42") == 42
+    assert parse_last_event_id(None) is None
+    assert parse_last_event_id("abc") is None
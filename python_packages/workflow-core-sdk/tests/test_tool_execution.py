@@ -69,6 +69,10 @@ def test_servicenow_tools_available():
         "servicenow_csm_create_case",
         "servicenow_csm_get_case",
         "servicenow_csm_update_case",
+        "servicenow_itsm_bulk_create_incidents",
+        "servicenow_itsm_bulk_update_incidents",
+        "servicenow_csm_bulk_create_cases",
+        "servicenow_csm_bulk_update_cases",
     ]
 
     for tool_name in servicenow_tools:
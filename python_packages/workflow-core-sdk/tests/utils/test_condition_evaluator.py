@@ -296,3 +296,49 @@ class TestEdgeCases:
             right_operand="value",
         )
         assert evaluator.evaluate_condition(condition, context) is True
+
+
+class TestCompiledPlans:
+    """Tests for compiled condition plans"""
+
+    def test_compiled_plan_reused_across_contexts(self, evaluator, context):
+        """Test that one compiled plan evaluates different contexts"""
+        expression = ConditionalExpression(
+            conditions=[
+                Condition("step1.output.count", ConditionOperator.GREATER_THAN, 10),
+                Condition("step1.output.status", ConditionOperator.EQUALS, "success"),
+            ],
+            logical_operator=LogicalOperator.AND,
+        )
+        plan = evaluator.compile(expression)
+
+        assert plan(context) is True
+        assert plan({"step1": {"output": {"count": 1, "status": "success"}}}) is False
+
+    def test_invalid_regex_is_false(self, evaluator, context):
+        """Test that an invalid regex compiles to a plan that returns False"""
+        condition = Condition(
+            left_operand="step1.output.message",
+            operator=ConditionOperator.REGEX_MATCH,
+            right_operand="([",
+        )
+        assert evaluator.evaluate_condition(condition, context) is False
+
+    def test_plan_for_caches_by_content(self, evaluator, context):
+        """Test that equal condition configs are parsed once"""
+        parsed = []
+
+        def parse(conditions):
+            parsed.append(conditions)
+            return evaluator.parse_condition_string(conditions["when"])
+
+        plan = evaluator.plan_for({"when": "step1.output.count > 10"}, parse)
+        again = evaluator.plan_for({"when": "step1.output.count > 10"}, parse)
+
+        assert plan is again
+        assert len(parsed) == 1
+        assert plan(context) is True
+
+    def test_plan_for_unparseable(self, evaluator):
+        """Test that configs without a condition tree have no plan"""
+        assert evaluator.plan_for("???", lambda _: None) is None
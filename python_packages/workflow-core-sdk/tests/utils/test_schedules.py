@@ -0,0 +1,114 @@
+"""
+Unit tests for schedule helpers
+
+Tests schedule parsing, next-run computation and scheduler wake-ups.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from workflow_core_sdk.utils.schedules import (
+    ScheduleChangeNotifier,
+    compute_next_run,
+    schedule_from_configuration,
+    schedule_signature,
+)
+
+
+def _config(schedule):
+    return {
+        "steps": [
+            {"step_id": "trigger", "step_type": "trigger", "parameters": {"schedule": schedule}},
+            {"step_id": "s1", "step_type": "prompt", "parameters": {}},
+        ]
+    }
+
+
+@pytest.fixture
+def now():
+    return datetime(2025, 1, 1, 12, 0, 30, tzinfo=timezone.utc)
+
+
+class TestScheduleFromConfiguration:
+    def test_disabled_schedule(self):
+        assert schedule_from_configuration(_config({"enabled": False})) is None
+        assert schedule_from_configuration({"steps": []}) is None
+        assert schedule_from_configuration(None) is None
+
+    def test_interval_defaults(self):
+        schedule = schedule_from_configuration(
+            _config({"enabled": True, "interval_seconds": 1})
+        )
+        assert schedule["mode"] == "interval"
+        assert schedule["interval_seconds"] == 5
+        assert schedule["backend"] == "dbos"
+        assert schedule["timezone"] == "UTC"
+
+    def test_cron_without_expression(self):
+        assert schedule_from_configuration(_config({"enabled": True, "mode": "cron"})) is None
+
+    def test_signature_ignores_unrelated_changes(self):
+        config = _config({"enabled": True, "mode": "cron", "cron": "*/5 * * * *"})
+        other = _config({"enabled": True, "mode": "cron", "cron": "*/5 * * * *"})
+        other["global_config"] = {"anything": 1}
+        assert schedule_signature(schedule_from_configuration(config)) == schedule_signature(
+            schedule_from_configuration(other)
+        )
+
+        changed = _config({"enabled": True, "mode": "cron", "cron": "*/10 * * * *"})
+        assert schedule_signature(schedule_from_configuration(config)) != schedule_signature(
+            schedule_from_configuration(changed)
+        )
+
+
+class TestComputeNextRun:
+    def test_interval_never_run_is_due(self, now):
+        schedule = schedule_from_configuration(_config({"enabled": True, "interval_seconds": 60}))
+        assert compute_next_run(schedule, now) == now
+
+    def test_interval_after_run(self, now):
+        schedule = schedule_from_configuration(_config({"enabled": True, "interval_seconds": 60}))
+        assert compute_next_run(schedule, now, last_run=now) == now + timedelta(seconds=60)
+        # Overdue schedules are due now rather than in the past
+        long_ago = now - timedelta(hours=1)
+        assert compute_next_run(schedule, now, last_run=long_ago) == now
+
+    def test_cron_next_fire_time(self, now):
+        schedule = schedule_from_configuration(
+            _config({"enabled": True, "mode": "cron", "cron": "*/5 * * * *"})
+        )
+        assert compute_next_run(schedule, now) == datetime(2025, 1, 1, 12, 5, tzinfo=timezone.utc)
+
+    def test_cron_timezone(self, now):
+        schedule = schedule_from_configuration(
+            _config(
+                {
+                    "enabled": True,
+                    "mode": "cron",
+                    "cron": "0 9 * * *",
+                    "timezone": "America/New_York",
+                }
+            )
+        )
+        # 09:00 in New York is 14:00 UTC in January
+        assert compute_next_run(schedule, now) == datetime(2025, 1, 1, 14, 0, tzinfo=timezone.utc)
+
+    def test_invalid_cron(self, now):
+        schedule = schedule_from_configuration(
+            _config({"enabled": True, "mode": "cron", "cron": "not a cron"})
+        )
+        assert compute_next_run(schedule, now) is None
+
+
+class TestScheduleChangeNotifier:
+    def test_notify_without_scheduler(self):
+        ScheduleChangeNotifier().notify()
+
+    @pytest.mark.asyncio
+    async def test_notify_from_thread_wakes_loop(self):
+        notifier = ScheduleChangeNotifier()
+        event = notifier.bind()
+        await asyncio.to_thread(notifier.notify)
+        await asyncio.wait_for(event.wait(), timeout=1)
+        notifier.unbind()
@@ -10,6 +10,7 @@ from unittest.mock import MagicMock
 
 from workflow_core_sdk.utils.variable_injection import (
     inject_variables,
+    compile_template,
     extract_variables,
     resolve_variable,
     get_builtin_variables,
@@ -254,3 +255,22 @@ Previous step output: {{prev_step.data}}."""
         assert "Previous step output: important info" in result
         # current_time should be replaced with actual time
         assert "{{current_time}}" not in result
+
+
+class TestCompileTemplate:
+    """Tests for compile_template"""
+
+    def test_compiled_once_per_template(self):
+        """Test that the same template string reuses its compiled form"""
+        template = "Hello {{name}} from {{step1.city}}"
+        assert compile_template(template) is compile_template(template)
+
+    def test_render(self):
+        """Test rendering a compiled template with different values"""
+        compiled = compile_template("Hello {{name}}, {{missing}}")
+
+        assert compiled.render({"name": "Alice"}) == "Hello Alice, "
+        assert (
+            compiled.render({"name": "Bob"}, preserve_unresolved=True)
+            == "Hello Bob, {{missing}}"
+        )
@@ -12,14 +12,19 @@ Based on Agent Studio's MCP client implementation, adapted for workflow-core-sdk
 """
 
 import asyncio
+import os
+import time
 import uuid
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Literal
+from typing import Dict, List, Optional, Any, Literal, Tuple
 import httpx
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Seconds a discovered MCP tool list is served before it is refreshed
+MCP_TOOLS_CACHE_TTL = float(os.getenv("MCP_TOOLS_CACHE_TTL", "300"))
+
 # MCP Protocol Transport Types
 MCPTransportType = Literal["auto", "streamable_http", "http_sse"]
 
@@ -69,6 +74,11 @@ class MCPClient:
             str, str
         ] = {}  # Cache session IDs per server (for Streamable HTTP)
         self._jsonrpc_id_counter = 0
+        # Discovered tool lists per server: server_key -> (fetched_at, tools)
+        self._tools_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._tools_refresh_tasks: Dict[str, asyncio.Task] = {}
+        # Incremented whenever a cached tool list changes
+        self.tools_generation = 0
 
     async def close(self):
         """
@@ -159,7 +169,7 @@ class MCPClient:
         auth_type = server_config.get("auth_type")
         auth_config = server_config.get("auth_config", {})
 
-        server_key = f"{host}:{port}"
+        server_key = self._server_key(server_config)
 
         if server_key not in self._client_cache:
             # Build base URL - just protocol://host:port, no path
@@ -200,6 +210,10 @@ class MCPClient:
 
         return self._client_cache[server_key]
 
+    @staticmethod
+    def _server_key(server_config: Dict[str, Any]) -> str:
+        return f"{server_config.get('host', 'localhost')}:{server_config.get('port', 8080)}"
+
     def _get_next_jsonrpc_id(self) -> int:
         """Get next JSON-RPC request ID."""
         self._jsonrpc_id_counter += 1
@@ -616,6 +630,90 @@ class MCPClient:
                 f"Tool discovery failed for {server_config.get('host')}: {e}"
             )
 
+    async def get_tools(
+        self, server_config: Dict[str, Any], ttl: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Cached tool discovery.
+
+        A fresh cached list is returned as is. A stale one is returned too while
+        a background refresh fetches the new list; only servers that were never
+        discovered are queried inline.
+
+        Args:
+            server_config: Server configuration dictionary
+            ttl: Cache lifetime in seconds (defaults to MCP_TOOLS_CACHE_TTL)
+
+        Returns:
+            List of tool definitions
+        """
+        ttl = MCP_TOOLS_CACHE_TTL if ttl is None else ttl
+        cached = self._tools_cache.get(self._server_key(server_config))
+        if cached is None:
+            return await self._refresh_tools(server_config)
+        fetched_at, tools = cached
+        if time.monotonic() - fetched_at >= ttl:
+            self.refresh_tools_in_background(server_config)
+        return tools
+
+    def get_cached_tools(
+        self, server_config: Dict[str, Any]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Return the cached tool list of a server without any I/O (None if unknown)."""
+        cached = self._tools_cache.get(self._server_key(server_config))
+        return cached[1] if cached else None
+
+    def is_tools_cache_stale(
+        self, server_config: Dict[str, Any], ttl: Optional[float] = None
+    ) -> bool:
+        ttl = MCP_TOOLS_CACHE_TTL if ttl is None else ttl
+        cached = self._tools_cache.get(self._server_key(server_config))
+        return cached is None or time.monotonic() - cached[0] >= ttl
+
+    def refresh_tools_in_background(self, server_config: Dict[str, Any]) -> bool:
+        """
+        Schedule a tool list refresh on the running event loop (one per server).
+
+        Returns:
+            False if there is no running event loop to schedule it on
+        """
+        server_key = self._server_key(server_config)
+        task = self._tools_refresh_tasks.get(server_key)
+        if task is not None and not task.done():
+            return True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+
+        async def _refresh():
+            try:
+                await self._refresh_tools(server_config)
+            except Exception as e:
+                logger.warning(f"Background MCP tool refresh failed for {server_key}: {e}")
+            finally:
+                self._tools_refresh_tasks.pop(server_key, None)
+
+        self._tools_refresh_tasks[server_key] = loop.create_task(_refresh())
+        return True
+
+    async def _refresh_tools(self, server_config: Dict[str, Any]) -> List[Dict[str, Any]]:
+        tools = await self.discover_tools(server_config)
+        server_key = self._server_key(server_config)
+        previous = self._tools_cache.get(server_key)
+        self._tools_cache[server_key] = (time.monotonic(), tools)
+        if previous is None or previous[1] != tools:
+            self.tools_generation += 1
+        return tools
+
+    def invalidate_tools(self, server_config: Optional[Dict[str, Any]] = None) -> None:
+        """Drop the cached tool list of one server, or of all servers."""
+        if server_config is None:
+            self._tools_cache.clear()
+        else:
+            self._tools_cache.pop(self._server_key(server_config), None)
+        self.tools_generation += 1
+
     async def _discover_tools_jsonrpc(
         self, server_config: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
@@ -845,6 +943,9 @@ class MCPClient:
 
     async def close(self):
         """Close all HTTP clients."""
+        for task in self._tools_refresh_tasks.values():
+            task.cancel()
+        self._tools_refresh_tasks.clear()
         for client in self._client_cache.values():
             await client.aclose()
         self._client_cache.clear()
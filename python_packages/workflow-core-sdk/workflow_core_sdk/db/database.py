@@ -9,9 +9,10 @@ Supports schema-based multitenancy when enabled via db-core middleware.
 
 import os
 import logging
-from typing import Generator
+from typing import Generator, Optional
 from sqlmodel import SQLModel, create_engine, Session
-from sqlalchemy import text, event
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
 
 logger = logging.getLogger(__name__)
@@ -56,6 +57,30 @@ engine = create_engine(
 
 SQLAlchemyInstrumentor().instrument(engine=engine)  # OTEL
 
+# Per-tenant pool tuning (see db_core.tenant_pools); unset values use db-core defaults
+_tenant_pool_env = {
+    "pool_size": os.getenv("WORKFLOW_ENGINE_TENANT_POOL_SIZE"),
+    "max_overflow": os.getenv("WORKFLOW_ENGINE_TENANT_POOL_MAX_OVERFLOW"),
+    "max_connections": os.getenv("WORKFLOW_ENGINE_TENANT_POOL_MAX_CONNECTIONS"),
+    "idle_timeout": os.getenv("WORKFLOW_ENGINE_TENANT_POOL_IDLE_TIMEOUT"),
+}
+_tenant_engines = None
+
+
+def _current_tenant_schema() -> Optional[str]:
+    """Schema of the current tenant context, or None when no tenant is set."""
+    try:
+        from db_core.middleware import get_current_tenant_id
+        from workflow_core_sdk.multitenancy import multitenancy_settings
+    except ImportError:
+        # db_core not available, skip tenant isolation
+        return None
+
+    tenant_id = get_current_tenant_id()
+    if not tenant_id:
+        return None
+    return f"{multitenancy_settings.schema_prefix}{tenant_id}"
+
 
 def _apply_tenant_schema_on_checkout(
     dbapi_connection, connection_record, connection_proxy
@@ -63,58 +88,90 @@ def _apply_tenant_schema_on_checkout(
     """
     Event listener that applies tenant schema on connection checkout.
 
-    This is called every time a connection is checked out from the pool,
-    ensuring ALL sessions automatically get the correct search_path based
-    on the current tenant context, regardless of how they're created.
+    Sessions on the shared engine (e.g. `Session(engine)` in background code)
+    get the search_path of the current tenant context. The schema applied to
+    each pooled connection is remembered, so SET only runs when a connection
+    switches tenant. Request sessions use per-tenant pools instead (see
+    get_tenant_engine) and never need it. A search_path set by other code
+    on a shared connection makes the remembered value unknown (see
+    _forget_search_path_on_set), so the next checkout sets it again.
     """
     try:
-        from db_core.middleware import get_current_tenant_id
-        from workflow_core_sdk.multitenancy import multitenancy_settings
-
-        tenant_id = get_current_tenant_id()
-        if tenant_id:
-            schema_name = f"{multitenancy_settings.schema_prefix}{tenant_id}"
-            cursor = dbapi_connection.cursor()
-            cursor.execute(f'SET search_path TO "{schema_name}", public')
-            cursor.close()
-            logger.info(f"Applied tenant schema on checkout: {schema_name}")
-    except ImportError:
-        # db_core not available, skip tenant isolation
-        pass
+        schema_name = _current_tenant_schema() or "public"
+        if connection_record.info.get("search_path", "public") == schema_name:
+            return
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f'SET search_path TO "{schema_name}", public')
+        cursor.close()
+        # Commit so a later rollback cannot undo the setting we remembered
+        dbapi_connection.commit()
+        connection_record.info["search_path"] = schema_name
+        logger.debug(f"Applied tenant schema on checkout: {schema_name}")
     except Exception as e:
+        connection_record.info["search_path"] = None
         logger.warning(f"Failed to apply tenant schema on checkout: {e}")
 
 
+def _forget_search_path_on_set(
+    conn, cursor, statement, parameters, context, executemany
+):
+    """
+    Event listener that drops the remembered search_path of a connection
+    when a statement run through the shared engine changes it.
+    """
+    if statement.lstrip()[:15].upper() == "SET SEARCH_PATH":
+        # Unknown, so it matches no schema (not even the "public" default)
+        conn.info["search_path"] = None
+
+
 # Register the checkout event listener
 event.listen(engine, "checkout", _apply_tenant_schema_on_checkout)
+event.listen(engine, "after_cursor_execute", _forget_search_path_on_set)
 
 
-def create_db_and_tables():
-    """Create database tables"""
-    SQLModel.metadata.create_all(engine)
-
+def _get_tenant_engine_manager():
+    """Create the per-tenant pool manager on first use."""
+    global _tenant_engines
+    if _tenant_engines is None:
+        from db_core.tenant_pools import TenantEngineManager
+        from workflow_core_sdk.multitenancy import multitenancy_settings
 
-def _apply_tenant_schema(session: Session) -> None:
+        _tenant_engines = TenantEngineManager(
+            DATABASE_URL,
+            multitenancy_settings,
+            engine_kwargs={
+                "echo": engine.echo,
+                "pool_recycle": pool_recycle,
+                "pool_timeout": pool_timeout,
+            },
+            on_engine_created=lambda e: SQLAlchemyInstrumentor().instrument(engine=e),
+            **{k: int(v) for k, v in _tenant_pool_env.items() if v},
+        )
+    return _tenant_engines
+
+
+def get_tenant_engine(tenant_id: Optional[str] = None) -> Engine:
     """
-    Apply tenant schema to session if tenant context is set.
+    Engine for a tenant (defaults to the current tenant context).
 
-    Checks db_core's context variable for current tenant ID and sets
-    the PostgreSQL search_path accordingly.
+    Each tenant gets a small pool whose connections have the tenant's
+    search_path set when they are opened, so sessions bound to it need no
+    per-checkout SET. Without a tenant, the shared engine is returned.
     """
-    try:
-        from db_core.middleware import get_current_tenant_id
-        from workflow_core_sdk.multitenancy import multitenancy_settings
-
+    if tenant_id is None:
+        try:
+            from db_core.middleware import get_current_tenant_id
+        except ImportError:
+            return engine
         tenant_id = get_current_tenant_id()
-        if tenant_id:
-            schema_name = f"{multitenancy_settings.schema_prefix}{tenant_id}"
-            session.execute(text(f'SET search_path TO "{schema_name}", public'))
-            logger.debug(f"Applied tenant schema: {schema_name}")
-    except ImportError:
-        # db_core not available, skip tenant isolation
-        pass
-    except Exception as e:
-        logger.warning(f"Failed to apply tenant schema: {e}")
+    if not tenant_id:
+        return engine
+    return _get_tenant_engine_manager().get_engine(tenant_id)
+
+
+def create_db_and_tables():
+    """Create database tables"""
+    SQLModel.metadata.create_all(engine)
 
 
 def get_session() -> Generator[Session, None, None]:
@@ -122,13 +179,12 @@ def get_session() -> Generator[Session, None, None]:
     Get database session with automatic tenant schema isolation.
 
     When a tenant context is set (via db_core's set_current_tenant_id or
-    TenantMiddleware), the session automatically has its search_path set
-    to the tenant's schema.
+    TenantMiddleware), the session is bound to that tenant's connection pool,
+    whose connections already use the tenant's schema.
 
     This provides transparent data isolation without manual intervention.
     """
-    with Session(engine) as session:
-        _apply_tenant_schema(session)
+    with Session(get_tenant_engine()) as session:
         yield session
 
 
@@ -144,9 +200,7 @@ def get_db_session() -> Session:
         def list_items(session: Session = Depends(get_db_session)):
             ...
     """
-    session = Session(engine)
-    _apply_tenant_schema(session)
-    return session
+    return Session(get_tenant_engine())
 
 
 # For backwards compatibility with existing code
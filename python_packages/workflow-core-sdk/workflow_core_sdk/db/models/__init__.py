@@ -13,6 +13,7 @@ from .workflows import (
     WorkflowRead,
     WorkflowUpdate,
 )
+from .schedules import WorkflowSchedule
 from .executions import (
     ExecutionStatus,
     StepStatus,
@@ -94,6 +95,7 @@ __all__ = [
     "WorkflowCreate",
     "WorkflowRead",
     "WorkflowUpdate",
+    "WorkflowSchedule",
     # Execution models
     "ExecutionStatus",
     "StepStatus",
@@ -9,7 +9,7 @@ import uuid as uuid_module
 from typing import Optional, Dict, Any
 from datetime import datetime
 from sqlmodel import SQLModel, Field
-from sqlalchemy import Column, JSON, Text, DateTime, func
+from sqlalchemy import Column, JSON, Text, DateTime, Index, func
 from enum import Enum
 
 from .base import get_utc_datetime
@@ -100,6 +100,21 @@ class WorkflowExecutionBase(SQLModel):
 class WorkflowExecution(WorkflowExecutionBase, table=True):
     """Workflow execution database model"""
 
+    # Execution listings: newest first, optionally per workflow or status,
+    # paged by (created_at, id)
+    __table_args__ = (
+        Index("ix_workflowexecution_created_at_id", "created_at", "id"),
+        Index(
+            "ix_workflowexecution_workflow_id_created_at",
+            "workflow_id",
+            "created_at",
+            "id",
+        ),
+        Index(
+            "ix_workflowexecution_status_created_at", "status", "created_at", "id"
+        ),
+    )
+
     # Primary key (single UUID)
     id: uuid_module.UUID = Field(
         default_factory=uuid_module.uuid4,
@@ -0,0 +1,54 @@
+"""
+Workflow schedule SQLModel definitions
+
+One row per workflow with an enabled schedule trigger. The row is kept in sync
+with the workflow configuration by DatabaseService.save_workflow and holds the
+precomputed next run, so the scheduler only reads workflows that are due.
+"""
+
+import uuid as uuid_module
+from datetime import datetime
+from typing import Optional
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Uuid
+
+from .base import get_utc_datetime
+
+
+class WorkflowSchedule(SQLModel, table=True):
+    """Scheduler state for a workflow with an enabled schedule trigger"""
+
+    __tablename__ = "workflow_schedules"
+    __table_args__ = (Index("ix_workflow_schedules_next_run_at", "next_run_at"),)
+
+    workflow_id: uuid_module.UUID = Field(
+        sa_column=Column(
+            Uuid(),
+            ForeignKey("workflow.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        description="Scheduled workflow",
+    )
+
+    mode: str = Field(default="interval", max_length=20, description="interval or cron")
+    cron: Optional[str] = Field(default=None, max_length=255)
+    timezone: str = Field(default="UTC", max_length=64)
+    seconds_at_beginning: bool = Field(default=False)
+    interval_seconds: Optional[int] = Field(default=None)
+    jitter_seconds: int = Field(default=0)
+    backend: str = Field(default="dbos", max_length=20)
+
+    # Hash of the schedule config; next_run_at is only recomputed when it changes
+    signature: str = Field(max_length=64)
+
+    next_run_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        description="Next time the workflow is due",
+    )
+    last_run_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
+    updated_at: datetime = Field(
+        default_factory=get_utc_datetime,
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
@@ -5,19 +5,58 @@ This module provides high-level database operations using SQLModel ORM.
 It replaces the previous raw SQL implementation with proper ORM operations.
 """
 
+import base64
+import json
 import uuid as uuid_module
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timezone
-from sqlmodel import Session, select, desc
+from sqlalchemy import JSON, Text, case, cast, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, array
+from sqlmodel import Session, select, desc, func
 
 from .models import (
     Workflow,
     WorkflowExecution,
+    WorkflowSchedule,
     StepType,
     ExecutionStatus,
     ApprovalRequest,
     ApprovalStatus,
 )
+from ..utils.schedules import (
+    compute_next_run,
+    schedule_change_notifier,
+    schedule_from_configuration,
+    schedule_signature,
+)
+
+# Columns needed for execution summaries; the JSON payload columns are not loaded
+_EXECUTION_SUMMARY_COLUMNS = (
+    WorkflowExecution.id,
+    WorkflowExecution.workflow_id,
+    WorkflowExecution.status,
+    WorkflowExecution.user_id,
+    WorkflowExecution.started_at,
+    WorkflowExecution.completed_at,
+    WorkflowExecution.execution_time_seconds,
+    WorkflowExecution.created_at,
+)
+
+
+def encode_execution_cursor(created_at: datetime, execution_id: uuid_module.UUID) -> str:
+    """Opaque keyset cursor pointing just after an execution in list order."""
+    raw = f"{created_at.isoformat()}|{execution_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_execution_cursor(cursor: str) -> Tuple[datetime, uuid_module.UUID]:
+    """Decode a cursor from encode_execution_cursor; raises ValueError if invalid."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, execution_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), uuid_module.UUID(execution_id)
+    except Exception as e:
+        raise ValueError(f"Invalid execution cursor: {cursor}") from e
 
 
 class DatabaseService:
@@ -75,7 +114,10 @@ class DatabaseService:
             )
             session.add(workflow)
 
+        schedule_changed = self._sync_workflow_schedule(session, wf_uuid, workflow_data)
         session.commit()
+        if schedule_changed:
+            schedule_change_notifier.notify()
         return workflow_id
 
     def get_workflow(
@@ -115,11 +157,130 @@ class DatabaseService:
         wf_uuid = uuid_module.UUID(workflow_id)
         workflow = session.exec(select(Workflow).where(Workflow.id == wf_uuid)).first()
         if workflow:
+            schedule = session.get(WorkflowSchedule, wf_uuid)
+            if schedule:
+                session.delete(schedule)
             session.delete(workflow)
             session.commit()
+            if schedule:
+                schedule_change_notifier.notify()
             return True
         return False
 
+    # Schedule operations
+    def _sync_workflow_schedule(
+        self,
+        session: Session,
+        wf_uuid: uuid_module.UUID,
+        configuration: Dict[str, Any],
+        last_run: Optional[datetime] = None,
+    ) -> bool:
+        """Create, update or remove the workflow's schedule row (caller commits).
+
+        next_run_at is only recomputed when the schedule definition changed, so
+        saving a workflow for other reasons does not shift its next run.
+
+        Returns:
+            True if the schedule row changed.
+        """
+        schedule = schedule_from_configuration(configuration)
+        existing = session.get(WorkflowSchedule, wf_uuid)
+
+        if schedule is None:
+            if existing:
+                session.delete(existing)
+                return True
+            return False
+
+        signature = schedule_signature(schedule)
+        if existing and existing.signature == signature:
+            return False
+
+        now = datetime.now(timezone.utc)
+        if existing:
+            last_run = existing.last_run_at
+        next_run = compute_next_run(schedule, now, last_run)
+        if next_run is None:
+            # Invalid cron: behave as if the schedule were disabled
+            if existing:
+                session.delete(existing)
+                return True
+            return False
+
+        row = existing or WorkflowSchedule(
+            workflow_id=wf_uuid, signature=signature, next_run_at=next_run
+        )
+        for key, value in schedule.items():
+            setattr(row, key, value)
+        row.signature = signature
+        row.next_run_at = next_run
+        row.last_run_at = last_run
+        row.updated_at = now
+        session.add(row)
+        return True
+
+    def backfill_workflow_schedules(self, session: Session, batch_size: int = 500) -> int:
+        """Create schedule rows for workflows saved before the table existed.
+
+        Returns:
+            Number of schedule rows created.
+        """
+        scheduled = set(session.exec(select(WorkflowSchedule.workflow_id)).all())
+        created = 0
+        offset = 0
+        while True:
+            workflows = session.exec(
+                select(Workflow.id, Workflow.configuration)
+                .order_by(Workflow.id)
+                .offset(offset)
+                .limit(batch_size)
+            ).all()
+            if not workflows:
+                break
+            for wf_id, configuration in workflows:
+                if wf_id in scheduled:
+                    continue
+                # Carry over the last run tracked by the previous scheduler
+                last_run = None
+                global_config = (configuration or {}).get("global_config") or {}
+                last_run_iso = global_config.get("scheduler_last_run_at")
+                if isinstance(last_run_iso, str):
+                    try:
+                        last_run = datetime.fromisoformat(
+                            last_run_iso.replace("Z", "+00:00")
+                        )
+                    except ValueError:
+                        last_run = None
+                if self._sync_workflow_schedule(
+                    session, wf_id, configuration, last_run=last_run
+                ):
+                    created += 1
+            session.commit()
+            offset += batch_size
+        return created
+
+    def claim_due_schedules(
+        self, session: Session, now: datetime, limit: int = 100
+    ) -> List[WorkflowSchedule]:
+        """Lock up to `limit` due schedules, skipping rows locked by other replicas.
+
+        The rows stay locked until the caller commits, so the caller should
+        advance next_run_at and commit promptly.
+        """
+        return list(
+            session.exec(
+                select(WorkflowSchedule)
+                .where(WorkflowSchedule.next_run_at <= now)
+                .order_by(WorkflowSchedule.next_run_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            ).all()
+        )
+
+    def get_next_schedule_time(self, session: Session) -> Optional[datetime]:
+        """Earliest next_run_at over all schedules (served by the index)."""
+        return session.exec(select(func.min(WorkflowSchedule.next_run_at))).first()
+
     # Execution operations
     def create_execution(self, session: Session, execution_data: Dict[str, Any]) -> str:
         """Create a new workflow execution"""
@@ -196,6 +357,50 @@ class DatabaseService:
         session.commit()
         return True
 
+    def set_execution_current_step(
+        self,
+        session: Session,
+        execution_id: str,
+        step_id: Optional[str],
+        completed_step: Optional[str] = None,
+        step_io_data: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Set execution_metadata.current_step with a single UPDATE.
+
+        The row is not read back and the rest of the metadata is left as is.
+        Pass step_id=None with completed_step to clear current_step only if it
+        still points at that step (other steps may be running concurrently).
+        step_io_data, when given, is written in the same statement.
+        """
+        metadata = func.coalesce(
+            func.nullif(
+                cast(WorkflowExecution.execution_metadata, JSONB),
+                cast("null", JSONB),
+                type_=JSONB,
+            ),
+            cast("{}", JSONB),
+        )
+        value = cast(json.dumps(step_id), JSONB)
+        if step_id is None and completed_step is not None:
+            current = metadata.op("->", return_type=JSONB)("current_step")
+            value = case(
+                (current == cast(json.dumps(completed_step), JSONB), value),
+                else_=func.coalesce(current, value),
+            )
+        path = cast(array(["current_step"]), ARRAY(Text))
+        values: Dict[str, Any] = {
+            "execution_metadata": cast(func.jsonb_set(metadata, path, value), JSON)
+        }
+        if step_io_data is not None:
+            values["step_io_data"] = step_io_data
+        result = session.exec(
+            update(WorkflowExecution)
+            .where(WorkflowExecution.id == uuid_module.UUID(execution_id))
+            .values(**values)
+        )
+        session.commit()
+        return result.rowcount > 0
+
     def list_executions(
         self,
         session: Session,
@@ -203,10 +408,121 @@ class DatabaseService:
         status: Optional[str] = None,
         limit: int = 100,
         offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        """List executions with optional filtering"""
-        query = select(WorkflowExecution)
+        """List execution summaries (newest first) with optional filtering.
+
+        Pass a cursor from list_executions_page to page by keyset instead of offset.
+        """
+        return self.list_executions_page(
+            session,
+            workflow_id=workflow_id,
+            status=status,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+        )["executions"]
+
+    def list_executions_page(
+        self,
+        session: Session,
+        workflow_id: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total_estimate: bool = False,
+    ) -> Dict[str, Any]:
+        """List a page of execution summaries ordered by (created_at, id) descending.
+
+        Only summary columns are selected. With a cursor (the next_cursor of the
+        previous page) the page starts right after that execution, which stays
+        an index range scan however deep the page is; offset is ignored then.
+
+        Returns:
+            Dict with "executions", "next_cursor" (None on the last page) and,
+            if requested, "total_estimate" (see estimate_execution_count)
+        """
+        query = self._filter_executions(
+            select(*_EXECUTION_SUMMARY_COLUMNS), workflow_id, status
+        )
+        if cursor:
+            created_at, execution_id = decode_execution_cursor(cursor)
+            query = query.where(
+                tuple_(WorkflowExecution.created_at, WorkflowExecution.id)
+                < tuple_(created_at, execution_id)
+            )
+        elif offset:
+            query = query.offset(offset)
+
+        # Fetch one extra row to know whether there is a next page
+        rows = session.exec(
+            query.order_by(
+                desc(WorkflowExecution.created_at), desc(WorkflowExecution.id)
+            ).limit(limit + 1)
+        ).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_execution_cursor(rows[-1].created_at, rows[-1].id)
+
+        page: Dict[str, Any] = {
+            "executions": [
+                {
+                    "execution_id": str(row.id),
+                    "workflow_id": str(row.workflow_id),
+                    "status": row.status,
+                    "user_id": row.user_id,
+                    "started_at": (
+                        row.started_at.isoformat() if row.started_at else None
+                    ),
+                    "completed_at": (
+                        row.completed_at.isoformat() if row.completed_at else None
+                    ),
+                    "execution_time_seconds": row.execution_time_seconds,
+                    "created_at": row.created_at.isoformat(),
+                }
+                for row in rows
+            ],
+            "next_cursor": next_cursor,
+        }
+        if include_total_estimate:
+            page["total_estimate"] = self.estimate_execution_count(
+                session, workflow_id=workflow_id, status=status
+            )
+        return page
+
+    def estimate_execution_count(
+        self,
+        session: Session,
+        workflow_id: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> int:
+        """Approximate number of executions matching the filters.
 
+        On PostgreSQL this is the planner's row estimate, which avoids counting
+        the whole history; other databases fall back to an exact COUNT(*).
+        """
+        conn = session.connection()
+        if conn.dialect.name == "postgresql":
+            query = self._filter_executions(
+                select(WorkflowExecution.id), workflow_id, status
+            )
+            compiled = query.compile(
+                dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+            )
+            plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}").scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+
+        query = self._filter_executions(
+            select(func.count()).select_from(WorkflowExecution), workflow_id, status
+        )
+        return int(session.exec(query).one())
+
+    @staticmethod
+    def _filter_executions(query, workflow_id: Optional[str], status: Optional[str]):
         if workflow_id:
             query = query.where(
                 WorkflowExecution.workflow_id == uuid_module.UUID(workflow_id)
@@ -215,32 +531,7 @@ class DatabaseService:
             status_enum = ExecutionStatus(status) if isinstance(status, str) else status
             if status_enum:
                 query = query.where(WorkflowExecution.status == status_enum)
-
-        executions = session.exec(
-            query.offset(offset)
-            .limit(limit)
-            .order_by(desc(WorkflowExecution.created_at))
-        ).all()
-
-        return [
-            {
-                "execution_id": str(execution.id),
-                "workflow_id": str(execution.workflow_id),
-                "status": execution.status,
-                "user_id": execution.user_id,
-                "started_at": (
-                    execution.started_at.isoformat() if execution.started_at else None
-                ),
-                "completed_at": (
-                    execution.completed_at.isoformat()
-                    if execution.completed_at
-                    else None
-                ),
-                "execution_time_seconds": execution.execution_time_seconds,
-                "created_at": execution.created_at.isoformat(),
-            }
-            for execution in executions
-        ]
+        return query
 
     # Step type operations
     def rekey_execution(
@@ -7,11 +7,10 @@ This module provides schema initialization for multi-tenant deployments.
 import logging
 from typing import Optional
 
-from sqlalchemy import event, MetaData
+from sqlalchemy import MetaData
 from sqlmodel import SQLModel
 
 from db_core import MultitenancySettings
-from db_core.middleware import get_current_tenant_id
 from db_core.utils import get_schema_name, tenant_schema_exists, create_tenant_schema
 
 from workflow_core_sdk.multitenancy import multitenancy_settings, DEFAULT_TENANTS
@@ -20,25 +19,6 @@ from workflow_core_sdk.multitenancy import multitenancy_settings, DEFAULT_TENANT
 from workflow_core_sdk.db.models import *  # noqa: F401, F403
 
 logger = logging.getLogger(__name__)
-_event_listener_attached = False
-
-
-def _attach_tenant_event_listener(engine, settings: MultitenancySettings):
-    """Attach event listener to set search_path per connection checkout."""
-    global _event_listener_attached
-    if _event_listener_attached:
-        return
-
-    @event.listens_for(engine, "checkout")
-    def set_search_path(dbapi_conn, conn_record, conn_proxy):
-        tenant_id = get_current_tenant_id()
-        schema = get_schema_name(tenant_id, settings) if tenant_id else "public"
-        cursor = dbapi_conn.cursor()
-        cursor.execute(f'SET search_path TO "{schema}", public')
-        cursor.close()
-
-    _event_listener_attached = True
-    logger.info("Tenant event listener attached")
 
 
 def initialize_tenant_db(
@@ -62,7 +42,9 @@ def initialize_tenant_db(
     settings = settings or multitenancy_settings
     tenant_ids = tenant_ids or DEFAULT_TENANTS
 
-    _attach_tenant_event_listener(engine, settings)
+    # Tenant routing is handled by workflow_core_sdk.db.database: request
+    # sessions use per-tenant pools, and the shared engine only issues
+    # SET search_path when a pooled connection switches tenant.
 
     for tenant_id in tenant_ids:
         schema_name = get_schema_name(tenant_id, settings)
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from typing import Final
+import os
+from typing import Any, Final
 
 # Central helper to keep topic format consistent across engine and routers
 _SUFFIX_USER_MSG: Final[str] = "user_msg"
+_SUFFIX_INGESTION_DONE: Final[str] = "ingestion_done"
 
 
 def make_decision_topic(
@@ -15,3 +17,36 @@ def make_decision_topic(
     """
     sfx = suffix or _SUFFIX_USER_MSG
     return f"wf:{execution_id}:{step_id}:{sfx}"
+
+
+def make_ingestion_topic(execution_id: str, step_id: str) -> str:
+    """Topic the ingestion service's completion callback is delivered on.
+
+    Example: wf:{execution_id}:{step_id}:ingestion_done
+    """
+    return make_decision_topic(execution_id, step_id, suffix=_SUFFIX_INGESTION_DONE)
+
+
+_client: Any = None
+
+
+def _get_client() -> Any:
+    """Process-wide DBOSClient, so senders don't need a launched DBOS runtime."""
+    global _client
+    if _client is None:
+        from dbos import DBOSClient
+        from workflow_core_sdk.db.database import DATABASE_URL as _SDK_DB_URL
+
+        _client = DBOSClient(
+            os.getenv("DBOS_DATABASE_URL") or os.getenv("DATABASE_URL") or _SDK_DB_URL
+        )
+    return _client
+
+
+async def send_to_workflow(dbos_workflow_id: str, topic: str, message: Any) -> None:
+    """Deliver a message to a DBOS workflow blocked in DBOS.recv_async(topic).
+
+    Messages are stored durably, so it's fine to send before the workflow
+    starts waiting.
+    """
+    await _get_client().send_async(dbos_workflow_id, message, topic)
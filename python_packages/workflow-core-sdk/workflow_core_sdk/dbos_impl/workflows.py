@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Dict, Optional, TypedDict, cast
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, TypedDict, Union, cast
 from datetime import datetime
 import uuid
 from datetime import timezone as _tz
 from sqlmodel import Session as _SQLSession
 
 from dbos import DBOS
+from .messaging import make_ingestion_topic
 from .steps import DBOSStepResult, dbos_execute_step_durable
 
 from ..streaming import (
@@ -23,6 +27,37 @@ from . import get_dbos_adapter
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on how long an ingesting step waits for its completion callback
+# before re-checking the job (covers callbacks lost in transit)
+INGESTION_RECHECK_SECONDS = int(os.getenv("DBOS_INGESTION_RECHECK_SECONDS", "600"))
+
+
+async def _set_current_step(
+    execution_id: str,
+    step_id: Optional[str],
+    tenant_id: Optional[str] = None,
+    completed_step: Optional[str] = None,
+    step_io_data: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Record (or clear) the running step with one narrow UPDATE, off the event loop."""
+
+    def _write() -> None:
+        from ..db.database import get_tenant_engine
+
+        with _SQLSession(get_tenant_engine(tenant_id)) as session:
+            _DBService().set_execution_current_step(
+                session,
+                execution_id,
+                step_id,
+                completed_step=completed_step,
+                step_io_data=step_io_data,
+            )
+
+    try:
+        await asyncio.to_thread(_write)
+    except Exception as e:
+        logger.warning(f"Failed to persist current_step for {execution_id}: {e}")
+
 
 def _persist_execution_status(
     execution_id: str,
@@ -35,22 +70,12 @@ def _persist_execution_status(
     """Persist execution status to database for async DBOS workflows."""
     try:
         from ..db.service import DatabaseService as _DBSvc
-        from ..db.database import get_db_session as _get_db_sess
-        from sqlalchemy import text
+        from ..db.database import get_tenant_engine
 
         _dbs = _DBSvc()
-        session = _get_db_sess()
+        # Bind to the tenant's pool for multitenancy (connections already use its schema)
+        session = _SQLSession(get_tenant_engine(tenant_id))
         try:
-            # Set tenant schema for multitenancy
-            if tenant_id:
-                from ..multitenancy import multitenancy_settings
-                from db_core.utils import get_schema_name
-
-                schema = get_schema_name(tenant_id, multitenancy_settings)
-                session.connection().execute(
-                    text(f'SET search_path TO "{schema}", public')
-                )
-
             completed_count = sum(
                 1
                 for sr in step_results.values()
@@ -150,6 +175,79 @@ def _topological_sort_steps(steps: list) -> list:
     return [step_by_id[sid] for sid in sorted_ids if sid in step_by_id]
 
 
+def _dependency_waves(steps: list) -> list:
+    """
+    Group topologically sorted steps into waves of mutually independent steps.
+
+    A step depends on its declared dependencies and on the steps its
+    input_mapping reads from; it is placed in the wave after the last of them.
+    Steps keep their topological order within a wave.
+    """
+    step_ids = {s.get("step_id") for s in steps}
+    wave_of: Dict[str, int] = {}
+    waves: list = []
+    for step in steps:
+        input_mapping = (
+            step.get("input_mapping")
+            or (step.get("config") or {}).get("input_mapping")
+            or {}
+        )
+        deps = set(step.get("dependencies") or [])
+        deps.update(
+            spec.split(".", 1)[0]
+            for spec in input_mapping.values()
+            if isinstance(spec, str) and "." in spec
+        )
+        wave = max(
+            (wave_of[d] + 1 for d in deps if d in step_ids and d in wave_of),
+            default=0,
+        )
+        wave_of[step["step_id"]] = wave
+        if wave == len(waves):
+            waves.append([])
+        waves[wave].append(step)
+    return waves
+
+
+@dataclass
+class _PendingStep:
+    """First result of a step that still has to wait (user message or ingestion)"""
+
+    result: Dict[str, Any]
+
+
+async def _run_wave(wave: list, run_step) -> Optional[DBOSWorkflowResult]:
+    """
+    Run a wave of independent steps; returns the first failure, if any.
+
+    DBOS assigns function IDs in call order, so only calls whose order does
+    not depend on timing may overlap. The first attempt of every step is a
+    single durable call, started in wave order, so those run concurrently.
+    Steps that then wait (DBOS.recv plus re-execution, as often as needed)
+    are continued one at a time in wave order.
+    """
+    if len(wave) == 1:
+        return await run_step(wave[0])
+
+    # return_exceptions: no sibling is left running when one step raises
+    outcomes = await asyncio.gather(
+        *(run_step(step, defer_waits=True) for step in wave),
+        return_exceptions=True,
+    )
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            raise outcome
+    for outcome in outcomes:
+        if outcome is not None and not isinstance(outcome, _PendingStep):
+            return outcome
+    for step, outcome in zip(wave, outcomes):
+        if isinstance(outcome, _PendingStep):
+            failure = await run_step(step, resume_with=outcome.result)
+            if failure is not None:
+                return failure
+    return None
+
+
 class DBOSWorkflowResult(TypedDict, total=False):
     success: bool | None
     execution_id: str
@@ -314,137 +412,94 @@ async def dbos_execute_workflow_durable(
         s = re.sub(r"_+", "_", s).strip("_")
         return s or "step"
 
-    for step in steps:
-        step_id = step.get("step_id")
-        step_type = step.get("step_type")
-        if not step_type:
-            adapter.logger.error(f"Invalid step configuration: {step}")
-            continue
-        if not step_id:
-            # Normalize: infer a step_id if missing
-            if step_type == "trigger":
-                step_id = "trigger"
-            else:
-                step_id = _slugify(step.get("name") or f"{step_type}")
-            step = {**step, "step_id": step_id}
+    tenant_id = (user_context_data or {}).get("tenant_id")
+
+    async def _attempt_step(step: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a step once (a single durable call) and publish its result."""
+        step_id = step["step_id"]
+        step_type = step["step_type"]
+        input_data = _prepare_step_input(step)
+        # Persist current_step in execution_metadata so polling can show "running".
+        # Not awaited before the step starts: concurrent steps must reach DBOS in a
+        # deterministic order for recovery.
+        current_step_write = asyncio.create_task(
+            _set_current_step(execution_id, step_id, tenant_id)
+        )
+        res = await dbos_execute_step_durable(
+            step_type=step_type,
+            step_config=step,
+            input_data=input_data,
+            execution_context_data=execution_context_data,
+        )
+        adapter.logger.info(
+            f"Step {step_id} executed, result: success={res.get('success')}, status={res.get('status')}"
+        )
+        await current_step_write
+        step_results[step_id] = res
+        execution_context_data["step_io_data"][step_id] = res.get("output_data")
+
+        # Emit step completion event
+        try:
+            # Prefer explicit status from step result; fallback to success flag
+            step_status = (
+                res.get("status") or ("completed" if res.get("success") else "failed")
+            ).lower()
+            step_event = create_step_event(
+                execution_id=execution_id,
+                step_id=step_id,
+                step_status=step_status,
+                workflow_id=workflow_id,
+                step_type=step_type,
+                output_data=res.get("output_data"),
+            )
+            await stream_manager.emit_execution_event(step_event)
+            await stream_manager.emit_workflow_event(step_event)
+        except Exception:
+            pass
+        return res
+
+    async def _run_step(
+        step: Dict[str, Any],
+        defer_waits: bool = False,
+        resume_with: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Union[DBOSWorkflowResult, _PendingStep]]:
+        """
+        Run one step until it completes; returns the failure result, if any.
+
+        With defer_waits, a step that has to wait for a user message or an
+        ingestion callback returns a _PendingStep after its first attempt
+        instead; pass its result as resume_with to continue it.
+        """
+        step_id = step["step_id"]
 
         # Inner loop to handle interactive WAITING steps by polling for new messages
         while True:
-            input_data = _prepare_step_input(step)
-            # Persist current_step in execution_metadata before executing so polling can show "running"
-            try:
-                from ..db.service import DatabaseService as _DBSCurrent
-                from ..db.database import get_db_session as _get_sess_current
-                from sqlmodel import select as _sel_current
-                from ..db.models import WorkflowExecution as _WECurrent
-                import uuid as _uuid_current
-
-                _dbs_current = _DBSCurrent()
-                _sess_current = _get_sess_current()
-                try:
-                    # Fetch current metadata and merge current_step into it
-                    _exec_row = _sess_current.exec(
-                        _sel_current(_WECurrent).where(
-                            _WECurrent.id == _uuid_current.UUID(execution_id)
-                        )
-                    ).first()
-                    if _exec_row:
-                        _meta = dict(_exec_row.execution_metadata or {})
-                        _meta["current_step"] = step_id
-                        _dbs_current.update_execution(
-                            _sess_current,
-                            execution_id,
-                            {"execution_metadata": _meta},
-                        )
-                finally:
-                    _sess_current.close()
-            except Exception as _curr_err:
-                adapter.logger.warning(
-                    f"Failed to persist current_step for {execution_id}: {_curr_err}"
-                )
             try:
-                res = await dbos_execute_step_durable(
-                    step_type=step_type,
-                    step_config=step,
-                    input_data=input_data,
-                    execution_context_data=execution_context_data,
-                )
-                adapter.logger.info(
-                    f"Step {step_id} executed, result: success={res.get('success')}, status={res.get('status')}"
-                )
-                step_results[step_id] = res
-                execution_context_data["step_io_data"][step_id] = res.get("output_data")
-
-                # Emit step completion event
-                try:
-                    # Prefer explicit status from step result; fallback to success flag
-                    step_status = (
-                        res.get("status")
-                        or ("completed" if res.get("success") else "failed")
-                    ).lower()
-                    step_event = create_step_event(
-                        execution_id=execution_id,
-                        step_id=step_id,
-                        step_status=step_status,
-                        workflow_id=workflow_id,
-                        step_type=step_type,
-                        output_data=res.get("output_data"),
-                    )
-                    await stream_manager.emit_execution_event(step_event)
-                    await stream_manager.emit_workflow_event(step_event)
-                except Exception:
-                    pass
+                if resume_with is not None:
+                    res, resume_with = resume_with, None
+                else:
+                    res = await _attempt_step(step)
 
                 # Completed -> persist step progress and proceed to next step
                 if res.get("success"):
-                    # Persist step_io_data to DB after each step so polling sees intermediate progress
-                    # Also clear current_step from metadata since step is now complete
-                    try:
-                        from ..db.service import DatabaseService as _DBSPersist
-                        from ..db.database import get_db_session as _get_sess_persist
-                        from sqlmodel import select as _sel_persist
-                        from ..db.models import WorkflowExecution as _WEPersist
-                        import uuid as _uuid_persist
-
-                        _dbs_persist = _DBSPersist()
-                        _sess_persist = _get_sess_persist()
-                        try:
-                            # Fetch current metadata and clear current_step
-                            _exec_row_p = _sess_persist.exec(
-                                _sel_persist(_WEPersist).where(
-                                    _WEPersist.id == _uuid_persist.UUID(execution_id)
-                                )
-                            ).first()
-                            _meta_p = {}
-                            if _exec_row_p:
-                                _meta_p = dict(_exec_row_p.execution_metadata or {})
-                            _meta_p["current_step"] = None  # Clear after step completes
-                            _dbs_persist.update_execution(
-                                _sess_persist,
-                                execution_id,
-                                {
-                                    "step_io_data": execution_context_data[
-                                        "step_io_data"
-                                    ],
-                                    "execution_metadata": _meta_p,
-                                },
-                            )
-                        finally:
-                            _sess_persist.close()
-                    except Exception as _persist_err:
-                        adapter.logger.warning(
-                            f"Failed to persist step progress for {execution_id}: {_persist_err}"
-                        )
-                    break
+                    # Persist step_io_data so polling sees intermediate progress, and clear
+                    # current_step (unless a concurrent step has set it since)
+                    await _set_current_step(
+                        execution_id,
+                        None,
+                        tenant_id,
+                        completed_step=step_id,
+                        step_io_data=execution_context_data["step_io_data"],
+                    )
+                    return None
 
                 # Not success -> either waiting or failed
                 status_lower = str(res.get("status") or "").lower()
                 adapter.logger.info(
                     f"Step {step_id} returned status: {status_lower}, success: {res.get('success')}"
                 )
-                adapter.logger.info(
-                    f"DEBUG: Checking status_lower='{status_lower}' against 'waiting', 'ingesting', etc."
-                )
+                if defer_waits and status_lower in ("waiting", "ingesting"):
+                    return _PendingStep(res)
                 if status_lower == "waiting":
                     # Emit explicit status=waiting so clients/DB reflect paused state
                     try:
@@ -585,20 +640,26 @@ async def dbos_execute_workflow_durable(
                     except Exception:
                         pass
 
-                    # Poll for ingestion completion instead of waiting for DBOS event
-                    # This allows cross-service communication without shared DBOS database
-                    import asyncio as _asyncio
-
+                    # Block until the ingestion callback is delivered to this workflow
+                    # (see the executions callback route); the timeout only bounds how
+                    # long a lost callback can stall the step before it re-checks the job.
+                    callback_topic = (res.get("output_data") or {}).get(
+                        "callback_topic"
+                    ) or make_ingestion_topic(execution_id, step_id)
                     adapter.logger.info(
-                        f"Polling for ingestion completion: exec={execution_id} step={step_id}"
+                        f"Waiting for ingestion completion: exec={execution_id} step={step_id} topic={callback_topic}"
                     )
+                    payload = await DBOS.recv_async(
+                        topic=callback_topic,
+                        timeout_seconds=INGESTION_RECHECK_SECONDS,
+                    )
+                    if payload is None:
+                        adapter.logger.warning(
+                            f"No ingestion callback within {INGESTION_RECHECK_SECONDS}s for "
+                            f"exec={execution_id} step={step_id}; re-checking job status"
+                        )
 
-                    # Sleep for a short time before re-checking (durable sleep)
-                    from dbos import DBOS as _DBOS
-
-                    await _DBOS.sleep_async(2)  # Poll every 2 seconds
-
-                    # Loop to re-execute this step (should check job status and return success=True when done)
+                    # Loop to re-execute this step (checks job status and returns success=True when done)
                     continue
 
                 # Otherwise, emit error event for failed step
@@ -639,6 +700,34 @@ async def dbos_execute_workflow_durable(
                     "step_results": step_results,
                 }
 
+    runnable_steps = []
+    for step in steps:
+        step_id = step.get("step_id")
+        step_type = step.get("step_type")
+        if not step_type:
+            adapter.logger.error(f"Invalid step configuration: {step}")
+            continue
+        if not step_id:
+            # Normalize: infer a step_id if missing
+            if step_type == "trigger":
+                step_id = "trigger"
+            else:
+                step_id = _slugify(step.get("name") or f"{step_type}")
+            step = {**step, "step_id": step_id}
+        runnable_steps.append(step)
+
+    # Like the local engine, only the "parallel" pattern runs independent steps
+    # concurrently; other patterns run one step at a time in topological order.
+    if workflow_config.get("execution_pattern") == "parallel":
+        waves = _dependency_waves(runnable_steps)
+    else:
+        waves = [[step] for step in runnable_steps]
+
+    for wave in waves:
+        failure = await _run_wave(wave, _run_step)
+        if failure is not None:
+            return failure
+
     # Emit workflow completion event
     try:
         completion_event = create_status_event(
@@ -654,7 +743,6 @@ async def dbos_execute_workflow_durable(
         pass
 
     # Persist final status to database (for async workflows with wait=False)
-    tenant_id = (user_context_data or {}).get("tenant_id")
     _persist_execution_status(
         execution_id,
         _ExecStatus.COMPLETED.value,
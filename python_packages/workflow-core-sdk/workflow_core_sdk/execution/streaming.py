@@ -8,10 +8,12 @@ to ensure a single shared stream_manager instance is used across the entire appl
 from ..streaming import (
     StreamEventType,
     StreamEvent,
+    SSEFrame,
     StreamManager,
     stream_manager,
     create_sse_stream,
     get_sse_headers,
+    parse_last_event_id,
     create_status_event,
     create_step_event,
     create_error_event,
@@ -20,10 +22,12 @@ from ..streaming import (
 __all__ = [
     "StreamEventType",
     "StreamEvent",
+    "SSEFrame",
     "StreamManager",
     "stream_manager",
     "create_sse_stream",
     "get_sse_headers",
+    "parse_last_event_id",
     "create_status_event",
     "create_step_event",
     "create_error_event",
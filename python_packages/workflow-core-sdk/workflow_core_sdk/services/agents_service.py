@@ -7,7 +7,7 @@ from uuid import UUID
 from sqlmodel import Session, select
 
 from ..db.models import Agent, AgentUpdate, AgentToolBinding
-from ..tools.registry import tool_registry
+from ..tools.registry import bump_tool_registry_version, tool_registry
 from ..schemas.inline_tools import (
     UserFunctionDefinition,
     WebSearchToolConfig,
@@ -47,6 +47,7 @@ class AgentsService:
         db_agent = Agent(**agent_data)
         session.add(db_agent)
         session.commit()
+        bump_tool_registry_version()
         session.refresh(db_agent)
         return db_agent
 
@@ -82,6 +83,7 @@ class AgentsService:
 
         session.add(db_agent)
         session.commit()
+        bump_tool_registry_version()
         session.refresh(db_agent)
         return db_agent
 
@@ -92,6 +94,7 @@ class AgentsService:
             return False
         session.delete(db_agent)
         session.commit()
+        bump_tool_registry_version()
         return True
 
     # ----- Agent Tool Bindings -----
@@ -168,6 +171,7 @@ class AgentsService:
 
         session.add(binding)
         session.commit()
+        bump_tool_registry_version()
         session.refresh(binding)
         return binding
 
@@ -192,6 +196,7 @@ class AgentsService:
 
         session.add(binding)
         session.commit()
+        bump_tool_registry_version()
         session.refresh(binding)
         return binding
 
@@ -206,4 +211,5 @@ class AgentsService:
             raise ValueError("Agent/binding mismatch")
         session.delete(binding)
         session.commit()
+        bump_tool_registry_version()
         return True
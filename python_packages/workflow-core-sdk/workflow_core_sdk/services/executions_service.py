@@ -32,6 +32,29 @@ class ExecutionsService:
             session, workflow_id=workflow_id, status=status, limit=limit, offset=offset
         )
 
+    @staticmethod
+    def list_executions_page(
+        session: Session,
+        *,
+        workflow_id: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total_estimate: bool = False,
+    ) -> Dict[str, Any]:
+        """Keyset-paginated execution summaries; raises ValueError on a bad cursor."""
+        db = DatabaseService()
+        return db.list_executions_page(
+            session,
+            workflow_id=workflow_id,
+            status=status,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            include_total_estimate=include_total_estimate,
+        )
+
     @staticmethod
     def execution_exists(session: Session, execution_id: str) -> bool:
         db = DatabaseService()
@@ -16,6 +16,7 @@ from ..db.models import (
     MCPServerCreate,
     MCPServerUpdate,
 )
+from ..tools.registry import bump_tool_registry_version
 
 
 class ToolsService:
@@ -42,6 +43,7 @@ class ToolsService:
         db_tool = Tool(**payload.model_dump())
         session.add(db_tool)
         session.commit()
+        bump_tool_registry_version()
         session.refresh(db_tool)
         return db_tool
 
@@ -65,6 +67,7 @@ class ToolsService:
             setattr(db_tool, k, v)
         session.add(db_tool)
         session.commit()
+        bump_tool_registry_version()
         session.refresh(db_tool)
         return db_tool
 
@@ -75,6 +78,7 @@ class ToolsService:
             return False
         session.delete(db_tool)
         session.commit()
+        bump_tool_registry_version()
         return True
 
     # ---- Categories ----
@@ -135,6 +139,7 @@ class ToolsService:
         db_server = MCPServer(**payload.model_dump())
         session.add(db_server)
         session.commit()
+        bump_tool_registry_version()
         session.refresh(db_server)
         return db_server
 
@@ -159,6 +164,7 @@ class ToolsService:
             setattr(db_server, k, v)
         session.add(db_server)
         session.commit()
+        bump_tool_registry_version()
         session.refresh(db_server)
         return db_server
 
@@ -169,4 +175,5 @@ class ToolsService:
             return False
         session.delete(db_server)
         session.commit()
+        bump_tool_registry_version()
         return True
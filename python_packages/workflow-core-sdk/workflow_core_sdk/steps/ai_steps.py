@@ -5,6 +5,7 @@ Steps that integrate with AI models and language models for
 intelligent processing, agent execution, and AI-powered workflows.
 """
 
+import copy
 import uuid
 import asyncio
 import json
@@ -18,6 +19,11 @@ from llm_gateway.a2a.client import A2AClientService
 from llm_gateway.a2a.types import A2AAgentInfo, A2AAuthConfig, A2AMessageRequest
 from workflow_core_sdk.db.service import DatabaseService
 from workflow_core_sdk.tools.basic_tools import get_tool_by_name as get_tool_function
+from workflow_core_sdk.tools.registry import (
+    TOOL_REGISTRY_CACHE_TTL,
+    current_tenant_key,
+    get_tool_registry_version,
+)
 from ..db.database import get_db_session
 from ..utils import decrypt_if_encrypted
 from ..utils.variable_injection import inject_variables
@@ -49,6 +55,12 @@ LLM_GATEWAY_AVAILABLE = True
 
 # -------- DB helper: load DB-defined tools for an agent and convert to OpenAI tool schemas --------
 
+# (tenant, agent_id, agent_name) -> (registry version, loaded_at, schemas)
+_agent_tool_schema_cache: Dict[
+    Tuple[str, Optional[str], Optional[str]],
+    Tuple[int, float, List[Dict[str, Any]]],
+] = {}
+
 
 def load_agent_db_tool_schemas(
     agent_id: Optional[str] = None, agent_name: Optional[str] = None
@@ -59,14 +71,39 @@ def load_agent_db_tool_schemas(
     - Resolves AgentToolBinding rows, joins Tool rows
     - Converts Tool.parameters_schema to OpenAI tool schema
     - Handles inline definitions stored in override_parameters['_inline_definition']
+
+    Schemas are memoized per tenant and agent until the tool registry version
+    changes (any tool, MCP server, agent or binding write) or the entry is older
+    than TOOL_REGISTRY_CACHE_TTL. Callers get a copy they may modify.
     """
-    from workflow_core_sdk.schemas.inline_tools import PLACEHOLDER_TOOL_IDS
+    key = (current_tenant_key(), agent_id, agent_name)
+    version = get_tool_registry_version(key[0])
+    now = time.monotonic()
+    cached = _agent_tool_schema_cache.get(key)
+    if (
+        cached is not None
+        and cached[0] == version
+        and now - cached[1] < TOOL_REGISTRY_CACHE_TTL
+    ):
+        return copy.deepcopy(cached[2])
 
     try:
-        session = get_db_session()
-    except Exception:
+        schemas = _load_agent_db_tool_schemas(agent_id, agent_name)
+    except Exception as e:
+        logger.warning(
+            f"Failed to load DB tools for agent {agent_id or agent_name}: {e}"
+        )
         return []
+    _agent_tool_schema_cache[key] = (version, now, schemas)
+    return copy.deepcopy(schemas)
+
+
+def _load_agent_db_tool_schemas(
+    agent_id: Optional[str], agent_name: Optional[str]
+) -> List[Dict[str, Any]]:
+    from workflow_core_sdk.schemas.inline_tools import PLACEHOLDER_TOOL_IDS
 
+    session = get_db_session()
     try:
         from uuid import UUID as _UUID
 
@@ -132,11 +169,8 @@ def load_agent_db_tool_schemas(
                     }
                 )
         return schemas
-    except Exception as e:
-        logger.warning(
-            f"Failed to load DB tools for agent {agent_id or agent_name}: {e}"
-        )
-        return []
+    finally:
+        session.close()
 
 
 def _build_inline_tool_schema(inline_def: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -77,13 +77,9 @@ async def ingestion_step(
 
     try:
         # Build callback topic for DBOS event notification
-        from ..dbos_impl.messaging import make_decision_topic
+        from ..dbos_impl.messaging import make_ingestion_topic
 
-        callback_topic = make_decision_topic(
-            execution_context.execution_id,
-            step_id,
-            suffix="ingestion_done",
-        )
+        callback_topic = make_ingestion_topic(execution_context.execution_id, step_id)
 
         # Prepare job request
         ingestion_config = config.get("ingestion_config", {})
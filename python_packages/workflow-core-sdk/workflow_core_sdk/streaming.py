@@ -6,16 +6,25 @@ for real-time workflow and execution updates.
 """
 
 import asyncio
+import itertools
 import json
 import logging
 import time
+from collections import OrderedDict, deque
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional, Set, AsyncGenerator
+from typing import Dict, Any, Optional, Set, AsyncGenerator, Deque, List, Union
 from dataclasses import dataclass, field
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Statuses that end an execution stream
+TERMINAL_STATUSES = frozenset({"completed", "failed", "error"})
+
+# Event IDs are unique per process and start from the boot time in milliseconds,
+# so IDs issued after a restart sort after the ones a reconnecting client saw.
+_event_ids = itertools.count(time.time_ns() // 1_000_000)
+
 
 class StreamEventType(str, Enum):
     """Types of streaming events"""
@@ -27,6 +36,19 @@ class StreamEventType(str, Enum):
     COMPLETE = "complete"
 
 
+@dataclass(frozen=True)
+class SSEFrame:
+    """An event serialized once and shared by every subscriber"""
+
+    id: int
+    payload: str
+    terminal: bool = False
+
+
+# Put on a subscriber queue to end its stream without a completion event
+_DISCONNECT = object()
+
+
 @dataclass
 class StreamEvent:
     """Standardized streaming event structure"""
@@ -36,13 +58,23 @@ class StreamEvent:
     workflow_id: Optional[str] = None
     timestamp: Optional[str] = None
     data: Dict[str, Any] = field(default_factory=dict)
+    _frame: Optional[SSEFrame] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         if self.timestamp is None:
             self.timestamp = datetime.now(timezone.utc).isoformat()
 
-    def to_sse(self) -> str:
-        """Convert to Server-Sent Events format"""
+    @property
+    def is_terminal(self) -> bool:
+        """Whether this event ends the stream of its execution"""
+        return (
+            self.type == StreamEventType.COMPLETE
+            or self.data.get("status") in TERMINAL_STATUSES
+        )
+
+    def _event_data(self) -> Dict[str, Any]:
         event_data = {
             "type": self.type,
             "execution_id": self.execution_id,
@@ -51,36 +83,122 @@ class StreamEvent:
         }
         if self.workflow_id:
             event_data["workflow_id"] = self.workflow_id
+        return event_data
 
-        return f"data: {json.dumps(event_data)}\n\n"
+    def to_sse(self) -> str:
+        """Convert to Server-Sent Events format"""
+        return f"data: {json.dumps(self._event_data())}\n\n"
+
+    def to_frame(self) -> SSEFrame:
+        """Serialize with an event ID; done once, however many streams receive it"""
+        if self._frame is None:
+            event_id = next(_event_ids)
+            self._frame = SSEFrame(
+                id=event_id,
+                payload=f"id: {event_id}\ndata: {json.dumps(self._event_data())}\n\n",
+                terminal=self.is_terminal,
+            )
+        return self._frame
+
+
+def parse_last_event_id(value: Optional[str]) -> Optional[int]:
+    """Parse a Last-Event-ID header value, ignoring anything malformed"""
+    try:
+        return int(value) if value else None
+    except (TypeError, ValueError):
+        return None
 
 
 class StreamManager:
-    """Manages active streaming connections and event distribution"""
+    """Manages active streaming connections and event distribution
 
-    def __init__(self):
+    Events are serialized once and the same frame is put on every subscriber
+    queue. Queues are bounded by their creator; a subscriber whose queue is full
+    is disconnected so it can reconnect with Last-Event-ID and resume from the
+    replay buffer instead of stalling the producer or silently losing events.
+    """
+
+    def __init__(self, replay_buffer_size: int = 500, max_replay_streams: int = 1000):
         # Track active connections per execution
         self.execution_streams: Dict[str, Set[asyncio.Queue]] = {}
         # Track active connections per workflow
         self.workflow_streams: Dict[str, Set[asyncio.Queue]] = {}
         self._cleanup_task: Optional[asyncio.Task] = None
-
-    def add_execution_stream(self, execution_id: str, queue: asyncio.Queue) -> None:
-        """Add a streaming connection for a specific execution"""
-        if execution_id not in self.execution_streams:
-            self.execution_streams[execution_id] = set()
-        self.execution_streams[execution_id].add(queue)
+        # Recent frames per execution / workflow for Last-Event-ID resume (LRU)
+        self.replay_buffer_size = replay_buffer_size
+        self.max_replay_streams = max_replay_streams
+        self._execution_replay: "OrderedDict[str, Deque[SSEFrame]]" = OrderedDict()
+        self._workflow_replay: "OrderedDict[str, Deque[SSEFrame]]" = OrderedDict()
+        self.dropped_subscribers = 0
+
+    def _subscribe(
+        self,
+        streams: Dict[str, Set[asyncio.Queue]],
+        replay: "OrderedDict[str, Deque[SSEFrame]]",
+        key: str,
+        queue: asyncio.Queue,
+        last_event_id: Optional[int],
+    ) -> None:
+        # Replay and registration happen without awaiting, so no event can be
+        # emitted in between and lost or duplicated
+        if last_event_id is not None:
+            frames = [frame for frame in replay.get(key, ()) if frame.id > last_event_id]
+            room = queue.maxsize - queue.qsize() if queue.maxsize > 0 else len(frames)
+            if len(frames) > room:
+                # Replay what fits and end the stream; the client reconnects
+                # with the last ID it got and receives the rest
+                logger.warning(f"Replay for {key} exceeds the stream queue size")
+                for frame in frames[: max(room - 1, 0)]:
+                    queue.put_nowait(frame)
+                try:
+                    queue.put_nowait(_DISCONNECT)
+                except asyncio.QueueFull:
+                    self._disconnect(queue)
+                return
+            for frame in frames:
+                queue.put_nowait(frame)
+        streams.setdefault(key, set()).add(queue)
+
+    def add_execution_stream(
+        self,
+        execution_id: str,
+        queue: asyncio.Queue,
+        last_event_id: Optional[int] = None,
+    ) -> None:
+        """Add a streaming connection for a specific execution
+
+        With last_event_id, buffered events after that ID are queued first.
+        """
+        self._subscribe(
+            self.execution_streams,
+            self._execution_replay,
+            execution_id,
+            queue,
+            last_event_id,
+        )
         logger.debug(
-            f"Added execution stream for {execution_id}, total: {len(self.execution_streams[execution_id])}"
+            f"Added execution stream for {execution_id}, total: {len(self.execution_streams.get(execution_id, ()))}"
         )
 
-    def add_workflow_stream(self, workflow_id: str, queue: asyncio.Queue) -> None:
-        """Add a streaming connection for a workflow"""
-        if workflow_id not in self.workflow_streams:
-            self.workflow_streams[workflow_id] = set()
-        self.workflow_streams[workflow_id].add(queue)
+    def add_workflow_stream(
+        self,
+        workflow_id: str,
+        queue: asyncio.Queue,
+        last_event_id: Optional[int] = None,
+    ) -> None:
+        """Add a streaming connection for a workflow
+
+        With last_event_id, buffered events after that ID are queued first.
+        """
+        self._subscribe(
+            self.workflow_streams,
+            self._workflow_replay,
+            workflow_id,
+            queue,
+            last_event_id,
+        )
         logger.debug(
-            f"Added workflow stream for {workflow_id}, total: {len(self.workflow_streams[workflow_id])}"
+            f"Added workflow stream for {workflow_id}, total: {len(self.workflow_streams.get(workflow_id, ()))}"
         )
 
     def remove_execution_stream(self, execution_id: str, queue: asyncio.Queue) -> None:
@@ -100,32 +218,56 @@ class StreamManager:
                 del self.workflow_streams[workflow_id]
         logger.debug(f"Removed workflow stream for {workflow_id}")
 
+    def _remember(
+        self, replay: "OrderedDict[str, Deque[SSEFrame]]", key: str, frame: SSEFrame
+    ) -> None:
+        buffer = replay.get(key)
+        if buffer is None:
+            buffer = replay[key] = deque(maxlen=self.replay_buffer_size)
+            while len(replay) > self.max_replay_streams:
+                replay.popitem(last=False)
+        else:
+            replay.move_to_end(key)
+        buffer.append(frame)
+
+    def _disconnect(self, queue: asyncio.Queue) -> None:
+        """Drop whatever is queued and tell the consumer to end its stream"""
+        while True:
+            try:
+                queue.get_nowait()
+                queue.task_done()
+            except asyncio.QueueEmpty:
+                break
+        queue.put_nowait(_DISCONNECT)
+
+    def _fan_out(self, queues: Set[asyncio.Queue], frame: SSEFrame, key: str) -> List:
+        dead_queues = []
+        for queue in queues:
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                logger.warning(f"Slow stream consumer on {key}; disconnecting it")
+                self._disconnect(queue)
+                dead_queues.append(queue)
+            except Exception as e:
+                logger.error(f"Error sending to stream {key}: {e}")
+                dead_queues.append(queue)
+        self.dropped_subscribers += len(dead_queues)
+        return dead_queues
+
     async def emit_execution_event(self, event: StreamEvent) -> None:
         """Emit an event to all streams listening to this execution"""
         execution_id = event.execution_id
         logger.debug(f"Emit event: type={event.type}, execution_id={execution_id}")
+        frame = event.to_frame()
+        self._remember(self._execution_replay, execution_id, frame)
         if execution_id not in self.execution_streams:
             logger.debug(f"No streams registered for execution {execution_id}")
             return
 
-        sse_data = event.to_sse()
-        dead_queues = set()
-        queue_count = len(self.execution_streams[execution_id])
-        logger.debug(f"Adding event to {queue_count} queue(s)")
-
-        for queue in self.execution_streams[execution_id]:
-            try:
-                queue.put_nowait(sse_data)
-                logger.debug(f"Event added to queue (qsize={queue.qsize()})")
-            except asyncio.QueueFull:
-                logger.warning(f"Stream queue full for execution {execution_id}")
-                dead_queues.add(queue)
-            except Exception as e:
-                logger.error(f"Error sending to execution stream {execution_id}: {e}")
-                dead_queues.add(queue)
-
-        # Clean up dead queues
-        for queue in dead_queues:
+        for queue in self._fan_out(
+            self.execution_streams[execution_id], frame, execution_id
+        ):
             self.remove_execution_stream(execution_id, queue)
 
     async def emit_workflow_event(self, event: StreamEvent) -> None:
@@ -134,24 +276,12 @@ class StreamManager:
             return
 
         workflow_id = event.workflow_id
+        frame = event.to_frame()
+        self._remember(self._workflow_replay, workflow_id, frame)
         if workflow_id not in self.workflow_streams:
             return
 
-        sse_data = event.to_sse()
-        dead_queues = set()
-
-        for queue in self.workflow_streams[workflow_id]:
-            try:
-                queue.put_nowait(sse_data)
-            except asyncio.QueueFull:
-                logger.warning(f"Stream queue full for workflow {workflow_id}")
-                dead_queues.add(queue)
-            except Exception as e:
-                logger.error(f"Error sending to workflow stream {workflow_id}: {e}")
-                dead_queues.add(queue)
-
-        # Clean up dead queues
-        for queue in dead_queues:
+        for queue in self._fan_out(self.workflow_streams[workflow_id], frame, workflow_id):
             self.remove_workflow_stream(workflow_id, queue)
 
     def get_stats(self) -> Dict[str, Any]:
@@ -165,6 +295,8 @@ class StreamManager:
             "total_workflow_connections": sum(
                 len(queues) for queues in self.workflow_streams.values()
             ),
+            "replay_buffers": len(self._execution_replay) + len(self._workflow_replay),
+            "dropped_subscribers": self.dropped_subscribers,
         }
 
 
@@ -184,53 +316,54 @@ async def create_sse_stream(
         max_events: Maximum events before auto-closing stream
     """
     event_count = 0
-    last_heartbeat = time.time()
+    # IDs of recently yielded frames, to skip duplicates
+    recent_ids: Deque[int] = deque(maxlen=256)
+    last_heartbeat = time.monotonic()
     cancelled = False
 
     try:
         while event_count < max_events:
             try:
-                # Check if we need to send a heartbeat
-                now = time.time()
-                if now - last_heartbeat >= heartbeat_interval:
+                # Block until the next event or until a heartbeat is due
+                timeout = heartbeat_interval - (time.monotonic() - last_heartbeat)
+                try:
+                    if timeout <= 0:
+                        raise asyncio.TimeoutError
+                    item: Union[SSEFrame, str, object] = await asyncio.wait_for(
+                        queue.get(), timeout=timeout
+                    )
+                except asyncio.TimeoutError:
                     heartbeat_event = StreamEvent(
                         type=StreamEventType.HEARTBEAT,
                         execution_id="system",
-                        data={"timestamp": now},
+                        data={"timestamp": time.time()},
                     )
                     yield heartbeat_event.to_sse()
-                    last_heartbeat = now
-
-                # Try to get an event from the queue (with short timeout)
-                try:
-                    event_data = await asyncio.wait_for(queue.get(), timeout=0.5)
-                except asyncio.TimeoutError:
-                    # No events available within timeout, loop again
+                    last_heartbeat = time.monotonic()
                     continue
-                except Exception:
-                    # Re-raise non-timeout exceptions
-                    raise
+
+                queue.task_done()
+                if item is _DISCONNECT:
+                    # Slow consumer: end the stream so the client reconnects
+                    # with Last-Event-ID and resumes from the replay buffer
+                    logger.debug("Stream closing: consumer fell behind")
+                    cancelled = True
+                    break
+
+                if isinstance(item, SSEFrame):
+                    # A queue listening to both a workflow and one of its
+                    # executions receives the same frame twice
+                    if item.id in recent_ids:
+                        continue
+                    recent_ids.append(item.id)
+                    yield item.payload
+                    event_count += 1
+                    if item.terminal:
+                        logger.debug("Stream closing: received terminal event")
+                        break
                 else:
-                    yield event_data
+                    yield item
                     event_count += 1
-                    queue.task_done()
-
-                    # Check if this is a completion event and close the stream
-                    try:
-                        # Parse the SSE data to check for completion
-                        # Format: "data: {...}\n\n"
-                        if event_data.startswith("data: "):
-                            json_str = event_data[6:].strip()
-                            parsed = json.loads(json_str)
-                            status = parsed.get("data", {}).get("status")
-                            if status in ("completed", "failed", "error"):
-                                logger.debug(
-                                    f"Stream closing: received '{status}' status"
-                                )
-                                break
-                    except (json.JSONDecodeError, KeyError, TypeError):
-                        # If we can't parse, just continue
-                        pass
 
             except asyncio.CancelledError:
                 logger.debug("SSE stream cancelled")
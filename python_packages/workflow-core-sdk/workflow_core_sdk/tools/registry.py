@@ -4,24 +4,59 @@ Unified Tool Registry for Workflow Engine POC
 Aggregates tools from:
 - Local provider (basic_tools)
 - DB provider (Tool table)
-- MCP provider (stub for now)
+- MCP provider (tool lists cached by the MCP client)
 
 Provides unified listing and lookup, plus optional sync of local tools into DB.
+
+The merged tool map is cached per tenant. Every write that affects tools or
+agent tool bindings bumps the tenant's registry version (see
+bump_tool_registry_version), which invalidates the cached map and the compiled
+agent tool schemas. Versions are per process, so entries also expire after
+TOOL_REGISTRY_CACHE_TTL seconds to pick up writes made by other replicas.
 """
 
 from __future__ import annotations
 
+import os
+import threading
+import time
 from typing import Dict, List, Optional, Any, Literal
 from dataclasses import dataclass
 import uuid
 
 from sqlmodel import Session, select
 
-from ..db.models import Tool as DBTool, ToolCreate
+from ..db.models import Tool as DBTool, ToolCreate, MCPServer as DBMCPServer
 from ..tools.basic_tools import get_all_tools, get_all_schemas
 
 ToolSource = Literal["local", "db", "mcp"]
 
+TOOL_REGISTRY_CACHE_TTL = float(os.getenv("TOOL_REGISTRY_CACHE_TTL", "60"))
+
+_versions: Dict[str, int] = {}
+_versions_lock = threading.Lock()
+
+
+def current_tenant_key() -> str:
+    """Cache key for the current tenant context ("public" without one)."""
+    try:
+        from db_core.middleware import get_current_tenant_id
+    except ImportError:
+        return "public"
+    return get_current_tenant_id() or "public"
+
+
+def get_tool_registry_version(tenant_key: Optional[str] = None) -> int:
+    return _versions.get(tenant_key or current_tenant_key(), 0)
+
+
+def bump_tool_registry_version(tenant_key: Optional[str] = None) -> int:
+    """Invalidate cached tools and agent tool schemas of a tenant."""
+    key = tenant_key or current_tenant_key()
+    with _versions_lock:
+        _versions[key] = _versions.get(key, 0) + 1
+        return _versions[key]
+
 
 @dataclass
 class UnifiedTool:
@@ -43,10 +78,19 @@ class ToolRegistry:
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance._local_cache = None
+            # tenant -> (registry version, MCP generation, loaded_at, tools by name)
+            cls._instance._cache = {}
         return cls._instance
 
     # -------- Providers --------
     def _load_local(self) -> Dict[str, UnifiedTool]:
+        # Local tools are defined in code, so they are loaded once per process
+        if self._local_cache is None:
+            self._local_cache = self._build_local()
+        return self._local_cache
+
+    def _build_local(self) -> Dict[str, UnifiedTool]:
         tools = get_all_tools()  # name -> function
         schemas = get_all_schemas()  # name -> openai schema
         out: Dict[str, UnifiedTool] = {}
@@ -89,48 +133,94 @@ class ToolRegistry:
             )
         return out
 
-    # Placeholder for future MCP provider. For now we rely on DB persistence of MCP tools if any.
     def _load_mcp(self, session: Session) -> Dict[str, UnifiedTool]:
-        return {}
+        """Tools of active MCP servers, from the MCP client's tool list cache.
+
+        No network I/O happens here: missing or stale lists are refreshed in the
+        background (when an event loop is running) and picked up through the
+        client's tools_generation on a later lookup.
+        """
+        from ..clients.mcp_client import mcp_client
+
+        out: Dict[str, UnifiedTool] = {}
+        servers = session.exec(
+            select(DBMCPServer).where(DBMCPServer.status == "active")
+        ).all()
+        for server in servers:
+            server_config = {
+                "host": server.host,
+                "port": server.port,
+                "protocol": server.protocol,
+                "endpoint": server.endpoint,
+                "auth_type": server.auth_type,
+                "auth_config": server.auth_config or {},
+            }
+            if mcp_client.is_tools_cache_stale(server_config):
+                mcp_client.refresh_tools_in_background(server_config)
+            for tool in mcp_client.get_cached_tools(server_config) or []:
+                name = tool.get("name") if isinstance(tool, dict) else None
+                if not name:
+                    continue
+                out[name] = UnifiedTool(
+                    name=name,
+                    description=tool.get("description") or "",
+                    parameters_schema=tool.get("inputSchema")
+                    or tool.get("parameters")
+                    or {"type": "object", "properties": {}, "required": []},
+                    return_schema=tool.get("outputSchema"),
+                    execution_type="api",
+                    version=server.version or "1.0.0",
+                    source="mcp",
+                    uri=f"mcp://{server.name}/{name}",
+                )
+        return out
+
+    def _get_tool_map(self, session: Session) -> Dict[str, UnifiedTool]:
+        """Merged tools of the current tenant, rebuilt only when invalidated."""
+        from ..clients.mcp_client import mcp_client
+
+        tenant_key = current_tenant_key()
+        version = get_tool_registry_version(tenant_key)
+        generation = mcp_client.tools_generation
+        now = time.monotonic()
+        cached = self._cache.get(tenant_key)
+        if (
+            cached is not None
+            and cached[0] == version
+            and cached[1] == generation
+            and now - cached[2] < TOOL_REGISTRY_CACHE_TTL
+        ):
+            return cached[3]
 
-    # -------- Public API --------
-    def get_unified_tools(self, session: Session) -> List[UnifiedTool]:
         db_map = self._load_db(session)
         local_map = self._load_local()
         mcp_map = self._load_mcp(session)
 
         # Merge by precedence: DB > Local > MCP (DB wins on collisions)
         merged: Dict[str, UnifiedTool] = {}
-        # Start with local and mcp
-        for name, ut in {**local_map, **mcp_map}.items():
+        # Start with mcp, then local, so built-in tools are never shadowed by an MCP server
+        for name, ut in {**mcp_map, **local_map}.items():
             merged[name] = ut
         # Overlay DB entries
         for name, ut in db_map.items():
             merged[name] = ut
-        return list(merged.values())
+        self._cache[tenant_key] = (version, generation, now, merged)
+        return merged
+
+    # -------- Public API --------
+    def get_unified_tools(self, session: Session) -> List[UnifiedTool]:
+        return list(self._get_tool_map(session).values())
 
     def get_tool_by_name(self, session: Session, name: str) -> Optional[UnifiedTool]:
-        # Prefer DB
-        rec = session.exec(select(DBTool).where(DBTool.name == name)).first()
-        if rec:
-            return UnifiedTool(
-                name=rec.name,
-                description=rec.description,
-                parameters_schema=rec.parameters_schema
-                or {"type": "object", "properties": {}, "required": []},
-                return_schema=rec.return_schema,
-                execution_type=rec.execution_type or "function",
-                version=rec.version or "1.0.0",
-                source="db",
-                uri=f"db://{rec.id}",
-                db_id=rec.id,
-            )
-        # Fallback to local
-        local = self._load_local()
-        if name in local:
-            return local[name]
-        # MCP: none for now
-        return None
+        # DB tools take precedence over local and MCP tools in the merged map
+        return self._get_tool_map(session).get(name)
+
+    def invalidate(self, tenant_key: Optional[str] = None) -> None:
+        """Drop cached tools of one tenant, or of all tenants."""
+        if tenant_key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(tenant_key, None)
 
     # Optional: sync local tools to DB with upsert semantics (by name+version)
     def sync_local_to_db(self, session: Session) -> Dict[str, int]:
@@ -180,6 +270,7 @@ class ToolRegistry:
                 session.add(existing)
                 session.commit()
                 session.refresh(existing)
+                bump_tool_registry_version()
                 return (0, 1)
             return (0, 0)
         create = ToolCreate(
@@ -197,6 +288,7 @@ class ToolRegistry:
         obj = DBTool(**create.model_dump())
         session.add(obj)
         session.commit()
+        bump_tool_registry_version()
         return (1, 0)
 
 
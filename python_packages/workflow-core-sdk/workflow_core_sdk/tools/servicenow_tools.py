@@ -15,11 +15,19 @@ import requests
 import json
 from typing import Optional
 
+from requests.adapters import HTTPAdapter
+
 from .decorators import function_schema
 
 # Config from environment
 SERVICENOW_API_BASE = os.getenv("SERVICENOW_CONNECTOR_URL", "http://localhost:8091")
 
+# Pooled session shared by all ServiceNow tool calls so connections to the
+# connector are reused instead of opened per operation
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_maxsize=16))
+_session.mount("https://", HTTPAdapter(pool_maxsize=16))
+
 
 # ==================== ITSM Tools (Incident Management) ====================
 
@@ -90,7 +98,7 @@ def servicenow_itsm_create_incident(
         if cmdb_ci:
             payload["cmdb_ci"] = cmdb_ci
 
-        response = requests.post(
+        response = _session.post(
             f"{SERVICENOW_API_BASE}/incidents",
             json=payload,
             headers={"Content-Type": "application/json"},
@@ -152,7 +160,7 @@ def servicenow_itsm_get_incident(
         else:
             endpoint = f"{SERVICENOW_API_BASE}/incidents/{identifier}"
 
-        response = requests.get(
+        response = _session.get(
             endpoint, headers={"Content-Type": "application/json"}, timeout=30
         )
 
@@ -248,7 +256,7 @@ def servicenow_itsm_update_incident(
         if close_notes is not None:
             payload["close_notes"] = close_notes
 
-        response = requests.put(
+        response = _session.put(
             f"{SERVICENOW_API_BASE}/incidents/{sys_id}",
             json=payload,
             headers={"Content-Type": "application/json"},
@@ -369,7 +377,7 @@ def servicenow_csm_create_case(
         if account:
             payload["account"] = account
 
-        response = requests.post(
+        response = _session.post(
             f"{SERVICENOW_API_BASE}/cases",
             json=payload,
             headers={"Content-Type": "application/json"},
@@ -429,7 +437,7 @@ def servicenow_csm_get_case(identifier: str, identifier_type: str = "sys_id") ->
         else:
             endpoint = f"{SERVICENOW_API_BASE}/cases/{identifier}"
 
-        response = requests.get(
+        response = _session.get(
             endpoint, headers={"Content-Type": "application/json"}, timeout=30
         )
 
@@ -529,7 +537,7 @@ def servicenow_csm_update_case(
         if escalation is not None:
             payload["escalation"] = escalation
 
-        response = requests.put(
+        response = _session.put(
             f"{SERVICENOW_API_BASE}/cases/{sys_id}",
             json=payload,
             headers={"Content-Type": "application/json"},
@@ -579,6 +587,124 @@ def servicenow_csm_update_case(
         )
 
 
+# ==================== Bulk Tools ====================
+
+
+def _bulk_request(path: str, items_json: str, noun: str, action: str) -> str:
+    """Send a JSON array of records to a connector bulk endpoint."""
+    try:
+        items = json.loads(items_json)
+        if not isinstance(items, list):
+            raise ValueError("expected a JSON array")
+    except ValueError as e:
+        return json.dumps(
+            {
+                "success": False,
+                "message": f"Invalid {noun} list: {str(e)}",
+                "error": str(e),
+            }
+        )
+
+    try:
+        response = _session.post(
+            f"{SERVICENOW_API_BASE}{path}",
+            json=items,
+            headers={"Content-Type": "application/json"},
+            timeout=300,
+        )
+
+        if response.status_code == 200:
+            data = response.json()
+            return json.dumps(
+                {
+                    "success": data.get("error_count", 0) == 0,
+                    "message": f"Bulk {action} finished for {len(items)} {noun}",
+                    "data": data,
+                }
+            )
+        else:
+            return json.dumps(
+                {
+                    "success": False,
+                    "message": f"Failed to bulk {action} {noun}: {response.status_code}",
+                    "error": response.text,
+                }
+            )
+
+    except requests.exceptions.RequestException as e:
+        return json.dumps(
+            {
+                "success": False,
+                "message": f"Network error during bulk {action} of {noun}: {str(e)}",
+                "error": str(e),
+            }
+        )
+    except Exception as e:
+        return json.dumps(
+            {
+                "success": False,
+                "message": f"Unexpected error during bulk {action} of {noun}: {str(e)}",
+                "error": str(e),
+            }
+        )
+
+
+@function_schema
+def servicenow_itsm_bulk_create_incidents(incidents: str) -> str:
+    """
+    Create many ServiceNow incidents in one call.
+
+    Args:
+        incidents: JSON array of incident objects, each with the same fields as servicenow_itsm_create_incident (short_description is required)
+
+    Returns:
+        str: JSON string with per-item results, the created incidents and any per-item errors
+    """
+    return _bulk_request("/incidents/bulk", incidents, "incidents", "create")
+
+
+@function_schema
+def servicenow_itsm_bulk_update_incidents(updates: str) -> str:
+    """
+    Update many ServiceNow incidents in one call.
+
+    Args:
+        updates: JSON array of update objects, each with the incident "sys_id" plus the fields to change (same fields as servicenow_itsm_update_incident)
+
+    Returns:
+        str: JSON string with per-item results, the updated incidents and any per-item errors
+    """
+    return _bulk_request("/incidents/bulk/update", updates, "incidents", "update")
+
+
+@function_schema
+def servicenow_csm_bulk_create_cases(cases: str) -> str:
+    """
+    Create many ServiceNow CSM cases in one call.
+
+    Args:
+        cases: JSON array of case objects, each with the same fields as servicenow_csm_create_case (short_description is required)
+
+    Returns:
+        str: JSON string with per-item results, the created cases and any per-item errors
+    """
+    return _bulk_request("/cases/bulk", cases, "cases", "create")
+
+
+@function_schema
+def servicenow_csm_bulk_update_cases(updates: str) -> str:
+    """
+    Update many ServiceNow CSM cases in one call.
+
+    Args:
+        updates: JSON array of update objects, each with the case "sys_id" plus the fields to change (same fields as servicenow_csm_update_case)
+
+    Returns:
+        str: JSON string with per-item results, the updated cases and any per-item errors
+    """
+    return _bulk_request("/cases/bulk/update", updates, "cases", "update")
+
+
 # Export store and schemas for aggregation in basic_tools
 SERVICENOW_TOOL_STORE = {
     "servicenow_itsm_create_incident": servicenow_itsm_create_incident,
@@ -587,6 +713,10 @@ SERVICENOW_TOOL_STORE = {
     "servicenow_csm_create_case": servicenow_csm_create_case,
     "servicenow_csm_get_case": servicenow_csm_get_case,
     "servicenow_csm_update_case": servicenow_csm_update_case,
+    "servicenow_itsm_bulk_create_incidents": servicenow_itsm_bulk_create_incidents,
+    "servicenow_itsm_bulk_update_incidents": servicenow_itsm_bulk_update_incidents,
+    "servicenow_csm_bulk_create_cases": servicenow_csm_bulk_create_cases,
+    "servicenow_csm_bulk_update_cases": servicenow_csm_bulk_update_cases,
 }
 
 SERVICENOW_TOOL_SCHEMAS = {
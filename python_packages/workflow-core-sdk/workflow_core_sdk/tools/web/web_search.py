@@ -7,13 +7,13 @@ import requests
 from typing import Optional
 from openai import OpenAI
 
+from llm_gateway.tools.web_fetch import get_web_fetcher
+
 try:
     from ..registry import function_schema
-    from .url_to_markdown import url_to_markdown
 except ImportError:
     # Fallback for when imported from Agent Studio
     from utils import function_schema
-    from .url_to_markdown import url_to_markdown
 
 
 # Initialize OpenAI client
@@ -29,18 +29,17 @@ def web_search(query: str, num: Optional[int] = 2) -> str:
     """
     Search the web using Google Custom Search and return AI-summarized results.
 
-    Performs a Google search, fetches the top result, converts it to markdown,
-    and uses GPT-4 to generate a concise answer to the query.
+    Performs a Google search, fetches the result pages concurrently, converts
+    them to markdown, and uses GPT-4 to generate a concise answer to the query.
 
     Args:
         query: The search query
-        num: Number of results to fetch (default: 2, currently limited to 1)
+        num: Number of results to fetch (default: 2, max: 10)
 
     Returns:
         str: AI-generated answer based on web search results
     """
-    # Currently limited to 1 result for performance
-    num = 1
+    num = min(max(1, num or 1), 10)
 
     try:
         # Perform Google Custom Search
@@ -55,8 +54,8 @@ def web_search(query: str, num: Optional[int] = 2) -> str:
 
         urls = [item["link"] for item in search_data["items"]]
 
-        # Convert URLs to markdown
-        text = "\n".join([url_to_markdown(url) for url in urls])
+        # Convert URLs to markdown, fetching all pages concurrently
+        text = "\n".join(get_web_fetcher().fetch_markdown_many_sync(urls))
 
         # Use GPT-4 to summarize and answer the query
         prompt = f"Use the following text to answer the given: {query} \n\n ---BEGIN WEB TEXT --- {text} ---END WEB TEXT --- "
@@ -22,6 +22,8 @@ from .schema_utils import (
     extract_output_fields,
 )
 from .variable_injection import (
+    CompiledTemplate,
+    compile_template,
     inject_variables,
     extract_variables,
     resolve_variable,
@@ -54,6 +56,8 @@ __all__ = [
     "get_encryption_key",
     "is_encrypted",
     # Variable injection utilities
+    "CompiledTemplate",
+    "compile_template",
     "inject_variables",
     "extract_variables",
     "resolve_variable",
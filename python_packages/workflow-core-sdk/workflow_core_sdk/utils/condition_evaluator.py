@@ -8,13 +8,20 @@ Supports complex conditions, comparisons, and logical operations.
 import re
 import json
 import logging
-from typing import Any, Dict, List, Optional, Union
+import operator
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from enum import Enum
 from dataclasses import dataclass
 
 
 logger = logging.getLogger(__name__)
 
+# A compiled condition tree: evaluates a context to a boolean
+ConditionPlan = Callable[[Dict[str, Any]], bool]
+
 
 class ConditionOperator(str, Enum):
     """Supported condition operators"""
@@ -65,13 +72,61 @@ class ConditionalExpression:
     description: Optional[str] = None
 
 
+_COMPARATORS = {
+    ConditionOperator.GREATER_THAN: operator.gt,
+    ConditionOperator.GREATER_THAN_OR_EQUAL: operator.ge,
+    ConditionOperator.LESS_THAN: operator.lt,
+    ConditionOperator.LESS_THAN_OR_EQUAL: operator.le,
+}
+
+
+def _always_true(*_: Any) -> bool:
+    return True
+
+
+def _always_false(*_: Any) -> bool:
+    return False
+
+
+@lru_cache(maxsize=1024)
+def _split_path(variable_path: str) -> Tuple[str, ...]:
+    return tuple(variable_path.split("."))
+
+
+@lru_cache(maxsize=256)
+def _compile_regex(pattern: str) -> "re.Pattern[str]":
+    return re.compile(pattern)
+
+
+def _resolve_path(parts: Tuple[str, ...], context: Dict[str, Any]) -> Any:
+    """Resolve a pre-split variable path like ('step1', 'output', 'status')"""
+    try:
+        current: Any = context
+        for part in parts:
+            if isinstance(current, dict):
+                current = current.get(part)
+            elif hasattr(current, part):
+                current = getattr(current, part)
+            else:
+                return None
+        return current
+
+    except Exception as e:
+        logger.error(f"Error resolving variable '{'.'.join(parts)}': {e}")
+        return None
+
+
 class ConditionEvaluator:
     """Evaluates conditional expressions against execution context"""
 
-    def __init__(self):
+    def __init__(self, max_plans: int = 1024):
         self.variable_pattern = re.compile(
             r"^([a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)*)"
         )
+        # Raw conditions config -> compiled plan (LRU)
+        self.max_plans = max_plans
+        self._plans: "OrderedDict[str, Optional[ConditionPlan]]" = OrderedDict()
+        self._plans_lock = threading.Lock()
 
     def evaluate_condition(self, condition: Condition, context: Dict[str, Any]) -> bool:
         """
@@ -84,85 +139,7 @@ class ConditionEvaluator:
         Returns:
             Boolean result of condition evaluation
         """
-        try:
-            # Get left operand value
-            left_value = self._resolve_variable(condition.left_operand, context)
-
-            # Evaluate based on operator
-            if condition.operator == ConditionOperator.EQUALS:
-                return left_value == condition.right_operand
-
-            elif condition.operator == ConditionOperator.NOT_EQUALS:
-                return left_value != condition.right_operand
-
-            elif condition.operator == ConditionOperator.GREATER_THAN:
-                return self._safe_compare(
-                    left_value, condition.right_operand, lambda a, b: a > b
-                )
-
-            elif condition.operator == ConditionOperator.GREATER_THAN_OR_EQUAL:
-                return self._safe_compare(
-                    left_value, condition.right_operand, lambda a, b: a >= b
-                )
-
-            elif condition.operator == ConditionOperator.LESS_THAN:
-                return self._safe_compare(
-                    left_value, condition.right_operand, lambda a, b: a < b
-                )
-
-            elif condition.operator == ConditionOperator.LESS_THAN_OR_EQUAL:
-                return self._safe_compare(
-                    left_value, condition.right_operand, lambda a, b: a <= b
-                )
-
-            elif condition.operator == ConditionOperator.CONTAINS:
-                return self._safe_contains(left_value, condition.right_operand)
-
-            elif condition.operator == ConditionOperator.NOT_CONTAINS:
-                return not self._safe_contains(left_value, condition.right_operand)
-
-            elif condition.operator == ConditionOperator.IN:
-                return (
-                    left_value in condition.right_operand
-                    if condition.right_operand
-                    else False
-                )
-
-            elif condition.operator == ConditionOperator.NOT_IN:
-                return (
-                    left_value not in condition.right_operand
-                    if condition.right_operand
-                    else True
-                )
-
-            elif condition.operator == ConditionOperator.STARTS_WITH:
-                return str(left_value).startswith(str(condition.right_operand))
-
-            elif condition.operator == ConditionOperator.ENDS_WITH:
-                return str(left_value).endswith(str(condition.right_operand))
-
-            elif condition.operator == ConditionOperator.REGEX_MATCH:
-                return bool(re.search(str(condition.right_operand), str(left_value)))
-
-            elif condition.operator == ConditionOperator.IS_EMPTY:
-                return self._is_empty(left_value)
-
-            elif condition.operator == ConditionOperator.IS_NOT_EMPTY:
-                return not self._is_empty(left_value)
-
-            elif condition.operator == ConditionOperator.IS_NULL:
-                return left_value is None
-
-            elif condition.operator == ConditionOperator.IS_NOT_NULL:
-                return left_value is not None
-
-            else:
-                logger.warning(f"Unknown operator: {condition.operator}")
-                return False
-
-        except Exception as e:
-            logger.error(f"Error evaluating condition {condition}: {e}")
-            return False
+        return self.compile(condition)(context)
 
     def evaluate_expression(
         self, expression: ConditionalExpression, context: Dict[str, Any]
@@ -177,40 +154,126 @@ class ConditionEvaluator:
         Returns:
             Boolean result of expression evaluation
         """
+        return self.compile(expression)(context)
+
+    def compile(self, condition: Union[Condition, ConditionalExpression]) -> ConditionPlan:
+        """
+        Compile a condition or expression tree into a plan.
+
+        Variable paths are split, operators dispatched and regexes compiled once;
+        calling the plan with a context only resolves values and compares them.
+        Evaluation errors make the failing condition False, as in evaluate_condition.
+        """
+        if isinstance(condition, Condition):
+            return self._compile_condition(condition)
+        if isinstance(condition, ConditionalExpression):
+            return self._compile_expression(condition)
+        logger.warning(f"Unknown condition type: {type(condition)}")
+        return _always_false
+
+    def plan_for(
+        self,
+        conditions: Any,
+        parse: Callable[[Any], Optional[Union[Condition, ConditionalExpression]]],
+    ) -> Optional[ConditionPlan]:
+        """
+        Get the compiled plan for a step's raw conditions config.
+
+        Plans are cached by the config's content, so each workflow version is
+        parsed and compiled once. parse turns the config into a condition tree
+        (or None when there is nothing to evaluate, in which case None is returned).
+        """
+        if isinstance(conditions, str):
+            key = conditions
+        else:
+            key = json.dumps(conditions, sort_keys=True, default=str)
+        with self._plans_lock:
+            if key in self._plans:
+                self._plans.move_to_end(key)
+                return self._plans[key]
+
+        parsed = parse(conditions)
+        plan = self.compile(parsed) if parsed is not None else None
+        with self._plans_lock:
+            self._plans[key] = plan
+            while len(self._plans) > self.max_plans:
+                self._plans.popitem(last=False)
+        return plan
+
+    def _compile_condition(self, condition: Condition) -> ConditionPlan:
         try:
-            if not expression.conditions:
-                return True
+            test = self._compile_test(condition.operator, condition.right_operand)
+        except Exception as e:
+            logger.error(f"Error evaluating condition {condition}: {e}")
+            return _always_false
+        if test is None:
+            logger.warning(f"Unknown operator: {condition.operator}")
+            return _always_false
 
-            results = []
+        path = _split_path(condition.left_operand)
 
-            for condition_or_expr in expression.conditions:
-                if isinstance(condition_or_expr, Condition):
-                    result = self.evaluate_condition(condition_or_expr, context)
-                elif isinstance(condition_or_expr, ConditionalExpression):
-                    result = self.evaluate_expression(condition_or_expr, context)
-                else:
-                    logger.warning(f"Unknown condition type: {type(condition_or_expr)}")
-                    result = False
-
-                results.append(result)
-
-            # Apply logical operator
-            if expression.logical_operator == LogicalOperator.AND:
-                return all(results)
-            elif expression.logical_operator == LogicalOperator.OR:
-                return any(results)
-            elif expression.logical_operator == LogicalOperator.NOT:
-                # For NOT, we negate the first result
-                return not results[0] if results else True
-            else:
-                logger.warning(
-                    f"Unknown logical operator: {expression.logical_operator}"
-                )
+        def evaluate(context: Dict[str, Any]) -> bool:
+            try:
+                return test(_resolve_path(path, context))
+            except Exception as e:
+                logger.error(f"Error evaluating condition {condition}: {e}")
                 return False
 
-        except Exception as e:
-            logger.error(f"Error evaluating expression {expression}: {e}")
-            return False
+        return evaluate
+
+    def _compile_test(
+        self, op: ConditionOperator, right: Any
+    ) -> Optional[Callable[[Any], bool]]:
+        """Build the test for one operator with its right operand bound."""
+        if op == ConditionOperator.EQUALS:
+            return lambda left: left == right
+        if op == ConditionOperator.NOT_EQUALS:
+            return lambda left: left != right
+        if op in _COMPARATORS:
+            comparator = _COMPARATORS[op]
+            return lambda left: self._safe_compare(left, right, comparator)
+        if op == ConditionOperator.CONTAINS:
+            return lambda left: self._safe_contains(left, right)
+        if op == ConditionOperator.NOT_CONTAINS:
+            return lambda left: not self._safe_contains(left, right)
+        if op == ConditionOperator.IN:
+            return (lambda left: left in right) if right else _always_false
+        if op == ConditionOperator.NOT_IN:
+            return (lambda left: left not in right) if right else _always_true
+        if op == ConditionOperator.STARTS_WITH:
+            prefix = str(right)
+            return lambda left: str(left).startswith(prefix)
+        if op == ConditionOperator.ENDS_WITH:
+            suffix = str(right)
+            return lambda left: str(left).endswith(suffix)
+        if op == ConditionOperator.REGEX_MATCH:
+            pattern = _compile_regex(str(right))
+            return lambda left: bool(pattern.search(str(left)))
+        if op == ConditionOperator.IS_EMPTY:
+            return self._is_empty
+        if op == ConditionOperator.IS_NOT_EMPTY:
+            return lambda left: not self._is_empty(left)
+        if op == ConditionOperator.IS_NULL:
+            return lambda left: left is None
+        if op == ConditionOperator.IS_NOT_NULL:
+            return lambda left: left is not None
+        return None
+
+    def _compile_expression(self, expression: ConditionalExpression) -> ConditionPlan:
+        if not expression.conditions:
+            return _always_true
+
+        children = [self.compile(c) for c in expression.conditions]
+        if expression.logical_operator == LogicalOperator.AND:
+            return lambda context: all(child(context) for child in children)
+        if expression.logical_operator == LogicalOperator.OR:
+            return lambda context: any(child(context) for child in children)
+        if expression.logical_operator == LogicalOperator.NOT:
+            # For NOT, we negate the first result
+            first = children[0]
+            return lambda context: not first(context)
+        logger.warning(f"Unknown logical operator: {expression.logical_operator}")
+        return _always_false
 
     def parse_condition_string(self, condition_str: str) -> Optional[Condition]:
         """
@@ -267,23 +330,7 @@ class ConditionEvaluator:
 
     def _resolve_variable(self, variable_path: str, context: Dict[str, Any]) -> Any:
         """Resolve a variable path like 'step1.output.status' from context"""
-        try:
-            parts = variable_path.split(".")
-            current = context
-
-            for part in parts:
-                if isinstance(current, dict):
-                    current = current.get(part)
-                elif hasattr(current, part):
-                    current = getattr(current, part)
-                else:
-                    return None
-
-            return current
-
-        except Exception as e:
-            logger.error(f"Error resolving variable '{variable_path}': {e}")
-            return None
+        return _resolve_path(_split_path(variable_path), context)
 
     def _parse_value(self, value_str: str) -> Any:
         """Parse a string value into appropriate Python type"""
@@ -0,0 +1,145 @@
+"""
+Schedule trigger helpers
+
+Parses the schedule of a workflow's trigger step and computes its next run.
+Used by DatabaseService to maintain the workflow_schedules table and by
+WorkflowScheduler to advance a schedule after it fires.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from zoneinfo import ZoneInfo
+
+from croniter import croniter
+
+logger = logging.getLogger(__name__)
+
+MIN_INTERVAL_SECONDS = 5
+
+
+def schedule_from_configuration(
+    configuration: Optional[Dict[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    """Return the normalized schedule of the workflow's trigger, or None if disabled."""
+    cfg = configuration or {}
+    steps = cfg.get("steps") or []
+    trigger = next((s for s in steps if s.get("step_type") == "trigger"), None)
+    trig_params = (trigger or {}).get("parameters") or {}
+    schedule = trig_params.get("schedule") or {}
+    if not (isinstance(schedule, dict) and schedule.get("enabled")):
+        return None
+
+    mode = (schedule.get("mode") or "interval").lower()
+    if mode not in ("interval", "cron"):
+        return None
+
+    normalized = {
+        "mode": mode,
+        "cron": (schedule.get("cron") or "").strip() or None,
+        "timezone": schedule.get("timezone") or "UTC",
+        # Seconds field is first for 6-field (Quartz-style) crons when set
+        "seconds_at_beginning": bool(
+            schedule.get("seconds_at_beginning") or schedule.get("second_at_beginning")
+        ),
+        "interval_seconds": max(
+            MIN_INTERVAL_SECONDS, int(schedule.get("interval_seconds") or 0)
+        ),
+        "jitter_seconds": int(schedule.get("jitter_seconds") or 0),
+        "backend": (schedule.get("backend") or "dbos").lower(),
+    }
+    if mode == "cron" and not normalized["cron"]:
+        return None
+    return normalized
+
+
+def schedule_signature(schedule: Dict[str, Any]) -> str:
+    """Stable hash of the fields that determine when a schedule fires."""
+    return hashlib.sha256(
+        json.dumps(schedule, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+def _zone(name: Optional[str]) -> ZoneInfo:
+    try:
+        return ZoneInfo(name or "UTC")
+    except Exception:
+        return ZoneInfo("UTC")
+
+
+def compute_next_run(
+    schedule: Dict[str, Any],
+    after: datetime,
+    last_run: Optional[datetime] = None,
+) -> Optional[datetime]:
+    """Next run (UTC) of a schedule, not earlier than `after`.
+
+    Interval schedules run `interval_seconds` after the last run, or right away
+    when they never ran. Cron schedules use croniter in the schedule's timezone
+    and return the first fire time strictly after `after`.
+    Returns None for an invalid cron expression.
+    """
+    if schedule["mode"] == "interval":
+        if last_run is None:
+            return after
+        next_run = last_run + timedelta(seconds=schedule["interval_seconds"])
+        return max(next_run, after)
+
+    tz = _zone(schedule.get("timezone"))
+    try:
+        next_local = croniter(
+            schedule["cron"],
+            after.astimezone(tz),
+            second_at_beginning=schedule.get("seconds_at_beginning", False),
+        ).get_next(datetime)
+    except Exception as e:
+        logger.warning(f"Invalid cron '{schedule.get('cron')}': {e}")
+        return None
+    if next_local.tzinfo is None:
+        next_local = next_local.replace(tzinfo=tz)
+    return next_local.astimezone(timezone.utc)
+
+
+class ScheduleChangeNotifier:
+    """Wakes a sleeping scheduler in this process when a schedule changes.
+
+    notify() may be called from any thread (e.g. a sync request handler).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._event: Optional[asyncio.Event] = None
+
+    def bind(self) -> asyncio.Event:
+        """Create the wake-up event on the running loop (called by the scheduler)."""
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._event = asyncio.Event()
+            return self._event
+
+    def unbind(self):
+        with self._lock:
+            self._loop = None
+            self._event = None
+
+    def notify(self):
+        with self._lock:
+            loop, event = self._loop, self._event
+        if loop is None or event is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            event.set()
+        else:
+            loop.call_soon_threadsafe(event.set)
+
+
+schedule_change_notifier = ScheduleChangeNotifier()
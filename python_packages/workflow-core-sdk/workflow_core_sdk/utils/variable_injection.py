@@ -13,6 +13,7 @@ Example:
 """
 
 import re
+from functools import lru_cache
 from datetime import datetime, timezone
 from typing import Any, Callable, Dict, Optional
 import uuid
@@ -54,6 +55,111 @@ def get_builtin_variables() -> Dict[str, Callable[[], Any]]:
     }
 
 
+# Built-ins are created once; placeholders bind to them when a template is compiled
+_BUILTIN_VARIABLES = get_builtin_variables()
+
+# Variables read from execution context attributes (before built-in fallback)
+_CONTEXT_VARIABLES = frozenset(
+    ["execution_id", "workflow_id", "user_id", "user_name", "session_id"]
+)
+
+
+class _Placeholder:
+    """A {{variable}} occurrence with its accessor path split up front."""
+
+    __slots__ = ("raw", "name", "step_id", "field_path", "context_attr", "builtin")
+
+    def __init__(self, raw: str, name: str):
+        self.raw = raw
+        self.name = name
+        parts = name.split(".")
+        self.step_id = parts[0] if len(parts) > 1 else None
+        self.field_path = tuple(parts[1:])
+        self.context_attr = name if name in _CONTEXT_VARIABLES else None
+        self.builtin = _BUILTIN_VARIABLES.get(name)
+
+    def resolve(
+        self,
+        custom_variables: Optional[Dict[str, Any]],
+        execution_context: Optional[Any],
+    ) -> Optional[str]:
+        # Custom variables first (highest priority)
+        if custom_variables and self.name in custom_variables:
+            value = custom_variables[self.name]
+            return str(value) if value is not None else None
+
+        if execution_context:
+            # Dot notation (e.g., "step_id.field_name" or "step_id.data.nested.field")
+            if self.step_id is not None and hasattr(execution_context, "step_io_data"):
+                value = (execution_context.step_io_data or {}).get(self.step_id, {})
+                if isinstance(value, dict):
+                    for field in self.field_path:
+                        if isinstance(value, dict):
+                            value = value.get(field)
+                        else:
+                            value = None
+                            break
+                    if value is not None:
+                        return str(value)
+
+            # Special variables from the execution context
+            if self.context_attr and hasattr(execution_context, self.context_attr):
+                return str(getattr(execution_context, self.context_attr))
+
+        # Built-in variables (fallback), evaluated only when reached
+        if self.builtin is not None:
+            return str(self.builtin())
+
+        return None
+
+
+class CompiledTemplate:
+    """
+    A template split into literal text and placeholders once, so rendering is
+    a single pass with no regex matching or path splitting.
+
+    Use compile_template() to get a (cached) instance.
+    """
+
+    __slots__ = ("template", "parts")
+
+    def __init__(self, template: str):
+        self.template = template
+        self.parts: list = []
+        pos = 0
+        for match in VARIABLE_PATTERN.finditer(template):
+            if match.start() > pos:
+                self.parts.append(template[pos : match.start()])
+            self.parts.append(_Placeholder(match.group(0), match.group(1).strip()))
+            pos = match.end()
+        if pos < len(template):
+            self.parts.append(template[pos:])
+
+    def render(
+        self,
+        custom_variables: Optional[Dict[str, Any]] = None,
+        execution_context: Optional[Any] = None,
+        preserve_unresolved: bool = False,
+    ) -> str:
+        out = []
+        for part in self.parts:
+            if isinstance(part, str):
+                out.append(part)
+                continue
+            resolved = part.resolve(custom_variables, execution_context)
+            if resolved is not None:
+                out.append(resolved)
+            elif preserve_unresolved:
+                out.append(part.raw)  # Keep original {{variable}}
+        return "".join(out)
+
+
+@lru_cache(maxsize=1024)
+def compile_template(template: str) -> CompiledTemplate:
+    """Compile a template once; repeated renders of the same template reuse it."""
+    return CompiledTemplate(template)
+
+
 def resolve_variable(
     var_name: str,
     custom_variables: Optional[Dict[str, Any]] = None,
@@ -71,62 +177,7 @@ def resolve_variable(
         The resolved value as a string, or None if not found
     """
     var_name = var_name.strip()
-    logger.debug(f"Resolving variable: {var_name}")
-
-    # Check custom variables first (highest priority)
-    if custom_variables and var_name in custom_variables:
-        value = custom_variables[var_name]
-        logger.debug(f"Found in custom_variables: {var_name} = {value}")
-        return str(value) if value is not None else None
-
-    # Check for dot notation (e.g., "step_id.field_name" or "step_id.data.nested.field")
-    if "." in var_name and execution_context:
-        parts = var_name.split(".")
-        step_id = parts[0]
-        field_path = parts[1:]  # Remaining parts form the nested path
-        logger.debug(f"Dot notation: step_id={step_id}, field_path={field_path}")
-
-        # Try to get from execution context step_io_data
-        if hasattr(execution_context, "step_io_data"):
-            logger.debug(
-                f"step_io_data keys: {list(execution_context.step_io_data.keys()) if execution_context.step_io_data else 'None'}"
-            )
-            step_data = execution_context.step_io_data.get(step_id, {})
-            logger.debug(f"step_data for {step_id}: {step_data}")
-            if isinstance(step_data, dict):
-                # Traverse nested path
-                value = step_data
-                for field in field_path:
-                    if isinstance(value, dict):
-                        value = value.get(field)
-                    else:
-                        value = None
-                        break
-                logger.debug(f"Resolved value for {var_name}: {value}")
-                if value is not None:
-                    return str(value)
-        else:
-            logger.debug("execution_context has no step_io_data attribute")
-
-    # Check execution context for special variables (before built-in fallback)
-    if execution_context:
-        if var_name == "execution_id" and hasattr(execution_context, "execution_id"):
-            return str(execution_context.execution_id)
-        if var_name == "workflow_id" and hasattr(execution_context, "workflow_id"):
-            return str(execution_context.workflow_id)
-        if var_name == "user_id" and hasattr(execution_context, "user_id"):
-            return str(execution_context.user_id)
-        if var_name == "user_name" and hasattr(execution_context, "user_name"):
-            return str(execution_context.user_name)
-        if var_name == "session_id" and hasattr(execution_context, "session_id"):
-            return str(execution_context.session_id)
-
-    # Check built-in variables (fallback)
-    builtins = get_builtin_variables()
-    if var_name in builtins:
-        return str(builtins[var_name]())
-
-    return None
+    return _Placeholder(var_name, var_name).resolve(custom_variables, execution_context)
 
 
 def inject_variables(
@@ -156,18 +207,9 @@ def inject_variables(
     if not template or not isinstance(template, str):
         return template
 
-    def replace_match(match: re.Match) -> str:
-        var_name = match.group(1)
-        resolved = resolve_variable(var_name, custom_variables, execution_context)
-
-        if resolved is not None:
-            return resolved
-        elif preserve_unresolved:
-            return match.group(0)  # Keep original {{variable}}
-        else:
-            return ""  # Replace with empty string
-
-    return VARIABLE_PATTERN.sub(replace_match, template)
+    return compile_template(template).render(
+        custom_variables, execution_context, preserve_unresolved
+    )
 
 
 def extract_variables(template: str) -> list[str]:
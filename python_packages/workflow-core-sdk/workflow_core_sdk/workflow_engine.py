@@ -602,57 +602,52 @@ class WorkflowEngine:
             return True  # No conditions means always execute
 
         try:
+            # Parsed and compiled once per distinct conditions config
+            plan = condition_evaluator.plan_for(conditions, self._parse_conditions)
+            if plan is None:
+                return True
+
             # Prepare context for condition evaluation
             condition_context = self._prepare_condition_context(execution_context)
-
-            # Handle different condition formats
-            if isinstance(conditions, str):
-                # Simple string condition
-                condition = condition_evaluator.parse_condition_string(conditions)
-                if condition:
-                    return condition_evaluator.evaluate_condition(
-                        condition, condition_context
-                    )
-                else:
-                    logger.warning(f"Could not parse condition string: {conditions}")
-                    return True
-
-            elif isinstance(conditions, dict):
-                # Complex condition object
-                if "logical_operator" in conditions or "conditions" in conditions:
-                    # Parse as conditional expression
-                    expression = self._parse_conditional_expression(conditions)
-                    if expression:
-                        return condition_evaluator.evaluate_expression(
-                            expression, condition_context
-                        )
-                else:
-                    # Parse as single condition
-                    condition = self._parse_condition_dict(conditions)
-                    if condition:
-                        return condition_evaluator.evaluate_condition(
-                            condition, condition_context
-                        )
-
-            elif isinstance(conditions, list):
-                # List of conditions (default AND logic)
-                expression = ConditionalExpression(
-                    conditions=[
-                        self._parse_condition_item(cond) for cond in conditions
-                    ],
-                    logical_operator=LogicalOperator.AND,
-                )
-                return condition_evaluator.evaluate_expression(
-                    expression, condition_context
-                )
-
-            logger.warning(f"Unknown condition format: {type(conditions)}")
-            return True
+            return plan(condition_context)
 
         except Exception as e:
             logger.error(f"Error evaluating step conditions: {e}")
             return True  # Default to executing on error
 
+    def _parse_conditions(
+        self, conditions: Any
+    ) -> Optional[Union[Condition, ConditionalExpression]]:
+        """Parse a step's conditions config (string, dict or list) into a condition tree"""
+        # Handle different condition formats
+        if isinstance(conditions, str):
+            # Simple string condition
+            condition = condition_evaluator.parse_condition_string(conditions)
+            if condition is None:
+                logger.warning(f"Could not parse condition string: {conditions}")
+            return condition
+
+        elif isinstance(conditions, dict):
+            # Complex condition object
+            if "logical_operator" in conditions or "conditions" in conditions:
+                # Parse as conditional expression
+                parsed = self._parse_conditional_expression(conditions)
+            else:
+                # Parse as single condition
+                parsed = self._parse_condition_dict(conditions)
+            if parsed is not None:
+                return parsed
+
+        elif isinstance(conditions, list):
+            # List of conditions (default AND logic)
+            return ConditionalExpression(
+                conditions=[self._parse_condition_item(cond) for cond in conditions],
+                logical_operator=LogicalOperator.AND,
+            )
+
+        logger.warning(f"Unknown condition format: {type(conditions)}")
+        return None
+
     def _prepare_condition_context(
         self, execution_context: ExecutionContext
     ) -> Dict[str, Any]: